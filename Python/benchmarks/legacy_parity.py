@@ -0,0 +1,536 @@
+"""Paridad con los informes del sistema FoxPro (CONTROL.EXE / OBS.EXE).
+
+Cada caso toma un informe generado por el programa viejo junto a su archivo de
+entrada, ejecuta el proceso portado sobre esa misma entrada, compara el resultado
+numéricamente (con tolerancia) y registra el tiempo de Python:
+
+    python -m benchmarks.legacy_parity --foxpro ../FoxPro --salida paridad.json
+
+Informes comparados:
+  B<marea>.TXT   "Control Dias horas Arrastrero" (obshar.PRG), sección por especie.
+  C<marea>.TXT   "Posiciones con una especie arrastreros" (obsposarr.PRG); también *_GIS.TXT.
+  P<marea>.TXT   "Resumen produccion" (obspro.PRG), grupos y total de producción.
+  <c|m|p><marea><letra>.dbf   "Cortar bases", con las etapas deducidas de los propios cortes.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from domain import marea_procesos  # noqa: F401  (registra los procesos y productos)
+from domain.jobs import JobContext
+from domain.marea_dataset import MareaDataset
+from domain.procesos import process_graph
+from domain.scheduler import DagScheduler
+from infrastructure.dbf_reader import DbfColumns, read_records
+from infrastructure.marea_files import MAREA_FILE_KINDS, parse_marea_file_name
+from infrastructure.marea_service import run_processes
+
+# Carpeta del sistema viejo, al lado de la del proyecto de Python
+FOXPRO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'FoxPro'))
+# Los informes se escribían con la página de códigos de Windows; terminan con ^Z
+LEGACY_ENCODING = 'cp1252'
+_EOF_MARKER = '\x1a'
+
+# Diferencias admitidas: los informes redondean kilos y porcentajes a 2 decimales,
+# posiciones a 4 y las horas (H.MM) se truncan al minuto con aritmética de punto flotante
+TOLERANCIAS = {
+    'kilos': 0.011,
+    'porcentaje': 0.011,
+    'minutos': 1.0,
+    'grados': 1e-4,
+}
+
+# Catálogo de especies con el que obshar.PRG arma el informe B (codinidep -> nomcient)
+LEGACY_SPECIES_CATALOG = 'especie1.dbf'
+FALLBACK_SPECIES_CATALOG = os.path.join(os.path.dirname(__file__), '..', 'data', 'Especies.dbf')
+
+_REPORT_PATTERN = re.compile(r'^([BCP])(\d{3,}[a-z]?)(_GIS)?\.txt$', re.IGNORECASE)
+_STAGE_CUT_PATTERN = re.compile(r'^([cmp])(\d{3,})([a-z])\.dbf$', re.IGNORECASE)
+_TOTAL_PRODUCCION = re.compile(r'^Total Producci\S*\s+(\S+)\s*$')
+
+REPORT_PROCESSES = {
+    'B': "Control Dias horas Arrastrero",
+    'C': "Posiciones con una especie arrastreros",
+    'P': "Resumen produccion",
+}
+REPORT_INPUTS = {'B': 'c', 'C': 'c', 'P': 'p'}
+
+
+# ---------------------------------------------------------------------------
+# Lectura de los informes del sistema viejo
+# ---------------------------------------------------------------------------
+
+def read_legacy_report(path: str) -> Tuple[List[List[str]], str]:
+    """Filas (celdas sin espacios) de un informe TXT y su separador decimal.
+
+    Los informes usan ';' como separador y ',' como decimal; los exportados para GIS
+    usan ',' y '.', y los pasados por Excel usan tabuladores y '.' de miles.
+    """
+    with open(path, 'rb') as f:
+        text = f.read().decode(LEGACY_ENCODING, errors='replace').replace(_EOF_MARKER, '')
+    if '\t' in text:
+        separator, decimal = '\t', ','
+    elif ';' in text:
+        separator, decimal = ';', ','
+    else:
+        separator, decimal = ',', '.'
+    rows = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        rows.append([cell.strip() for cell in line.split(separator)])
+    return rows, decimal
+
+
+def legacy_number(text: str, decimal: str = ',') -> Optional[float]:
+    """Número de un informe ('1.244.268,43', '-43.2900'); None si está vacío o desbordado ('****')."""
+    text = text.strip()
+    if decimal == ',':
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def legacy_hmm_minutes(value: float) -> float:
+    """Minutos de un valor H.MM (horas.minutos) como los lista obshar.PRG."""
+    horas = int(value)
+    return horas * 60 + round((value - horas) * 100)
+
+
+def legacy_dates(text: str) -> Set[date]:
+    """Fechas posibles de un texto dd/mm/aaaa o mm/dd/aaaa (depende de SET DATE al generar el informe)."""
+    fechas = set()
+    for formato in ('%m/%d/%Y', '%d/%m/%Y'):
+        try:
+            fechas.add(datetime.strptime(text.strip(), formato).date())
+        except ValueError:
+            pass
+    return fechas
+
+
+@dataclass
+class SpeciesReport:
+    """Informe B: una fila por especie y la línea de totales."""
+    especies: Dict[str, Dict[str, Optional[float]]]
+    totales: Dict[str, Optional[float]]
+
+
+def parse_species_report(path: str) -> SpeciesReport:
+    """Sección "Especie ; Kilos ; Descarte ; Desc.% ; Lances ; Dias ; Horas" de un informe B."""
+    rows, decimal = read_legacy_report(path)
+    columnas = ('kilos', 'descarte', 'descarte_pct', 'lances', 'dias')
+    especies, totales = {}, {}
+    for row in rows:
+        nombre = row[0]
+        if nombre.startswith('Especie') or nombre == 'Totales' or len(row) < 6:
+            continue
+        valores = [legacy_number(cell, decimal) for cell in row[1:7]]
+        if not nombre:
+            # Línea de totales: kilos, descarte, %, registros del archivo y días distintos
+            totales = dict(zip(columnas, valores[:5]))
+            break
+        fila = dict(zip(columnas, valores[:5]))
+        fila['minutos'] = legacy_hmm_minutes(valores[5]) if len(valores) > 5 and valores[5] is not None else None
+        especies[nombre] = fila
+    return SpeciesReport(especies, totales)
+
+
+@dataclass
+class PositionRow:
+    """Fila de un informe C (posición de inicio de un lance)."""
+    barco: str
+    marea: Optional[float]
+    lance: Optional[float]
+    fechas: Set[date]
+    latitud: Optional[float]
+    longitud: Optional[float]
+
+
+def parse_positions_report(path: str) -> List[PositionRow]:
+    """Filas "Buque ; marea ; lan ; fecha ; latitud ; longitud" de un informe C, en orden."""
+    rows, decimal = read_legacy_report(path)
+    posiciones = []
+    for row in rows:
+        if row[0].startswith('Buque') or len(row) < 6:
+            continue
+        posiciones.append(PositionRow(row[0], legacy_number(row[1], decimal), legacy_number(row[2], decimal),
+                                      legacy_dates(row[3]), legacy_number(row[4], decimal),
+                                      legacy_number(row[5], decimal)))
+    return posiciones
+
+
+@dataclass
+class ProductionReport:
+    """Informe P: kilos y factor por (especie, producto, categoría) y total de producción."""
+    grupos: Dict[Tuple[str, str, str], Dict[str, Optional[float]]]
+    total: Optional[float]
+
+
+def parse_production_report(path: str) -> ProductionReport:
+    """Grupos de un informe P; la lista "Factor en cero" (fechas por registro) no se compara."""
+    rows, decimal = read_legacy_report(path)
+    grupos, total, en_grupos = {}, None, True
+    for row in rows:
+        match = _TOTAL_PRODUCCION.match(row[0])
+        if match:
+            total = legacy_number(match.group(1), decimal)
+        elif row[0].startswith('Factor en cero'):
+            en_grupos = False
+        elif en_grupos and len(row) >= 5 and not row[0].startswith('Especie'):
+            grupos[(row[0], row[1], row[2])] = {'kilos': legacy_number(row[3], decimal),
+                                                'factor': legacy_number(row[4], decimal)}
+    return ProductionReport(grupos, total)
+
+
+# ---------------------------------------------------------------------------
+# Comparación
+# ---------------------------------------------------------------------------
+
+def _differs(legacy: Optional[float], value: float, tolerancia: float) -> bool:
+    return legacy is not None and abs(legacy - float(value)) > tolerancia
+
+
+def _compare_fields(etiqueta: str, legacy: Dict[str, Optional[float]], python: Dict[str, float],
+                    tolerancias: Dict[str, float]) -> List[str]:
+    diferencias = []
+    for nombre, tolerancia in tolerancias.items():
+        if nombre in legacy and _differs(legacy[nombre], python[nombre], tolerancia):
+            diferencias.append(f"{etiqueta}: {nombre} legado={legacy[nombre]} python={python[nombre]:.4f}")
+    return diferencias
+
+
+def _run_process(name: str, kind: str, path: str) -> Tuple[MareaDataset, Dict[str, np.ndarray]]:
+    """Lee `path` como la tabla `kind` de una marea sin etapas y ejecuta el proceso `name`."""
+    dataset = MareaDataset('', '', None, {kind: DbfColumns(path)}, {kind: path})
+    return dataset, DagScheduler(process_graph(), max_workers=0).run([name], dataset, {'especies': []})[name]
+
+
+@dataclass
+class SpeciesCatalog:
+    """Catálogo de especies que usaba el sistema viejo."""
+    nombres: Dict[int, str]                  # codinidep -> nombre científico
+    cientificos: Dict[str, Set[str]]         # nombre vulgar (minúsculas) -> nombres científicos
+
+    def aliases(self, nombre: str) -> Set[str]:
+        """Nombres con que puede figurar una especie en un informe: el propio y sus científicos."""
+        return {nombre} | self.cientificos.get(nombre.lower(), set())
+
+
+def load_species_catalog(foxpro_dir: str) -> SpeciesCatalog:
+    """Lee el catálogo de especies de la carpeta del sistema viejo (o el de la aplicación)."""
+    path = _find_file(foxpro_dir, LEGACY_SPECIES_CATALOG) or os.path.abspath(FALLBACK_SPECIES_CATALOG)
+    catalogo = DbfColumns(path)
+    nombres: Dict[int, str] = {}
+    cientificos: Dict[str, Set[str]] = {}
+    for codigo, cientifico, vulgar in zip(catalogo['CODINIDEP'], catalogo['NOMCIENT'], catalogo['NOMVULCAS']):
+        cientifico = str(cientifico).strip()
+        nombres.setdefault(int(codigo), cientifico)
+        cientificos.setdefault(str(vulgar).strip().lower(), set()).add(cientifico)
+    return SpeciesCatalog(nombres, cientificos)
+
+
+def compare_species_report(report: SpeciesReport, dataset: MareaDataset, resultado: Dict[str, np.ndarray],
+                           catalogo: SpeciesCatalog) -> Tuple[int, List[str]]:
+    """Compara el informe B con "Control Dias horas Arrastrero"; devuelve (filas de Python, diferencias).
+
+    obshar.PRG recorre su catálogo de especies, así que las especies sin nombre en el
+    catálogo no aparecen en el informe ni en sus totales.
+    """
+    filas = {}
+    for i, codigo in enumerate(resultado.get('especie', [])):
+        nombre = catalogo.nombres.get(int(codigo))
+        if nombre is not None:
+            filas[nombre] = {
+                'kilos': resultado['kilos'][i],
+                'descarte': resultado['descarte'][i],
+                'descarte_pct': resultado['descarte_pct'][i],
+                'lances': resultado['lances'][i],
+                'dias': resultado['dias'][i],
+                'minutos': resultado['horas'][i] * 60,
+            }
+    tolerancias = {'kilos': TOLERANCIAS['kilos'], 'descarte': TOLERANCIAS['kilos'],
+                   'descarte_pct': TOLERANCIAS['porcentaje'], 'lances': 0, 'dias': 0,
+                   'minutos': TOLERANCIAS['minutos']}
+    diferencias = [f"{nombre}: falta en Python" for nombre in report.especies if nombre not in filas]
+    diferencias += [f"{nombre}: no figura en el informe" for nombre in filas if nombre not in report.especies]
+    for nombre, legacy in report.especies.items():
+        if nombre in filas:
+            diferencias += _compare_fields(nombre, legacy, filas[nombre], tolerancias)
+
+    if report.totales:
+        kilos = sum(fila['kilos'] for fila in filas.values())
+        descarte = sum(fila['descarte'] for fila in filas.values())
+        totales = {
+            'kilos': kilos,
+            'descarte': descarte,
+            'descarte_pct': descarte / kilos * 100 if kilos else 0.0,
+            'lances': dataset.num_rows('captura'),
+            'dias': len(np.unique(dataset.table('captura')['FECHA'])),
+        }
+        diferencias += _compare_fields("Totales", report.totales, totales,
+                                       {'kilos': TOLERANCIAS['kilos'], 'descarte': TOLERANCIAS['kilos'],
+                                        'descarte_pct': TOLERANCIAS['porcentaje'], 'lances': 0, 'dias': 0})
+    return len(filas), diferencias
+
+
+def compare_positions_report(report: List[PositionRow], resultado: Dict[str, np.ndarray]) -> List[str]:
+    """Compara el informe C, fila por fila y en el orden del archivo, con las posiciones de Python."""
+    n = len(resultado.get('lance', []))
+    diferencias = [] if n == len(report) else [f"filas: legado={len(report)} python={n}"]
+    for i, legacy in enumerate(report[:n]):
+        etiqueta = f"fila {i + 1} (lance {legacy.lance:g})" if legacy.lance is not None else f"fila {i + 1}"
+        fecha = resultado['fecha'][i].astype('datetime64[D]').item()
+        if legacy.barco != str(resultado['barco'][i]).strip():
+            diferencias.append(f"{etiqueta}: barco legado={legacy.barco!r} python={resultado['barco'][i]!r}")
+        if fecha not in legacy.fechas:
+            diferencias.append(f"{etiqueta}: fecha legado={sorted(legacy.fechas)} python={fecha}")
+        python = {'marea': resultado['marea'][i], 'lance': resultado['lance'][i],
+                  'latitud': resultado['latitud'][i], 'longitud': resultado['longitud'][i]}
+        legado = {'marea': legacy.marea, 'lance': legacy.lance, 'latitud': legacy.latitud,
+                  'longitud': legacy.longitud}
+        diferencias += _compare_fields(etiqueta, legado, python,
+                                       {'marea': 0, 'lance': 0, 'latitud': TOLERANCIAS['grados'],
+                                        'longitud': TOLERANCIAS['grados']})
+    return diferencias
+
+
+def compare_production_report(report: ProductionReport, resultado: Dict[str, np.ndarray],
+                              catalogo: SpeciesCatalog) -> Tuple[int, List[str]]:
+    """Compara el informe P con "Resumen produccion"; devuelve (filas de Python, diferencias).
+
+    Algunos informes viejos listan la especie con su nombre científico aunque la base
+    de producción guarde el vulgar, así que se acepta cualquiera de los dos.
+    """
+    grupos = {}
+    for i in range(len(resultado.get('especie', []))):
+        clave = tuple(str(resultado[c][i]).strip() for c in ('especie', 'producto', 'categoria'))
+        grupos[clave] = {'kilos': resultado['kilos'][i], 'factor': resultado['factor'][i]}
+    pares, sin_par = {}, set(grupos)
+    for especie, producto, categoria in report.grupos:
+        for clave in sorted(sin_par):
+            if clave[1:] == (producto, categoria) and especie in catalogo.aliases(clave[0]):
+                pares[(especie, producto, categoria)] = clave
+                sin_par.discard(clave)
+                break
+    diferencias = [f"{' / '.join(c)}: falta en Python" for c in report.grupos if c not in pares]
+    diferencias += [f"{' / '.join(c)}: no figura en el informe" for c in sorted(sin_par)]
+    for clave, legacy in report.grupos.items():
+        if clave in pares:
+            diferencias += _compare_fields(' / '.join(clave), legacy, grupos[pares[clave]],
+                                           {'kilos': TOLERANCIAS['kilos'], 'factor': TOLERANCIAS['kilos']})
+    if report.total is not None:
+        total = float(sum(g['kilos'] for g in grupos.values()))
+        if _differs(report.total, total, TOLERANCIAS['kilos']):
+            diferencias.append(f"Total Producción: legado={report.total} python={total:.2f}")
+    return len(grupos), diferencias
+
+
+# ---------------------------------------------------------------------------
+# Casos
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ParityResult:
+    """Resultado de un caso: diferencias encontradas y tiempo de Python."""
+    caso: str
+    proceso: str
+    legado: str
+    entrada: str
+    filas_legado: int
+    filas_python: int
+    segundos: float
+    diferencias: List[str] = field(default_factory=list)
+    omitido: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.diferencias
+
+    def to_dict(self) -> Dict[str, Any]:
+        datos = asdict(self)
+        datos['ok'] = self.ok
+        return datos
+
+
+@dataclass(frozen=True)
+class ParityCase:
+    """Un informe (o juego de cortes) del sistema viejo y la entrada con la que se generó."""
+    nombre: str
+    tipo: str
+    legado: Tuple[str, ...]
+    entrada: Tuple[str, ...]
+
+
+def _find_file(directory: str, name: str) -> Optional[str]:
+    """Ruta de `name` en `directory` sin distinguir mayúsculas (los DBF vienen de DOS)."""
+    for entry in os.listdir(directory):
+        if entry.lower() == name.lower():
+            return os.path.join(directory, entry)
+    return None
+
+
+def discover_cases(foxpro_dir: str) -> List[ParityCase]:
+    """Casos disponibles en la carpeta del sistema viejo: informes con su entrada y cortes por etapa."""
+    casos = []
+    cortes: Dict[str, List[str]] = {}
+    for entry in sorted(os.listdir(foxpro_dir), key=str.lower):
+        path = os.path.join(foxpro_dir, entry)
+        report = _REPORT_PATTERN.match(entry)
+        if report:
+            tipo, sufijo = report.group(1).upper(), report.group(2)
+            entrada = _find_file(foxpro_dir, f"{REPORT_INPUTS[tipo]}{sufijo}.dbf")
+            # Informes vacíos (sólo ^Z) quedan de corridas interrumpidas
+            if entrada and os.path.getsize(path) > 1:
+                casos.append(ParityCase(os.path.splitext(entry)[0], tipo, (path,), (entrada,)))
+            continue
+        corte = _STAGE_CUT_PATTERN.match(entry)
+        if corte:
+            cortes.setdefault(corte.group(2), []).append(path)
+    for marea, archivos in sorted(cortes.items()):
+        bases = [_find_file(foxpro_dir, f"{prefix}{marea}.dbf") for prefix in 'cmp']
+        bases = tuple(base for base in bases if base)
+        if bases:
+            casos.append(ParityCase(f"cortes_{marea}", 'cortes', tuple(sorted(archivos)), bases))
+    return casos
+
+
+def infer_etapas(cortes: Sequence[str]) -> List[Tuple[str, str]]:
+    """Etapas con que se cortaron los archivos: primera y última fecha de cada letra."""
+    rangos: Dict[str, List[np.datetime64]] = {}
+    for path in cortes:
+        letra = _STAGE_CUT_PATTERN.match(os.path.basename(path)).group(3).lower()
+        fechas = DbfColumns(path)['FECHA']
+        fechas = fechas[~np.isnat(fechas)]
+        if len(fechas):
+            rangos.setdefault(letra, []).extend([fechas.min(), fechas.max()])
+    return [(str(min(r)), str(max(r))) for _, r in sorted(rangos.items())]
+
+
+def _timed(funcion: Callable[[], Any], repeticiones: int) -> Tuple[Any, float]:
+    """Resultado de la última ejecución y mediana de los tiempos."""
+    tiempos, resultado = [], None
+    for _ in range(max(1, repeticiones)):
+        start = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - start)
+    return resultado, statistics.median(tiempos)
+
+
+def _run_report_case(caso: ParityCase, repeticiones: int, catalogo: SpeciesCatalog) -> ParityResult:
+    proceso = REPORT_PROCESSES[caso.tipo]
+    legado, entrada = caso.legado[0], caso.entrada[0]
+    kind = MAREA_FILE_KINDS[REPORT_INPUTS[caso.tipo]]
+    (dataset, resultado), segundos = _timed(lambda: _run_process(proceso, kind, entrada), repeticiones)
+    if caso.tipo == 'B':
+        report = parse_species_report(legado)
+        filas_legado = len(report.especies)
+        filas_python, diferencias = compare_species_report(report, dataset, resultado, catalogo)
+    elif caso.tipo == 'C':
+        report = parse_positions_report(legado)
+        filas_legado, filas_python = len(report), len(resultado.get('lance', []))
+        diferencias = compare_positions_report(report, resultado)
+    else:
+        report = parse_production_report(legado)
+        filas_legado = len(report.grupos)
+        filas_python, diferencias = compare_production_report(report, resultado, catalogo)
+        if report.total is None and not report.grupos:
+            return ParityResult(caso.nombre, proceso, legado, entrada, 0, filas_python, round(segundos, 6),
+                                omitido="informe incompleto (sin grupos ni total de producción)")
+    return ParityResult(caso.nombre, proceso, legado, entrada, filas_legado, filas_python,
+                        round(segundos, 6), diferencias)
+
+
+def _run_stage_cut_case(caso: ParityCase, repeticiones: int) -> ParityResult:
+    """Corta las bases con las etapas de los cortes viejos y compara registro por registro."""
+    etapas = infer_etapas(caso.legado)
+    _, num_marea, anio_marea = parse_marea_file_name(os.path.basename(caso.entrada[0]))
+    data_dir = os.path.dirname(caso.entrada[0])
+    legado = {os.path.basename(path).lower(): path for path in caso.legado}
+    diferencias = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, segundos = _timed(lambda: run_processes(JobContext(), ["Cortar bases"], num_marea, anio_marea, etapas,
+                                                   data_dir=data_dir, output_dir=output_dir), repeticiones)
+        # El programa viejo sólo cortaba algunos archivos (c, m, p): se comparan esos tipos
+        prefijos = {name[0] for name in legado}
+        generados = {name.lower(): os.path.join(output_dir, name) for name in os.listdir(output_dir)
+                     if name[0].lower() in prefijos}
+        filas_legado = sum(len(read_records(path)) for path in legado.values())
+        filas_python = sum(len(read_records(path)) for path in generados.values())
+        for name, path in sorted(legado.items()):
+            if name not in generados:
+                diferencias.append(f"{name}: falta en Python")
+                continue
+            viejos, nuevos = read_records(path), read_records(generados[name])
+            if viejos.shape != nuevos.shape or not np.array_equal(viejos, nuevos):
+                diferencias.append(f"{name}: registros legado={len(viejos)} python={len(nuevos)} "
+                                   f"({'mismos registros, distinto contenido' if len(viejos) == len(nuevos) else 'distinta cantidad'})")
+        diferencias += [f"{name}: no figura en el legado" for name in sorted(generados) if name not in legado]
+    return ParityResult(caso.nombre, "Cortar bases", ', '.join(sorted(legado)),
+                        ', '.join(os.path.basename(p) for p in caso.entrada), filas_legado, filas_python,
+                        round(segundos, 6), diferencias)
+
+
+def run_parity(foxpro_dir: str = FOXPRO_DIR, repeticiones: int = 5, casos: Optional[Sequence[str]] = None,
+               log=print) -> Dict[str, Any]:
+    """Ejecuta todos los casos de `foxpro_dir` y devuelve el informe de paridad."""
+    catalogo = load_species_catalog(foxpro_dir)
+    resultados = []
+    for caso in discover_cases(foxpro_dir):
+        if casos and caso.nombre not in casos:
+            continue
+        if caso.tipo == 'cortes':
+            resultado = _run_stage_cut_case(caso, repeticiones)
+        else:
+            resultado = _run_report_case(caso, repeticiones, catalogo)
+        resultados.append(resultado)
+        if resultado.omitido:
+            estado = f"omitido, {resultado.omitido}"
+        else:
+            estado = 'OK' if resultado.ok else f'{len(resultado.diferencias)} diferencias'
+        log(f"{resultado.caso}: {estado} ({resultado.filas_python} filas, {resultado.segundos * 1000:.1f} ms)")
+        for diferencia in resultado.diferencias:
+            log(f"    {diferencia}")
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'foxpro': os.path.abspath(foxpro_dir),
+        'repeticiones': repeticiones,
+        'tolerancias': TOLERANCIAS,
+        'entorno': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'plataforma': platform.platform()},
+        'casos': [resultado.to_dict() for resultado in resultados],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Paridad de los procesos portados con los informes FoxPro")
+    parser.add_argument('--foxpro', default=FOXPRO_DIR, help="Carpeta con los informes y archivos del sistema viejo")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Ejecuciones por caso para medir el tiempo")
+    parser.add_argument('--casos', nargs='+', default=None, help="Limita la corrida a estos casos (ej. B12822a)")
+    parser.add_argument('--salida', default=None, help="Archivo JSON con los resultados")
+    args = parser.parse_args(argv)
+
+    informe = run_parity(args.foxpro, args.repeticiones, args.casos)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+    comparados = [caso for caso in informe['casos'] if not caso['omitido']]
+    fallidos = [caso['caso'] for caso in comparados if not caso['ok']]
+    print(f"{len(comparados) - len(fallidos)}/{len(comparados)} casos coinciden con el legado")
+    return 1 if fallidos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
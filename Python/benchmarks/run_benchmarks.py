@@ -0,0 +1,262 @@
+"""Benchmarks de tiempo y memoria sobre mareas sintéticas.
+
+Genera (una vez) los archivos de la escala pedida, mide cada caso varias veces y
+escribe los resultados en JSON para comparar entre versiones:
+
+    python -m benchmarks.run_benchmarks --escala temporada --salida bench.json
+    python -m benchmarks.run_benchmarks --escala flota --comparar bench_anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic_marea import ESPECIES, generate_season
+from domain.columnar import concat
+from domain.jobs import JobContext
+from domain.procesos import read_only_processes
+from infrastructure.exporters import EXPORT_FORMATS, ExportRequest, export_path, export_tables
+from infrastructure.marea_service import load_marea_dataset, run_processes
+from infrastructure.repositories import CatalogRepository
+from util import resource_path
+
+# Escalas: (mareas, lances por marea)
+ESCALAS = {
+    'marea': (1, 200),
+    'flota': (50, 200),
+    'temporada': (500, 200),
+}
+ANIO = 2025
+# Porcentaje de aumento de tiempo a partir del cual `--comparar` informa una regresión
+TOLERANCIA_REGRESION = 0.2
+# Registros por bloque de los casos que recorren los archivos por partes
+BLOQUE = 5000
+
+Benchmark = Callable[[], int]
+
+
+def _etapas(anio: int) -> List[Tuple[str, str]]:
+    return [(f'{anio}-01-01', f'{anio}-06-30'), (f'{anio}-07-01', f'{anio + 1}-01-31')]
+
+
+def _per_marea(data_dir: str, mareas: Sequence[Tuple[str, str]], names: List[str],
+               output_dir: Optional[str] = None, especies: Sequence[int] = ()) -> Benchmark:
+    """Caso que lee cada marea y ejecuta `names` sobre ella; devuelve los registros procesados."""
+    def run() -> int:
+        filas = 0
+        for num, anio in mareas:
+            dataset = load_marea_dataset(data_dir, num, anio, _etapas(int(anio)))
+            run_processes(JobContext(), names, num, anio, especies=especies, data_dir=data_dir,
+                          output_dir=output_dir, dataset=dataset)
+            filas += sum(dataset.num_rows(kind) for kind in dataset.tables)
+        return filas
+    return run
+
+
+def _por_bloques(data_dir: str, mareas: Sequence[Tuple[str, str]], names: List[str],
+                 especies: Sequence[int] = ()) -> Benchmark:
+    """Caso que ejecuta `names` recorriendo los archivos por bloques; devuelve las filas de los resultados."""
+    def run() -> int:
+        filas = 0
+        for num, anio in mareas:
+            resultados = run_processes(JobContext(), names, num, anio, _etapas(int(anio)), especies=especies,
+                                       data_dir=data_dir, chunk_rows=BLOQUE)
+            filas += sum(len(next(iter(r.values()), ())) for r in resultados.values() if r)
+        return filas
+    return run
+
+
+def _lectura(data_dir: str, mareas: Sequence[Tuple[str, str]]) -> Benchmark:
+    """Lee y decodifica todas las columnas de captura y muestras."""
+    def run() -> int:
+        filas = 0
+        for num, anio in mareas:
+            dataset = load_marea_dataset(data_dir, num, anio)
+            for kind in ('captura', 'muestra'):
+                table = dataset.table(kind)
+                for name in table:
+                    table[name]
+                filas += dataset.num_rows(kind)
+        return filas
+    return run
+
+
+def _exportar(data_dir: str, mareas: Sequence[Tuple[str, str]], names: List[str], output_dir: str,
+              especies: Sequence[int] = ()) -> Benchmark:
+    """Exporta en todos los formatos el resultado de `names` consolidado para todas las mareas.
+
+    Los procesos se ejecutan una sola vez (en la primera corrida); se mide la exportación.
+    """
+    tablas: Dict[str, Any] = {}
+
+    def run() -> int:
+        if not tablas:
+            partes: Dict[str, List] = {}
+            for num, anio in mareas:
+                resultados = run_processes(JobContext(), names, num, anio, _etapas(int(anio)),
+                                           especies=especies, data_dir=data_dir)
+                for name, tabla in resultados.items():
+                    partes.setdefault(name, []).append(tabla)
+            tablas.update({name: concat(p) for name, p in partes.items()})
+        export_tables([ExportRequest(export_path(output_dir, name, formato), tabla, formato)
+                       for name, tabla in tablas.items() for formato in EXPORT_FORMATS])
+        return sum(len(next(iter(t.values()), ())) for t in tablas.values()) * len(EXPORT_FORMATS)
+    return run
+
+
+def _catalogos() -> int:
+    repo = CatalogRepository(base_path=resource_path('data'))
+    return len(repo.get_especies()) + len(repo.get_buques()) + len(repo.get_observadores())
+
+
+def _catalogos_vistas() -> int:
+    """Lo que hace la interfaz con los catálogos: un texto por fila para los combos y búsquedas por código."""
+    repo = CatalogRepository(base_path=resource_path('data'))
+    filas = 0
+    for catalogo, campo in ((repo.get_especies(), 'codinidep'), (repo.get_buques(), 'buque_cod'),
+                            (repo.get_observadores(), 'obs_nro')):
+        textos = [entidad.display_name for entidad in catalogo]
+        codigos = catalogo.values(campo)
+        filas += sum(catalogo.find(campo, codigo) is not None for codigo in codigos[::10]) + len(textos)
+    return filas
+
+
+# Controles que ya tienen su propio caso; el resto se mide junto en 'validacion'
+_CONTROLES_MEDIDOS = ("Distribución de tallas", "Resumen produccion", "Control Dias horas Arrastrero")
+
+
+def validation_processes() -> List[str]:
+    """Controles de validación de la marea (muestreo, derrotero, posiciones, maduros, ...)."""
+    return [name for name in read_only_processes() if name not in _CONTROLES_MEDIDOS]
+
+
+def build_benchmarks(data_dir: str, mareas: Sequence[Tuple[str, str]], work_dir: str) -> Dict[str, Benchmark]:
+    """Casos medidos, por nombre.
+
+    'validacion' ejecuta juntos todos los controles de sólo lectura que no tienen caso
+    propio, así los controles que se agreguen quedan medidos sin tocar esta lista.
+    """
+    cortes_dir = os.path.join(work_dir, 'cortes')
+    return {
+        'carga_catalogos': _catalogos,
+        'catalogos_vistas': _catalogos_vistas,
+        'lectura_mareas': _lectura(data_dir, mareas),
+        'cortar_bases': _per_marea(data_dir, mareas, ["Cortar bases"], output_dir=cortes_dir),
+        'distribucion_tallas': _per_marea(data_dir, mareas, ["Distribución de tallas"],
+                                          especies=[ESPECIES[0][0]]),
+        'distribucion_tallas_bloques': _por_bloques(data_dir, mareas, ["Distribución de tallas"],
+                                                    especies=[ESPECIES[0][0]]),
+        'resumen_produccion': _per_marea(data_dir, mareas, ["Resumen produccion"]),
+        'control_dias_horas': _per_marea(data_dir, mareas, ["Control Dias horas Arrastrero"]),
+        'validacion': _per_marea(data_dir, mareas, validation_processes(), especies=[ESPECIES[0][0]]),
+        'exportar_distribucion': _exportar(data_dir, mareas, ["Distribución de tallas"],
+                                           os.path.join(work_dir, 'exportar'), especies=[ESPECIES[0][0]]),
+    }
+
+
+def measure(benchmark: Benchmark, repeticiones: int) -> Dict[str, Any]:
+    """Tiempo (mínimo, mediana) de `repeticiones` ejecuciones y pico de memoria de una más."""
+    tiempos = []
+    filas = 0
+    for _ in range(repeticiones):
+        start = time.perf_counter()
+        filas = benchmark()
+        tiempos.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        benchmark()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'filas': filas,
+        'segundos_min': round(min(tiempos), 6),
+        'segundos_mediana': round(statistics.median(tiempos), 6),
+        'pico_memoria_mb': round(pico / 2 ** 20, 3),
+    }
+
+
+def run_suite(escala: str = 'marea', repeticiones: int = 3, data_dir: Optional[str] = None,
+              casos: Optional[Sequence[str]] = None, log=print) -> Dict[str, Any]:
+    """Genera los datos de la escala (si `data_dir` no los tiene) y mide todos los casos."""
+    num_mareas, lances = ESCALAS[escala]
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = data_dir or os.path.join(work_dir, 'datos')
+        start = time.perf_counter()
+        mareas = generate_season(data_dir, ANIO, num_mareas, lances) \
+            if not os.path.isdir(data_dir) or not os.listdir(data_dir) \
+            else [(str(n), str(ANIO)) for n in range(1, num_mareas + 1)]
+        log(f"Datos de la escala '{escala}' listos en {time.perf_counter() - start:.1f} s "
+            f"({num_mareas * lances} lances)")
+
+        resultados = {}
+        for nombre, benchmark in build_benchmarks(data_dir, mareas, work_dir).items():
+            if casos and nombre not in casos:
+                continue
+            resultados[nombre] = measure(benchmark, repeticiones)
+            log(f"{nombre}: {resultados[nombre]['segundos_mediana']:.4f} s, "
+                f"{resultados[nombre]['pico_memoria_mb']:.1f} MB")
+
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'escala': escala,
+        'mareas': num_mareas,
+        'lances': num_mareas * lances,
+        'repeticiones': repeticiones,
+        'entorno': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'plataforma': platform.platform(), 'cpus': os.cpu_count()},
+        'resultados': resultados,
+    }
+
+
+def compare(actual: Dict[str, Any], anterior: Dict[str, Any],
+            tolerancia: float = TOLERANCIA_REGRESION) -> List[Dict[str, Any]]:
+    """Relación de tiempos contra una corrida anterior; marca las que superan la tolerancia."""
+    filas = []
+    for nombre, resultado in actual['resultados'].items():
+        previo = anterior.get('resultados', {}).get(nombre)
+        if not previo or not previo['segundos_mediana']:
+            continue
+        relacion = resultado['segundos_mediana'] / previo['segundos_mediana']
+        filas.append({'caso': nombre, 'relacion': round(relacion, 3), 'regresion': relacion > 1 + tolerancia})
+    return filas
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de Control de Mareas")
+    parser.add_argument('--escala', choices=list(ESCALAS), default='marea')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--salida', default='benchmarks.json', help="Archivo JSON con los resultados")
+    parser.add_argument('--datos', default=None, help="Carpeta de datos sintéticos a reutilizar entre corridas")
+    parser.add_argument('--casos', nargs='+', default=None, help="Limita la corrida a estos casos")
+    parser.add_argument('--comparar', default=None, help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    resultados = run_suite(args.escala, args.repeticiones, args.datos, args.casos)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+        comparacion = compare(resultados, anterior)
+        for fila in comparacion:
+            marca = '  <-- REGRESIÓN' if fila['regresion'] else ''
+            print(f"{fila['caso']}: x{fila['relacion']}{marca}")
+        if any(fila['regresion'] for fila in comparacion):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Informe del tiempo de inicio de la aplicación con presupuesto para el build.
+
+Mide dos cosas en procesos nuevos (inicio en frío):
+  - `python -X importtime` de la ventana principal, agrupado por paquete de primer nivel;
+  - el tiempo hasta el primer pintado y hasta tener catálogos y estado cargados, lanzando
+    `main.py` con CONTROL_MAREAS_MEDIR_INICIO definida (mediana de varias corridas).
+
+    python -m benchmarks.startup_report --presupuesto-ms 1500 --salida inicio.json
+
+Devuelve 1 si la mediana del primer pintado supera el presupuesto.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODULO_INICIAL = 'presentation.main_window'
+ENV_MEDIR_INICIO = 'CONTROL_MAREAS_MEDIR_INICIO'
+# Presupuesto por defecto para el primer pintado, en milisegundos
+PRESUPUESTO_MS = 1500.0
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Líneas de `-X importtime` como [{modulo, propio_us, acumulado_us, nivel}, ...]."""
+    modulos = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            propio, acumulado, sangria, modulo = match.groups()
+            modulos.append({'modulo': modulo, 'propio_us': int(propio), 'acumulado_us': int(acumulado),
+                            'nivel': len(sangria) // 2})
+    return modulos
+
+
+def group_by_package(modulos: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Milisegundos de importación propios sumados por paquete de primer nivel (mayor primero)."""
+    totales: Dict[str, int] = {}
+    for modulo in modulos:
+        paquete = modulo['modulo'].split('.')[0]
+        totales[paquete] = totales.get(paquete, 0) + modulo['propio_us']
+    return {paquete: round(us / 1000, 1) for paquete, us in sorted(totales.items(), key=lambda kv: -kv[1])}
+
+
+def measure_imports(modulo: str = MODULO_INICIAL) -> Dict[str, Any]:
+    """Importa `modulo` en un intérprete nuevo con `-X importtime`."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                          cwd=RAIZ, env=_env(), capture_output=True, text=True, check=True)
+    modulos = parse_importtime(proc.stderr)
+    total = next((m['acumulado_us'] for m in reversed(modulos) if m['modulo'] == modulo), 0)
+    return {'modulo': modulo, 'total_ms': round(total / 1000, 1), 'por_paquete': group_by_package(modulos)}
+
+
+def measure_startup(repeticiones: int = 3, timeout: float = 60.0) -> Dict[str, Any]:
+    """Corre `main.py` en modo medición y devuelve las medianas de sus tiempos."""
+    corridas = []
+    env = _env()
+    env[ENV_MEDIR_INICIO] = '1'
+    for _ in range(repeticiones):
+        proc = subprocess.run([sys.executable, 'main.py'], cwd=RAIZ, env=env, capture_output=True,
+                              text=True, timeout=timeout, check=True)
+        linea = next(l for l in reversed(proc.stdout.splitlines()) if l.startswith('{'))
+        corridas.append(json.loads(linea))
+    return {
+        'corridas': corridas,
+        'primer_pintado_ms': statistics.median(c['primer_pintado_ms'] for c in corridas),
+        'listo_ms': statistics.median(c['listo_ms'] for c in corridas),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Informe de tiempo de inicio de Control de Mareas")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--presupuesto-ms', type=float, default=PRESUPUESTO_MS,
+                        help="Máximo permitido hasta el primer pintado (mediana)")
+    parser.add_argument('--salida', default=None, help="Archivo JSON con el informe")
+    args = parser.parse_args(argv)
+
+    informe = {'importaciones': measure_imports(), 'inicio': measure_startup(args.repeticiones),
+               'presupuesto_ms': args.presupuesto_ms}
+    importaciones, inicio = informe['importaciones'], informe['inicio']
+    print(f"Importar {importaciones['modulo']}: {importaciones['total_ms']:.1f} ms")
+    for paquete, ms in list(importaciones['por_paquete'].items())[:10]:
+        print(f"  {paquete:<24}{ms:>8.1f} ms")
+    print(f"Primer pintado: {inicio['primer_pintado_ms']:.1f} ms "
+          f"(presupuesto {args.presupuesto_ms:.0f} ms)")
+    print(f"Catálogos y estado cargados: {inicio['listo_ms']:.1f} ms")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+
+    if inicio['primer_pintado_ms'] > args.presupuesto_ms:
+        print("El inicio supera el presupuesto.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
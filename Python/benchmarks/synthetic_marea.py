@@ -0,0 +1,177 @@
+"""Generador de mareas sintéticas con la estructura exacta de los archivos c/m/p/s.
+
+Los valores imitan los de una marea real de arrastre (lances de ~1 h, posiciones en
+GG.MM de la plataforma patagónica, tallas codificadas en TALLA_n) para que los
+benchmarks ejerciten los mismos caminos que los datos de los observadores.
+
+Ejemplo:
+    python -m benchmarks.synthetic_marea salida --mareas 500 --lances 200
+"""
+import argparse
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from domain.marea_procesos import encode_tallas
+from infrastructure.dbf_reader import write_dbf
+from infrastructure.marea_files import marea_file_stem
+from infrastructure.marea_layouts import (CAPTURA_LAYOUT, CAPTURA_SLOTS, MUESTRA_LAYOUT, MUESTRA_TALLAS,
+                                          PRODUCCION_LAYOUT, SUBMUESTRA_LAYOUT)
+
+# Especies frecuentes en la captura, en el orden en que suelen cargarse los slots
+# ESPECIE_n (código INIDEP, nombre científico, nombre vulgar)
+ESPECIES = [
+    (5139030101, 'Pleoticus muelleri', 'Langostino'),
+    (7210040101, 'Merluccius hubbsi', 'Merluza'),
+    (3400000000, 'Invertebrados', 'Invertebrados'),
+    (7218280000, 'Macruronus magellanicus', 'Merluza de cola'),
+    (6600000000, 'Peces varios', 'Peces varios'),
+    (7216030101, 'Genypterus blacodes', 'Abadejo'),
+    (7106010101, 'Squalus acanthias', 'Espinillo'),
+    (5702150101, 'Illex argentinus', 'Calamar'),
+    (5139600101, 'Peisos petrunkevitchi', 'Camarón'),
+    (7102010201, 'Mustelus schmitti', 'Gatuzo'),
+    (7109010701, 'Psammobatis spp.', 'Raya'),
+    (5702010102, 'Loligo gahi', 'Calamarete'),
+]
+
+BUQUES = ['DON SANTIAGO', 'FEDERICO C', 'MARIA EUGENIA', 'ANTONINO', 'CONARPESA I', 'PROMARSA III']
+PRODUCTOS = [('Langostino', 'ENTERO', '1', 1.0), ('Langostino', 'COLA', '2', 1.6), ('Merluza', 'FILET', '1', 2.8)]
+
+
+def _grados_minutos(decimal: np.ndarray) -> np.ndarray:
+    """Grados decimales (positivos) al formato GG.MM de los archivos de captura."""
+    grados = np.floor(decimal)
+    return np.round(grados + (decimal - grados) * 0.6, 3)
+
+
+def _horas_hmm(minutos: np.ndarray) -> np.ndarray:
+    minutos = np.mod(minutos, 1440)
+    return np.round(minutos // 60 + (minutos % 60) / 100, 2)
+
+
+def generate_marea(output_dir: str, num_marea: int, anio: int, lances: int = 200,
+                   seed: Optional[int] = None, buque: Optional[str] = None,
+                   muestreo: float = 0.3) -> Dict[str, str]:
+    """Escribe c/m/p/s<marea><año>.dbf con `lances` lances y devuelve tipo -> ruta."""
+    rng = np.random.default_rng(seed if seed is not None else num_marea * 10000 + anio)
+    buque = buque or BUQUES[num_marea % len(BUQUES)]
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+
+    # Captura: ~4 lances por día desde el inicio de la marea
+    inicio = np.datetime64(f'{anio}-01-01') + int(rng.integers(0, max(1, 360 - lances // 4)))
+    numero = np.arange(1, lances + 1)
+    fechas = inicio + (numero - 1) // 4
+    hora_inic = rng.integers(300, 1320, lances)
+    hora_final = hora_inic + rng.integers(40, 180, lances)
+    lat = rng.uniform(42.0, 47.0, lances)
+    lon = rng.uniform(60.0, 65.0, lances)
+    captura = {
+        'BARCO': np.full(lances, buque), 'MAREA': np.full(lances, num_marea), 'LANCE': numero,
+        'FECHA': fechas, 'HORA_INIC': _horas_hmm(hora_inic), 'HORA_FINAL': _horas_hmm(hora_final),
+        'LAT_INIC': _grados_minutos(lat), 'LAT_FINAL': _grados_minutos(lat + rng.normal(0, 0.05, lances)),
+        'LONG_INIC': _grados_minutos(lon), 'LONG_FINAL': _grados_minutos(lon + rng.normal(0, 0.05, lances)),
+        'PROF_INIC': rng.integers(60, 140, lances), 'PROF_FINAL': rng.integers(60, 140, lances),
+        'TARTE': np.full(lances, 14), 'VEL_ARRAS': np.round(rng.uniform(2.8, 3.6, lances), 2),
+        'CAB_FILAD': np.full(lances, 300), 'MALL_COPO': np.full(lances, 5),
+    }
+    especies_por_lance = rng.integers(3, 11, lances)
+    total_kg = np.zeros(lances)
+    total_descarte = np.zeros(lances)
+    for slot in range(1, CAPTURA_SLOTS + 1):
+        presente = especies_por_lance >= slot
+        if slot <= len(ESPECIES):
+            especie = np.where(presente, ESPECIES[slot - 1][0], 0)
+        else:
+            especie = np.zeros(lances, dtype=np.int64)
+            presente[:] = False
+        kg = np.where(presente, np.round(rng.lognormal(6 - slot * 0.4, 1.0, lances)), 0.0)
+        descarte = np.round(kg * np.where(slot == 1, 0.03, rng.uniform(0.5, 1.0, lances)))
+        captura[f'ESPECIE_{slot}'] = especie
+        captura[f'KG_{slot}'] = kg
+        captura[f'DESCAR_{slot}'] = descarte
+        total_kg += kg
+        total_descarte += descarte
+    captura['CAPT_TOTAL'] = total_kg
+    captura['DESCARTE'] = total_descarte
+    paths['captura'] = os.path.join(output_dir, marea_file_stem('c', num_marea, anio) + '.dbf')
+    write_dbf(paths['captura'], CAPTURA_LAYOUT, captura)
+
+    # Muestras de tallas: una fracción de los lances, especie objetivo
+    muestreados = np.flatnonzero(rng.random(lances) < muestreo)
+    m = len(muestreados)
+    prim_talla = rng.integers(28, 36, m)
+    clases = rng.integers(15, 30, m)
+    muestra = {
+        'BARCO': np.full(m, buque), 'FECHA': fechas[muestreados], 'MAREA': np.full(m, num_marea),
+        'LANCE': numero[muestreados], 'ESPECIE': np.full(m, ESPECIES[0][1]),
+        'COD_ESPEC': np.full(m, ESPECIES[0][0]), 'TARTE': np.full(m, 14), 'AREA': np.full(m, 4462.4),
+        'PRIM_TALLA': prim_talla, 'ULT_TALLA': prim_talla + clases - 1, 'INTERVALO': np.ones(m, dtype=np.int64),
+        'FACT_POND': np.ones(m),
+    }
+    for n in range(1, MUESTRA_TALLAS + 1):
+        activa = n <= clases
+        machos = np.where(activa, rng.poisson(8, m), 0)
+        hembras = np.where(activa, rng.poisson(8, m), 0)
+        total = machos + hembras
+        talla = np.where(activa, prim_talla + n - 1, 0)
+        muestra[f'TALLA_{n}'] = np.where(activa, encode_tallas(talla, machos, hembras, 0, total), 0)
+    paths['muestra'] = os.path.join(output_dir, marea_file_stem('m', num_marea, anio) + '.dbf')
+    write_dbf(paths['muestra'], MUESTRA_LAYOUT, muestra)
+
+    # Producción: un registro por día y producto
+    dias = np.unique(fechas)
+    producto = np.tile(np.arange(len(PRODUCTOS)), len(dias))
+    p = len(producto)
+    produccion = {
+        'BARCO': np.full(p, buque), 'MAREA': np.full(p, num_marea), 'FECHA': np.repeat(dias, len(PRODUCTOS)),
+        'ESPECIE': np.array([PRODUCTOS[i][0] for i in producto]),
+        'PRODUCTO': np.array([PRODUCTOS[i][1] for i in producto]),
+        'CATEGORIA': np.array([PRODUCTOS[i][2] for i in producto]),
+        'FACTOR': np.array([PRODUCTOS[i][3] for i in producto]),
+        'KILOS': np.round(rng.uniform(300, 40000, p)),
+    }
+    paths['produccion'] = os.path.join(output_dir, marea_file_stem('p', num_marea, anio) + '.dbf')
+    write_dbf(paths['produccion'], PRODUCCION_LAYOUT, produccion)
+
+    # Submuestras biológicas: 20 ejemplares de merluza en algunos lances muestreados
+    sub_lances = muestreados[::3]
+    s = len(sub_lances) * 20
+    largo = rng.integers(25, 70, s)
+    submuestra = {
+        'BARCO': np.full(s, buque), 'MAREA': np.full(s, num_marea), 'LANCE': np.repeat(numero[sub_lances], 20),
+        'FECHA': np.repeat(fechas[sub_lances], 20), 'AREA': np.full(s, 4362.4),
+        'ESPECIE': np.full(s, ESPECIES[1][1]), 'NEJEMPLAR': np.tile(np.arange(1, 21), len(sub_lances)),
+        'LARGO_TOT': largo, 'PESO_TOT': np.round(0.006 * largo.astype(float) ** 3.1, 1),
+        'SEXO': rng.integers(1, 3, s), 'ESTADIO': rng.integers(1, 6, s),
+    }
+    paths['submuestra'] = os.path.join(output_dir, marea_file_stem('s', num_marea, anio) + '.dbf')
+    write_dbf(paths['submuestra'], SUBMUESTRA_LAYOUT, submuestra)
+    return paths
+
+
+def generate_season(output_dir: str, anio: int, mareas: int, lances_por_marea: int = 200,
+                    seed: int = 0) -> List[Tuple[str, str]]:
+    """Genera una temporada de `mareas` mareas (1..n) y devuelve [(marea, año), ...]."""
+    generadas = []
+    for num in range(1, mareas + 1):
+        generate_marea(output_dir, num, anio, lances_por_marea, seed=seed * 100000 + num)
+        generadas.append((str(num), str(anio)))
+    return generadas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera archivos de marea sintéticos")
+    parser.add_argument('output_dir')
+    parser.add_argument('--anio', type=int, default=2025)
+    parser.add_argument('--mareas', type=int, default=1)
+    parser.add_argument('--lances', type=int, default=200, help="Lances por marea (máximo 999)")
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+    generate_season(args.output_dir, args.anio, args.mareas, args.lances, args.semilla)
+
+
+if __name__ == '__main__':
+    main()
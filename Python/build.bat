@@ -4,16 +4,36 @@ setlocal EnableExtensions EnableDelayedExpansion
 REM Asegurar ejecución desde la carpeta del script
 pushd %~dp0
 
-echo Generando ejecutable con PyInstaller...
-
-REM Preferir PyInstaller del entorno virtual si existe
+REM Preferir Python y PyInstaller del entorno virtual si existen
+set "PY_CMD=python"
+if exist ".venv\Scripts\python.exe" (
+    set "PY_CMD=.venv\Scripts\python.exe"
+)
 set "PYI_CMD=pyinstaller"
 if exist ".venv\Scripts\pyinstaller.exe" (
     set "PYI_CMD=.venv\Scripts\pyinstaller.exe"
 )
 
+REM "build.bat carpeta" genera una carpeta en lugar de un único .exe (inicia más rápido: no descomprime)
+set "PYI_MODO=--onefile"
+if /I "%~1"=="carpeta" set "PYI_MODO=--onedir"
+
+REM Presupuesto de inicio (ms hasta el primer pintado); se puede redefinir con PRESUPUESTO_INICIO_MS
+if not defined PRESUPUESTO_INICIO_MS set "PRESUPUESTO_INICIO_MS=1500"
+
+echo Midiendo tiempo de inicio (presupuesto %PRESUPUESTO_INICIO_MS% ms)...
+%PY_CMD% -m benchmarks.startup_report --presupuesto-ms %PRESUPUESTO_INICIO_MS% --salida build_inicio.json
+if errorlevel 1 (
+    echo El tiempo de inicio supera el presupuesto. Revise build_inicio.json antes de generar el ejecutable.
+    popd
+    pause
+    exit /b 1
+)
+
+echo Generando ejecutable con PyInstaller...
+
 %PYI_CMD% --name ControlMareas ^
-    --onefile ^
+    %PYI_MODO% ^
     --windowed ^
     --noconfirm ^
     --add-data "presentation/styles;presentation/styles" ^
@@ -24,6 +44,8 @@ if exist ".venv\Scripts\pyinstaller.exe" (
 echo.
 if exist "dist\ControlMareas.exe" (
     echo Proceso completado. El ejecutable se encuentra en la carpeta 'dist'.
+) else if exist "dist\ControlMareas\ControlMareas.exe" (
+    echo Proceso completado. El ejecutable se encuentra en la carpeta 'dist'.
 ) else (
     echo Hubo un error al generar el ejecutable.
 )
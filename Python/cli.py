@@ -0,0 +1,402 @@
+"""Modo por lotes (sin interfaz gráfica) para ejecutar procesos sobre muchas mareas.
+
+Ejemplos:
+    python cli.py procesar input_data --procesos "Resumen produccion" "Distribución de tallas" --salida resumen.csv
+    python cli.py derrotero input_data derrotero.csv --anio 2025
+
+Cada comando (procesar, importar, corregir-descarte, resolver-barcos, derrotero, almacen) tiene sus
+propias opciones: python cli.py <comando> --help.
+
+No importa PySide6: puede ejecutarse en servidores o en tareas programadas.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.columnar import Table, concat, table_length
+from domain.derrotero import velocidad_limite
+from domain.descartes import DISCARD_TRANSFORMS
+from domain.jobs import JobContext
+from domain.procesos import PROCESS_REGISTRY, get_process, read_only_processes
+from domain.registry_lookup import RegistryLookup
+from infrastructure import config_manager
+from infrastructure.exporters import EXPORT_FORMATS, ExportRequest, export_path, export_table, export_tables
+from infrastructure.importacion import import_planillas
+from infrastructure.marea_files import parse_marea_file_name
+from infrastructure.marea_service import (RUN_ALL_PROCESSES, correct_discards, load_marea_dataset,
+                                          open_result_cache, run_processes, season_barcos,
+                                          season_track_check)
+from infrastructure.repositories import CatalogRepository
+from infrastructure.season_store import SeasonStore
+from infrastructure.workspace import MareaWorkspace
+from util import resource_path
+
+SUMMARY_FIELDS = ['marea', 'anio', 'proceso', 'estado', 'filas', 'segundos', 'detalle']
+VESSEL_RESOLUTION_FIELDS = ['barco', 'registros', 'estado', 'buque', 'buque_cod', 'matricula', 'distancia',
+                            'candidatos']
+
+
+def discover_mareas(input_dir: str) -> List[Tuple[str, str]]:
+    """Mareas presentes en una carpeta estilo `input_data`, detectadas por su archivo de captura."""
+    mareas = set()
+    for entry in os.listdir(input_dir):
+        parsed = parse_marea_file_name(entry)
+        if parsed and parsed[0] == 'captura':
+            mareas.add(parsed[1:])
+    return sorted(mareas, key=lambda m: (m[1], int(m[0])))
+
+
+def marea_settings(workspace_dir: Optional[str], mareas: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+    """Etapas y especies objetivo de cada marea, tomadas de su estado en el espacio de trabajo
+    de la aplicación; las mareas que no están ahí quedan sin etapas ni especies."""
+    workspace = MareaWorkspace(workspace_dir) if workspace_dir and os.path.isdir(workspace_dir) else None
+    settings = {}
+    for num, anio in mareas:
+        entry = workspace.find(num, anio) if workspace else None
+        state = workspace.load(entry.id) if entry else {}
+        settings[(num, anio)] = {'etapas': list(state.get('etapas') or []),
+                                 'especies': [int(e) for e in state.get('especies') or []]}
+    return settings
+
+
+def process_marea(input_dir: str, num_marea: str, anio_marea: str, names: Sequence[str],
+                  output_dir: Optional[str] = None, cache_dir: Optional[str] = None,
+                  chunk_rows: Optional[int] = None, etapas: Optional[Sequence] = None,
+                  especies: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """Ejecuta los procesos de una marea (se invoca en un proceso del pool).
+
+    Devuelve las filas del resumen y las tablas de resultados, nunca lanza excepciones
+    para que una marea con errores no detenga el lote. Con `chunk_rows`, los procesos
+    que lo admiten recorren los archivos por bloques en lugar de cargarlos completos.
+
+    Los procesos comparten la lectura y los productos intermedios, así que no tienen un
+    tiempo propio: el tiempo de la marea va una sola vez, en la fila '*'. Sin etapas, los
+    procesos que las necesitan ("Cortar bases") se informan como error y no se ejecutan.
+    """
+    summary, tables = [], {}
+
+    def fila(proceso: str, estado: str, filas: int = 0, segundos: Any = '', detalle: str = '') -> Dict[str, Any]:
+        return {'marea': num_marea, 'anio': anio_marea, 'proceso': proceso, 'estado': estado, 'filas': filas,
+                'segundos': segundos, 'detalle': detalle}
+
+    start = time.perf_counter()
+    sin_etapas = [name for name in names if not etapas and getattr(get_process(name), 'needs_etapas', False)]
+    for name in sin_etapas:
+        summary.append(fila(name, 'error', detalle="la marea no tiene etapas cargadas"))
+    names = [name for name in names if name not in sin_etapas]
+    try:
+        results = {}
+        if names:
+            dataset = None if chunk_rows else load_marea_dataset(input_dir, num_marea, anio_marea, etapas)
+            cache = open_result_cache(cache_dir) if cache_dir else None
+            results = run_processes(JobContext(), names, num_marea, anio_marea, etapas, especies,
+                                    data_dir=input_dir, output_dir=output_dir, dataset=dataset, cache=cache,
+                                    chunk_rows=chunk_rows)
+    except Exception as e:
+        summary.append(fila('*', 'error', segundos=round(time.perf_counter() - start, 4), detalle=str(e)))
+        return {'summary': summary, 'tables': tables}
+
+    summary.append(fila('*', 'ok', segundos=round(time.perf_counter() - start, 4),
+                        detalle='' if etapas else "sin etapas: todos los lances en la etapa -1"))
+    for name, result in results.items():
+        rows = table_length(result) if isinstance(result, dict) else 0
+        summary.append(fila(name, 'ok', filas=rows))
+        if isinstance(result, dict) and rows:
+            tables[name] = dict(result, marea=np.full(rows, num_marea), anio=np.full(rows, anio_marea))
+    return {'summary': summary, 'tables': tables}
+
+
+def run_batch(input_dir: str, names: Sequence[str], mareas: Optional[Sequence[Tuple[str, str]]] = None,
+              workers: Optional[int] = None, output_dir: Optional[str] = None,
+              log=print, cache_dir: Optional[str] = None,
+              chunk_rows: Optional[int] = None,
+              workspace_dir: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Table]]:
+    """Reparte las mareas en un pool de procesos del tamaño de los núcleos disponibles.
+
+    Las etapas y especies de cada marea salen del espacio de trabajo `workspace_dir`.
+    """
+    mareas = list(mareas) if mareas else discover_mareas(input_dir)
+    settings = marea_settings(workspace_dir, mareas)
+    workers = workers or os.cpu_count() or 1
+    summary: List[Dict[str, Any]] = []
+    partial_tables: Dict[str, List[Table]] = {}
+
+    def collect(outcome: Dict[str, Any]) -> None:
+        summary.extend(outcome['summary'])
+        for name, table in outcome['tables'].items():
+            partial_tables.setdefault(name, []).append(table)
+
+    if workers == 1 or len(mareas) <= 1:
+        for num, anio in mareas:
+            collect(process_marea(input_dir, num, anio, names, output_dir, cache_dir, chunk_rows,
+                                  **settings[(num, anio)]))
+            log(f"Marea {num}/{anio} procesada")
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(mareas))) as pool:
+            futures = {pool.submit(process_marea, input_dir, num, anio, names, output_dir, cache_dir,
+                                   chunk_rows, **settings[(num, anio)]): (num, anio)
+                       for num, anio in mareas}
+            for future in as_completed(futures):
+                num, anio = futures[future]
+                collect(future.result())
+                log(f"Marea {num}/{anio} procesada")
+
+    summary.sort(key=lambda row: (row['anio'], int(row['marea']), row['proceso']))
+    return summary, {name: concat(parts) for name, parts in partial_tables.items()}
+
+
+def write_summary(path: str, summary: List[Dict[str, Any]]) -> None:
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(summary)
+
+
+def _result_columns(table: Table) -> List[str]:
+    return ['marea', 'anio'] + [c for c in table if c not in ('marea', 'anio')]
+
+
+def write_table(path: str, table: Table) -> None:
+    """Escribe una tabla de columnas como CSV (marea y año primero)."""
+    export_table(ExportRequest(path, table, 'csv', _result_columns(table)))
+
+
+def write_results(directory: str, tables: Dict[str, Table], formatos: Sequence[str] = ('csv',),
+                  workers: Optional[int] = None) -> None:
+    """Exporta cada tabla consolidada en cada formato, todos los archivos en paralelo."""
+    os.makedirs(directory, exist_ok=True)
+    requests = [ExportRequest(export_path(directory, name, formato), table, formato, _result_columns(table),
+                              hoja=name)
+                for name, table in tables.items() for formato in formatos]
+    export_tables(requests, max_workers=workers, processes=True)
+
+
+def _registry_lookup(catalog_dir: Optional[str] = None) -> RegistryLookup:
+    repo = CatalogRepository(base_path=catalog_dir or resource_path('data'))
+    return RegistryLookup(repo.get_buques(), repo.get_observadores())
+
+
+def write_vessel_resolutions(path: str, input_dir: str, anio_marea: Optional[str] = None,
+                             catalog_dir: Optional[str] = None) -> Tuple[int, int]:
+    """Resuelve cada BARCO distinto de las capturas contra el registro de buques y lo escribe
+    como CSV. Devuelve (nombres distintos, nombres sin resolver)."""
+    resoluciones = _registry_lookup(catalog_dir).resolve_vessels(season_barcos(input_dir, anio_marea))
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=VESSEL_RESOLUTION_FIELDS)
+        writer.writeheader()
+        for resolucion in resoluciones:
+            mejor = resolucion.candidatos[0] if resolucion.candidatos else None
+            writer.writerow({
+                'barco': resolucion.barco,
+                'registros': resolucion.registros,
+                'estado': resolucion.estado,
+                'buque': mejor.item.nombre if mejor else '',
+                'buque_cod': mejor.item.buque_cod if mejor else '',
+                'matricula': mejor.item.matricula if mejor else '',
+                'distancia': mejor.distancia if mejor else '',
+                'candidatos': ' | '.join(f"{m.item.nombre} ({m.item.buque_cod})" for m in resolucion.candidatos),
+            })
+    return len(resoluciones), sum(1 for r in resoluciones if r.buque is None)
+
+
+def write_track_check(path: str, input_dir: str, anio_marea: Optional[str] = None,
+                      catalog_dir: Optional[str] = None) -> Tuple[int, int]:
+    """Controla en un solo lote el derrotero de todas las mareas de la carpeta (opcionalmente de
+    un año), con el límite de velocidad del buque de cada BARCO resuelto en el registro, y lo
+    escribe como CSV. Devuelve (tránsitos, tránsitos con alerta)."""
+    limites = {}
+    for resolucion in _registry_lookup(catalog_dir).resolve_vessels(season_barcos(input_dir, anio_marea)):
+        buque = resolucion.buque
+        if buque is not None:
+            limites[resolucion.barco] = float(velocidad_limite(buque.eslora, buque.pot_hp))
+    tabla = season_track_check(input_dir, anio_marea, limites)
+    if not tabla:
+        return 0, 0
+    write_table(path, tabla)
+    return table_length(tabla), int(np.count_nonzero(tabla['alerta'] != ''))
+
+
+def marea_arg(text: str) -> Tuple[str, str]:
+    """Marea de la línea de comandos en la forma NUM/AÑO (ej. 118/2025)."""
+    partes = text.strip().split('/')
+    if len(partes) != 2 or not all(p.strip().isdigit() for p in partes) or len(partes[1].strip()) < 2:
+        raise argparse.ArgumentTypeError(f"marea inválida '{text}': se espera NUM/AÑO (ej. 118/2025)")
+    return partes[0].strip(), partes[1].strip()
+
+
+def batch_processes(names: Sequence[str]) -> List[str]:
+    """Procesos del lote: 'Ejecutar todos' son los controles; los que escriben archivos
+    (cortes por etapa, FACTORES) se ejecutan sólo si se nombran."""
+    procesos: List[str] = []
+    for name in names:
+        for proceso in (read_only_processes() if name == RUN_ALL_PROCESSES else [name]):
+            if proceso not in procesos:
+                procesos.append(proceso)
+    return procesos
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Control de Mareas - procesamiento por lotes")
+    sub = parser.add_subparsers(dest='comando', required=True, metavar='COMANDO')
+
+    procesar = sub.add_parser('procesar', help="Ejecuta procesos sobre las mareas de una carpeta")
+    procesar.add_argument('input_dir', nargs='?', help="Carpeta con los archivos c/m/p/s<marea><año>.dbf")
+    procesar.add_argument('--procesos', nargs='+', default=[RUN_ALL_PROCESSES],
+                          help=f"Procesos a ejecutar (por defecto: '{RUN_ALL_PROCESSES}', todos los controles; "
+                               "'Cortar bases' y 'Factores CPUE' escriben archivos y hay que nombrarlos)")
+    procesar.add_argument('--mareas', nargs='+', metavar='MAREA/AÑO', type=marea_arg,
+                          help="Limita el lote a estas mareas (ej. 118/2025)")
+    procesar.add_argument('--workers', type=int, default=None,
+                          help="Procesos en paralelo (por defecto: cantidad de núcleos)")
+    procesar.add_argument('--salida', default='resumen_lote.csv', help="Archivo CSV con el resumen consolidado")
+    procesar.add_argument('--resultados', default=None,
+                          help="Carpeta donde escribir un archivo consolidado por proceso y formato")
+    procesar.add_argument('--formatos', nargs='+', choices=EXPORT_FORMATS, default=['csv'],
+                          help="Formatos de --resultados: csv, txt (informe ';' del sistema viejo), "
+                               "gis (TXT con ',' y '.') y xlsx")
+    procesar.add_argument('--cortes', default=None,
+                          help="Carpeta para los archivos de 'Cortar bases' (por defecto, la de entrada)")
+    procesar.add_argument('--espacio', default=None, metavar='CARPETA',
+                          help="Espacio de trabajo de la aplicación de donde se toman las etapas y especies de "
+                               "cada marea (por defecto, el de la aplicación)")
+    procesar.add_argument('--cache', default=None,
+                          help="Carpeta de caché de resultados: las mareas sin cambios no se recalculan")
+    procesar.add_argument('--bloque', type=int, default=None, metavar='REGISTROS',
+                          help="Recorre los archivos de a REGISTROS registros (memoria acotada para archivos grandes)")
+    procesar.add_argument('--listar', action='store_true', help="Lista los procesos disponibles y termina")
+    procesar.set_defaults(func=cmd_procesar)
+
+    importar = sub.add_parser('importar', help="Importa planillas de Excel a los archivos C y M de una marea")
+    importar.add_argument('input_dir', help="Carpeta de la marea")
+    importar.add_argument('planillas', nargs='+', metavar='PLANILLA',
+                          help="Planillas de Excel (.xls/.xlsx) de captura y de tallas")
+    importar.add_argument('--marea', required=True, metavar='MAREA/AÑO', type=marea_arg,
+                          help="Marea a la que se importan las planillas (ej. 118/2025)")
+    importar.add_argument('--reemplazar', action='store_true',
+                          help="Reemplaza los archivos C y M que la marea ya tenga")
+    importar.set_defaults(func=cmd_importar)
+
+    corregir = sub.add_parser('corregir-descarte', help="Corrige el descarte en las capturas de las mareas")
+    corregir.add_argument('input_dir', help="Carpeta con los archivos de las mareas")
+    corregir.add_argument('transformacion', choices=DISCARD_TRANSFORMS,
+                          help="100%% descarte de --especie, cajones a kilos (--kg-cajon) o descarte en "
+                               "porcentaje a kilos")
+    corregir.add_argument('--mareas', nargs='+', metavar='MAREA/AÑO', type=marea_arg,
+                          help="Mareas a corregir (por defecto, todas las de la carpeta)")
+    corregir.add_argument('--especie', type=int, default=None, help="Código de especie a corregir")
+    corregir.add_argument('--lances', nargs='+', type=int, default=None,
+                          help="Lances a corregir (por defecto, todos)")
+    corregir.add_argument('--kg-cajon', type=float, default=None, help="Kilos por cajón para 'cajones_a_kilos'")
+    corregir.set_defaults(func=cmd_corregir_descarte)
+
+    resolver = sub.add_parser('resolver-barcos',
+                              help="Resuelve cada BARCO distinto de las capturas contra el registro de buques")
+    resolver.add_argument('input_dir', help="Carpeta con los archivos de las mareas")
+    resolver.add_argument('salida', metavar='CSV', help="Archivo CSV con las resoluciones")
+    resolver.add_argument('--anio', default=None, help="Año de la temporada (por defecto, todas)")
+    resolver.set_defaults(func=cmd_resolver_barcos)
+
+    derrotero = sub.add_parser('derrotero',
+                               help="Controla la distancia y la velocidad entre lances consecutivos")
+    derrotero.add_argument('input_dir', help="Carpeta con los archivos de las mareas")
+    derrotero.add_argument('salida', metavar='CSV', help="Archivo CSV con los tránsitos entre lances")
+    derrotero.add_argument('--anio', default=None, help="Año de la temporada (por defecto, todas)")
+    derrotero.set_defaults(func=cmd_derrotero)
+
+    almacen = sub.add_parser('almacen',
+                             help="Carga en forma incremental los archivos de entrada en una base de temporada")
+    almacen.add_argument('input_dir', help="Carpeta con los archivos de las mareas")
+    almacen.add_argument('base', metavar='SQLITE', help="Base SQLite de temporada")
+    almacen.set_defaults(func=cmd_almacen)
+    return parser
+
+
+def cmd_procesar(args: argparse.Namespace) -> int:
+    if args.listar:
+        for name in PROCESS_REGISTRY:
+            print(name)
+        return 0
+    if not args.input_dir:
+        print("procesar necesita la carpeta de entrada", file=sys.stderr)
+        return 2
+    unknown = [p for p in args.procesos if p != RUN_ALL_PROCESSES and p not in PROCESS_REGISTRY]
+    if unknown:
+        print(f"Procesos desconocidos: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    summary, tables = run_batch(args.input_dir, batch_processes(args.procesos), args.mareas, args.workers,
+                                args.cortes, cache_dir=args.cache, chunk_rows=args.bloque,
+                                workspace_dir=args.espacio or config_manager.get_workspace_path())
+    write_summary(args.salida, summary)
+    if args.resultados:
+        write_results(args.resultados, tables, args.formatos, args.workers)
+
+    errores = sum(1 for row in summary if row['estado'] == 'error')
+    print(f"{len({(r['marea'], r['anio']) for r in summary})} mareas en {time.perf_counter() - start:.2f} s, "
+          f"{errores} con errores. Resumen: {args.salida}")
+    return 1 if errores else 0
+
+
+def cmd_importar(args: argparse.Namespace) -> int:
+    num, anio = args.marea
+    try:
+        result = import_planillas(JobContext(), args.planillas, args.input_dir, num, anio, args.reemplazar)
+    except (OSError, ValueError) as e:
+        print(f"Marea {num}/{anio}: {e}", file=sys.stderr)
+        return 1
+    for error in result.errores:
+        print(error, file=sys.stderr)
+    if result.errores:
+        print(f"Marea {num}/{anio}: {len(result.errores)} errores, no se escribió ningún archivo", file=sys.stderr)
+        return 1
+    for kind, path in result.archivos.items():
+        print(f"Marea {num}/{anio}: {result.registros[kind]} registros de {kind} en {path}")
+    return 0
+
+
+def cmd_corregir_descarte(args: argparse.Namespace) -> int:
+    for num, anio in args.mareas or discover_mareas(args.input_dir):
+        try:
+            result = correct_discards(args.input_dir, num, anio, args.transformacion, args.especie,
+                                      args.lances, kg_cajon=args.kg_cajon)
+        except (OSError, ValueError) as e:
+            print(f"Marea {num}/{anio}: {e}", file=sys.stderr)
+            return 1
+        print(f"Marea {num}/{anio}: {result.pares} pares corregidos en {result.registros} lances")
+    return 0
+
+
+def cmd_resolver_barcos(args: argparse.Namespace) -> int:
+    distintos, pendientes = write_vessel_resolutions(args.salida, args.input_dir, args.anio)
+    print(f"{distintos} nombres de buque, {pendientes} sin resolver. Resultado: {args.salida}")
+    return 0
+
+
+def cmd_derrotero(args: argparse.Namespace) -> int:
+    tramos, alertas = write_track_check(args.salida, args.input_dir, args.anio)
+    print(f"{tramos} tránsitos entre lances, {alertas} con alerta. Resultado: {args.salida}")
+    return 0
+
+
+def cmd_almacen(args: argparse.Namespace) -> int:
+    with SeasonStore(args.base) as store:
+        report = store.ingest_directory(args.input_dir, log=print)
+    print(f"Almacén {args.base}: {len(report.cargados)} archivos cargados, "
+          f"{len(report.sin_cambios)} sin cambios, {len(report.eliminados)} eliminados")
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
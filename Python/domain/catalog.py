@@ -0,0 +1,217 @@
+"""Catálogos (especies, buques, observadores) guardados por columnas.
+
+En lugar de un objeto por registro, cada catálogo guarda un arreglo por campo:
+- los textos de cada columna van en un solo `str` con desplazamientos (como Arrow),
+- las columnas con pocos valores distintos (flota, tipo de flota) son categóricas:
+  códigos enteros más la lista de valores, cada uno una sola vez (`sys.intern`),
+- los números son arreglos NumPy.
+
+Las filas se identifican por su posición. `catalog[i]` arma al vuelo la entidad de esa
+fila (una dataclass con `__slots__`); la interfaz guarda sólo la posición en cada combo.
+"""
+import sys
+from array import array
+from dataclasses import fields
+from typing import (Any, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Sequence, Type,
+                    TypeVar, Union, overload)
+
+import numpy as np
+
+T = TypeVar('T')
+
+
+class StringColumn:
+    """Textos de una columna concatenados en un solo `str`, con el desplazamiento de cada uno."""
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self, values: Iterable[Any]):
+        values = [str(v) for v in values]
+        self._data = ''.join(values)
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(v) for v in values], out=offsets[1:])
+        # array('q') ocupa lo mismo que el arreglo NumPy pero se indexa tan rápido como una lista
+        self._offsets = array('q', offsets.tobytes())
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self._data[self._offsets[row]:self._offsets[row + 1]]
+
+    def tolist(self) -> List[str]:
+        data, offsets = self._data, self._offsets
+        return [data[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def take(self, order: Sequence[int]) -> 'StringColumn':
+        return StringColumn(self[i] for i in order)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+class Categorical:
+    """Columna de pocos valores distintos: un código entero por fila y cada valor una sola vez."""
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes: np.ndarray, categories: Sequence[str]):
+        self.codes = codes
+        self.categories = tuple(sys.intern(str(c)) for c in categories)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> 'Categorical':
+        positions: Dict[str, int] = {}
+        codes = [positions.setdefault(str(v), len(positions)) for v in values]
+        dtype = np.uint8 if len(positions) <= 2 ** 8 else np.uint16 if len(positions) <= 2 ** 16 else np.int32
+        return cls(np.array(codes, dtype=dtype), list(positions))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self.categories[self.codes[row]]
+
+    def tolist(self) -> List[str]:
+        categories = self.categories
+        return [categories[c] for c in self.codes.tolist()]
+
+    def take(self, order: Sequence[int]) -> 'Categorical':
+        return Categorical(self.codes[np.asarray(order, dtype=np.intp)], self.categories)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(sys.getsizeof(c) for c in self.categories)
+
+
+class NumericColumn:
+    """Arreglo NumPy que devuelve escalares de Python (float/int) al indexar una fila."""
+    __slots__ = ('values',)
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int):
+        return self.values.item(row)
+
+    def tolist(self) -> list:
+        return self.values.tolist()
+
+    def take(self, order: Sequence[int]) -> 'NumericColumn':
+        return NumericColumn(self.values[np.asarray(order, dtype=np.intp)])
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+
+Column = Union[StringColumn, Categorical, NumericColumn]
+
+
+def make_column(values: Any, categorical: bool = False) -> Column:
+    """Columna compacta para `values` (arreglo NumPy o secuencia de Python)."""
+    if isinstance(values, (StringColumn, Categorical, NumericColumn)):
+        return values
+    if categorical:
+        return Categorical.from_values(values.tolist() if isinstance(values, np.ndarray) else values)
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iufb':
+        return NumericColumn(values)
+    values = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return NumericColumn(np.array(values))
+    return StringColumn(values)
+
+
+def _as_list(values: Any) -> list:
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+def _take(values: Any, order: List[int]) -> Any:
+    if isinstance(values, np.ndarray):
+        return values[np.asarray(order, dtype=np.intp)]
+    if isinstance(values, (StringColumn, Categorical, NumericColumn)):
+        return values.take(order)
+    return [values[i] for i in order]
+
+
+class CatalogTable(Generic[T]):
+    """Catálogo por columnas cuyas filas se leen como entidades `entity` (una por posición)."""
+
+    def __init__(self, entity: Type[T], columns: Mapping[str, Any], categorical: Iterable[str] = (),
+                 sort_by: Optional[str] = None):
+        self.entity = entity
+        self.field_names = tuple(f.name for f in fields(entity))
+        raw = {name: columns[name] for name in self.field_names}
+        lengths = {len(values) for values in raw.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columnas de distinto largo en el catálogo de {entity.__name__}")
+        self._length = lengths.pop() if lengths else 0
+        if sort_by is not None and self._length:
+            # Orden estable por código de carácter, igual que `sorted` sobre las entidades
+            keys = _as_list(raw[sort_by])
+            order = sorted(range(self._length), key=keys.__getitem__)
+            if order != list(range(self._length)):
+                raw = {name: _take(values, order) for name, values in raw.items()}
+        categorical = set(categorical)
+        self.columns: Dict[str, Column] = {name: make_column(values, name in categorical)
+                                           for name, values in raw.items()}
+        self._indexes: Dict[str, Dict[Any, int]] = {}
+
+    @classmethod
+    def from_entities(cls, entity: Type[T], items: Iterable[T], categorical: Iterable[str] = (),
+                      sort_by: Optional[str] = None) -> 'CatalogTable[T]':
+        """Catálogo a partir de entidades ya armadas; si `items` ya es un catálogo, se devuelve tal cual."""
+        if isinstance(items, CatalogTable):
+            return items
+        items = list(items)
+        names = [f.name for f in fields(entity)]
+        return cls(entity, {name: [getattr(item, name) for item in items] for name in names},
+                   categorical, sort_by)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, row: int) -> T: ...
+
+    @overload
+    def __getitem__(self, row: slice) -> List[T]: ...
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._length))]
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError(row)
+        return self.entity(*(self.columns[name][row] for name in self.field_names))
+
+    def __iter__(self) -> Iterator[T]:
+        columns = [self.columns[name].tolist() for name in self.field_names]
+        entity = self.entity
+        for values in zip(*columns):
+            yield entity(*values)
+
+    def value(self, row: int, name: str) -> Any:
+        """Un campo de una fila, sin armar la entidad."""
+        return self.columns[name][row]
+
+    def values(self, name: str) -> List[Any]:
+        return self.columns[name].tolist()
+
+    def find(self, name: str, value: Any) -> Optional[int]:
+        """Primera fila con `name == value` (el índice por campo se arma la primera vez)."""
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            for row, key in enumerate(self.columns[name].tolist()):
+                index.setdefault(key, row)
+            self._indexes[name] = index
+        return index.get(value)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria aproximada de las columnas."""
+        return sum(column.nbytes for column in self.columns.values())
@@ -0,0 +1,147 @@
+"""Control de cobertura de muestreo (opción 2 del menú FoxPro, "Controla días pesca, cantidad
+de muestras y submuestras"): por día y por etapa, lances de pesca, muestras de tallas y
+submuestras biológicas de cada especie objetivo, con los días que no llegan al protocolo.
+
+Los archivos C, M y S se indexan una sola vez en una tabla larga (fecha, lance, especie,
+fuente) y todos los conteos salen de un único agrupamiento sobre ella.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from domain.columnar import Table, concat, count_distinct, group_by, group_keys
+from domain.marea_dataset import MareaDataset
+from domain.procesos import register_process, register_product
+
+# Fuentes de la tabla índice
+CAPTURA, MUESTRA, SUBMUESTRA = 0, 1, 2
+
+# Mínimos por día de pesca de la especie (se pueden cambiar con params['umbrales'])
+UMBRALES_MUESTREO = {'muestras': 2, 'submuestras': 1}
+
+
+def _indice(fuente: int, fechas, lances, especies) -> Table:
+    n = len(lances)
+    return {
+        'fecha': np.asarray(fechas, dtype='datetime64[D]'),
+        'lance': np.asarray(lances, dtype=np.int64),
+        'especie': np.asarray(especies, dtype=np.int64),
+        'fuente': np.full(n, fuente, dtype=np.int64),
+    }
+
+
+def codigos_por_nombre(dataset: MareaDataset, nombres: np.ndarray,
+                       conocidos: Dict[str, Any] = None) -> np.ndarray:
+    """Código de especie de cada nombre científico (la submuestra guarda el nombre, no el código).
+
+    Los pares nombre/código salen del archivo de muestras y de `conocidos`; sin pareja queda 0.
+    """
+    codigos: Dict[str, int] = {str(k).strip().lower(): int(v) for k, v in (conocidos or {}).items()}
+    muestra = dataset.table('muestra')
+    if dataset.num_rows('muestra'):
+        pares = group_by({'nombre': np.char.lower(muestra['ESPECIE'].astype(str)),
+                          'codigo': muestra['COD_ESPEC']})
+        codigos.update(zip(pares['nombre'].tolist(), pares['codigo'].tolist()))
+    distintos, posiciones = np.unique(np.char.lower(np.char.strip(np.asarray(nombres, dtype=str))),
+                                      return_inverse=True)
+    return np.array([codigos.get(nombre, 0) for nombre in distintos.tolist()],
+                    dtype=np.int64)[posiciones.reshape(-1)]
+
+
+@register_product('indice_muestreo', deps=('captura_larga',), tables=('muestra', 'submuestra'))
+def indice_muestreo(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Una fila por especie capturada en cada lance, por registro de muestra y por ejemplar
+    submuestreado, con su fecha, lance, especie y fuente."""
+    partes = []
+    larga = inputs['captura_larga']
+    if larga:
+        partes.append(_indice(CAPTURA, larga['fecha'], larga['lance'], larga['especie']))
+    muestra = dataset.table('muestra')
+    if dataset.num_rows('muestra'):
+        partes.append(_indice(MUESTRA, muestra['FECHA'], muestra['LANCE'], muestra['COD_ESPEC']))
+    submuestra = dataset.table('submuestra')
+    if dataset.num_rows('submuestra'):
+        especies = codigos_por_nombre(dataset, submuestra['ESPECIE'], params.get('nombres_especies'))
+        partes.append(_indice(SUBMUESTRA, submuestra['FECHA'], submuestra['LANCE'], especies))
+    return concat(partes)
+
+
+@register_process("Control muestreo", deps=('indice_muestreo', 'lances'),
+                  description="Lances, muestras y submuestras por día y especie objetivo")
+def control_muestreo(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Cobertura diaria de cada especie objetivo y alerta de los días bajo el protocolo.
+
+    Sin especies objetivo se controlan todas las especies capturadas. `alerta` nombra
+    los conteos que no llegan al mínimo en los días en que se capturó la especie.
+    """
+    indice = inputs['indice_muestreo']
+    if not indice:
+        return {}
+    especies = [int(e) for e in params.get('especies') or []]
+    if especies:
+        mask = np.isin(indice['especie'], especies)
+    else:
+        mask = np.isin(indice['especie'], indice['especie'][indice['fuente'] == CAPTURA])
+    indice = {name: column[mask] for name, column in indice.items()}
+    if not len(indice['fecha']):
+        return {}
+
+    # Un agrupamiento (fecha, especie, fuente): registros y lances distintos de cada fuente
+    grupos = group_by({'fecha': indice['fecha'], 'especie': indice['especie'], 'fuente': indice['fuente']},
+                      counts='registros')
+    ids, _ = group_keys([indice['fecha'], indice['especie'], indice['fuente']])
+    grupos['lances'] = count_distinct(ids, indice['lance'], len(grupos['fuente']))
+
+    dias = group_by({'fecha': grupos['fecha'], 'especie': grupos['especie']})
+    fila, _ = group_keys([grupos['fecha'], grupos['especie']])
+    n = len(dias['fecha'])
+
+    def por_fuente(fuente: int, columna: str) -> np.ndarray:
+        sel = grupos['fuente'] == fuente
+        return np.bincount(fila[sel], weights=grupos[columna][sel], minlength=n).astype(np.int64)
+
+    lances_tabla = inputs['lances']
+    lances_dia = np.zeros(n, dtype=np.int64)
+    if lances_tabla:
+        por_dia = group_by({'fecha': np.asarray(lances_tabla['fecha'], dtype='datetime64[D]')}, counts='lances')
+        pos = np.clip(np.searchsorted(por_dia['fecha'], dias['fecha']), 0, len(por_dia['fecha']) - 1)
+        lances_dia = np.where(por_dia['fecha'][pos] == dias['fecha'], por_dia['lances'][pos], 0)
+
+    tabla = {
+        'fecha': dias['fecha'],
+        'etapa': dataset.etapa_index(dias['fecha']),
+        'especie': dias['especie'],
+        'lances_dia': lances_dia,
+        'lances_especie': por_fuente(CAPTURA, 'lances'),
+        'muestras': por_fuente(MUESTRA, 'registros'),
+        'lances_muestreados': por_fuente(MUESTRA, 'lances'),
+        'submuestras': por_fuente(SUBMUESTRA, 'lances'),
+        'ejemplares': por_fuente(SUBMUESTRA, 'registros'),
+    }
+    umbrales = dict(UMBRALES_MUESTREO, **(params.get('umbrales') or {}))
+    alerta = np.full(n, '', dtype=object)
+    pescado = tabla['lances_especie'] > 0
+    for conteo, minimo in umbrales.items():
+        bajo = pescado & (tabla[conteo] < minimo)
+        alerta[bajo] = np.where(alerta[bajo] == '', '', alerta[bajo] + '; ') + f'{conteo} < {minimo}'
+    tabla['alerta'] = alerta.astype(str)
+    return tabla
+
+
+@register_process("Control muestreo por etapa", deps=("Control muestreo",),
+                  description="Totales de la cobertura de muestreo por etapa y especie")
+def control_muestreo_etapa(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Suma por etapa y especie de la tabla diaria, con los días de pesca y los días con alerta."""
+    diario = inputs["Control muestreo"]
+    if not diario:
+        return {}
+    resumen = group_by(
+        {'etapa': diario['etapa'], 'especie': diario['especie']},
+        sums={name: diario[name] for name in ('lances_dia', 'lances_especie', 'muestras',
+                                              'lances_muestreados', 'submuestras', 'ejemplares')},
+        counts='dias')
+    ids, _ = group_keys([diario['etapa'], diario['especie']])
+    size = len(resumen['especie'])
+    resumen['dias_pesca'] = np.bincount(ids, weights=diario['lances_especie'] > 0, minlength=size).astype(np.int64)
+    resumen['dias_alerta'] = np.bincount(ids, weights=diario['alerta'] != '', minlength=size).astype(np.int64)
+    return resumen
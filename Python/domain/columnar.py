@@ -0,0 +1,86 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Una tabla es un diccionario nombre de columna -> arreglo NumPy, todas del mismo largo
+Table = Dict[str, np.ndarray]
+
+
+def table_length(table: Table) -> int:
+    for column in table.values():
+        return len(column)
+    return 0
+
+
+def take(table: Table, indices: np.ndarray) -> Table:
+    """Filtra/reordena todas las columnas de una tabla con el mismo índice."""
+    return {name: column[indices] for name, column in table.items()}
+
+
+def concat(tables: Sequence[Table]) -> Table:
+    """Concatena tablas con las mismas columnas (se omiten las vacías)."""
+    tables = [t for t in tables if t and table_length(t)]
+    if not tables:
+        return {}
+    return {name: np.concatenate([t[name] for t in tables]) for name in tables[0]}
+
+
+def factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Devuelve (códigos, categorías) de forma que categorías[códigos] == values."""
+    categories, codes = np.unique(values, return_inverse=True)
+    return codes.reshape(-1), categories
+
+
+def group_keys(keys: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Agrupa por varias columnas clave.
+
+    Devuelve (id_grupo por fila, índice de la primera fila de cada grupo), con los
+    grupos ordenados lexicográficamente por las claves.
+    """
+    length = len(keys[0]) if keys else 0
+    if length == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    combined = np.zeros(length, dtype=np.int64)
+    for key in keys:
+        codes, categories = factorize(key)
+        # Re-factorizar en cada paso mantiene los códigos acotados (sin desbordes de int64)
+        combined = factorize(combined * len(categories) + codes)[0]
+    _, first, group_ids = np.unique(combined, return_index=True, return_inverse=True)
+    return group_ids.reshape(-1), first
+
+
+def group_by(keys: Dict[str, np.ndarray], sums: Optional[Dict[str, np.ndarray]] = None,
+             counts: Optional[str] = None,
+             firsts: Optional[Dict[str, np.ndarray]] = None) -> Table:
+    """Agregación vectorizada estilo SQL `GROUP BY`.
+
+    Parameters
+    ----------
+    keys : columnas de agrupamiento (aparecen en el resultado con el mismo nombre).
+    sums : columnas a sumar por grupo.
+    counts : si se indica, nombre de la columna con la cantidad de filas por grupo.
+    firsts : columnas de las que se toma el valor de la primera fila del grupo.
+    """
+    key_names = list(keys)
+    group_ids, first = group_keys([keys[name] for name in key_names])
+    size = len(first)
+    result: Table = {name: keys[name][first] for name in key_names}
+    for name, values in (sums or {}).items():
+        summed = np.bincount(group_ids, weights=values, minlength=size)
+        if np.issubdtype(np.asarray(values).dtype, np.integer):
+            summed = np.rint(summed).astype(np.int64)
+        result[name] = summed
+    if counts:
+        result[counts] = np.bincount(group_ids, minlength=size)
+    for name, values in (firsts or {}).items():
+        result[name] = values[first]
+    return result
+
+
+def count_distinct(group_ids: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Cantidad de valores distintos de `values` dentro de cada grupo."""
+    if len(group_ids) == 0:
+        return np.zeros(size, dtype=np.int64)
+    pair_ids, _ = group_keys([group_ids, values])
+    unique_pairs = np.unique(pair_ids, return_index=True)[1]
+    return np.bincount(group_ids[unique_pairs], minlength=size)
@@ -0,0 +1,115 @@
+"""Control de derrotero: distancia y velocidad implícita entre lances consecutivos de un buque.
+
+Los lances se ordenan por FECHA + HORA_INIC y, para cada par consecutivo, se mide la
+distancia ortodrómica (haversine) entre el fin de un lance y el inicio del siguiente y
+el tiempo entre ambos. Una posición mal cargada (ej. un dígito cambiado en LAT_FINAL)
+aparece como un tránsito más rápido de lo que el buque puede navegar.
+
+Todo se calcula con arreglos sobre una tabla con los lances de una o de muchas mareas
+(`grupo` separa las mareas), así una temporada completa se controla en una sola pasada.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from domain.columnar import Table
+from domain.marea_dataset import MareaDataset
+from domain.marea_procesos import duracion_horas, grados_minutos_a_decimal, hora_a_minutos
+from domain.procesos import register_process
+
+# Radio medio de la Tierra en millas náuticas
+RADIO_TIERRA_MN = 3440.065
+# Velocidad entre lances (nudos) si no se conoce el buque; también es el tope de cualquier límite
+VELOCIDAD_LIMITE = 20.0
+# Margen sobre la velocidad de casco (corrientes, errores de redondeo de la hora)
+MARGEN_VELOCIDAD = 1.25
+# Sin eslora, límite por potencia: (hasta HP, nudos)
+LIMITES_POR_POTENCIA = ((300, 10.0), (1000, 13.0), (2500, 16.0))
+# Distancia que se tolera entre lances sin tiempo entre ellos (mn)
+TOLERANCIA_MN = 1.0
+
+CAMPOS_DERROTERO = ('LANCE', 'FECHA', 'HORA_INIC', 'HORA_FINAL', 'LAT_INIC', 'LAT_FINAL', 'LONG_INIC', 'LONG_FINAL')
+
+
+def distancia_mn(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Distancia ortodrómica (haversine) en millas náuticas entre posiciones en grados decimales."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA_MN * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def velocidad_limite(eslora, pot_hp) -> np.ndarray:
+    """Velocidad máxima creíble (nudos) de un buque entre lances.
+
+    Con eslora, la velocidad de casco (1,34·√eslora en pies) con `MARGEN_VELOCIDAD`; sin
+    eslora, la clase por potencia de `LIMITES_POR_POTENCIA`; sin datos, `VELOCIDAD_LIMITE`.
+    """
+    eslora = np.asarray(eslora, dtype=np.float64)
+    pot_hp = np.asarray(pot_hp, dtype=np.float64)
+    casco = 1.34 * np.sqrt(np.clip(eslora, 0.0, None) * 3.2808) * MARGEN_VELOCIDAD
+    por_potencia = np.full(pot_hp.shape, VELOCIDAD_LIMITE)
+    for hasta, nudos in reversed(LIMITES_POR_POTENCIA):
+        por_potencia = np.where((pot_hp > 0) & (pot_hp <= hasta), nudos, por_potencia)
+    return np.minimum(np.where(eslora > 0, casco, por_potencia), VELOCIDAD_LIMITE)
+
+
+def tramos(captura: Table, grupo: np.ndarray, limite: np.ndarray) -> Table:
+    """Tránsitos entre lances consecutivos del mismo `grupo` (marea) con posiciones cargadas.
+
+    `limite` es la velocidad máxima (nudos) de cada lance. `fila` es el registro del
+    lance de llegada en `captura`; `alerta` queda vacía en los tránsitos creíbles.
+    """
+    grupo = np.asarray(grupo, dtype=np.int64)
+    dias = np.asarray(captura['FECHA'], dtype='datetime64[D]')
+    fechada = ~np.isnat(dias)
+    inicio = np.where(fechada, dias.astype(np.int64), 0) * 1440.0 + hora_a_minutos(captura['HORA_INIC'])
+    fin = inicio + duracion_horas(captura['HORA_INIC'], captura['HORA_FINAL']) * 60.0
+    orden = np.lexsort((inicio, grupo))
+    orden = orden[fechada[orden]]
+    desde, hasta = orden[:-1], orden[1:]
+    par = grupo[desde] == grupo[hasta]
+    # Las posiciones en 0 son lances sin posición cargada
+    par &= (captura['LAT_FINAL'][desde] != 0) & (captura['LONG_FINAL'][desde] != 0)
+    par &= (captura['LAT_INIC'][hasta] != 0) & (captura['LONG_INIC'][hasta] != 0)
+    desde, hasta = desde[par], hasta[par]
+
+    millas = distancia_mn(grados_minutos_a_decimal(captura['LAT_FINAL'][desde]),
+                          grados_minutos_a_decimal(captura['LONG_FINAL'][desde]),
+                          grados_minutos_a_decimal(captura['LAT_INIC'][hasta]),
+                          grados_minutos_a_decimal(captura['LONG_INIC'][hasta]))
+    horas = (inicio[hasta] - fin[desde]) / 60.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        velocidad = np.where(horas > 0, millas / horas, np.where(millas > TOLERANCIA_MN, np.inf, 0.0))
+    maxima = np.asarray(limite, dtype=np.float64)[hasta]
+    alerta = np.full(len(hasta), '', dtype=object)
+    alerta[velocidad > maxima] = 'velocidad'
+    alerta[(horas < 0) & (millas > TOLERANCIA_MN)] = 'superpuesto'
+    return {
+        'fila': hasta,
+        'lance_anterior': np.asarray(captura['LANCE'])[desde],
+        'lance': np.asarray(captura['LANCE'])[hasta],
+        'fecha': dias[hasta],
+        'distancia_mn': np.round(millas, 2),
+        'horas': np.round(horas, 2),
+        'velocidad_kn': np.round(np.where(np.isfinite(velocidad), velocidad, -1.0), 1),
+        'limite_kn': np.round(maxima, 1),
+        'alerta': alerta.astype(str),
+    }
+
+
+@register_process("Control derrotero", description="Distancia y velocidad entre lances consecutivos",
+                  tables=('captura',))
+def control_derrotero(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Tránsitos entre lances de la marea; `velocidad_limite` es el máximo del buque (nudos).
+
+    `velocidad_kn` es -1 cuando dos lances se superponen en el tiempo a más de `TOLERANCIA_MN`.
+    """
+    captura = dataset.table('captura')
+    n = dataset.num_rows('captura')
+    if not n or any(name not in captura for name in CAMPOS_DERROTERO):
+        return {}
+    limite = np.full(n, float(params.get('velocidad_limite') or VELOCIDAD_LIMITE))
+    tabla = tramos(captura, np.zeros(n, dtype=np.int64), limite)
+    tabla['etapa'] = dataset.etapa_index(tabla['fecha'])
+    del tabla['fila']
+    return tabla
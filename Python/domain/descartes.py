@@ -0,0 +1,100 @@
+"""Correcciones masivas de captura y descarte sobre los 25 pares KG_n/DESCAR_n de un archivo
+de captura, en reemplazo de las opciones 9, 11 y 13 del menú FoxPro, que se aplicaban lance
+por lance:
+
+- 'descarte_total': pone 100% de descarte para la especie (DESCAR_n = KG_n),
+- 'cajones_a_kilos': la captura se cargó en cajones; KG_n y DESCAR_n se multiplican por
+  los kilos por cajón,
+- 'porcentaje_a_kilos': DESCAR_n se cargó como porcentaje de KG_n y pasa a kilos.
+
+Cada corrección se aplica a una especie (o a todas), a los lances elegidos, a los que
+cumplen una regla o a toda la marea, y vuelve a calcular CAPT_TOTAL y DESCARTE como la
+suma de los pares.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from domain.marea_procesos import slot_count
+
+DISCARD_TRANSFORMS = ('descarte_total', 'cajones_a_kilos', 'porcentaje_a_kilos')
+
+# Decimales de los campos de la captura (KG_n/DESCAR_n N(9,2), CAPT_TOTAL/DESCARTE N(10,1))
+_SLOT_DECIMALS = 2
+_TOTAL_DECIMALS = 1
+
+
+@dataclass
+class DiscardResult:
+    """Filas modificadas y nuevos valores de los campos que cambiaron (sólo esas filas)."""
+    filas: np.ndarray
+    columnas: Dict[str, np.ndarray]
+    pares: int
+
+    @property
+    def registros(self) -> int:
+        return len(self.filas)
+
+
+def select_rows(captura: Mapping, lances: Optional[Iterable[int]] = None,
+                regla: Optional[Callable[[Mapping], np.ndarray]] = None) -> np.ndarray:
+    """Máscara de lances a corregir: los de `lances`, los que cumplen `regla`, o todos."""
+    n = len(captura['LANCE'])
+    mask = np.ones(n, dtype=bool)
+    if lances is not None:
+        mask &= np.isin(captura['LANCE'], np.fromiter((int(x) for x in lances), dtype=np.int64))
+    if regla is not None:
+        mask &= np.asarray(regla(captura), dtype=bool)
+    return mask
+
+
+def apply_discard_transform(captura: Mapping, transform: str, especie: Optional[int] = None,
+                            lances: Optional[Iterable[int]] = None,
+                            regla: Optional[Callable[[Mapping], np.ndarray]] = None,
+                            kg_cajon: Optional[float] = None) -> DiscardResult:
+    """Aplica una corrección a la captura (mapeo campo -> arreglo) sin modificarla.
+
+    Devuelve sólo las filas que cambian, con los KG_n/DESCAR_n afectados y los totales.
+    """
+    if transform not in DISCARD_TRANSFORMS:
+        raise ValueError(f"Corrección desconocida: {transform}")
+    if transform == 'cajones_a_kilos' and not (kg_cajon and kg_cajon > 0):
+        raise ValueError("Falta el peso por cajón")
+    if transform == 'descarte_total' and especie is None:
+        raise ValueError("El descarte total se aplica a una especie")
+
+    slots = slot_count(captura, 'ESPECIE')
+    nombres = range(1, slots + 1)
+    especies = np.column_stack([captura[f'ESPECIE_{i}'] for i in nombres])
+    kilos = np.column_stack([captura[f'KG_{i}'] for i in nombres]).astype(np.float64)
+    descarte = np.column_stack([captura[f'DESCAR_{i}'] for i in nombres]).astype(np.float64)
+
+    # Pares (lance, slot) afectados
+    afectados = select_rows(captura, lances, regla)[:, None] & (especies != 0)
+    if especie is not None:
+        afectados &= especies == int(especie)
+
+    nuevos_kilos, nuevo_descarte = kilos.copy(), descarte.copy()
+    if transform == 'descarte_total':
+        nuevo_descarte = np.where(afectados, kilos, descarte)
+    elif transform == 'cajones_a_kilos':
+        nuevos_kilos = np.where(afectados, kilos * kg_cajon, kilos)
+        nuevo_descarte = np.where(afectados, descarte * kg_cajon, descarte)
+    else:
+        nuevo_descarte = np.where(afectados, kilos * descarte / 100.0, descarte)
+    nuevos_kilos = np.round(nuevos_kilos, _SLOT_DECIMALS)
+    nuevo_descarte = np.round(nuevo_descarte, _SLOT_DECIMALS)
+
+    cambiados = (nuevos_kilos != kilos) | (nuevo_descarte != descarte)
+    filas = np.flatnonzero(cambiados.any(axis=1))
+    columnas: Dict[str, np.ndarray] = {}
+    for j in np.flatnonzero(cambiados[filas].any(axis=0)):
+        if (nuevos_kilos[filas, j] != kilos[filas, j]).any():
+            columnas[f'KG_{j + 1}'] = nuevos_kilos[filas, j]
+        if (nuevo_descarte[filas, j] != descarte[filas, j]).any():
+            columnas[f'DESCAR_{j + 1}'] = nuevo_descarte[filas, j]
+    if len(filas):
+        columnas['CAPT_TOTAL'] = np.round(nuevos_kilos[filas].sum(axis=1), _TOTAL_DECIMALS)
+        columnas['DESCARTE'] = np.round(nuevo_descarte[filas].sum(axis=1), _TOTAL_DECIMALS)
+    return DiscardResult(filas, columnas, int(cambiados.sum()))
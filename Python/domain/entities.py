@@ -1,7 +1,9 @@
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
-@dataclass
+# Con __slots__: las entidades se arman por fila desde los catálogos (ver domain/catalog.py)
+
+@dataclass(slots=True)
 class Especie:
     codinidep: str
     nom_vul_cas: str
@@ -12,7 +14,7 @@ class Especie:
         """Formato: Nombre Vulgar (Nombre Científico)"""
         return f"{self.nom_vul_cas} ({self.nom_cient})"
 
-@dataclass
+@dataclass(slots=True)
 class Observador:
     obs_nro: str
     apellido: str
@@ -23,7 +25,7 @@ class Observador:
         """Formato: Apellido, Nombre"""
         return f"{self.apellido}, {self.nombre}"
 
-@dataclass
+@dataclass(slots=True)
 class Buque:
     # Usamos el nombre como identificador principal por la inconsistencia del código
     nombre: str 
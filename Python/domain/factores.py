@@ -0,0 +1,197 @@
+"""Área barrida, captura por unidad de esfuerzo (CPUE) y densidad por lance, mes, etapa y año,
+los indicadores del archivo FACTORES.DBF que hasta ahora se calculaban fuera de la aplicación.
+
+- Área barrida (millas náuticas²) = VEL_ARRAS (nudos) × duración (h) × DIST_ALAS (m) / 1852;
+  si el lance ya trae AREA_BARR se usa ese valor.
+- CPUE (kg/h) = kilos / horas de arrastre.
+- Densidad (t/mn²) = toneladas / área barrida, sólo con los lances que tienen área.
+
+Los agregados son estimadores de razón: suma de kilos sobre suma del esfuerzo de *todos*
+los lances del período (también los que no capturaron la especie).
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from domain.columnar import Table, group_by, group_keys
+from domain.marea_dataset import MareaDataset
+from domain.procesos import register_process, register_product
+
+# Metros por milla náutica
+MILLA_NAUTICA = 1852.0
+
+
+def area_barrida(vel_arrastre: np.ndarray, horas: np.ndarray, dist_alas: np.ndarray,
+                 area_registrada: np.ndarray = None) -> np.ndarray:
+    """Área barrida por lance en mn²; prevalece el AREA_BARR cargado en el archivo."""
+    calculada = (np.asarray(vel_arrastre, dtype=np.float64) * np.asarray(horas, dtype=np.float64)
+                 * np.asarray(dist_alas, dtype=np.float64) / MILLA_NAUTICA)
+    if area_registrada is None:
+        return calculada
+    area_registrada = np.asarray(area_registrada, dtype=np.float64)
+    return np.where(area_registrada > 0, area_registrada, calculada)
+
+
+def cpue(kilos: np.ndarray, horas: np.ndarray) -> np.ndarray:
+    """Kilos por hora de arrastre (0 sin esfuerzo)."""
+    kilos, horas = np.asarray(kilos, dtype=np.float64), np.asarray(horas, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(horas > 0, kilos / horas, 0.0)
+
+
+def densidad(kilos: np.ndarray, area: np.ndarray) -> np.ndarray:
+    """Toneladas por milla náutica² (0 sin área barrida)."""
+    kilos, area = np.asarray(kilos, dtype=np.float64), np.asarray(area, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(area > 0, kilos / 1000.0 / area, 0.0)
+
+
+def _mes(fechas: np.ndarray) -> np.ndarray:
+    return fechas.astype('datetime64[M]').astype(np.int64) % 12 + 1
+
+
+def _anio(fechas: np.ndarray) -> np.ndarray:
+    return fechas.astype('datetime64[Y]').astype(np.int64) + 1970
+
+
+# ---------------------------------------------------------------------------
+# Productos intermedios
+# ---------------------------------------------------------------------------
+
+@register_product('esfuerzo', deps=('lances',), tables=('captura',))
+def esfuerzo(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Esfuerzo de cada lance: horas de arrastre y área barrida, con su año, mes y etapa."""
+    lances_tabla = inputs['lances']
+    if not lances_tabla:
+        return {}
+    captura = dataset.table('captura')
+    n = len(lances_tabla['lance'])
+
+    def columna(name: str) -> np.ndarray:
+        return captura[name] if name in captura else np.zeros(n)
+
+    fechas = np.asarray(lances_tabla['fecha'], dtype='datetime64[D]')
+    return {
+        'lance': lances_tabla['lance'],
+        'fecha': fechas,
+        'anio': _anio(fechas),
+        'mes': _mes(fechas),
+        'etapa': lances_tabla['etapa'],
+        'horas': lances_tabla['horas'],
+        'area_barr': area_barrida(columna('VEL_ARRAS'), lances_tabla['horas'], columna('DIST_ALAS'),
+                                  columna('AREA_BARR')),
+    }
+
+
+@register_product('aportes_factores', deps=('esfuerzo', 'captura_larga'))
+def aportes_factores(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Table]:
+    """Sumas de la marea por año y mes que alimentan los factores de toda la temporada.
+
+    'esfuerzo': horas, área y lances por (anio, mes); 'captura': kilos (y kilos de lances
+    con área) por (anio, mes, especie). Se suman entre mareas sin volver a leerlas.
+    """
+    tabla, larga = inputs['esfuerzo'], inputs['captura_larga']
+    if not tabla:
+        return {'esfuerzo': {}, 'captura': {}}
+    con_area = tabla['area_barr'] > 0
+    aporte_esfuerzo = group_by({'anio': tabla['anio'], 'mes': tabla['mes']},
+                               sums={'horas': tabla['horas'], 'area_barr': tabla['area_barr']},
+                               counts='lances')
+    aporte_captura: Table = {}
+    if larga:
+        filas = larga['fila']
+        aporte_captura = group_by(
+            {'anio': tabla['anio'][filas], 'mes': tabla['mes'][filas], 'especie': larga['especie']},
+            sums={'kg': larga['kg'], 'kg_area': np.where(con_area[filas], larga['kg'], 0.0)})
+    return {'esfuerzo': aporte_esfuerzo, 'captura': aporte_captura}
+
+
+def datos_muestra(dataset: MareaDataset, lance: np.ndarray, especie: np.ndarray) -> Table:
+    """Área estadística, peso muestreado y nombre de la especie de la muestra de cada (lance, especie).
+
+    Cruce vectorizado con el archivo de muestras; sin muestra quedan en 0 / ''.
+    """
+    n = len(lance)
+    result = {'area': np.zeros(n), 'peso_mues': np.zeros(n), 'nombre': np.full(n, '')}
+    muestra = dataset.table('muestra')
+    if not dataset.num_rows('muestra') or not n:
+        return result
+    por_muestra = group_by({'clave': muestra['LANCE'].astype(np.int64) * 10 ** 10 + muestra['COD_ESPEC']},
+                           sums={'peso_mues': muestra['PESO_MUES']},
+                           firsts={'area': muestra['AREA'], 'nombre': muestra['ESPECIE']})
+    claves = np.asarray(lance, dtype=np.int64) * 10 ** 10 + np.asarray(especie, dtype=np.int64)
+    pos = np.clip(np.searchsorted(por_muestra['clave'], claves), 0, len(por_muestra['clave']) - 1)
+    hallado = por_muestra['clave'][pos] == claves
+    result['area'] = np.where(hallado, por_muestra['area'][pos], 0.0)
+    result['peso_mues'] = np.where(hallado, por_muestra['peso_mues'][pos], 0.0)
+    result['nombre'] = np.where(hallado, por_muestra['nombre'][pos], '')
+    return result
+
+
+def _por_periodo(periodo: np.ndarray, tabla: Table, con_area: np.ndarray) -> Dict[str, np.ndarray]:
+    """Esfuerzo total de cada período (para cada lance): horas, área y cantidad de lances."""
+    ids, first = group_keys([periodo])
+    size = len(first)
+    return {
+        'ids': ids,
+        'horas': np.bincount(ids, weights=tabla['horas'], minlength=size),
+        'area_barr': np.bincount(ids, weights=np.where(con_area, tabla['area_barr'], 0.0), minlength=size),
+        'lances': np.bincount(ids, minlength=size),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Proceso
+# ---------------------------------------------------------------------------
+
+# Lee la captura (por el esfuerzo y la captura larga) y la muestra (área, peso muestreado y nombre)
+@register_process("Factores CPUE", deps=('esfuerzo', 'captura_larga'), tables=('captura', 'muestra'),
+                  description="Área barrida, CPUE y densidad por lance, mes, etapa y año (FACTORES)",
+                  writes_files=True)
+def factores_cpue(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Una fila por lance y especie con los indicadores del lance, del mes, de la etapa y del año.
+
+    Con especies objetivo en los parámetros sólo se listan esas especies; el esfuerzo de
+    cada período se calcula siempre con todos los lances.
+    """
+    tabla, larga = inputs['esfuerzo'], inputs['captura_larga']
+    if not tabla or not larga:
+        return {}
+    especies = [int(e) for e in params.get('especies') or []]
+    if especies:
+        mask = np.isin(larga['especie'], especies)
+        larga = {name: column[mask] for name, column in larga.items()}
+    filas = larga['fila']
+    con_area = tabla['area_barr'] > 0
+    kg = np.asarray(larga['kg'], dtype=np.float64)
+    kg_area = np.where(con_area[filas], kg, 0.0)
+
+    result: Table = {
+        'barco': dataset.table('captura')['BARCO'][filas] if 'BARCO' in dataset.table('captura')
+        else np.full(len(filas), ''),
+        'lance': larga['lance'],
+        'fecha': tabla['fecha'][filas],
+        'mes': tabla['mes'][filas],
+        'etapa': larga['etapa'],
+        'especie': larga['especie'],
+        'kg': kg,
+        'horas': tabla['horas'][filas],
+        'area_barr': tabla['area_barr'][filas],
+        'cap_ce': cpue(kg, tabla['horas'][filas]),
+        'den_ce': densidad(kg_area, tabla['area_barr'][filas]),
+    }
+    result.update(datos_muestra(dataset, larga['lance'], larga['especie']))
+    periodos = {'mes': (tabla['anio'] * 100 + tabla['mes'], 'men', 'den_m', 'slme'),
+                'etapa': (tabla['etapa'], 'etapa', 'den_etapa', 'sletapa'),
+                'anio': (tabla['anio'], 'anu', 'den_anu', 'slma')}
+    for periodo, (claves, sufijo, nombre_densidad, nombre_lances) in periodos.items():
+        total = _por_periodo(claves, tabla, con_area)
+        grupo = total['ids'][filas]
+        # Kilos de cada especie en el período (sobre todos los lances del período)
+        pares, first = group_keys([grupo, larga['especie']])
+        kilos = np.bincount(pares, weights=kg, minlength=len(first))[pares]
+        kilos_area = np.bincount(pares, weights=kg_area, minlength=len(first))[pares]
+        result[f'cap_{sufijo}'] = cpue(kilos, total['horas'][grupo])
+        result[nombre_densidad] = densidad(kilos_area, total['area_barr'][grupo])
+        result[nombre_lances] = total['lances'][grupo]
+    return result
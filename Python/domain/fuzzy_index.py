@@ -0,0 +1,133 @@
+"""Índice de búsqueda aproximada de nombres (buques, observadores, ...).
+
+Las claves se normalizan (mayúsculas, sin acentos ni signos) y se indexan por
+trigramas. Una consulta sólo se compara con las claves que comparten trigramas con
+ella (bloqueo), y esos candidatos se ordenan por distancia de edición, así el costo
+no depende del tamaño del registro sino de cuántas claves se parecen a la consulta.
+"""
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Claves con más trigramas en común que se comparan por distancia de edición
+MAX_CANDIDATES = 64
+
+
+def normalize_text(text: object) -> str:
+    """'  Don Tomasso  ' -> 'DON TOMASSO'; 'Piñero' -> 'PINERO'; 'S/N°-12' -> 'S N 12'."""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).upper()
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in text).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigramas de una clave normalizada, con bordes para que cuenten el inicio y el final."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Distancia de Levenshtein; si supera `max_distance` devuelve `max_distance + 1` sin terminar."""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+@dataclass(frozen=True)
+class Match(Generic[T]):
+    """Un elemento encontrado, la clave por la que coincidió y su distancia a la consulta."""
+    item: T
+    campo: str
+    clave: str
+    distancia: int
+
+    @property
+    def exacta(self) -> bool:
+        return self.distancia == 0
+
+
+class FuzzyIndex(Generic[T]):
+    """Índice de elementos por una o más claves de texto (nombre, matrícula, código, ...)."""
+
+    def __init__(self, max_candidates: int = MAX_CANDIDATES):
+        self.max_candidates = max_candidates
+        self._items: List[T] = []
+        self._keys: List[Tuple[str, int, str]] = []          # (clave, elemento, campo)
+        self._exact: Dict[str, List[int]] = {}               # clave -> posiciones en _keys
+        self._postings: Dict[str, List[int]] = {}            # trigrama -> posiciones en _keys
+        self._sorted: Optional[List[Tuple[str, int]]] = None  # (clave, posición), para prefijos
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: T, **claves: object) -> None:
+        """Indexa `item` por cada clave no vacía (campo=texto)."""
+        item_id = len(self._items)
+        self._items.append(item)
+        for campo, texto in claves.items():
+            clave = normalize_text(texto)
+            if not clave:
+                continue
+            pos = len(self._keys)
+            self._keys.append((clave, item_id, campo))
+            self._exact.setdefault(clave, []).append(pos)
+            for gram in trigrams(clave):
+                self._postings.setdefault(gram, []).append(pos)
+        self._sorted = None
+
+    def _prefixed(self, query: str) -> List[int]:
+        """Claves que empiezan con `query` (búsqueda binaria sobre las claves ordenadas)."""
+        if self._sorted is None:
+            self._sorted = sorted((clave, pos) for pos, (clave, _, _) in enumerate(self._keys))
+        found = []
+        for clave, pos in self._sorted[bisect_left(self._sorted, (query, -1)):]:
+            if not clave.startswith(query):
+                break
+            found.append(pos)
+        return found
+
+    def _candidates(self, query: str) -> List[int]:
+        shared = Counter()
+        for gram in trigrams(query):
+            shared.update(self._postings.get(gram, ()))
+        candidates = [pos for pos, _ in shared.most_common(self.max_candidates)]
+        # Las claves que empiezan con la consulta (como LEFT(obser,6) del programa viejo)
+        # se consideran aunque tengan pocos trigramas en común
+        return list(dict.fromkeys(self._exact.get(query, []) + self._prefixed(query)[:self.max_candidates]
+                                  + candidates))
+
+    def search(self, query: object, limit: int = 10, max_distance: Optional[int] = None) -> List[Match[T]]:
+        """Mejores coincidencias de la consulta, una por elemento, de menor a mayor distancia.
+
+        Una clave que empieza con la consulta cuenta como distancia 1 (le faltan letras).
+        """
+        query = normalize_text(query)
+        if not query:
+            return []
+        best: Dict[int, Match[T]] = {}
+        for pos in self._candidates(query):
+            clave, item_id, campo = self._keys[pos]
+            distancia = edit_distance(query, clave, max_distance)
+            if distancia and clave.startswith(query):
+                distancia = 1
+            if max_distance is not None and distancia > max_distance:
+                continue
+            actual = best.get(item_id)
+            if actual is None or distancia < actual.distancia:
+                best[item_id] = Match(self._items[item_id], campo, clave, distancia)
+        ranked = sorted(best.values(), key=lambda m: (m.distancia, m.clave))
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,102 @@
+"""Histogramas de tallas para el gráfico de distribución (lo que hoy se revisa pegando la
+distribución en las planillas `Dist_tallas_*.xls`).
+
+Las tallas decodificadas se agrupan una sola vez por especie, etapa, lance y talla, con
+las filas ordenadas por especie. Cada consulta recorre sólo el tramo de su especie y arma
+las series con `np.bincount` sobre un eje de tallas fijo por especie: al filtrar por lance
+o etapa el eje no cambia y sólo cambian los conteos.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from domain.columnar import Table, group_by, table_length
+from domain.marea_dataset import MareaDataset
+from domain.procesos import register_product
+
+SEXOS = ('machos', 'hembras', 'indeterminados')
+
+# Etapa de los ejemplares cuya fecha no cae en ninguna etapa
+SIN_ETAPA = -1
+
+
+class HistogramaTallas:
+    """Ejemplares por talla de cada especie, listos para graficar por sexo o por etapa."""
+
+    def __init__(self, tallas: Table, nombres: Optional[Dict[int, str]] = None):
+        claves = ('especie', 'etapa', 'lance', 'talla')
+        if tallas and table_length(tallas):
+            tabla = group_by({name: np.asarray(tallas[name], dtype=np.int64) for name in claves},
+                             sums={sexo: tallas[sexo] for sexo in SEXOS})
+        else:
+            tabla = {name: np.zeros(0, dtype=np.int64) for name in claves + SEXOS}
+        # group_by devuelve los grupos ordenados por las claves: cada especie es un tramo contiguo
+        self.tabla = tabla
+        self.especies, inicios = np.unique(tabla['especie'], return_index=True)
+        self._limites = np.append(inicios, len(tabla['especie']))
+        vacia = len(inicios) == 0
+        self._talla_min = np.zeros(0, dtype=np.int64) if vacia else np.minimum.reduceat(tabla['talla'], inicios)
+        self._talla_max = np.zeros(0, dtype=np.int64) if vacia else np.maximum.reduceat(tabla['talla'], inicios)
+        self.nombres = {int(codigo): str(nombre) for codigo, nombre in (nombres or {}).items()}
+
+    def _indice(self, especie: int) -> int:
+        i = int(np.searchsorted(self.especies, especie))
+        if i == len(self.especies) or self.especies[i] != especie:
+            raise KeyError(f"La especie {especie} no tiene tallas")
+        return i
+
+    def _tramo(self, especie: int) -> slice:
+        i = self._indice(especie)
+        return slice(int(self._limites[i]), int(self._limites[i + 1]))
+
+    def eje(self, especie: int) -> np.ndarray:
+        """Tallas de la especie, de la menor a la mayor medida (el eje x de sus gráficos)."""
+        i = self._indice(especie)
+        return np.arange(self._talla_min[i], self._talla_max[i] + 1)
+
+    def lances(self, especie: int) -> np.ndarray:
+        return np.unique(self.tabla['lance'][self._tramo(especie)])
+
+    def etapas(self, especie: int) -> np.ndarray:
+        return np.unique(self.tabla['etapa'][self._tramo(especie)])
+
+    def _filas(self, especie: int, lances: Optional[Iterable[int]], etapas: Optional[Iterable[int]]):
+        tramo = self._tramo(especie)
+        mask = np.ones(tramo.stop - tramo.start, dtype=bool)
+        if lances is not None:
+            mask &= np.isin(self.tabla['lance'][tramo], np.asarray(list(lances), dtype=np.int64))
+        if etapas is not None:
+            mask &= np.isin(self.tabla['etapa'][tramo], np.asarray(list(etapas), dtype=np.int64))
+        return tramo, mask
+
+    def por_sexo(self, especie: int, lances: Optional[Iterable[int]] = None,
+                 etapas: Optional[Iterable[int]] = None) -> Dict[str, np.ndarray]:
+        """Ejemplares por talla de cada sexo, alineados con `eje(especie)`."""
+        tramo, mask = self._filas(especie, lances, etapas)
+        eje = self.eje(especie)
+        posicion = self.tabla['talla'][tramo][mask] - eje[0]
+        return {sexo: np.bincount(posicion, weights=self.tabla[sexo][tramo][mask],
+                                  minlength=len(eje)).astype(np.int64) for sexo in SEXOS}
+
+    def por_etapa(self, especie: int, lances: Optional[Iterable[int]] = None) -> Dict[int, np.ndarray]:
+        """Total de ejemplares por talla en cada etapa de la especie (SIN_ETAPA incluida)."""
+        tramo, mask = self._filas(especie, lances, None)
+        eje = self.eje(especie)
+        etapas = self.etapas(especie)
+        codigo = np.searchsorted(etapas, self.tabla['etapa'][tramo][mask])
+        posicion = codigo * len(eje) + self.tabla['talla'][tramo][mask] - eje[0]
+        total = sum(self.tabla[sexo][tramo][mask] for sexo in SEXOS)
+        conteos = np.bincount(posicion, weights=total, minlength=len(etapas) * len(eje))
+        conteos = conteos.astype(np.int64).reshape(len(etapas), len(eje))
+        return {int(etapa): conteos[i] for i, etapa in enumerate(etapas)}
+
+
+@register_product('histograma_tallas', deps=('tallas',), tables=('muestra',))
+def histograma_tallas(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> HistogramaTallas:
+    """Histogramas de tallas de la marea, con el nombre científico de cada especie."""
+    nombres = {}
+    muestra = dataset.table('muestra')
+    if dataset.num_rows('muestra') and 'ESPECIE' in muestra:
+        pares = group_by({'codigo': muestra['COD_ESPEC'], 'nombre': np.char.strip(muestra['ESPECIE'].astype(str))})
+        nombres = dict(zip(pares['codigo'].tolist(), pares['nombre'].tolist()))
+    return HistogramaTallas(inputs['tallas'], nombres)
@@ -0,0 +1,53 @@
+from bisect import bisect_right
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+class IntervalIndex:
+    """Intervalos cerrados [inicio, fin] sin solapamientos, ordenados por inicio.
+
+    Como los intervalos no se solapan, los fines quedan ordenados igual que los
+    inicios: el único candidato a solaparse con [a, b] es el último que empieza
+    antes o en `b`, y se encuentra con una búsqueda binaria.
+    """
+
+    def __init__(self):
+        self._starts: List[Any] = []
+        self._ends: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, row: int) -> Tuple[Any, Any]:
+        return self._starts[row], self._ends[row]
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return iter(zip(self._starts, self._ends))
+
+    def overlapping(self, start: Any, end: Any) -> Optional[int]:
+        """Posición del intervalo que se solapa con [start, end], o None."""
+        row = bisect_right(self._starts, end) - 1
+        if row >= 0 and self._ends[row] >= start:
+            return row
+        return None
+
+    def insertion_row(self, start: Any) -> int:
+        """Posición que ocuparía un intervalo que empieza en `start`."""
+        return bisect_right(self._starts, start)
+
+    def insert(self, start: Any, end: Any) -> int:
+        """Agrega [start, end] (que no debe solaparse con ninguno) y devuelve su posición."""
+        if end < start:
+            raise ValueError("El fin del intervalo es anterior al inicio")
+        if self.overlapping(start, end) is not None:
+            raise ValueError("El intervalo se solapa con uno existente")
+        row = self.insertion_row(start)
+        self._starts.insert(row, start)
+        self._ends.insert(row, end)
+        return row
+
+    def pop(self, row: int) -> Tuple[Any, Any]:
+        return self._starts.pop(row), self._ends.pop(row)
+
+    def clear(self) -> None:
+        self._starts.clear()
+        self._ends.clear()
@@ -0,0 +1,75 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+
+class JobCancelledError(Exception):
+    """Se lanza dentro de un proceso cuando su ejecución fue cancelada."""
+
+
+class CancellationToken:
+    """Bandera de cancelación compartida entre quien lanza el proceso y el proceso."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Interrumpe el proceso si se solicitó la cancelación."""
+        if self._event.is_set():
+            raise JobCancelledError()
+
+
+@dataclass
+class JobContext:
+    """Canal por el que un proceso informa progreso y resultados intermedios.
+
+    Los callbacks se inyectan desde el ejecutor (hilo de Qt, CLI, tests), de modo
+    que los procesos no dependen de ninguna librería de UI.
+    """
+    token: CancellationToken = field(default_factory=CancellationToken)
+    on_progress: Optional[Callable[[int, str], None]] = None
+    on_partial: Optional[Callable[[Any], None]] = None
+
+    def report_progress(self, percent: int, message: str = "") -> None:
+        """Informa el avance (0-100) y verifica si hubo cancelación."""
+        self.token.raise_if_cancelled()
+        if self.on_progress:
+            self.on_progress(max(0, min(100, int(percent))), message)
+
+    def emit_partial(self, result: Any) -> None:
+        """Publica un resultado intermedio (por ejemplo, una tabla por etapa)."""
+        self.token.raise_if_cancelled()
+        if self.on_partial:
+            self.on_partial(result)
+
+    def check_cancelled(self) -> None:
+        self.token.raise_if_cancelled()
+
+
+@dataclass
+class Job:
+    """Unidad de trabajo ejecutable en segundo plano.
+
+    `func` recibe un `JobContext` seguido de `params` como argumentos con nombre.
+    Si `cpu_bound` es True, `func` se ejecuta en un proceso separado y se llama
+    sin contexto (`func(**params)`), por lo que debe ser una función de módulo
+    serializable con pickle.
+    """
+    name: str
+    func: Callable[..., Any]
+    params: Dict[str, Any] = field(default_factory=dict)
+    cpu_bound: bool = False
+
+    def run(self, context: JobContext) -> Any:
+        """Ejecuta el trabajo en el hilo actual."""
+        context.check_cancelled()
+        if self.cpu_bound:
+            return self.func(**self.params)
+        return self.func(context, **self.params)
@@ -0,0 +1,93 @@
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EtapaSpec = Any  # (inicio, fin) en ISO, o {'start_date': ..., 'end_date': ...} como en config.json
+
+
+def parse_etapas(etapas: Optional[Iterable[EtapaSpec]]) -> np.ndarray:
+    """Convierte la lista de etapas del estado guardado en un arreglo (k, 2) de `datetime64[D]`."""
+    parsed = []
+    for etapa in etapas or []:
+        if isinstance(etapa, dict):
+            start, end = etapa['start_date'], etapa['end_date']
+        else:
+            start, end = etapa
+        parsed.append((np.datetime64(str(start), 'D'), np.datetime64(str(end), 'D')))
+    parsed.sort()
+    return np.array(parsed, dtype='datetime64[D]').reshape(-1, 2)
+
+
+class MareaDataset:
+    """Agregado con todas las tablas de una marea, leídas una sola vez.
+
+    Cada tabla (captura, muestra, produccion, submuestra, ...) es un mapeo nombre de
+    campo -> arreglo NumPy. Los productos intermedios que comparten varios procesos
+    (captura en formato largo, tallas decodificadas, posiciones) se calculan una vez y
+    quedan memorizados en el propio dataset.
+    """
+
+    def __init__(self, num_marea: str, anio_marea: str, etapas: Optional[Iterable[EtapaSpec]],
+                 tables: Dict[str, Mapping], sources: Optional[Dict[str, str]] = None):
+        self.num_marea = str(num_marea)
+        self.anio_marea = str(anio_marea)
+        self.etapas = parse_etapas(etapas)
+        self.tables = dict(tables)
+        self.sources = dict(sources or {})
+        self._products: Dict[str, Any] = {}
+        self._product_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def has_table(self, kind: str) -> bool:
+        return kind in self.tables
+
+    def table(self, kind: str) -> Mapping:
+        """Tabla por tipo; si la marea no tiene ese archivo se devuelve una tabla vacía."""
+        return self.tables.get(kind, {})
+
+    def num_rows(self, kind: str) -> int:
+        table = self.tables.get(kind)
+        if table is None:
+            return 0
+        if hasattr(table, 'num_rows'):
+            return table.num_rows
+        for column in table.values():
+            return len(column)
+        return 0
+
+    def etapa_index(self, fechas: np.ndarray) -> np.ndarray:
+        """Índice de etapa (0..k-1) de cada fecha; -1 si no cae en ninguna etapa."""
+        fechas = np.asarray(fechas, dtype='datetime64[D]')
+        if len(self.etapas) == 0:
+            return np.full(len(fechas), -1, dtype=np.int64)
+        starts, ends = self.etapas[:, 0], self.etapas[:, 1]
+        idx = np.searchsorted(starts, fechas, side='right') - 1
+        safe_idx = np.clip(idx, 0, len(starts) - 1)
+        inside = (idx >= 0) & ~np.isnat(fechas) & (fechas <= ends[safe_idx])
+        return np.where(inside, idx, -1)
+
+    def product(self, name: str, builder: Callable[[], Any]) -> Any:
+        """Devuelve el producto memorizado `name`, construyéndolo una sola vez aunque
+        varios hilos lo pidan a la vez."""
+        if name in self._products:
+            return self._products[name]
+        with self._locks_guard:
+            lock = self._product_locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._products:
+                self._products[name] = builder()
+        return self._products[name]
+
+    def cached_products(self) -> List[str]:
+        return list(self._products)
+
+    def keep_products(self, other: 'MareaDataset', names: Iterable[str]) -> None:
+        """Toma de `other` los productos ya calculados en `names` (los que no leen tablas que cambiaron)."""
+        for name in names:
+            if name in other._products:
+                self._products.setdefault(name, other._products[name])
+
+    def key(self) -> Tuple[str, str]:
+        return (self.num_marea, self.anio_marea)
@@ -0,0 +1,321 @@
+"""Procesos de control de marea portados de los programas FoxPro (obshar, obspro,
+obsposarr, obsdist, cortar*), expresados como operaciones vectorizadas sobre un
+`MareaDataset`. Al importar el módulo se registran en `domain.procesos` (y, los que
+pueden calcularse por bloques de registros, en `domain.streaming`).
+"""
+import string
+from typing import Any, Dict, List
+
+import numpy as np
+
+from domain.columnar import Table, count_distinct, group_by, group_keys
+from domain.marea_dataset import MareaDataset
+from domain.procesos import register_process, register_product
+from domain.streaming import register_stream, regrouper
+
+# Tablas de una marea que se cortan por etapa (todas tienen el campo FECHA)
+STAGE_CUT_KINDS = ('captura', 'muestra', 'muestra_descarte', 'produccion', 'submuestra')
+
+# Cada TALLA_n guarda 5 grupos de 3 dígitos: talla, machos, hembras, indeterminados, total
+_TALLA_GROUP = 1000
+
+
+def slot_count(table, prefix: str) -> int:
+    """Cantidad de campos repetidos `<prefix>_1.. <prefix>_n` presentes en una tabla."""
+    n = 0
+    while f"{prefix}_{n + 1}" in table:
+        n += 1
+    return n
+
+
+def decode_tallas(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Separa los valores codificados de TALLA_n (ej. 42015009000024) en sus componentes."""
+    values = np.asarray(values, dtype=np.int64)
+    return {
+        'talla': values // _TALLA_GROUP ** 4,
+        'machos': (values // _TALLA_GROUP ** 3) % _TALLA_GROUP,
+        'hembras': (values // _TALLA_GROUP ** 2) % _TALLA_GROUP,
+        'indeterminados': (values // _TALLA_GROUP) % _TALLA_GROUP,
+        'total': values % _TALLA_GROUP,
+    }
+
+
+def encode_tallas(talla, machos, hembras, indeterminados, total) -> np.ndarray:
+    """Operación inversa de `decode_tallas`."""
+    g = _TALLA_GROUP
+    return (np.asarray(talla, dtype=np.int64) * g ** 4 + np.asarray(machos, dtype=np.int64) * g ** 3
+            + np.asarray(hembras, dtype=np.int64) * g ** 2
+            + np.asarray(indeterminados, dtype=np.int64) * g + np.asarray(total, dtype=np.int64))
+
+
+def grados_minutos_a_decimal(values: np.ndarray) -> np.ndarray:
+    """Convierte posiciones GG.MMM (grados.minutos) a grados decimales negativos (Sur/Oeste),
+    igual que obsposarr.PRG: -(int(x) + frac(x) / 0.6)."""
+    values = np.asarray(values, dtype=np.float64)
+    grados = np.trunc(values)
+    return -(grados + (values - grados) / 0.6)
+
+
+def hora_a_minutos(values: np.ndarray) -> np.ndarray:
+    """Convierte horas en formato HH.MM (ej. 17.45) a minutos desde medianoche."""
+    values = np.asarray(values, dtype=np.float64)
+    horas = np.trunc(values)
+    return horas * 60 + np.round((values - horas) * 100)
+
+
+def duracion_horas(hora_inicio: np.ndarray, hora_final: np.ndarray) -> np.ndarray:
+    """Duración de cada lance en horas; si termina antes de empezar cruzó la medianoche."""
+    inicio = hora_a_minutos(hora_inicio)
+    final = hora_a_minutos(hora_final)
+    minutos = np.where(final > inicio, final - inicio, 1440 - inicio + final)
+    return minutos / 60.0
+
+
+def horas_a_hmm(horas: np.ndarray) -> np.ndarray:
+    """Formatea horas decimales como H.MM (horas.minutos), tal como se listan en los informes."""
+    horas = np.asarray(horas, dtype=np.float64)
+    enteras = np.trunc(horas)
+    return enteras + np.trunc((horas - enteras) * 60 + 1e-9) / 100
+
+
+def etapa_letter(index: int) -> str:
+    """Sufijo de archivo de cada etapa (a, b, c, ...) usado por los programas de corte."""
+    return string.ascii_lowercase[index]
+
+
+# ---------------------------------------------------------------------------
+# Productos intermedios compartidos
+# ---------------------------------------------------------------------------
+
+@register_product('lances', tables=('captura',))
+def lances(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Atributos por lance del archivo de captura: etapa y duración."""
+    captura = dataset.table('captura')
+    if not dataset.num_rows('captura'):
+        return {}
+    return {
+        'fila': np.arange(dataset.num_rows('captura')),
+        'lance': captura['LANCE'],
+        'fecha': captura['FECHA'],
+        'etapa': dataset.etapa_index(captura['FECHA']),
+        'horas': duracion_horas(captura['HORA_INIC'], captura['HORA_FINAL']),
+    }
+
+
+@register_product('captura_larga', deps=('lances',), tables=('captura',))
+def captura_larga(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Captura en formato largo: una fila por cada par ESPECIE_n/KG_n/DESCAR_n no vacío."""
+    captura = dataset.table('captura')
+    slots = slot_count(captura, 'ESPECIE')
+    lances_tabla = inputs['lances']
+    if not slots or not lances_tabla:
+        return {}
+    especies = np.column_stack([captura[f'ESPECIE_{i}'] for i in range(1, slots + 1)])
+    kilos = np.column_stack([captura[f'KG_{i}'] for i in range(1, slots + 1)])
+    descarte = np.column_stack([captura[f'DESCAR_{i}'] for i in range(1, slots + 1)])
+    filas, columnas = np.nonzero(especies)
+    return {
+        'fila': filas,
+        'slot': columnas + 1,
+        'lance': lances_tabla['lance'][filas],
+        'fecha': lances_tabla['fecha'][filas],
+        'etapa': lances_tabla['etapa'][filas],
+        'especie': especies[filas, columnas],
+        'kg': kilos[filas, columnas],
+        'descarte': descarte[filas, columnas],
+    }
+
+
+@register_product('tallas', tables=('muestra',))
+def tallas(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Tallas decodificadas del archivo de muestras, una fila por TALLA_n no vacío."""
+    muestra = dataset.table('muestra')
+    slots = slot_count(muestra, 'TALLA')
+    if not slots or not dataset.num_rows('muestra'):
+        return {}
+    codificadas = np.column_stack([muestra[f'TALLA_{i}'] for i in range(1, slots + 1)])
+    filas, columnas = np.nonzero(codificadas)
+    tabla = {
+        'fila': filas,
+        'lance': muestra['LANCE'][filas],
+        'fecha': muestra['FECHA'][filas],
+        'etapa': dataset.etapa_index(muestra['FECHA'])[filas],
+        'especie': muestra['COD_ESPEC'][filas],
+    }
+    tabla.update(decode_tallas(codificadas[filas, columnas]))
+    return tabla
+
+
+@register_product('posiciones', tables=('captura',))
+def posiciones(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Posiciones de inicio y fin de cada lance en grados decimales."""
+    captura = dataset.table('captura')
+    if not dataset.num_rows('captura'):
+        return {}
+    return {
+        'lat_inic': grados_minutos_a_decimal(captura['LAT_INIC']),
+        'long_inic': grados_minutos_a_decimal(captura['LONG_INIC']),
+        'lat_final': grados_minutos_a_decimal(captura['LAT_FINAL']),
+        'long_final': grados_minutos_a_decimal(captura['LONG_FINAL']),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Procesos (botones)
+# ---------------------------------------------------------------------------
+
+@register_process("Cortar bases", description="Separa los archivos de la marea por etapa", tables=STAGE_CUT_KINDS,
+                  writes_files=True, needs_etapas=True)
+def cortar_bases(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, List[np.ndarray]]:
+    """Índices de registros de cada archivo que caen en cada etapa (cortar*.prg).
+
+    Devuelve tipo de tabla -> lista con un arreglo de filas por etapa; la escritura de
+    los archivos <c|m|p|s><marea><año><letra>.dbf queda a cargo de la infraestructura.
+    """
+    cortes = {}
+    for kind in STAGE_CUT_KINDS:
+        if not dataset.has_table(kind) or 'FECHA' not in dataset.table(kind):
+            continue
+        etapa = dataset.etapa_index(dataset.table(kind)['FECHA'])
+        cortes[kind] = [np.flatnonzero(etapa == i) for i in range(len(dataset.etapas))]
+    return cortes
+
+
+@register_process("Control Dias horas Arrastrero", deps=('captura_larga', 'lances'),
+                  description="Kilos, descarte, lances, días y horas por especie (obshar)")
+def control_dias_horas(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Resumen de captura y esfuerzo por etapa y especie, como el archivo B de obshar.PRG."""
+    larga = inputs['captura_larga']
+    if not larga:
+        return {}
+    horas = inputs['lances']['horas'][larga['fila']]
+    resumen = group_by({'etapa': larga['etapa'], 'especie': larga['especie']},
+                       sums={'kilos': larga['kg'], 'descarte': larga['descarte'], 'horas': horas},
+                       counts='lances')
+    group_ids, _ = group_keys([larga['etapa'], larga['especie']])
+    resumen['dias'] = count_distinct(group_ids, larga['fecha'], len(resumen['especie']))
+    return _con_descarte_pct(resumen)
+
+
+def _con_descarte_pct(resumen: Table) -> Table:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resumen['descarte_pct'] = np.where(resumen['kilos'] > 0,
+                                           resumen['descarte'] / resumen['kilos'] * 100, 0.0)
+    return resumen
+
+
+def _dias_horas_por_fecha(dataset: MareaDataset, params: Dict[str, Any]) -> Table:
+    """Parcial por bloques de obshar: sumas por etapa, especie y fecha (los días se cuentan al final)."""
+    lances_tabla = lances(dataset, {}, params)
+    larga = captura_larga(dataset, {'lances': lances_tabla}, params)
+    if not larga:
+        return {}
+    return group_by({'etapa': larga['etapa'], 'especie': larga['especie'], 'fecha': larga['fecha']},
+                    sums={'kilos': larga['kg'], 'descarte': larga['descarte'],
+                          'horas': lances_tabla['horas'][larga['fila']]},
+                    counts='lances')
+
+
+def _dias_horas_final(por_fecha: Table, params: Dict[str, Any]) -> Table:
+    resumen = group_by({'etapa': por_fecha['etapa'], 'especie': por_fecha['especie']},
+                       sums={name: por_fecha[name] for name in ('kilos', 'descarte', 'horas', 'lances')},
+                       counts='dias')
+    return _con_descarte_pct(resumen)
+
+
+register_stream("Control Dias horas Arrastrero", 'captura',
+                merge=regrouper(('etapa', 'especie', 'fecha'), sums=('kilos', 'descarte', 'horas', 'lances')),
+                partial=_dias_horas_por_fecha, finish=_dias_horas_final)
+
+
+@register_process("Posiciones con una especie arrastreros", deps=('posiciones', 'captura_larga'), tables=('captura',),
+                  description="Posición de cada lance en grados decimales (obsposarr)")
+def posiciones_lances(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Tabla de posiciones por lance; `kg_objetivo` suma las especies objetivo de la marea."""
+    captura = dataset.table('captura')
+    pos = inputs['posiciones']
+    if not pos:
+        return {}
+    n = dataset.num_rows('captura')
+    larga = inputs['captura_larga']
+    objetivo = np.zeros(n)
+    especies = [int(e) for e in params.get('especies') or []]
+    if larga and especies:
+        mask = np.isin(larga['especie'], especies)
+        objetivo = np.bincount(larga['fila'][mask], weights=larga['kg'][mask], minlength=n)
+    return {
+        'barco': captura['BARCO'],
+        'marea': captura['MAREA'],
+        'lance': captura['LANCE'],
+        'fecha': captura['FECHA'],
+        'etapa': dataset.etapa_index(captura['FECHA']),
+        'latitud': pos['lat_inic'],
+        'longitud': pos['long_inic'],
+        'kg_objetivo': objetivo,
+    }
+
+
+@register_process("Resumen produccion", description="Kilos por especie, producto y categoría (obspro)",
+                  tables=('produccion',))
+def resumen_produccion(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Suma de kilos de producción por etapa, especie, producto y categoría."""
+    produccion = dataset.table('produccion')
+    if not dataset.num_rows('produccion'):
+        return {}
+    return group_by(
+        {
+            'etapa': dataset.etapa_index(produccion['FECHA']),
+            'especie': produccion['ESPECIE'],
+            'producto': produccion['PRODUCTO'],
+            'categoria': produccion['CATEGORIA'],
+        },
+        sums={'kilos': produccion['KILOS']},
+        firsts={'factor': produccion['FACTOR']},
+    )
+
+
+register_stream("Resumen produccion", 'produccion',
+                merge=regrouper(('etapa', 'especie', 'producto', 'categoria'), sums=('kilos',), firsts=('factor',)))
+
+
+@register_process("Distribución de tallas", deps=('tallas',),
+                  description="Ejemplares por talla y sexo para las especies objetivo (obsdist)")
+def distribucion_tallas(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Distribución de tallas por etapa, especie y talla, separada por sexo."""
+    tabla = inputs['tallas']
+    if not tabla:
+        return {}
+    especies = [int(e) for e in params.get('especies') or []]
+    if especies:
+        mask = np.isin(tabla['especie'], especies)
+        tabla = {name: column[mask] for name, column in tabla.items()}
+    return group_by(
+        {'etapa': tabla['etapa'], 'especie': tabla['especie'], 'talla': tabla['talla']},
+        sums={name: tabla[name] for name in ('machos', 'hembras', 'indeterminados', 'total')},
+    )
+
+
+register_stream("Distribución de tallas", 'muestra',
+                merge=regrouper(('etapa', 'especie', 'talla'), sums=('machos', 'hembras', 'indeterminados', 'total')))
+
+
+@register_process("Resumen muestra/maduros", description="Ejemplares submuestreados por sexo y estadio",
+                  tables=('submuestra',))
+def resumen_maduros(dataset: MareaDataset, inputs: Dict[str, Any], params: Dict[str, Any]) -> Table:
+    """Cantidad de ejemplares de la submuestra biológica por etapa, especie, sexo y estadio."""
+    submuestra = dataset.table('submuestra')
+    if not dataset.num_rows('submuestra'):
+        return {}
+    return group_by(
+        {
+            'etapa': dataset.etapa_index(submuestra['FECHA']),
+            'especie': submuestra['ESPECIE'],
+            'sexo': submuestra['SEXO'],
+            'estadio': submuestra['ESTADIO'],
+        },
+        counts='ejemplares',
+    )
+
+
+register_stream("Resumen muestra/maduros", 'submuestra',
+                merge=regrouper(('etapa', 'especie', 'sexo', 'estadio'), sums=('ejemplares',)))
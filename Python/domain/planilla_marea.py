@@ -0,0 +1,254 @@
+"""Planillas de los observadores llevadas a los campos de los archivos C y M.
+
+Cada hoja tiene una fila de encabezados con los nombres de los campos (o sus variantes
+habituales: 'Buque', 'lan', 'Cód. especie') y una fila por registro:
+
+- captura: una fila por lance, con los campos de CAPTURA_LAYOUT que tenga la planilla;
+- muestra: una fila por talla medida (TALLA, MACHOS, HEMBRAS, INDET, TOTAL) de cada
+  muestra (LANCE, COD_ESPEC, FUENTE); las tallas de cada muestra se codifican en TALLA_n
+  como en los archivos cargados con FoxPro. Una hoja que ya trae TALLA_n se copia tal cual.
+
+Los valores se convierten y validan por columna, sobre bloques de filas.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.columnar import Table, group_by, group_keys, table_length
+from domain.marea_procesos import encode_tallas
+
+FieldSpec = Tuple[str, str, int, int]
+
+# Variantes de encabezado de las planillas -> campo del archivo
+ALIAS_ENCABEZADOS = {
+    'BUQUE': 'BARCO', 'LAN': 'LANCE', 'NRO_LANCE': 'LANCE', 'N_LANCE': 'LANCE',
+    'COD_ESP': 'COD_ESPEC', 'COD_ESPECIE': 'COD_ESPEC', 'CODIGO': 'COD_ESPEC',
+    'HORA_INICIO': 'HORA_INIC', 'HORA_FIN': 'HORA_FINAL', 'CAPTURA': 'CAPT_TOTAL',
+    'MACHO': 'MACHOS', 'HEMBRA': 'HEMBRAS', 'INDET': 'INDETERMINADOS', 'INDETERMINADO': 'INDETERMINADOS',
+    'LARGO': 'TALLA', 'LONGITUD_TOTAL': 'TALLA',
+}
+# Columnas de las planillas de tallas (una fila por talla de cada muestra)
+COLUMNAS_TALLAS = ('TALLA', 'MACHOS', 'HEMBRAS', 'INDETERMINADOS', 'TOTAL')
+# Claves de una muestra dentro de la planilla de tallas
+CLAVE_MUESTRA = ('LANCE', 'COD_ESPEC', 'FUENTE')
+# Máximo de ejemplares por grupo de TALLA_n (3 dígitos)
+_MAX_EJEMPLARES = 999
+# Primer día de las fechas seriales de Excel
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'D')
+_FECHA_TEXTO = re.compile(r'^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})$')
+_FECHA_ISO = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})')
+
+
+@dataclass(frozen=True)
+class ErrorPlanilla:
+    """Valor rechazado de una planilla (fila como la muestra Excel, desde 1)."""
+    hoja: str
+    fila: int
+    campo: str
+    mensaje: str
+
+    def __str__(self) -> str:
+        return f"{self.hoja}!{self.fila} {self.campo}: {self.mensaje}"
+
+
+def normalizar_encabezado(texto: object) -> str:
+    """'Cód. especie ' -> 'COD_ESPECIE'."""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Z0-9]+', '_', texto.upper()).strip('_')
+
+
+def mapear_encabezado(fila: Sequence[object], campos: Iterable[str]) -> Dict[int, str]:
+    """Columna de la planilla -> campo, para los encabezados que están en `campos`."""
+    conocidos = set(campos)
+    mapa: Dict[int, str] = {}
+    for col, texto in enumerate(fila):
+        nombre = normalizar_encabezado(texto)
+        nombre = ALIAS_ENCABEZADOS.get(nombre, nombre)
+        if nombre in conocidos and nombre not in mapa.values():
+            mapa[col] = nombre
+    return mapa
+
+
+def tipo_planilla(columnas: Iterable[str]) -> Optional[str]:
+    """'muestra', 'captura' o None según los campos que trae la hoja."""
+    columnas = set(columnas)
+    if 'LANCE' not in columnas:
+        return None
+    if columnas & {'TALLA', 'TALLA_1', 'PRIM_TALLA'}:
+        return 'muestra'
+    return 'captura'
+
+
+def _a_numeros(valores: List[object]) -> Tuple[np.ndarray, np.ndarray]:
+    """(valores, inválidos); las celdas vacías valen 0 como en FoxPro."""
+    try:
+        numeros = np.array([0.0 if v is None or v == '' else v for v in valores], dtype=np.float64)
+        return numeros, np.isnan(numeros)
+    except (TypeError, ValueError):
+        pass
+    numeros = np.zeros(len(valores))
+    invalidos = np.zeros(len(valores), dtype=bool)
+    for i, v in enumerate(valores):
+        if isinstance(v, str):
+            v = v.strip().replace(',', '.')
+        if v is None or v == '':
+            continue
+        try:
+            numeros[i] = float(v)
+        except (TypeError, ValueError):
+            invalidos[i] = True
+    return numeros, invalidos | np.isnan(numeros)
+
+
+def _a_fechas(valores: List[object]) -> np.ndarray:
+    """Fechas seriales de Excel o texto dd/mm/aaaa (o ISO); NaT si no se entienden."""
+    fechas = np.full(len(valores), np.datetime64('NaT'), dtype='datetime64[D]')
+    for i, v in enumerate(valores):
+        if isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0:
+            fechas[i] = _EXCEL_EPOCH + np.timedelta64(int(v), 'D')
+            continue
+        texto = str(v or '').strip()
+        match = _FECHA_TEXTO.match(texto)
+        if match:
+            dia, mes, anio = (int(x) for x in match.groups())
+            anio += 2000 if anio < 100 else 0
+        else:
+            match = _FECHA_ISO.match(texto)
+            if not match:
+                continue
+            anio, mes, dia = (int(x) for x in match.groups())
+        try:
+            fechas[i] = np.datetime64(f'{anio:04d}-{mes:02d}-{dia:02d}', 'D')
+        except ValueError:
+            pass
+    return fechas
+
+
+def _a_texto(valores: List[object]) -> np.ndarray:
+    textos = []
+    for v in valores:
+        if isinstance(v, float) and v.is_integer():
+            v = int(v)
+        textos.append(''.join(c for c in str('' if v is None else v) if c >= ' ').strip())
+    return np.array(textos, dtype=str) if textos else np.zeros(0, dtype=str)
+
+
+def _limite(length: int, decimals: int) -> float:
+    """Primer valor que ya no entra en un campo numérico (con lugar para el signo)."""
+    enteros = length - (decimals + 1 if decimals else 0)
+    return 10.0 ** enteros
+
+
+def convertir_bloque(crudo: Dict[str, List[object]], specs: Sequence[FieldSpec], hoja: str,
+                     filas: np.ndarray) -> Tuple[Table, List[ErrorPlanilla]]:
+    """Convierte las columnas crudas de un bloque a los tipos de los campos y las valida.
+
+    `filas` es el número de fila de Excel de cada registro, para los mensajes de error.
+    """
+    tipos = {name: (field_type, length, decimals) for name, field_type, length, decimals in specs}
+    tipos.update({name: ('N', 3, 0) for name in COLUMNAS_TALLAS})
+    tabla: Table = {}
+    errores: List[ErrorPlanilla] = []
+
+    def rechazar(mascara: np.ndarray, campo: str, mensaje: str) -> None:
+        errores.extend(ErrorPlanilla(hoja, int(f), campo, mensaje) for f in filas[mascara])
+
+    for name, valores in crudo.items():
+        field_type, length, decimals = tipos[name]
+        if field_type in ('N', 'F'):
+            numeros, invalidos = _a_numeros(valores)
+            rechazar(invalidos, name, "no es un número")
+            numeros = np.where(invalidos, 0.0, np.round(numeros, decimals))
+            limite = _limite(length, decimals)
+            rechazar((numeros >= limite) | (numeros <= -limite / 10), name,
+                     f"no entra en el campo ({length},{decimals})")
+            tabla[name] = numeros
+        elif field_type == 'D':
+            tabla[name] = _a_fechas(valores)
+        elif field_type == 'L':
+            tabla[name] = np.array([str(v).strip().upper() in ('T', 'S', 'Y', '1', 'TRUE') or v is True
+                                    for v in valores], dtype=bool)
+        else:
+            tabla[name] = _a_texto(valores)
+
+    if 'LANCE' in tabla:
+        rechazar(tabla['LANCE'] <= 0, 'LANCE', "falta el número de lance")
+    if 'FECHA' in tabla:
+        rechazar(np.isnat(tabla['FECHA']), 'FECHA', "falta la fecha o no es válida")
+    return tabla, errores
+
+
+def completar_captura(tabla: Table, slots: int) -> Table:
+    """CAPT_TOTAL y DESCARTE como suma de los pares si la planilla no los trae."""
+    n = table_length(tabla)
+    for total, prefijo in (('CAPT_TOTAL', 'KG'), ('DESCARTE', 'DESCAR')):
+        columnas = [tabla[f'{prefijo}_{i}'] for i in range(1, slots + 1) if f'{prefijo}_{i}' in tabla]
+        if total not in tabla and columnas:
+            tabla[total] = np.round(np.sum(columnas, axis=0), 1) if n else np.zeros(0)
+    return tabla
+
+
+def agrupar_tallas(tabla: Table, hoja_filas: Sequence[Tuple[str, int]], max_tallas: int
+                   ) -> Tuple[Table, List[ErrorPlanilla]]:
+    """Una fila por talla -> un registro por muestra, con las tallas codificadas en TALLA_n.
+
+    TALLA_1 es la talla más chica de la muestra y los campos siguen de a INTERVALO
+    (1 si la planilla no lo trae) hasta la más grande, con las tallas sin ejemplares en 0.
+    """
+    n = table_length(tabla)
+    errores: List[ErrorPlanilla] = []
+
+    def rechazar(mascara: np.ndarray, campo: str, mensaje: str) -> None:
+        errores.extend(ErrorPlanilla(*hoja_filas[i], campo, mensaje) for i in np.flatnonzero(mascara))
+
+    if not n:
+        return {}, errores
+    cero = np.zeros(n)
+    machos, hembras, indet = (np.rint(tabla.get(name, cero)).astype(np.int64)
+                              for name in ('MACHOS', 'HEMBRAS', 'INDETERMINADOS'))
+    total = np.rint(tabla['TOTAL']).astype(np.int64) if 'TOTAL' in tabla else machos + hembras + indet
+    talla = np.rint(tabla['TALLA']).astype(np.int64)
+    rechazar(talla <= 0, 'TALLA', "falta la talla")
+    for name, valores in (('MACHOS', machos), ('HEMBRAS', hembras), ('INDETERMINADOS', indet), ('TOTAL', total)):
+        rechazar((valores < 0) | (valores > _MAX_EJEMPLARES), name, f"debe estar entre 0 y {_MAX_EJEMPLARES}")
+
+    claves = {name: tabla[name] if name in tabla else np.zeros(n, dtype=np.int64) for name in CLAVE_MUESTRA}
+    ids, _ = group_keys([claves[name] for name in CLAVE_MUESTRA])
+    resto = {name: column for name, column in tabla.items()
+             if name not in COLUMNAS_TALLAS and name not in CLAVE_MUESTRA}
+    muestras = group_by(claves, firsts=resto)
+    size = table_length(muestras)
+
+    prim = np.full(size, np.iinfo(np.int64).max)
+    np.minimum.at(prim, ids, talla)
+    ult = np.zeros(size, dtype=np.int64)
+    np.maximum.at(ult, ids, talla)
+    intervalo = np.rint(muestras.get('INTERVALO', np.zeros(size))).astype(np.int64)
+    intervalo = np.where(intervalo > 0, intervalo, 1)
+    desde_prim = talla - prim[ids]
+    slot = desde_prim // intervalo[ids]
+    rechazar(desde_prim % intervalo[ids] != 0, 'TALLA', "no coincide con el intervalo de la muestra")
+    rechazar(slot >= max_tallas, 'TALLA', f"la muestra pasa de {max_tallas} tallas")
+    orden = np.lexsort((slot, ids))
+    repetida = np.zeros(n, dtype=bool)
+    repetida[orden[1:]] = (ids[orden[1:]] == ids[orden[:-1]]) & (slot[orden[1:]] == slot[orden[:-1]])
+    rechazar(repetida, 'TALLA', "talla repetida en la muestra")
+    if errores:
+        return {}, errores
+
+    # Todas las tallas del rango de cada muestra, con los ejemplares de las filas cargadas
+    cantidad = (ult - prim) // intervalo + 1
+    conteos = np.zeros((size, max_tallas, 4), dtype=np.int64)
+    conteos[ids, slot] = np.column_stack([machos, hembras, indet, total])
+    posiciones = np.arange(max_tallas)
+    tallas = prim[:, None] + posiciones[None, :] * intervalo[:, None]
+    codificadas = encode_tallas(tallas, conteos[..., 0], conteos[..., 1], conteos[..., 2], conteos[..., 3])
+    codificadas[posiciones[None, :] >= cantidad[:, None]] = 0
+
+    muestras.update({'PRIM_TALLA': prim, 'ULT_TALLA': ult, 'INTERVALO': intervalo})
+    for i in range(max_tallas):
+        muestras[f'TALLA_{i + 1}'] = codificadas[:, i]
+    return muestras, errores
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from domain.scheduler import TaskNode, affected_nodes
+
+
+@dataclass(frozen=True)
+class ProcessDefinition(TaskNode):
+    """Proceso ejecutable desde los botones de la ventana principal.
+
+    Es un nodo del grafo de procesos: `func(dataset, inputs, params)` recibe la marea
+    cargada, los productos intermedios declarados en `deps` y los parámetros de la
+    marea (etapas, especies, ...). Con `writes_files`, al ejecutarlo se escriben archivos
+    en la carpeta de la marea (cortes por etapa, FACTORES); los demás sólo leen. Con
+    `needs_etapas`, sin etapas cargadas no hay nada que hacer (no hay qué cortar).
+    """
+    description: str = ""
+    writes_files: bool = False
+    needs_etapas: bool = False
+
+
+# Texto del botón que ejecuta todos los procesos registrados
+RUN_ALL_PROCESSES = "Ejecutar todos"
+
+# Procesos disponibles, indexados por el texto de su botón (ver PROCESS_BUTTON_NAMES)
+PROCESS_REGISTRY: Dict[str, ProcessDefinition] = {}
+
+# Productos intermedios compartidos entre procesos (captura larga, tallas, posiciones, ...)
+PRODUCT_REGISTRY: Dict[str, TaskNode] = {}
+
+
+def register_process(name: str, deps: Tuple[str, ...] = (), description: str = "",
+                     tables: Tuple[str, ...] = (), writes_files: bool = False, needs_etapas: bool = False):
+    """Decorador que registra una función como proceso con el nombre de su botón.
+
+    `tables` son las tablas de la marea que lee el proceso (además de sus `deps`).
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        PROCESS_REGISTRY[name] = ProcessDefinition(name, func, tuple(deps), memoize=False, tables=tuple(tables),
+                                                   description=description, writes_files=writes_files,
+                                                   needs_etapas=needs_etapas)
+        return func
+    return decorator
+
+
+def register_product(name: str, deps: Tuple[str, ...] = (), tables: Tuple[str, ...] = ()):
+    """Decorador que registra un producto intermedio memorizado en el dataset."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        PRODUCT_REGISTRY[name] = TaskNode(name, func, tuple(deps), memoize=True, tables=tuple(tables))
+        return func
+    return decorator
+
+
+def get_process(name: str) -> Optional[ProcessDefinition]:
+    return PROCESS_REGISTRY.get(name)
+
+
+def read_only_processes() -> List[str]:
+    """Procesos que sólo leen la marea (los controles), sin los que escriben archivos."""
+    return [name for name, process in PROCESS_REGISTRY.items() if not process.writes_files]
+
+
+def process_graph() -> Dict[str, TaskNode]:
+    """Todos los nodos (productos y procesos) para el planificador."""
+    nodes: Dict[str, TaskNode] = dict(PRODUCT_REGISTRY)
+    nodes.update(PROCESS_REGISTRY)
+    return nodes
+
+
+def affected_by(tables: Iterable[str]) -> Set[str]:
+    """Productos y procesos que hay que recalcular si cambian esas tablas de la marea."""
+    return affected_nodes(process_graph(), tables)
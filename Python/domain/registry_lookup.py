@@ -0,0 +1,96 @@
+"""Búsqueda de códigos de buques y observadores ("BUSCAR CODIGO BARCO/AIP", bus_bar.PRG).
+
+El programa viejo recorría todo el registro comparando `UPPER(TRIM(buque))` o
+`LEFT(obser,6)`. Acá ambos registros se indexan una vez (nombre, matrícula y código
+del buque; apellido, nombre y número del observador) y las consultas se resuelven
+por bloqueo y distancia de edición, lo que también tolera los nombres escritos
+distinto en los archivos de marea.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Optional, Union
+
+from domain.entities import Buque, Observador
+from domain.fuzzy_index import FuzzyIndex, Match, normalize_text
+
+# Distancia máxima para aceptar un BARCO de marea como un buque del registro
+MAX_RESOLUTION_DISTANCE = 2
+
+RESOLUTION_EXACT = 'exacto'
+RESOLUTION_APPROXIMATE = 'aproximado'
+RESOLUTION_AMBIGUOUS = 'ambiguo'
+RESOLUTION_NOT_FOUND = 'sin coincidencia'
+
+
+def _without_leading_zeros(code: str) -> str:
+    return code.lstrip('0') if code.isdigit() else ''
+
+
+@dataclass
+class BarcoResolution:
+    """Buque del registro que corresponde a un valor BARCO de los archivos de marea."""
+    barco: str
+    registros: int
+    candidatos: List[Match[Buque]] = field(default_factory=list)
+
+    @property
+    def buque(self) -> Optional[Buque]:
+        """Buque elegido, sólo si la resolución no es ambigua."""
+        if self.estado in (RESOLUTION_EXACT, RESOLUTION_APPROXIMATE):
+            return self.candidatos[0].item
+        return None
+
+    @property
+    def estado(self) -> str:
+        if not self.candidatos:
+            return RESOLUTION_NOT_FOUND
+        mejor = self.candidatos[0]
+        empatados = [m for m in self.candidatos if m.distancia == mejor.distancia]
+        # Registros repetidos (mismo nombre, distinto código) no se pueden elegir solos
+        if len(empatados) > 1:
+            return RESOLUTION_AMBIGUOUS
+        return RESOLUTION_EXACT if mejor.exacta else RESOLUTION_APPROXIMATE
+
+
+class RegistryLookup:
+    """Índices de búsqueda sobre los registros de buques y observadores."""
+
+    def __init__(self, buques: Iterable[Buque], observadores: Iterable[Observador]):
+        self.buques: FuzzyIndex[Buque] = FuzzyIndex()
+        for buque in buques:
+            cod = str(buque.buque_cod).strip()
+            self.buques.add(buque, nombre=buque.nombre, matricula=buque.matricula,
+                            matricula_sin_ceros=_without_leading_zeros(buque.matricula),
+                            codigo=cod if cod not in ('', '0') else '')
+        self.observadores: FuzzyIndex[Observador] = FuzzyIndex()
+        for observador in observadores:
+            self.observadores.add(observador, apellido=observador.apellido,
+                                  nombre_completo=f"{observador.apellido} {observador.nombre}",
+                                  numero=observador.obs_nro)
+
+    def search_vessels(self, query: str, limit: int = 10) -> List[Match[Buque]]:
+        return self.buques.search(query, limit)
+
+    def search_observers(self, query: str, limit: int = 10) -> List[Match[Observador]]:
+        return self.observadores.search(query, limit)
+
+    def resolve_vessels(self, barcos: Union[Mapping[str, int], Iterable[str]],
+                        max_distance: int = MAX_RESOLUTION_DISTANCE,
+                        limit: int = 5) -> List[BarcoResolution]:
+        """Resuelve cada valor BARCO distinto (con su cantidad de registros si es un mapeo).
+
+        Los valores que se normalizan igual ('Don Tomasso ' y 'DON TOMASSO') se buscan una vez.
+        """
+        if not isinstance(barcos, Mapping):
+            contados = {}
+            for barco in barcos:
+                contados[barco] = contados.get(barco, 0) + 1
+            barcos = contados
+        por_clave = {}
+        resoluciones = []
+        for barco, registros in barcos.items():
+            clave = normalize_text(barco)
+            if clave not in por_clave:
+                por_clave[clave] = self.buques.search(clave, limit, max_distance) if clave else []
+            resoluciones.append(BarcoResolution(str(barco).strip(), int(registros), por_clave[clave]))
+        resoluciones.sort(key=lambda r: (-r.registros, r.barco))
+        return resoluciones
@@ -0,0 +1,142 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from domain.jobs import JobContext
+
+# Cada cuánto (segundos) se revisa la cancelación mientras hay nodos en ejecución
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class TaskNode:
+    """Nodo del grafo de procesos.
+
+    `func(dataset, inputs, params)` recibe los resultados de sus dependencias en
+    `inputs` (nombre -> resultado). Los nodos con `memoize` (productos intermedios
+    como la captura en formato largo) se guardan en el dataset y no se recalculan.
+    `tables` son las tablas de la marea que el nodo lee directamente (sin contar las
+    que leen sus dependencias).
+    """
+    name: str
+    func: Callable[[Any, Dict[str, Any], Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    memoize: bool = False
+    tables: Tuple[str, ...] = ()
+
+
+def resolve_order(nodes: Mapping[str, TaskNode], targets: Iterable[str],
+                  available: Iterable[str] = ()) -> List[str]:
+    """Orden topológico de los nodos necesarios para calcular `targets`.
+
+    Las dependencias de los nodos en `available` (ya calculados) no se recorren.
+
+    Raises
+    ------
+    KeyError si un objetivo o dependencia no existe; ValueError si hay un ciclo.
+    """
+    order: List[str] = []
+    state: Dict[str, str] = {}
+    available = set(available)
+
+    def visit(name: str, path: Tuple[str, ...]) -> None:
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Ciclo de dependencias: {' -> '.join(path + (name,))}")
+        if name not in nodes:
+            raise KeyError(f"Proceso o producto desconocido: {name}")
+        state[name] = 'visiting'
+        if name not in available:
+            for dep in nodes[name].deps:
+                visit(dep, path + (name,))
+        state[name] = 'done'
+        order.append(name)
+
+    for target in targets:
+        visit(target, ())
+    return order
+
+
+def tables_read(nodes: Mapping[str, TaskNode], name: str) -> FrozenSet[str]:
+    """Tablas de la marea de las que depende un nodo, directamente o por sus dependencias."""
+    tables = set()
+    for dep in resolve_order(nodes, [name]):
+        tables.update(nodes[dep].tables)
+    return frozenset(tables)
+
+
+def affected_nodes(nodes: Mapping[str, TaskNode], tables: Iterable[str]) -> Set[str]:
+    """Nodos cuyo resultado cambia si cambian esas tablas (los que las leen y los que dependen de ellos)."""
+    tables = set(tables)
+    return {name for name in nodes if tables & tables_read(nodes, name)}
+
+
+class DagScheduler:
+    """Ejecuta un conjunto de procesos como grafo de dependencias.
+
+    Los nodos cuyas dependencias ya están resueltas se ejecutan en paralelo en un
+    pool de hilos (NumPy libera el GIL en la mayoría de las operaciones sobre arreglos).
+    Con `max_workers=0` se ejecutan en orden en el hilo que llama (útil para perfilar).
+    `tracer(nombre)` devuelve un context manager que envuelve la ejecución de cada nodo.
+    """
+
+    def __init__(self, nodes: Mapping[str, TaskNode], max_workers: Optional[int] = None,
+                 tracer: Optional[Callable[[str], ContextManager]] = None):
+        self.nodes = dict(nodes)
+        self.max_workers = max_workers
+        self.tracer = tracer
+
+    def run(self, targets: Iterable[str], dataset: Any, params: Optional[Dict[str, Any]] = None,
+            context: Optional[JobContext] = None) -> Dict[str, Any]:
+        """Calcula `targets` (y sus dependencias) y devuelve los resultados por nombre."""
+        targets = list(targets)
+        params = dict(params or {})
+        context = context or JobContext()
+        cached = set(dataset.cached_products()) if dataset is not None else set()
+        order = resolve_order(self.nodes, targets, available=cached)
+        pending = {name: set() if name in cached else set(self.nodes[name].deps) for name in order}
+        results: Dict[str, Any] = {}
+        total = len(order)
+
+        if self.max_workers == 0:
+            for name in order:
+                context.check_cancelled()
+                results[name] = self._run_node(name, dataset, results, params)
+                context.report_progress(len(results) * 100 // total, name)
+            return {name: results[name] for name in targets}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                context.check_cancelled()
+                ready = [name for name, deps in pending.items() if not deps]
+                for name in ready:
+                    del pending[name]
+                    running[executor.submit(self._run_node, name, dataset, results, params)] = name
+                done, _ = wait(running, timeout=_CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    for deps in pending.values():
+                        deps.discard(name)
+                    context.report_progress(len(results) * 100 // total, name)
+        return {name: results[name] for name in targets}
+
+    def _run_node(self, name: str, dataset: Any, results: Dict[str, Any], params: Dict[str, Any]) -> Any:
+        if self.tracer is None:
+            return self._compute_node(name, dataset, results, params)
+        with self.tracer(name):
+            return self._compute_node(name, dataset, results, params)
+
+    def _compute_node(self, name: str, dataset: Any, results: Dict[str, Any], params: Dict[str, Any]) -> Any:
+        node = self.nodes[name]
+        if node.memoize and dataset is not None:
+            return dataset.product(name, lambda: node.func(
+                dataset, {dep: results[dep] for dep in node.deps}, params))
+        return node.func(dataset, {dep: results[dep] for dep in node.deps}, params)
@@ -0,0 +1,86 @@
+"""Ejecución de procesos por bloques de registros, con memoria acotada.
+
+Un proceso "por bloques" recorre una sola tabla de la marea: cada bloque se procesa
+como si fuera una marea completa (`partial`), los resultados parciales se combinan
+(`merge`) y al final se calcula el resultado (`finish`). `merge` debe devolver una
+tabla con la misma forma que los parciales para poder combinar de a tandas; así la
+memoria depende del tamaño del bloque y de la cantidad de grupos, no del archivo.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+from domain.columnar import Table, concat, group_by
+from domain.jobs import JobContext
+from domain.marea_dataset import EtapaSpec, MareaDataset
+from domain.procesos import process_graph
+from domain.scheduler import DagScheduler
+
+# Parciales acumulados antes de combinarlos en uno solo
+MERGE_EVERY = 8
+
+
+@dataclass(frozen=True)
+class StreamAggregator:
+    """Cómo calcular un proceso recorriendo la tabla `table` por bloques."""
+    name: str
+    table: str
+    merge: Callable[[Sequence[Table], Dict[str, Any]], Table]
+    partial: Optional[Callable[[MareaDataset, Dict[str, Any]], Table]] = None
+    finish: Optional[Callable[[Table, Dict[str, Any]], Table]] = None
+
+
+# Procesos que pueden calcularse por bloques, indexados por el texto de su botón
+STREAM_REGISTRY: Dict[str, StreamAggregator] = {}
+
+
+def register_stream(name: str, table: str, merge, partial=None, finish=None) -> StreamAggregator:
+    """Declara que el proceso `name` puede calcularse recorriendo `table` por bloques.
+
+    Sin `partial`, cada bloque se procesa con el propio proceso (y sus productos).
+    """
+    aggregator = StreamAggregator(name, table, merge, partial, finish)
+    STREAM_REGISTRY[name] = aggregator
+    return aggregator
+
+
+def regroup(partials: Sequence[Table], keys: Sequence[str], sums: Sequence[str] = (),
+            firsts: Sequence[str] = ()) -> Table:
+    """Une resultados de `group_by` volviendo a agrupar por `keys` y sumando `sums`."""
+    table = concat(partials)
+    if not table:
+        return {}
+    return group_by({k: table[k] for k in keys}, sums={s: table[s] for s in sums},
+                    firsts={f: table[f] for f in firsts})
+
+
+def regrouper(keys: Sequence[str], sums: Sequence[str] = (), firsts: Sequence[str] = ()):
+    """`merge` para procesos cuyo resultado es un `group_by` con sumas y conteos."""
+    def merge(partials: Sequence[Table], params: Dict[str, Any]) -> Table:
+        return regroup(partials, keys, sums, firsts)
+    return merge
+
+
+def _process_chunk(name: str, dataset: MareaDataset, params: Dict[str, Any]) -> Table:
+    return DagScheduler(process_graph(), max_workers=0).run([name], dataset, params)[name]
+
+
+def run_streaming(aggregator: StreamAggregator, chunks: Iterable[Mapping], num_marea: str, anio_marea: str,
+                  etapas: Optional[Iterable[EtapaSpec]], params: Dict[str, Any],
+                  context: Optional[JobContext] = None, merge_every: int = MERGE_EVERY) -> Table:
+    """Calcula el proceso de `aggregator` sobre una secuencia de bloques de su tabla."""
+    etapas = list(etapas or [])
+    partials = []
+    for chunk in chunks:
+        if context is not None:
+            context.check_cancelled()
+        dataset = MareaDataset(num_marea, anio_marea, etapas, {aggregator.table: chunk})
+        if aggregator.partial is not None:
+            partials.append(aggregator.partial(dataset, params))
+        else:
+            partials.append(_process_chunk(aggregator.name, dataset, params))
+        if len(partials) >= merge_every:
+            partials = [aggregator.merge(partials, params)]
+    merged = aggregator.merge(partials, params)
+    if aggregator.finish is not None and merged:
+        return aggregator.finish(merged, params)
+    return merged
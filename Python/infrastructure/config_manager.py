@@ -3,6 +3,10 @@ import os
 import sys
 
 CONFIG_FILE = "config.json"
+INPUT_DATA_DIR = "input_data"
+RESULT_CACHE_DIR = "cache"
+LOGS_DIR = "logs"
+WORKSPACE_DIR = "mareas"
 
 def _app_root_path() -> str:
     """Ruta base para lectura/escritura persistente.
@@ -27,6 +31,26 @@ def get_config_path():
     """Ruta persistente de config.json (junto al .exe en modo congelado)."""
     return os.path.join(_app_root_path(), CONFIG_FILE)
 
+def get_input_data_path() -> str:
+    """Carpeta donde se buscan los archivos de marea (c/m/p/s<marea><año>.dbf)."""
+    return os.path.join(_app_root_path(), INPUT_DATA_DIR)
+
+def get_result_cache_path() -> str:
+    """Carpeta de la caché de resultados de procesos."""
+    return os.path.join(_app_root_path(), RESULT_CACHE_DIR)
+
+def get_workspace_path() -> str:
+    """Carpeta del espacio de trabajo: un archivo de estado por marea y su índice."""
+    return os.path.join(_app_root_path(), WORKSPACE_DIR)
+
+def get_diagnostics_log_path() -> str:
+    """Log JSON-lines (rotativo) con los tramos de tiempo de la instrumentación."""
+    return os.path.join(_app_root_path(), LOGS_DIR, "diagnostico.jsonl")
+
+def get_profiles_path() -> str:
+    """Carpeta donde se guardan los perfiles cProfile de los procesos."""
+    return os.path.join(_app_root_path(), LOGS_DIR, "perfiles")
+
 def save_config(data):
     """Guarda la configuración en un archivo JSON."""
     try:
@@ -0,0 +1,545 @@
+import os
+import struct
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from infrastructure.instrumentation import count, span
+
+# Código de página usado por los archivos de FoxPro/Clipper de los observadores
+DBF_CODEPAGE = 'cp1252'
+_HEADER_TERMINATOR = 0x0D
+_DELETED_FLAG = ord('*')
+_EOF_MARKER = b'\x1a'
+# Registros por bloque al recorrer un archivo por partes (ver `iter_dbf_chunks`)
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+@dataclass(frozen=True)
+class DbfField:
+    """Descriptor de un campo del encabezado DBF."""
+    name: str
+    type: str
+    length: int
+    decimals: int
+    offset: int  # Desplazamiento dentro del registro (el byte 0 es la marca de borrado)
+
+
+@dataclass(frozen=True)
+class DbfHeader:
+    version: int
+    record_count: int
+    header_length: int
+    record_length: int
+    fields: List[DbfField]
+
+    def field(self, name: str) -> DbfField:
+        for f in self.fields:
+            if f.name == name.upper():
+                return f
+        raise KeyError(name)
+
+    @property
+    def field_names(self) -> List[str]:
+        return [f.name for f in self.fields]
+
+
+def read_header(path: str) -> DbfHeader:
+    """Lee el encabezado de un archivo DBF (dBase III / FoxPro).
+
+    Se usa en lugar del paquete `dbf` porque los archivos de marea suelen traer
+    bytes extra al final del encabezado que esa librería no interpreta.
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(32)
+        if len(prefix) < 32:
+            raise ValueError(f"Encabezado DBF incompleto: {path}")
+        version = prefix[0]
+        record_count, header_length, record_length = struct.unpack('<IHH', prefix[4:12])
+        descriptors = f.read(max(0, header_length - 32))
+
+    fields = []
+    offset = 1
+    for pos in range(0, len(descriptors) - 31, 32):
+        descriptor = descriptors[pos:pos + 32]
+        if descriptor[0] == _HEADER_TERMINATOR:
+            break
+        name = descriptor[:11].split(b'\0')[0].decode('ascii', errors='replace').strip().upper()
+        field_type = chr(descriptor[11]).upper()
+        length = descriptor[16]
+        decimals = descriptor[17]
+        fields.append(DbfField(name, field_type, length, decimals, offset))
+        offset += length
+    return DbfHeader(version, record_count, header_length, record_length, fields)
+
+
+def read_records(path: str, header: Optional[DbfHeader] = None,
+                 include_deleted: bool = False) -> np.ndarray:
+    """Lee el área de registros en una matriz `uint8` de forma (registros, largo_registro)."""
+    header = header or read_header(path)
+    count = header.record_count
+    with open(path, 'rb') as f:
+        f.seek(header.header_length)
+        data = f.read(count * header.record_length)
+    # Tolerar archivos truncados: solo se consideran los registros completos
+    count = min(count, len(data) // header.record_length) if header.record_length else 0
+    records = np.frombuffer(data, dtype=np.uint8, count=count * header.record_length)
+    records = records.reshape(count, header.record_length)
+    if not include_deleted and count:
+        records = records[records[:, 0] != _DELETED_FLAG]
+    return records
+
+
+def complete_record_count(path: str, header: DbfHeader) -> int:
+    """Registros completos presentes en el archivo (tolera archivos truncados)."""
+    if not header.record_length:
+        return 0
+    available = max(0, os.path.getsize(path) - header.header_length) // header.record_length
+    return min(header.record_count, available)
+
+
+def iter_record_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, header: Optional[DbfHeader] = None,
+                       include_deleted: bool = False) -> Iterator[Tuple[int, np.ndarray]]:
+    """Recorre el área de registros en bloques de hasta `chunk_rows` registros.
+
+    El archivo se mapea en memoria y cada bloque se copia desde su porción del mapa,
+    así la memoria usada depende del tamaño del bloque y no del archivo. Devuelve
+    (posición del primer registro del bloque, matriz `uint8`); la posición cuenta sólo
+    los registros no borrados, igual que los índices de `read_records`.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows debe ser mayor que cero")
+    header = header or read_header(path)
+    total = complete_record_count(path, header)
+    if not total:
+        return
+    mapped = np.memmap(path, dtype=np.uint8, mode='r', offset=header.header_length,
+                       shape=(total, header.record_length))
+    try:
+        start = 0
+        for first in range(0, total, chunk_rows):
+            block = mapped[first:first + chunk_rows]
+            block = np.array(block) if include_deleted else block[block[:, 0] != _DELETED_FLAG]
+            yield start, block
+            start += block.shape[0]
+    finally:
+        del mapped
+
+
+def _field_bytes(records: np.ndarray, field: DbfField) -> np.ndarray:
+    return records[:, field.offset:field.offset + field.length]
+
+
+def _digits_value(matrix: np.ndarray, skip_column: int = -1) -> np.ndarray:
+    """Interpreta una matriz de dígitos ASCII alineados a derecha como enteros `int64`."""
+    digits = matrix.astype(np.int64) - 48
+    is_digit = (digits >= 0) & (digits <= 9)
+    digits = np.where(is_digit, digits, 0)
+    width = matrix.shape[1]
+    weights = np.zeros(width, dtype=np.int64)
+    place = 0
+    for j in range(width - 1, -1, -1):
+        if j == skip_column:
+            continue
+        weights[j] = 10 ** place
+        place += 1
+    return digits @ weights
+
+
+def decode_numeric(raw: np.ndarray, field: DbfField) -> np.ndarray:
+    """Decodifica un campo N/F: `int64` si no tiene decimales, `float64` en otro caso.
+
+    Los campos vacíos valen 0, igual que en FoxPro. Se aprovecha que FoxPro escribe
+    los números alineados a derecha con una cantidad fija de decimales; las filas
+    que no siguen ese formato se interpretan una a una.
+    """
+    rows, width = raw.shape
+    dot_column = width - field.decimals - 1 if field.decimals else -1
+    valid_chars = ((raw >= 48) & (raw <= 57)) | (raw == 32) | (raw == 45)
+    if dot_column >= 0:
+        valid_chars[:, dot_column] |= raw[:, dot_column] == 46
+    regular = valid_chars.all(axis=1)
+
+    mantissa = _digits_value(raw, skip_column=dot_column)
+    negative = (raw == 45).any(axis=1)
+    mantissa = np.where(negative, -mantissa, mantissa)
+    if field.decimals:
+        values = mantissa / float(10 ** field.decimals)
+    else:
+        values = mantissa
+
+    if not regular.all():
+        for row in np.flatnonzero(~regular):
+            text = raw[row].tobytes().decode('ascii', errors='ignore').strip()
+            try:
+                parsed = float(text) if text else 0.0
+            except ValueError:
+                parsed = 0.0  # FoxPro rellena con '*' los valores que desbordan el ancho
+            values[row] = parsed if field.decimals else int(parsed)
+    return values
+
+
+def decode_date(raw: np.ndarray) -> np.ndarray:
+    """Decodifica un campo D ('AAAAMMDD') como `datetime64[D]`; vacío se vuelve NaT."""
+    if raw.shape[0] == 0:
+        return np.array([], dtype='datetime64[D]')
+    year = _digits_value(raw[:, 0:4])
+    month = _digits_value(raw[:, 4:6])
+    day = _digits_value(raw[:, 6:8])
+    valid = (year > 0) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    safe_year = np.where(valid, year, 1970)
+    safe_month = np.where(valid, month, 1)
+    safe_day = np.where(valid, day, 1)
+    dates = (safe_year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (safe_month - 1)
+    dates = dates.astype('datetime64[D]') + (safe_day - 1)
+    dates[~valid] = np.datetime64('NaT')
+    return dates
+
+
+def decode_character(raw: np.ndarray, codepage: str = DBF_CODEPAGE) -> np.ndarray:
+    """Decodifica un campo C como arreglo de `str` sin espacios a los costados."""
+    rows, width = raw.shape
+    if rows == 0:
+        return np.array([], dtype='<U1')
+    fixed = np.ascontiguousarray(raw).view(f'S{width}').reshape(rows)
+    return np.char.strip(np.char.decode(fixed, codepage, errors='replace'))
+
+
+def decode_logical(raw: np.ndarray) -> np.ndarray:
+    return np.isin(raw[:, 0], np.frombuffer(b'TtYy', dtype=np.uint8))
+
+
+def decode_field(records: np.ndarray, field: DbfField, codepage: str = DBF_CODEPAGE) -> np.ndarray:
+    """Decodifica la columna `field` de una matriz de registros."""
+    raw = _field_bytes(records, field)
+    if field.type in ('N', 'F'):
+        return decode_numeric(raw, field)
+    if field.type == 'D':
+        return decode_date(raw)
+    if field.type == 'L':
+        return decode_logical(raw)
+    return decode_character(raw, codepage)
+
+
+class _RecordColumns(Mapping):
+    """Columnas de una matriz de registros, decodificadas al primer acceso y memorizadas."""
+
+    def __init__(self, header: DbfHeader, records: np.ndarray, codepage: str = DBF_CODEPAGE):
+        self.header = header
+        self.records = records
+        self.codepage = codepage
+        self._fields = {f.name: f for f in header.fields}
+        self._decoded: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def num_rows(self) -> int:
+        return self.records.shape[0]
+
+    @property
+    def size_bytes(self) -> int:
+        return self.records.nbytes
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        key = name.upper()
+        column = self._decoded.get(key)
+        if column is not None:
+            return column
+        field = self._fields[key]  # KeyError si no existe, como cualquier Mapping
+        with self._lock:
+            column = self._decoded.get(key)
+            if column is None:
+                column = decode_field(self.records, field, self.codepage)
+                self._decoded[key] = column
+        return column
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.upper() in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+
+class DbfColumns(_RecordColumns):
+    """Vista por columnas de un archivo DBF leído una sola vez.
+
+    Los registros se leen completos al construir el objeto; cada columna se decodifica
+    la primera vez que se accede a ella y queda memorizada. Es segura entre hilos.
+    """
+
+    def __init__(self, path: str, codepage: str = DBF_CODEPAGE, include_deleted: bool = False):
+        self.path = path
+        with span('dbf.leer', archivo=os.path.basename(path)):
+            header = read_header(path)
+            super().__init__(header, read_records(path, header, include_deleted=include_deleted), codepage)
+        count('dbf.registros_leidos', self.records.shape[0])
+        count('dbf.bytes_leidos', self.header.header_length + self.records.nbytes)
+
+
+class DbfChunk(_RecordColumns):
+    """Bloque de registros consecutivos de un DBF; `start` es la posición de su primer registro."""
+
+    def __init__(self, header: DbfHeader, records: np.ndarray, start: int, codepage: str = DBF_CODEPAGE):
+        super().__init__(header, records, codepage)
+        self.start = start
+
+
+def iter_dbf_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, codepage: str = DBF_CODEPAGE,
+                    include_deleted: bool = False) -> Iterator[DbfChunk]:
+    """Recorre un DBF como una secuencia de tablas por columnas de hasta `chunk_rows` registros."""
+    header = read_header(path)
+    for start, records in iter_record_chunks(path, chunk_rows, header, include_deleted):
+        count('dbf.registros_leidos', records.shape[0])
+        count('dbf.bytes_leidos', records.nbytes)
+        yield DbfChunk(header, records, start, codepage)
+
+
+def read_dbf_columns(path: str, fields: Optional[Iterable[str]] = None,
+                     codepage: str = DBF_CODEPAGE) -> Dict[str, np.ndarray]:
+    """Lee un DBF y devuelve un diccionario nombre -> arreglo con las columnas pedidas."""
+    table = DbfColumns(path, codepage)
+    names = [n.upper() for n in fields] if fields is not None else list(table)
+    return {name: table[name] for name in names}
+
+
+def write_dbf_subset(source_path: str, target_path: str, row_indices: np.ndarray) -> int:
+    """Copia en `target_path` los registros de `source_path` indicados, sin re-codificarlos.
+
+    Equivale a `COPY FILE` + `DELETE FOR` + `PACK` de los programas originales:
+    el encabezado se conserva byte a byte y solo se actualiza la cantidad de registros.
+    """
+    header = read_header(source_path)
+    with open(source_path, 'rb') as f:
+        header_bytes = bytearray(f.read(header.header_length))
+    records = read_records(source_path, header)
+    selected = records[np.asarray(row_indices, dtype=np.int64)]
+    struct.pack_into('<I', header_bytes, 4, selected.shape[0])
+
+    _write_dbf_file(target_path, bytes(header_bytes), selected)
+    return selected.shape[0]
+
+
+class DbfRecordWriter:
+    """Escribe registros ya codificados de a bloques detrás de un encabezado dado.
+
+    La cantidad de registros del encabezado se corrige al cerrar; el archivo se arma en
+    un temporal que reemplaza al destino sólo si la escritura terminó sin errores.
+
+        with DbfRecordWriter(destino, encabezado) as writer:
+            for bloque in bloques:
+                writer.append(bloque)
+    """
+
+    def __init__(self, target_path: str, header_bytes: bytes, buffer_bytes: int = 1 << 20):
+        os.makedirs(os.path.dirname(os.path.abspath(target_path)), exist_ok=True)
+        self.target_path = target_path
+        self.record_count = 0
+        self._tmp_path = target_path + '.tmp'
+        self._file = open(self._tmp_path, 'wb', buffering=buffer_bytes)
+        self._file.write(header_bytes)
+
+    def append(self, records: np.ndarray) -> None:
+        if records.shape[0]:
+            self._file.write(np.ascontiguousarray(records).tobytes())
+            self.record_count += records.shape[0]
+
+    def close(self) -> int:
+        """Completa el archivo, lo mueve a su destino y devuelve la cantidad de registros."""
+        self._file.write(_EOF_MARKER)
+        self._file.seek(4)
+        self._file.write(struct.pack('<I', self.record_count))
+        self._file.close()
+        os.replace(self._tmp_path, self.target_path)
+        return self.record_count
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> 'DbfRecordWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def rewrite_dbf_fields(path: str, rows: np.ndarray, columns: Mapping,
+                       codepage: str = DBF_CODEPAGE) -> int:
+    """Reescribe en una sola pasada los campos `columns` (nombre -> valores) de las filas `rows`.
+
+    Las filas se cuentan sin los registros borrados, como en `DbfColumns`. Sólo se
+    recodifican las celdas cuyo valor cambia; encabezado, registros borrados y demás
+    campos se copian byte a byte. Si algún valor no entra en su campo no se escribe nada.
+    Devuelve la cantidad de celdas modificadas.
+    """
+    header = read_header(path)
+    with open(path, 'rb') as f:
+        header_bytes = f.read(header.header_length)
+    records = read_records(path, header, include_deleted=True).copy()
+    targets = np.flatnonzero(records[:, 0] != _DELETED_FLAG)[np.asarray(rows, dtype=np.int64)]
+    modified = 0
+    for name, values in columns.items():
+        field = header.field(name)
+        values = np.asarray(values)
+        changed = decode_field(records[targets], field, codepage) != values
+        if not changed.any():
+            continue
+        encoded = encode_field(values[changed], field, codepage)
+        if field.type in ('N', 'F') and (encoded == 42).all(axis=1).any():
+            raise ValueError(f"Valores de {name} que no entran en el campo ({field.length},{field.decimals})")
+        records[targets[changed], field.offset:field.offset + field.length] = encoded
+        modified += int(changed.sum())
+    if modified:
+        with DbfRecordWriter(path, header_bytes) as writer:
+            writer.append(records)
+    return modified
+
+
+def _write_dbf_file(target_path: str, header_bytes: bytes, records: np.ndarray) -> None:
+    """Escribe encabezado, registros y marca de fin en un archivo temporal y lo reemplaza."""
+    os.makedirs(os.path.dirname(os.path.abspath(target_path)), exist_ok=True)
+    tmp_path = target_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header_bytes)
+        f.write(np.ascontiguousarray(records).tobytes())
+        f.write(_EOF_MARKER)
+    os.replace(tmp_path, target_path)
+
+
+def make_fields(specs: Iterable[Tuple[str, str, int, int]]) -> List[DbfField]:
+    """Descriptores con su desplazamiento a partir de (nombre, tipo, largo, decimales)."""
+    fields, offset = [], 1
+    for name, field_type, length, decimals in specs:
+        fields.append(DbfField(name.upper(), field_type.upper(), length, decimals, offset))
+        offset += length
+    return fields
+
+
+def build_header(fields: List[DbfField], record_count: int, version: int = 0x03,
+                 updated: Optional[date] = None) -> bytes:
+    """Encabezado dBase III como el de los archivos de marea (con un byte nulo tras el 0x0D)."""
+    updated = updated or date.today()
+    record_length = 1 + sum(f.length for f in fields)
+    header_length = 32 + 32 * len(fields) + 2
+    prefix = struct.pack('<BBBBIHH20x', version, updated.year % 100, updated.month, updated.day,
+                         record_count, header_length, record_length)
+    descriptors = b''.join(
+        struct.pack('<11sc4xBB14x', f.name.encode('ascii'), f.type.encode('ascii'), f.length, f.decimals)
+        for f in fields)
+    return prefix + descriptors + bytes([_HEADER_TERMINATOR, 0])
+
+
+def encode_numeric(values: np.ndarray, field: DbfField) -> np.ndarray:
+    """Codifica números alineados a derecha con decimales fijos, como FoxPro ('  6330.00').
+
+    Los valores que no entran en el ancho del campo se rellenan con '*'.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows, width, decimals = values.shape[0], field.length, field.decimals
+    scaled = np.rint(np.abs(np.nan_to_num(values)) * 10 ** decimals).astype(np.int64)
+    negative = (values < 0) & (scaled > 0)
+    out = np.full((rows, width), 32, dtype=np.uint8)
+
+    remaining = scaled.copy()
+    significant = np.ones(rows, dtype=bool)
+    column = width - 1
+    used = np.zeros(rows, dtype=np.int64)
+    for place in range(width):
+        if column < 0:
+            break
+        if decimals and place == decimals:
+            out[:, column] = 46  # '.'
+            column -= 1
+            used += 1
+            if column < 0:
+                break
+        if place > decimals:
+            significant = remaining > 0
+        out[significant, column] = 48 + (remaining[significant] % 10)
+        used[significant] += 1
+        remaining //= 10
+        column -= 1
+
+    sign_column = width - 1 - used
+    overflow = (remaining > 0) | (negative & (sign_column < 0))
+    fits_sign = negative & ~overflow
+    out[np.flatnonzero(fits_sign), sign_column[fits_sign]] = 45  # '-'
+    out[overflow] = 42  # '*'
+    return out
+
+
+def encode_date(values: np.ndarray) -> np.ndarray:
+    """Codifica fechas `datetime64` como 'AAAAMMDD'; NaT queda en blanco."""
+    dates = np.asarray(values, dtype='datetime64[D]')
+    if dates.shape[0] == 0:
+        return np.empty((0, 8), dtype=np.uint8)
+    text = np.where(np.isnat(dates), '', np.char.replace(dates.astype(str), '-', ''))
+    return encode_character(text, 8)
+
+
+def encode_character(values: np.ndarray, width: int, codepage: str = DBF_CODEPAGE) -> np.ndarray:
+    """Codifica texto alineado a izquierda y completado con espacios hasta `width` bytes."""
+    values = np.asarray(values, dtype=str)
+    if values.shape[0] == 0:
+        return np.empty((0, width), dtype=np.uint8)
+    encoded = np.char.encode(values, codepage, errors='replace').astype(f'S{width}')
+    rows = encoded.shape[0]
+    out = encoded.view(np.uint8).reshape(rows, width).copy()
+    out[out == 0] = 32
+    return out
+
+
+def encode_field(values: np.ndarray, field: DbfField, codepage: str = DBF_CODEPAGE) -> np.ndarray:
+    """Codifica una columna como matriz `uint8` (registros, largo del campo)."""
+    if field.type in ('N', 'F'):
+        return encode_numeric(values, field)
+    if field.type == 'D':
+        return encode_date(values)
+    if field.type == 'L':
+        return encode_character(np.where(np.asarray(values, dtype=bool), 'T', 'F'), field.length)
+    return encode_character(values, field.length, codepage)
+
+
+def write_dbf(target_path: str, specs: Iterable[Tuple[str, str, int, int]], columns: Mapping,
+              codepage: str = DBF_CODEPAGE) -> int:
+    """Escribe un DBF nuevo con la estructura `specs` y las columnas dadas (nombre -> arreglo).
+
+    Los campos sin columna quedan en cero (numéricos) o en blanco. Todo el archivo se
+    arma en memoria y se escribe de una vez.
+    """
+    fields = make_fields(specs)
+    records = encode_records(fields, columns, codepage)
+    _write_dbf_file(target_path, build_header(fields, records.shape[0]), records)
+    return records.shape[0]
+
+
+def encode_records(fields: List[DbfField], columns: Mapping, codepage: str = DBF_CODEPAGE) -> np.ndarray:
+    """Registros (con la marca de borrado en blanco) a partir de columnas nombre -> arreglo.
+
+    Los campos sin columna quedan en cero (numéricos) o en blanco.
+    """
+    rows = 0
+    for column in columns.values():
+        rows = len(column)
+        break
+    records = np.full((rows, 1 + sum(f.length for f in fields)), 32, dtype=np.uint8)
+    for field in fields:
+        values = columns.get(field.name)
+        if values is None:
+            if field.type not in ('N', 'F'):
+                continue
+            values = np.zeros(rows)
+        records[:, field.offset:field.offset + field.length] = encode_field(values, field, codepage)
+    return records
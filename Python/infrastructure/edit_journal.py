@@ -0,0 +1,361 @@
+"""Diario de ediciones de un DBF con deshacer/rehacer (reemplaza la edición en el lugar de las
+opciones 10, 12 y 14 del menú FoxPro: "Editar lance a lance", "Edita lances" y "Edita archivo
+completo").
+
+Las ediciones no tocan el archivo: se guardan como una capa dispersa (fila, campo, anterior,
+nuevo) sobre el original mapeado en memoria, así cada edición cuesta lo que sus celdas y no
+lo que el archivo. Al guardar, la capa se aplica con una sola reescritura
+(`rewrite_dbf_fields`). Cada paso se agrega a `<archivo>.journal` (JSON por línea), que se
+relee al abrir: una sesión interrumpida se recupera con sus ediciones y su historial.
+
+    diario = EditJournal(ruta)
+    diario.edit([3, 4], {'KG_1': [120.0, 80.0]}, "Corrige kilos")
+    diario.undo()
+    diario.redo()
+    diario.save()
+"""
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from infrastructure.dbf_reader import (DBF_CODEPAGE, complete_record_count, decode_field, encode_field,
+                                       read_header, rewrite_dbf_fields)
+from infrastructure.file_hashing import file_signature
+from infrastructure.instrumentation import span
+
+JOURNAL_SUFFIX = '.journal'
+_DELETED_FLAG = ord('*')
+
+
+@dataclass
+class Edit:
+    """Un paso del historial: por campo, las filas editadas con sus valores anterior y nuevo."""
+    description: str
+    cells: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return sum(len(rows) for rows, _, _ in self.cells.values())
+
+
+def journal_path(path: str) -> str:
+    return path + JOURNAL_SUFFIX
+
+
+def _to_json(values: np.ndarray) -> list:
+    if values.dtype.kind == 'M':
+        return [None if np.isnat(v) else str(v) for v in values]
+    return values.tolist()
+
+
+def _from_json(values: list, dbf_field) -> np.ndarray:
+    if dbf_field.type == 'D':
+        return np.array(values, dtype='datetime64[D]')
+    if dbf_field.type in ('N', 'F'):
+        return np.array(values, dtype=np.float64 if dbf_field.decimals else np.int64)
+    if dbf_field.type == 'L':
+        return np.array(values, dtype=bool)
+    return np.array(values, dtype=str)
+
+
+class EditJournal:
+    """Ediciones pendientes de un DBF; las filas se cuentan sin los registros borrados,
+    como en `DbfColumns`."""
+
+    def __init__(self, path: str, codepage: str = DBF_CODEPAGE, recover: bool = True):
+        self.path = path
+        self.codepage = codepage
+        self.journal_path = journal_path(path)
+        self._undo: List[Edit] = []
+        self._redo: List[Edit] = []
+        # Valor actual de cada celda editada: campo -> {fila: valor}
+        self._overlay: Dict[str, Dict[int, Any]] = {}
+        self._open()
+        if os.path.exists(self.journal_path):
+            if recover:
+                self._replay()
+            else:
+                os.remove(self.journal_path)
+
+    # -- archivo original ---------------------------------------------------
+
+    def _open(self) -> None:
+        self.header = read_header(self.path)
+        self.signature = file_signature(self.path)
+        total = complete_record_count(self.path, self.header)
+        self._mapped = np.memmap(self.path, dtype=np.uint8, mode='r', offset=self.header.header_length,
+                                 shape=(total, self.header.record_length)) if total else \
+            np.empty((0, self.header.record_length), dtype=np.uint8)
+        self._live: Optional[np.ndarray] = None
+
+    def _release(self) -> None:
+        # El mapa se suelta antes de reemplazar el archivo (en Windows no se puede con el mapa abierto)
+        self._mapped = None
+        self._live = None
+
+    def _records(self, rows: np.ndarray) -> np.ndarray:
+        if self._live is None:
+            flags = self._mapped[:, 0]
+            self._live = None if not (flags == _DELETED_FLAG).any() else np.flatnonzero(flags != _DELETED_FLAG)
+        return self._mapped[rows if self._live is None else self._live[rows]]
+
+    @property
+    def num_rows(self) -> int:
+        if self._live is None:
+            self._records(np.empty(0, dtype=np.int64))
+        return self._mapped.shape[0] if self._live is None else len(self._live)
+
+    # -- lectura con la capa aplicada ----------------------------------------
+
+    def values(self, name: str, rows) -> np.ndarray:
+        """Valores actuales (original más ediciones) del campo `name` en las filas `rows`."""
+        dbf_field = self.header.field(name)
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and (rows.min() < 0 or rows.max() >= self.num_rows):
+            raise IndexError(f"Filas fuera del archivo ({self.num_rows} registros)")
+        values = decode_field(self._records(rows), dbf_field, self.codepage)
+        overlay = self._overlay.get(dbf_field.name)
+        hits = [(i, overlay[row]) for i, row in enumerate(rows.tolist()) if row in overlay] if overlay else []
+        if hits:
+            values = _widen(values, dbf_field)
+            for i, value in hits:
+                values[i] = value
+        return values
+
+    def column(self, name: str) -> np.ndarray:
+        """Columna completa con las ediciones aplicadas; del mapa sólo se leen los bytes del campo."""
+        dbf_field = self.header.field(name)
+        values = decode_field(self._mapped, dbf_field, self.codepage)
+        if self.num_rows != len(values):
+            values = values[self._live]
+        rows, edited = self.overlay(name)
+        if len(rows):
+            values = _widen(values, dbf_field)
+            values[rows] = edited
+        return values
+
+    def is_edited(self, name: str, row: int) -> bool:
+        return row in self._overlay.get(name.upper(), ())
+
+    def overlay(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(filas, valores) editados del campo, ordenados por fila."""
+        dbf_field = self.header.field(name)
+        celdas = self._overlay.get(dbf_field.name) or {}
+        rows = np.array(sorted(celdas), dtype=np.int64)
+        values = _from_json([], dbf_field) if not len(rows) else np.array([celdas[r] for r in rows.tolist()])
+        return rows, values
+
+    def columns(self) -> Mapping:
+        """Vista por columnas del archivo con las ediciones aplicadas (para procesos y correcciones)."""
+        return _EditedColumns(self)
+
+    @property
+    def edited_cells(self) -> int:
+        return sum(len(celdas) for celdas in self._overlay.values())
+
+    @property
+    def dirty(self) -> bool:
+        return self.edited_cells > 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def history(self) -> List[str]:
+        return [edit.description for edit in self._undo]
+
+    # -- edición -------------------------------------------------------------
+
+    def edit(self, rows, columns: Mapping, description: str = '') -> int:
+        """Asigna `columns` (campo -> valores) en las filas `rows` como un solo paso de deshacer.
+
+        Los valores se normalizan como quedarán en el archivo (ej. redondeo a los decimales
+        del campo) y sólo se registran las celdas que cambian. Si algún valor no entra en su
+        campo no se registra nada. Devuelve la cantidad de celdas editadas.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        edit = Edit(description)
+        for name, new in columns.items():
+            dbf_field = self.header.field(name)
+            new = np.broadcast_to(np.asarray(new), rows.shape)
+            encoded = encode_field(new, dbf_field, self.codepage)
+            if dbf_field.type in ('N', 'F') and (encoded == 42).all(axis=1).any():
+                raise ValueError(f"Valores de {dbf_field.name} que no entran en el campo "
+                                 f"({dbf_field.length},{dbf_field.decimals})")
+            new = decode_field(np.pad(encoded, ((0, 0), (dbf_field.offset, 0)), constant_values=32),
+                               dbf_field, self.codepage)
+            old = self.values(dbf_field.name, rows)
+            changed = (old != new) & ~np.asarray(_isnat(old) & _isnat(new), dtype=bool)
+            if changed.any():
+                edit.cells[dbf_field.name] = (rows[changed], old[changed], new[changed])
+        if not edit.cells:
+            return 0
+        self._apply(edit, forward=True)
+        self._undo.append(edit)
+        self._redo.clear()
+        self._log({'op': 'editar', 'descripcion': description,
+                   'celdas': {name: {'filas': r.tolist(), 'antes': _to_json(o), 'despues': _to_json(n)}
+                              for name, (r, o, n) in edit.cells.items()}})
+        return edit.size
+
+    def undo(self) -> Optional[Edit]:
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        self._apply(edit, forward=False)
+        self._redo.append(edit)
+        self._log({'op': 'deshacer'})
+        return edit
+
+    def redo(self) -> Optional[Edit]:
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        self._apply(edit, forward=True)
+        self._undo.append(edit)
+        self._log({'op': 'rehacer'})
+        return edit
+
+    def _apply(self, edit: Edit, forward: bool) -> None:
+        for name, (rows, old, new) in edit.cells.items():
+            celdas = self._overlay.setdefault(name, {})
+            for row, value in zip(rows.tolist(), (new if forward else old)):
+                celdas[row] = value
+        self._drop_unchanged(edit)
+
+    def _drop_unchanged(self, edit: Edit) -> None:
+        """Quita de la capa las celdas que volvieron a su valor original."""
+        for name, (rows, _, _) in edit.cells.items():
+            celdas = self._overlay[name]
+            dbf_field = self.header.field(name)
+            original = decode_field(self._records(rows), dbf_field, self.codepage)
+            for row, value in zip(rows.tolist(), original):
+                actual = celdas.get(row)
+                if actual == value or (_isnat(actual) and _isnat(value)):
+                    del celdas[row]
+            if not celdas:
+                del self._overlay[name]
+
+    # -- diario en disco -------------------------------------------------------
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        nuevo = not os.path.exists(self.journal_path)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            if nuevo:
+                f.write(json.dumps({'archivo': os.path.basename(self.path), 'firma': list(self.signature)}) + '\n')
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _replay(self) -> None:
+        with open(self.journal_path, encoding='utf-8') as f:
+            lines = f.readlines()
+        if not lines:
+            return
+        inicio = json.loads(lines[0])
+        if tuple(inicio.get('firma') or ()) != tuple(self.signature):
+            raise ValueError(f"El diario {os.path.basename(self.journal_path)} no corresponde a la versión actual "
+                             f"de {os.path.basename(self.path)}")
+        with span('diario.recuperar', archivo=os.path.basename(self.path), pasos=len(lines) - 1):
+            for numero, line in enumerate(lines[1:], start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea a medio escribir: se descarta para que lo que siga quede legible
+                    with open(self.journal_path, 'w', encoding='utf-8') as f:
+                        f.writelines(lines[:numero])
+                    break
+                if entry['op'] == 'editar':
+                    edit = Edit(entry.get('descripcion', ''))
+                    for name, celdas in entry['celdas'].items():
+                        dbf_field = self.header.field(name)
+                        edit.cells[dbf_field.name] = (np.array(celdas['filas'], dtype=np.int64),
+                                                      _from_json(celdas['antes'], dbf_field),
+                                                      _from_json(celdas['despues'], dbf_field))
+                    self._apply(edit, forward=True)
+                    self._undo.append(edit)
+                    self._redo.clear()
+                elif entry['op'] == 'deshacer' and self._undo:
+                    edit = self._undo.pop()
+                    self._apply(edit, forward=False)
+                    self._redo.append(edit)
+                elif entry['op'] == 'rehacer' and self._redo:
+                    edit = self._redo.pop()
+                    self._apply(edit, forward=True)
+                    self._undo.append(edit)
+
+    # -- guardar / descartar ----------------------------------------------------
+
+    def save(self) -> int:
+        """Aplica las ediciones al archivo con una sola reescritura y vacía el diario.
+
+        Falla si el archivo cambió desde que se abrió. Devuelve las celdas escritas.
+        """
+        if not self.dirty:
+            self.discard()
+            return 0
+        if file_signature(self.path) != self.signature:
+            raise ValueError(f"{os.path.basename(self.path)} cambió desde que se empezó a editar")
+        rows = np.unique(np.concatenate([np.fromiter(celdas, dtype=np.int64, count=len(celdas))
+                                         for celdas in self._overlay.values()]))
+        columns = {name: self.values(name, rows) for name in self._overlay}
+        with span('diario.guardar', archivo=os.path.basename(self.path), celdas=self.edited_cells):
+            self._release()
+            try:
+                modified = rewrite_dbf_fields(self.path, rows, columns, self.codepage)
+            finally:
+                self._open()
+        self.discard()
+        return modified
+
+    def discard(self) -> None:
+        """Descarta las ediciones pendientes y el historial."""
+        self._overlay.clear()
+        self._undo.clear()
+        self._redo.clear()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def close(self) -> None:
+        """Suelta el archivo; el diario queda en disco para retomar la sesión."""
+        self._release()
+
+
+def _isnat(value) -> Any:
+    if isinstance(value, (np.ndarray, np.datetime64)) and np.asarray(value).dtype.kind == 'M':
+        return np.isnat(value)
+    return False
+
+
+def _widen(values: np.ndarray, dbf_field) -> np.ndarray:
+    """Copia de la columna donde entra cualquier texto del campo (la decodificada es tan ancha
+    como su valor más largo)."""
+    return values.astype(f'<U{dbf_field.length}') if values.dtype.kind == 'U' else values.copy()
+
+
+class _EditedColumns(Mapping):
+    """Columnas completas del archivo con la capa de ediciones aplicada."""
+
+    def __init__(self, journal: EditJournal):
+        self.journal = journal
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.journal.column(name)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.upper() in self.journal.header.field_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.journal.header.field_names)
+
+    def __len__(self) -> int:
+        return len(self.journal.header.fields)
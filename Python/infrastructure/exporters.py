@@ -0,0 +1,276 @@
+"""Exportación de resultados de procesos (tablas de columnas) a CSV, TXT, GIS y XLSX.
+
+Las tablas se recorren en bloques de `BATCH_ROWS` filas: cada bloque se formatea por
+columnas y se escribe de una vez, sin armar el archivo completo en memoria.
+
+Formatos:
+- `csv`: UTF-8, separador ',' y fechas ISO.
+- `txt`: el formato de los informes del sistema viejo (`SET ALTERNATE TO`): cp1252,
+  ' ; ' entre celdas, ',' decimal y fechas dd/mm/aaaa.
+- `gis`: como `txt` pero con ' , ' y '.' decimal (los *_GIS.TXT para SIG).
+- `xlsx`: planilla de Excel escrita directamente como XML dentro del ZIP, sin
+  dependencias externas.
+"""
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from domain.columnar import Table, table_length
+
+BATCH_ROWS = 20_000
+LEGACY_ENCODING = 'cp1252'
+EXPORT_FORMATS = ('csv', 'txt', 'gis', 'xlsx')
+FORMAT_SUFFIXES = {'csv': '.csv', 'txt': '.TXT', 'gis': '_GIS.TXT', 'xlsx': '.xlsx'}
+# Decimales de los informes de texto (el resto de las columnas reales usa 2, como obspro.PRG)
+DEFAULT_DECIMALS = {'latitud': 4, 'longitud': 4, 'factor': 4}
+# Primer día de las fechas seriales de Excel
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'D')
+
+
+@dataclass
+class ExportRequest:
+    """Una tabla a exportar en un formato."""
+    path: str
+    table: Table
+    formato: str = 'csv'
+    columnas: Optional[Sequence[str]] = None
+    decimales: Mapping[str, int] = field(default_factory=dict)
+    hoja: str = 'Datos'
+
+
+@dataclass
+class ExportResult:
+    path: str
+    formato: str
+    filas: int
+    segundos: float
+
+
+def export_path(directory: str, name: str, formato: str) -> str:
+    """Ruta de salida de una tabla: el nombre sin caracteres raros más el sufijo del formato."""
+    safe = ''.join(c if c.isalnum() else '_' for c in name).strip('_')
+    return os.path.join(directory, safe + FORMAT_SUFFIXES[formato])
+
+
+def _batches(table: Table, columns: Sequence[str], batch_rows: int) -> Iterator[List[np.ndarray]]:
+    n = table_length(table)
+    for start in range(0, n, batch_rows):
+        yield [np.asarray(table[c])[start:start + batch_rows] for c in columns]
+
+
+def _iso_dates(values: np.ndarray) -> np.ndarray:
+    text = np.datetime_as_string(values.astype('datetime64[D]'))
+    return np.where(np.isnat(values), '', text)
+
+
+def _by_distinct(values: np.ndarray, fmt: Callable[[np.ndarray], List[str]]) -> List[str]:
+    """Formatea una vez cada valor distinto (fechas, buques, especies: hay pocos) y los reparte."""
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array(fmt(unique), dtype=object)[inverse.reshape(-1)].tolist()
+
+
+def _legacy_dates(values: np.ndarray) -> List[str]:
+    """Fechas dd/mm/aaaa."""
+    return _by_distinct(values.astype('datetime64[D]'), lambda unique: [
+        f"{s[8:10]}/{s[5:7]}/{s[:4]}" if s else '' for s in _iso_dates(unique).tolist()])
+
+
+def _csv_quote(text: str) -> str:
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _format_csv(values: np.ndarray) -> List[str]:
+    """Celdas CSV de una columna (mismo resultado que `csv.writer`, sin pasar celda por celda)."""
+    kind = values.dtype.kind
+    if kind == 'M':
+        return _by_distinct(values.astype('datetime64[D]'), lambda unique: _iso_dates(unique).tolist())
+    if kind == 'f':
+        return [t if t != 'nan' else '' for t in map(repr, values.tolist())]
+    if kind in 'iub':
+        return list(map(str, values.tolist()))
+    return _by_distinct(values, lambda unique: [_csv_quote(str(v)) for v in unique.tolist()])
+
+
+def _format_text(values: np.ndarray, decimals: int, decimal_mark: str, width: int = 0) -> List[str]:
+    kind = values.dtype.kind
+    if kind == 'f':
+        text = map(f'{{:.{decimals}f}}'.format, values.tolist())
+        if decimal_mark != '.':
+            text = (t.replace('.', decimal_mark) for t in text)
+        return [t if t != 'nan' else '' for t in text]
+    if kind == 'M':
+        return _legacy_dates(values)
+    if kind in 'iub':
+        return list(map(str, values.tolist()))
+    # Un separador (';' o ',') dentro de un texto correría las columnas del informe
+    return _by_distinct(values, lambda unique: [str(v).replace(';', ' ').replace(',', ' ').ljust(width)
+                                                for v in unique.tolist()])
+
+
+def _text_width(values: np.ndarray) -> int:
+    """Ancho de una columna de texto (para alinear como los informes viejos)."""
+    if values.dtype.kind == 'U' and len(values):
+        return int(np.char.str_len(values).max())
+    return 0
+
+
+def _write_csv(request: ExportRequest, columns: Sequence[str], batch_rows: int) -> None:
+    with open(request.path, 'w', newline='', encoding='utf-8') as f:
+        f.write(','.join(_csv_quote(c) for c in columns) + '\r\n')
+        for batch in _batches(request.table, columns, batch_rows):
+            f.write('\r\n'.join(map(','.join, zip(*(_format_csv(values) for values in batch)))) + '\r\n')
+
+
+def _write_legacy_text(request: ExportRequest, columns: Sequence[str], batch_rows: int) -> None:
+    separator, decimal_mark = (';', ',') if request.formato == 'txt' else (',', '.')
+    widths = [_text_width(np.asarray(request.table[c])) for c in columns]
+    decimals = [request.decimales.get(c, DEFAULT_DECIMALS.get(c, 2)) for c in columns]
+    with open(request.path, 'w', encoding=LEGACY_ENCODING, errors='replace') as f:
+        # Como los informes del sistema viejo: una línea en blanco y los títulos
+        joiner = f' {separator} '
+        f.write('\n' + joiner.join(c.ljust(w) for c, w in zip(columns, widths)) + '\n')
+        for batch in _batches(request.table, columns, batch_rows):
+            cells = [_format_text(values, d, decimal_mark, w)
+                     for values, d, w in zip(batch, decimals, widths)]
+            f.write('\n'.join(map(joiner.join, zip(*cells))) + '\n')
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>')
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>')
+# Estilo 1: fecha dd/mm/aaaa (formato numérico 14 de Excel)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '</styleSheet>')
+
+
+def _xlsx_workbook(sheet_name: str) -> str:
+    # Excel no admite estos caracteres ni más de 31 en el nombre de una hoja
+    sheet_name = ''.join('_' if c in '[]:*?/\\' else c for c in sheet_name)[:31] or 'Datos'
+    sheet_name = escape(sheet_name, {'"': '&quot;'})
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+
+
+def _xlsx_cells(values: np.ndarray) -> List[str]:
+    """Celdas XML de una columna: números y fechas como valores, el resto como texto."""
+    kind = values.dtype.kind
+    if kind in 'iu':
+        return list(map('<c><v>{}</v></c>'.format, values.tolist()))
+    if kind == 'f':
+        return ['<c/>' if v != v else f'<c><v>{v!r}</v></c>' for v in values.tolist()]
+    if kind == 'M':
+        return _by_distinct(values.astype('datetime64[D]'), lambda unique: [
+            '<c/>' if nat else f'<c s="1"><v>{serial}</v></c>'
+            for serial, nat in zip((unique - _EXCEL_EPOCH).astype(np.int64).tolist(), np.isnat(unique).tolist())])
+    return _by_distinct(values, lambda unique: [f'<c t="inlineStr"><is><t>{escape(str(v).strip())}</t></is></c>'
+                                                for v in unique.tolist()])
+
+
+def _write_xlsx(request: ExportRequest, columns: Sequence[str], batch_rows: int) -> None:
+    with zipfile.ZipFile(request.path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        zf.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        zf.writestr('xl/workbook.xml', _xlsx_workbook(request.hoja))
+        zf.writestr('xl/styles.xml', _XLSX_STYLES)
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as raw:
+            write = raw.write
+            write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                  b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                  b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+                  b'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews><sheetData>')
+            header = ''.join(f'<c t="inlineStr" s="2"><is><t>{escape(c)}</t></is></c>' for c in columns)
+            write(f'<row>{header}</row>'.encode('utf-8'))
+            for batch in _batches(request.table, columns, batch_rows):
+                cells = [_xlsx_cells(values) for values in batch]
+                write(('<row>' + '</row><row>'.join(map(''.join, zip(*cells))) + '</row>').encode('utf-8'))
+            write(b'</sheetData></worksheet>')
+
+
+_WRITERS: Dict[str, Callable[[ExportRequest, Sequence[str], int], None]] = {
+    'csv': _write_csv,
+    'txt': _write_legacy_text,
+    'gis': _write_legacy_text,
+    'xlsx': _write_xlsx,
+}
+
+
+def export_table(request: ExportRequest, batch_rows: int = BATCH_ROWS) -> ExportResult:
+    """Escribe una tabla en el formato pedido, de a `batch_rows` filas."""
+    if request.formato not in _WRITERS:
+        raise ValueError(f"Formato de exportación desconocido: {request.formato}")
+    columns = list(request.columnas or request.table)
+    missing = [c for c in columns if c not in request.table]
+    if missing:
+        raise KeyError(f"Columnas inexistentes: {', '.join(missing)}")
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(request.path)), exist_ok=True)
+    _WRITERS[request.formato](request, columns, batch_rows)
+    return ExportResult(request.path, request.formato, table_length(request.table),
+                        time.perf_counter() - start)
+
+
+def export_tables(requests: Iterable[ExportRequest], max_workers: Optional[int] = None,
+                  batch_rows: int = BATCH_ROWS, processes: bool = False) -> List[ExportResult]:
+    """Exporta varias tablas/formatos en paralelo sobre un pool de escritura, un archivo por tarea.
+
+    Con hilos (por defecto) se solapan la escritura a disco y la compresión del XLSX, que
+    liberan el GIL; con `processes` también el formateo, a costa de copiar cada tabla al
+    proceso que la escribe (conviene en lotes grandes y con varios núcleos). Si un archivo
+    falla se termina el resto y se relanza el primer error.
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+    workers = max_workers or min(len(requests), os.cpu_count() or 1)
+    if processes and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='exportar')
+    with pool:
+        futures = [pool.submit(export_table, request, batch_rows) for request in requests]
+    return [future.result() for future in futures]
@@ -0,0 +1,238 @@
+"""Factores de la temporada: acumulados anuales de CPUE y densidad que se actualizan por marea,
+y escritura del resultado con la estructura de FACTORES.DBF.
+
+Cada marea aporta sus sumas por año y mes (horas, área barrida, lances y kilos por
+especie, ver `domain.factores.aportes_factores`). Al llegar una marea nueva se suman sus
+aportes a los totales guardados; si la marea ya estaba, primero se restan los que tenía.
+Así el año se mantiene al día sin volver a leer las demás mareas.
+"""
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from domain.columnar import Table, table_length
+from domain.factores import cpue, densidad
+from infrastructure.dbf_reader import write_dbf
+from infrastructure.marea_files import marea_file_stem
+from infrastructure.marea_layouts import FACTORES_LAYOUT
+
+# Archivo con los acumulados, en la carpeta de salida de la temporada
+FACTORES_FILE = 'factores_temporada.json'
+
+_ESFUERZO = ('horas', 'area_barr', 'lances')
+_CAPTURA = ('kg', 'kg_area')
+
+
+def factores_path(output_dir: str, num_marea: str, anio_marea: str) -> str:
+    """Archivo FACTORES de una marea, p. ej. factores11825.dbf."""
+    return os.path.join(output_dir, marea_file_stem('factores', num_marea, anio_marea) + '.dbf')
+
+
+def _rows(table: Table, keys: Tuple[str, ...], values: Tuple[str, ...]) -> list:
+    if not table or not table_length(table):
+        return []
+    columns = [np.asarray(table[name]).tolist() for name in keys + values]
+    return [list(row) for row in zip(*columns)]
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == 'nt':
+        # En Windows os.kill termina el proceso: no se puede sondear así, vale sólo la antigüedad
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Existe, pero es de otro usuario
+    return True
+
+
+def _lock_is_stale(lock_path: str, max_age: float) -> bool:
+    """True si el .lock quedó de un proceso que terminó sin borrarlo (o es más viejo que `max_age`)."""
+    try:
+        with open(lock_path, encoding='utf-8') as f:
+            contenido = f.read().split()
+        age = time.time() - os.path.getmtime(lock_path)
+    except OSError:
+        return False  # Ya lo liberaron
+    if age > max_age:
+        return True
+    if len(contenido) >= 2 and contenido[1] == socket.gethostname() and contenido[0].isdigit():
+        return not _pid_alive(int(contenido[0]))
+    return False
+
+
+class FactoresTemporada:
+    """Totales por año y mes de todas las mareas cargadas, guardados en un JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._load()
+
+    def _load(self) -> None:
+        """Lee aportes y totales; si faltan los totales se rearman sumando los aportes."""
+        self._esfuerzo: Dict[Tuple[int, int], np.ndarray] = {}
+        self._captura: Dict[Tuple[int, int, int], np.ndarray] = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._mareas: Dict[str, Dict[str, list]] = data['mareas']
+        except (OSError, ValueError, KeyError, TypeError):
+            data, self._mareas = {}, {}
+        if 'esfuerzo' in data and 'captura' in data:
+            self._esfuerzo = {(int(r[0]), int(r[1])): np.asarray(r[2:], dtype=float) for r in data['esfuerzo']}
+            self._captura = {(int(r[0]), int(r[1]), int(r[2])): np.asarray(r[3:], dtype=float)
+                             for r in data['captura']}
+        else:
+            for aporte in self._mareas.values():
+                self._sumar(aporte, 1)
+
+    @contextmanager
+    def _locked(self, timeout: float = 30.0):
+        """Bloqueo entre procesos (el lote procesa varias mareas a la vez) con un archivo .lock.
+
+        El .lock guarda el PID y el equipo del dueño: si ese proceso ya no existe, o el
+        archivo es más viejo que `timeout`, se considera abandonado y se rompe.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        lock_path = self.path + '.lock'
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, f"{os.getpid()} {socket.gethostname()}".encode('utf-8'))
+                break
+            except FileExistsError:
+                if _lock_is_stale(lock_path, timeout):
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass  # Otro proceso lo rompió primero
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"No se pudo bloquear {self.path}")
+                time.sleep(0.01)
+        try:
+            # Otro proceso pudo haber sumado su marea desde la última lectura
+            self._load()
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    @staticmethod
+    def marea_key(num_marea: str, anio_marea: str) -> str:
+        return f"{int(num_marea)}/{anio_marea}"
+
+    def mareas(self) -> list:
+        return sorted(self._mareas)
+
+    def _sumar(self, aporte: Dict[str, list], signo: int) -> None:
+        for row in aporte['esfuerzo']:
+            key = (int(row[0]), int(row[1]))
+            total = self._esfuerzo.get(key, np.zeros(len(_ESFUERZO))) + signo * np.asarray(row[2:], dtype=float)
+            self._esfuerzo[key] = total
+            if total[2] <= 0:
+                del self._esfuerzo[key]
+        for row in aporte['captura']:
+            key = (int(row[0]), int(row[1]), int(row[2]))
+            total = self._captura.get(key, np.zeros(len(_CAPTURA))) + signo * np.asarray(row[3:], dtype=float)
+            self._captura[key] = total
+            if signo < 0 and np.allclose(total, 0, atol=1e-6):
+                del self._captura[key]
+
+    def actualizar(self, num_marea: str, anio_marea: str, aportes: Dict[str, Table]) -> bool:
+        """Suma los aportes de una marea (reemplazando los anteriores); False si no cambiaron."""
+        aporte = {'esfuerzo': _rows(aportes.get('esfuerzo'), ('anio', 'mes'), _ESFUERZO),
+                  'captura': _rows(aportes.get('captura'), ('anio', 'mes', 'especie'), _CAPTURA)}
+        key = self.marea_key(num_marea, anio_marea)
+        with self._locked():
+            previo = self._mareas.get(key)
+            if previo == aporte:
+                return False
+            if previo is not None:
+                self._sumar(previo, -1)
+            self._sumar(aporte, 1)
+            self._mareas[key] = aporte
+            self._save()
+        return True
+
+    def quitar(self, num_marea: str, anio_marea: str) -> None:
+        with self._locked():
+            previo = self._mareas.pop(self.marea_key(num_marea, anio_marea), None)
+            if previo is not None:
+                self._sumar(previo, -1)
+                self._save()
+
+    def _save(self) -> None:
+        data = {
+            'mareas': self._mareas,
+            'esfuerzo': [list(key) + total.tolist() for key, total in sorted(self._esfuerzo.items())],
+            'captura': [list(key) + total.tolist() for key, total in sorted(self._captura.items())],
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def anuales(self, anios: Iterable[int], especies: Iterable[int]) -> Table:
+        """CPUE, densidad y lances del año de toda la temporada para cada (año, especie) dado."""
+        anios = np.asarray(list(anios), dtype=np.int64)
+        especies = np.asarray(list(especies), dtype=np.int64)
+        esfuerzo_anual: Dict[int, np.ndarray] = {}
+        for (anio, _), total in self._esfuerzo.items():
+            esfuerzo_anual[anio] = esfuerzo_anual.get(anio, 0) + total
+        captura_anual: Dict[Tuple[int, int], np.ndarray] = {}
+        for (anio, _, especie), total in self._captura.items():
+            captura_anual[(anio, especie)] = captura_anual.get((anio, especie), 0) + total
+
+        sin_datos = np.zeros(len(_ESFUERZO))
+        esfuerzo = np.array([esfuerzo_anual.get(a, sin_datos) for a in anios.tolist()]).reshape(-1, 3)
+        captura = np.array([captura_anual.get(k, np.zeros(len(_CAPTURA)))
+                            for k in zip(anios.tolist(), especies.tolist())]).reshape(-1, 2)
+        return {
+            'cap_anu': cpue(captura[:, 0], esfuerzo[:, 0]),
+            'den_anu': densidad(captura[:, 1], esfuerzo[:, 1]),
+            'slma': np.rint(esfuerzo[:, 2]).astype(np.int64),
+        }
+
+
+def con_factores_anuales(tabla: Table, temporada: FactoresTemporada) -> Table:
+    """Reemplaza los indicadores anuales de la marea por los de toda la temporada."""
+    if not tabla:
+        return tabla
+    anios = np.asarray(tabla['fecha'], dtype='datetime64[Y]').astype(np.int64) + 1970
+    return dict(tabla, **temporada.anuales(anios, tabla['especie']))
+
+
+def write_factores(path: str, tabla: Table, num_marea: str) -> int:
+    """Escribe la tabla del proceso "Factores CPUE" con la estructura de FACTORES.DBF."""
+    n = table_length(tabla)
+    columns = {
+        'BARCO': tabla['barco'], 'MAREA': np.full(n, int(num_marea)), 'LANCE': tabla['lance'],
+        'MES': tabla['mes'], 'FECHA': tabla['fecha'], 'AREA': tabla['area'], 'ESPECIE': tabla['nombre'],
+        'COD_ESPEC': tabla['especie'], 'PESO_MUES': tabla['peso_mues'], 'CAP_BAR': tabla['kg'],
+        'CAP_CE': tabla['cap_ce'], 'DEN_CE': tabla['den_ce'], 'CAP_MEN': tabla['cap_men'],
+        'DEN_M': tabla['den_m'], 'CAP_ANU': tabla['cap_anu'], 'DEN_ANU': tabla['den_anu'],
+        'AREA_BARR': tabla['area_barr'], 'SLME': tabla['slme'], 'SLMA': tabla['slma'],
+    } if n else {}
+    return write_dbf(path, FACTORES_LAYOUT, columns)
+
+
+def save_factores(output_dir: str, num_marea: str, anio_marea: str, tabla: Table,
+                  aportes: Dict[str, Table], temporada: Optional[FactoresTemporada] = None) -> Table:
+    """Actualiza los acumulados de la temporada con la marea y escribe su archivo FACTORES.
+
+    Devuelve la tabla con los indicadores anuales de la temporada.
+    """
+    temporada = temporada or FactoresTemporada(os.path.join(output_dir, FACTORES_FILE))
+    temporada.actualizar(num_marea, anio_marea, aportes)
+    tabla = con_factores_anuales(tabla, temporada)
+    write_factores(factores_path(output_dir, num_marea, anio_marea), tabla, num_marea)
+    return tabla
@@ -0,0 +1,40 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+
+# Tamaño de bloque para calcular el hash sin cargar el archivo completo en memoria
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Hash ya calculado por ruta, válido mientras no cambie su firma (mtime, tamaño)
+_digest_memo: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_digest_memo_lock = threading.Lock()
+
+
+def file_digest(path: str, algorithm: str = 'sha1') -> str:
+    """Hash hexadecimal del contenido de un archivo, leído por bloques."""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """(mtime en nanosegundos, tamaño) para detectar cambios sin leer el archivo."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cached_file_digest(path: str) -> str:
+    """Como `file_digest`, pero sin releer archivos cuya firma no cambió desde el último cálculo."""
+    path = os.path.abspath(path)
+    signature = file_signature(path)
+    with _digest_memo_lock:
+        memo = _digest_memo.get(path)
+    if memo and memo[0] == signature:
+        return memo[1]
+    digest = file_digest(path)
+    with _digest_memo_lock:
+        _digest_memo[path] = (signature, digest)
+    return digest
@@ -0,0 +1,169 @@
+"""Importación de planillas de Excel de los observadores a los archivos C y M de una marea.
+
+Cada hoja se recorre por filas (`infrastructure.planillas`) y se procesa en bloques
+de `BLOQUE_FILAS`: los valores se convierten y validan por columna
+(`domain.planilla_marea`), se codifican como registros DBF y se agregan al archivo con
+un `DbfRecordWriter`. Si alguna fila no pasa la validación no se escribe ningún archivo
+y se devuelven todos los errores juntos.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from domain.columnar import table_length
+from domain.jobs import JobContext
+from domain.planilla_marea import (COLUMNAS_TALLAS, ErrorPlanilla, agrupar_tallas, completar_captura,
+                                   convertir_bloque, mapear_encabezado, tipo_planilla)
+from infrastructure.dbf_reader import DbfRecordWriter, build_header, encode_records, make_fields
+from infrastructure.instrumentation import span
+from infrastructure.marea_files import find_marea_files, marea_file_stem
+from infrastructure.marea_layouts import CAPTURA_LAYOUT, CAPTURA_SLOTS, MUESTRA_LAYOUT, MUESTRA_TALLAS
+from infrastructure.planillas import iter_rows, sheet_names
+
+# Filas de planilla por bloque de conversión y escritura
+BLOQUE_FILAS = 5_000
+# Filas en las que se busca el encabezado (las planillas suelen tener un título arriba)
+FILAS_ENCABEZADO = 20
+
+_LAYOUTS = {'captura': CAPTURA_LAYOUT, 'muestra': MUESTRA_LAYOUT}
+_PREFIJOS = {'captura': 'c', 'muestra': 'm'}
+
+
+@dataclass
+class ImportResult:
+    """Archivos escritos y registros por tipo de tabla, o los errores si no se escribió nada."""
+    archivos: Dict[str, str] = field(default_factory=dict)
+    registros: Dict[str, int] = field(default_factory=dict)
+    errores: List[ErrorPlanilla] = field(default_factory=list)
+    hojas_omitidas: List[str] = field(default_factory=list)
+
+
+def _destino(data_dir: str, kind: str, num_marea: str, anio_marea: str, reemplazar: bool) -> str:
+    existente = find_marea_files(data_dir, num_marea, anio_marea).get(kind)
+    if existente and not reemplazar:
+        raise FileExistsError(f"La marea {num_marea}/{anio_marea} ya tiene {os.path.basename(existente)}")
+    return existente or os.path.join(data_dir, marea_file_stem(_PREFIJOS[kind], num_marea, anio_marea).upper() + '.DBF')
+
+
+class _Hoja:
+    """Encabezado reconocido de una hoja y sus filas pendientes de convertir."""
+
+    def __init__(self, nombre: str, kind: str, mapa: Dict[int, str]):
+        self.nombre = nombre
+        self.kind = kind
+        self.mapa = mapa
+        self.crudo: Dict[str, list] = {name: [] for name in mapa.values()}
+        self.filas: List[int] = []
+
+    def agregar(self, numero: int, valores: list) -> None:
+        celdas = [valores[col] if col < len(valores) else None for col in self.mapa]
+        if all(v is None or (isinstance(v, str) and not v.strip()) for v in celdas):
+            return
+        for name, valor in zip(self.mapa.values(), celdas):
+            self.crudo[name].append(valor)
+        self.filas.append(numero + 1)
+
+    def tomar(self):
+        crudo, filas = self.crudo, np.array(self.filas, dtype=np.int64)
+        self.crudo = {name: [] for name in self.mapa.values()}
+        self.filas = []
+        return crudo, filas
+
+
+def _buscar_encabezado(nombre: str, filas) -> Optional[_Hoja]:
+    """Primera fila cuyos encabezados identifican una planilla de captura o de muestras."""
+    todos = {name for layout in _LAYOUTS.values() for name, *_ in layout} | set(COLUMNAS_TALLAS)
+    for _, valores in filas:
+        kind = tipo_planilla(mapear_encabezado(valores, todos).values())
+        if kind:
+            campos = [name for name, *_ in _LAYOUTS[kind]]
+            if kind == 'muestra':
+                campos += list(COLUMNAS_TALLAS)
+            return _Hoja(nombre, kind, mapear_encabezado(valores, campos))
+    return None
+
+
+def import_planillas(context: JobContext, paths: Iterable[str], data_dir: str, num_marea: str,
+                     anio_marea: str, reemplazar: bool = False) -> ImportResult:
+    """Importa las hojas de captura y de muestras de las planillas a c/m<marea><año>.dbf.
+
+    Las hojas sin un encabezado reconocible (resúmenes, gráficos) se omiten. Sin
+    `reemplazar`, falla si la marea ya tiene el archivo que se va a escribir.
+    """
+    result = ImportResult()
+    writers: Dict[str, DbfRecordWriter] = {}
+    campos = {kind: make_fields(layout) for kind, layout in _LAYOUTS.items()}
+    marea = float(num_marea)
+
+    def escribir(kind: str, tabla: dict) -> None:
+        if not table_length(tabla):
+            return
+        if kind not in writers:
+            destino = _destino(data_dir, kind, num_marea, anio_marea, reemplazar)
+            writers[kind] = DbfRecordWriter(destino, build_header(campos[kind], 0))
+            result.archivos[kind] = destino
+        if kind == 'captura':
+            tabla = completar_captura(tabla, CAPTURA_SLOTS)
+        marea_hoja = tabla.get('MAREA', np.zeros(table_length(tabla)))
+        tabla['MAREA'] = np.where(marea_hoja == 0, marea, marea_hoja)
+        writers[kind].append(encode_records(campos[kind], tabla))
+
+    def convertir(hoja: _Hoja):
+        crudo, filas = hoja.tomar()
+        tabla, errores = convertir_bloque(crudo, _LAYOUTS[hoja.kind], hoja.nombre, filas)
+        if 'MAREA' in tabla:
+            otra = (tabla['MAREA'] != 0) & (tabla['MAREA'] != marea)
+            errores += [ErrorPlanilla(hoja.nombre, int(f), 'MAREA', f"no es la marea {num_marea}")
+                        for f in filas[otra]]
+        result.errores.extend(errores)
+        return tabla, filas
+
+    try:
+        with span('planillas.importar', marea=f"{num_marea}/{anio_marea}"):
+            for path in paths:
+                for nombre in sheet_names(path):
+                    context.check_cancelled()
+                    filas = iter_rows(path, nombre)
+                    etiqueta = f"{os.path.basename(path)}:{nombre}"
+                    primeras = (fila for _, fila in zip(range(FILAS_ENCABEZADO), filas))
+                    encabezado = _buscar_encabezado(etiqueta, primeras)
+                    if encabezado is None:
+                        result.hojas_omitidas.append(etiqueta)
+                        continue
+                    agrupar = encabezado.kind == 'muestra' and 'TALLA' in encabezado.crudo
+                    bloques, ubicaciones = [], []
+                    for numero, valores in filas:
+                        encabezado.agregar(numero, valores)
+                        if len(encabezado.filas) < BLOQUE_FILAS:
+                            continue
+                        context.check_cancelled()
+                        tabla, filas_bloque = convertir(encabezado)
+                        if agrupar:
+                            bloques.append(tabla)
+                            ubicaciones.extend((etiqueta, int(f)) for f in filas_bloque)
+                        elif not result.errores:
+                            escribir(encabezado.kind, tabla)
+                    tabla, filas_bloque = convertir(encabezado)
+                    if agrupar:
+                        # Las tallas de una muestra pueden estar en cualquier parte de la hoja
+                        bloques.append(tabla)
+                        ubicaciones.extend((etiqueta, int(f)) for f in filas_bloque)
+                        tabla = {name: np.concatenate([b[name] for b in bloques]) for name in bloques[0]}
+                        tabla, errores = agrupar_tallas(tabla, ubicaciones, MUESTRA_TALLAS)
+                        result.errores.extend(errores)
+                    if not result.errores:
+                        escribir(encabezado.kind, tabla)
+        if result.errores:
+            for writer in writers.values():
+                writer.abort()
+            result.archivos = {}
+            return result
+        for kind, writer in writers.items():
+            result.registros[kind] = writer.close()
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    return result
@@ -0,0 +1,202 @@
+"""Instrumentación liviana: tramos de tiempo con nombre, contadores y perfiles cProfile.
+
+Desactivada (el valor por defecto) cada llamada se reduce a una comparación: `span()`
+devuelve un objeto nulo compartido y `count()` retorna de inmediato. Activada, los
+tramos se guardan en memoria para el diálogo de diagnóstico y, si se configuró una
+ruta, en un log JSON-lines rotativo.
+
+    with span('catalogos.especies', archivo=path):
+        ...
+    count('dbf.registros_leidos', n)
+"""
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Variable de entorno que activa la instrumentación al iniciar (1/true/si)
+ENV_ENABLED = 'CONTROL_MAREAS_DIAGNOSTICO'
+_LOGGER_NAME = 'control_mareas.diagnostico'
+_MAX_RECENT_SPANS = 1000
+
+
+class _NullSpan:
+    """Tramo que no mide nada (instrumentación desactivada)."""
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Tramo de tiempo con nombre y atributos; se registra al salir del bloque `with`."""
+    __slots__ = ('_owner', 'name', 'attrs', 'start', 'duration_ms')
+
+    def __init__(self, owner: 'Instrumentation', name: str, attrs: Dict[str, Any]):
+        self._owner = owner
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration_ms = 0.0
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self._owner._record(self)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Agrega atributos conocidos recién dentro del bloque (ej. registros leídos)."""
+        self.attrs.update(attrs)
+
+
+class Instrumentation:
+    """Registro de tramos y contadores de la aplicación (seguro entre hilos)."""
+
+    def __init__(self):
+        self.enabled = os.environ.get(ENV_ENABLED, '').lower() in ('1', 'true', 'si', 'sí')
+        self.profiling = False
+        self.profile_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=_MAX_RECENT_SPANS)
+        self._counters: Dict[str, int] = {}
+        self._logger = logging.getLogger(_LOGGER_NAME)
+        self._logger.propagate = False
+        self._handler: Optional[logging.Handler] = None
+
+    def configure(self, enabled: Optional[bool] = None, log_path: Optional[str] = None,
+                  max_bytes: int = 1024 * 1024, backup_count: int = 3,
+                  profiling: Optional[bool] = None, profile_dir: Optional[str] = None) -> None:
+        """Activa/desactiva la instrumentación y define el log rotativo y la carpeta de perfiles."""
+        if enabled is not None:
+            self.enabled = enabled
+        if profiling is not None:
+            self.profiling = profiling
+        if profile_dir is not None:
+            self.profile_dir = profile_dir
+        if log_path is not None:
+            if self._handler is not None:
+                self._logger.removeHandler(self._handler)
+                self._handler.close()
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            self._handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count,
+                                                encoding='utf-8', delay=True)
+            self._handler.setFormatter(logging.Formatter('%(message)s'))
+            self._logger.addHandler(self._handler)
+            self._logger.setLevel(logging.INFO)
+
+    @property
+    def log_path(self) -> Optional[str]:
+        return self._handler.baseFilename if self._handler is not None else None
+
+    def span(self, name: str, **attrs: Any):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + int(value)
+
+    def _record(self, span: Span) -> None:
+        entry = {
+            'hora': datetime.now().isoformat(timespec='milliseconds'),
+            'tramo': span.name,
+            'ms': round(span.duration_ms, 3),
+            'hilo': threading.current_thread().name,
+        }
+        if span.attrs:
+            entry['atributos'] = span.attrs
+        with self._lock:
+            self._spans.append(entry)
+        if self._handler is not None:
+            self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def recent_spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._spans)
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[Optional['cProfile.Profile']]:
+        """Perfila el bloque con cProfile si está activado y guarda `<fecha>_<nombre>.prof`.
+
+        Sólo se perfila el hilo actual: quien lo use debe ejecutar el trabajo en línea.
+        """
+        if not (self.enabled and self.profiling):
+            yield None
+            return
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            self._save_profile(name, profiler)
+
+    def _save_profile(self, name: str, profiler: 'cProfile.Profile') -> None:
+        import pstats
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(15)
+        path = None
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            safe_name = ''.join(c if c.isalnum() else '_' for c in name).strip('_')
+            path = os.path.join(self.profile_dir, f"{datetime.now():%Y%m%d_%H%M%S}_{safe_name}.prof")
+            profiler.dump_stats(path)
+        with self._lock:
+            self._spans.append({'hora': datetime.now().isoformat(timespec='milliseconds'),
+                                'tramo': f'perfil:{name}', 'ms': 0.0, 'archivo': path,
+                                'resumen': summary.getvalue()})
+
+
+# Instancia compartida por toda la aplicación
+INSTRUMENTATION = Instrumentation()
+
+
+def span(name: str, **attrs: Any):
+    """Tramo de tiempo con nombre (nulo si la instrumentación está desactivada)."""
+    if not INSTRUMENTATION.enabled:
+        return _NULL_SPAN
+    return Span(INSTRUMENTATION, name, attrs)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Suma `value` al contador `name` (no hace nada si la instrumentación está desactivada)."""
+    if INSTRUMENTATION.enabled:
+        INSTRUMENTATION.count(name, value)
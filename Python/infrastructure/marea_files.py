@@ -0,0 +1,102 @@
+import os
+import re
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from infrastructure.file_hashing import file_signature
+
+# Prefijos de los archivos de una marea: captura, muestras, muestras de descarte,
+# producción y submuestras (nomenclatura <prefijo><marea><año>.dbf de los programas FoxPro)
+MAREA_FILE_KINDS = {
+    'c': 'captura',
+    'm': 'muestra',
+    'md': 'muestra_descarte',
+    'p': 'produccion',
+    's': 'submuestra',
+}
+
+
+def marea_file_stem(prefix: str, num_marea: str, anio_marea: str) -> str:
+    """Nombre base (sin extensión) de un archivo de marea, p. ej. ('c', '118', '2025') -> 'c11825'."""
+    marea = f"{int(str(num_marea).strip()):02d}"
+    anio = str(anio_marea).strip()[-2:]
+    return f"{prefix}{marea}{anio}"
+
+
+def find_marea_files(data_dir: str, num_marea: str, anio_marea: str) -> Dict[str, str]:
+    """Ubica los archivos de una marea en `data_dir`.
+
+    Devuelve un diccionario tipo de tabla -> ruta (ver MAREA_FILE_KINDS) solo con los
+    archivos existentes. La búsqueda no distingue mayúsculas (C11825.DBF, c11825.dbf).
+    """
+    try:
+        num = str(num_marea).strip()
+        anio = str(anio_marea).strip()
+        if not num or len(anio) < 2:
+            return {}
+        stems = {marea_file_stem(prefix, num, anio): kind for prefix, kind in MAREA_FILE_KINDS.items()}
+    except ValueError:
+        return {}
+
+    found = {}
+    try:
+        entries = os.listdir(data_dir)
+    except OSError:
+        return {}
+    for entry in entries:
+        stem, ext = os.path.splitext(entry)
+        if ext.lower() != '.dbf':
+            continue
+        kind = stems.get(stem.lower())
+        if kind:
+            found[kind] = os.path.join(data_dir, entry)
+    return found
+
+
+_MAREA_FILE_PATTERN = re.compile(r'^(md|c|m|p|s)(\d{3,})\.dbf$', re.IGNORECASE)
+
+
+def parse_marea_file_name(file_name: str) -> Optional[Tuple[str, str, str]]:
+    """Interpreta 'C11825.DBF' como ('captura', '118', '2025').
+
+    El año son los dos últimos dígitos del nombre; los archivos de corte por etapa
+    (c11825a.dbf) y otros nombres no reconocidos devuelven None.
+    """
+    match = _MAREA_FILE_PATTERN.match(os.path.basename(file_name))
+    if not match:
+        return None
+    prefix, digits = match.group(1).lower(), match.group(2)
+    yy = int(digits[-2:])
+    century = 2000 if yy <= datetime.now().year % 100 else 1900
+    return MAREA_FILE_KINDS[prefix], str(int(digits[:-2])), str(century + yy)
+
+
+def snapshot_marea_files(data_dir: str) -> Dict[str, Tuple[int, int]]:
+    """Firma (mtime, tamaño) de cada archivo de marea de la carpeta, por ruta."""
+    snapshot = {}
+    try:
+        entries = os.listdir(data_dir)
+    except OSError:
+        return snapshot
+    for entry in entries:
+        if parse_marea_file_name(entry) is None:
+            continue
+        path = os.path.join(data_dir, entry)
+        try:
+            snapshot[path] = file_signature(path)
+        except OSError:
+            pass
+    return snapshot
+
+
+def changed_mareas(old: Dict[str, Tuple[int, int]],
+                   new: Dict[str, Tuple[int, int]]) -> Dict[Tuple[str, str], Set[str]]:
+    """Archivos nuevos, borrados o modificados entre dos `snapshot_marea_files`,
+    agrupados por marea: (número, año) -> tipos de tabla."""
+    changed: Dict[Tuple[str, str], Set[str]] = {}
+    for path in set(old) | set(new):
+        if old.get(path) == new.get(path):
+            continue
+        kind, num, anio = parse_marea_file_name(path)
+        changed.setdefault((num, anio), set()).add(kind)
+    return changed
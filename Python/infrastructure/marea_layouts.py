@@ -0,0 +1,77 @@
+"""Estructura de campos de los archivos de marea (c/m/p/s<marea><año>.dbf), tal como
+los crean los programas FoxPro de carga de datos. Cada campo es (nombre, tipo, largo,
+decimales).
+"""
+from typing import Dict, List, Tuple
+
+FieldSpec = Tuple[str, str, int, int]
+
+# Pares ESPECIE_n/KG_n/DESCAR_n de la captura y campos TALLA_n de las muestras
+CAPTURA_SLOTS = 25
+MUESTRA_TALLAS = 90
+
+CAPTURA_LAYOUT: List[FieldSpec] = [
+    ('BARCO', 'C', 20, 0), ('MAREA', 'N', 3, 0), ('LANCE', 'N', 3, 0), ('MUS', 'N', 1, 0),
+    ('ESTAC_GRAL', 'N', 4, 0), ('FECHA', 'D', 8, 0), ('HORA_INIC', 'N', 5, 2), ('HORA_FINAL', 'N', 5, 2),
+    ('LAT_INIC', 'N', 6, 3), ('LAT_FINAL', 'N', 6, 3), ('LONG_INIC', 'N', 6, 3), ('LONG_FINAL', 'N', 6, 3),
+    ('ESTRATO', 'N', 4, 0), ('RUMBO', 'N', 3, 0), ('TIEMPO', 'N', 2, 0), ('MAR', 'N', 2, 0),
+    ('EDAD_LUNA', 'N', 2, 0), ('LUZ', 'N', 2, 0), ('DIR_VIENTO', 'N', 3, 0), ('VEL_VIENTO', 'N', 2, 0),
+    ('PROF_INIC', 'N', 4, 0), ('PROF_FINAL', 'N', 4, 0), ('TMP_A_SECO', 'N', 5, 2), ('TMP_A_HUM', 'N', 5, 2),
+    ('TMP_MAR_S', 'N', 5, 2), ('TMP_MAR_F', 'N', 5, 2), ('PRESION_B', 'N', 6, 1), ('CAPT_TOTAL', 'N', 10, 1),
+    ('DESCARTE', 'N', 10, 1), ('OBSERVAC', 'C', 50, 0), ('TARTE', 'N', 2, 0), ('NARTE', 'N', 2, 0),
+    ('VEL_ARRAS', 'N', 4, 2), ('AREA_BARR', 'N', 8, 5), ('CAB_FILAD', 'N', 4, 0), ('DIST_ALAS', 'N', 5, 1),
+    ('ABER_VERT', 'N', 4, 1), ('MALL_ALAS', 'N', 4, 0), ('MALL_COPO', 'N', 3, 0), ('MALL_SOBRE', 'N', 3, 0),
+    ('DIST_E_POR', 'N', 5, 1),
+] + [spec for n in range(1, CAPTURA_SLOTS + 1)
+     for spec in ((f'ESPECIE_{n}', 'N', 10, 0), (f'KG_{n}', 'N', 9, 2), (f'DESCAR_{n}', 'N', 9, 2))]
+
+MUESTRA_LAYOUT: List[FieldSpec] = [
+    ('BARCO', 'C', 20, 0), ('FECHA', 'D', 8, 0), ('MAREA', 'N', 3, 0), ('LANCE', 'N', 3, 0),
+    ('ESPECIE', 'C', 34, 0), ('COD_ESPEC', 'N', 10, 0), ('FUENTE', 'N', 1, 0), ('TARTE', 'N', 2, 0),
+    ('AREA', 'N', 6, 1), ('PRIM_TALLA', 'N', 3, 0), ('ULT_TALLA', 'N', 3, 0), ('INTERVALO', 'N', 2, 0),
+    ('PESO_MUES', 'N', 7, 2), ('FACT_POND', 'N', 17, 4),
+] + [(f'TALLA_{n}', 'N', 15, 0) for n in range(1, MUESTRA_TALLAS + 1)]
+
+PRODUCCION_LAYOUT: List[FieldSpec] = [
+    ('BARCO', 'C', 20, 0), ('MAREA', 'N', 3, 0), ('FECHA', 'D', 8, 0), ('ESPECIE', 'C', 25, 0),
+    ('PRODUCTO', 'C', 25, 0), ('CATEGORIA', 'C', 3, 0), ('OPERARIOS', 'N', 3, 0), ('FACTOR', 'N', 5, 2),
+    ('KILOS', 'N', 9, 2),
+]
+
+SUBMUESTRA_LAYOUT: List[FieldSpec] = [
+    ('BARCO', 'C', 20, 0), ('MAREA', 'N', 3, 0), ('LANCE', 'N', 3, 0), ('FECHA', 'D', 8, 0),
+    ('TARTE', 'N', 2, 0), ('FUENTE', 'N', 1, 0), ('AREA', 'N', 6, 1), ('ESPECIE', 'C', 24, 0),
+    ('NEJEMPLAR', 'N', 3, 0), ('LARGO_TOT', 'N', 3, 0), ('LARGO_STA', 'N', 3, 0), ('PESO_TOT', 'N', 7, 1),
+    ('PESO_VAC', 'N', 6, 1), ('SEXO', 'N', 1, 0), ('ESTADIO', 'N', 1, 0), ('PESO_GON', 'N', 6, 2),
+    ('PESO_HIG', 'N', 6, 2), ('REPLESION', 'N', 1, 0), ('CONTENIDO', 'C', 30, 0), ('EDAD', 'N', 2, 0),
+    ('R_TOTAL', 'N', 4, 2),
+]
+
+# Estructura por tipo de tabla (ver MAREA_FILE_KINDS); el descarte muestreado usa la de muestras
+MAREA_LAYOUTS: Dict[str, List[FieldSpec]] = {
+    'captura': CAPTURA_LAYOUT,
+    'muestra': MUESTRA_LAYOUT,
+    'muestra_descarte': MUESTRA_LAYOUT,
+    'produccion': PRODUCCION_LAYOUT,
+    'submuestra': SUBMUESTRA_LAYOUT,
+}
+
+# Indicadores por lance, mes y año (FACTORES.DBF); los campos que la aplicación no calcula quedan en 0
+FACTORES_LAYOUT: List[FieldSpec] = [
+    ('BARCO', 'C', 20, 0), ('MAREA', 'N', 3, 0), ('LANCE', 'N', 3, 0), ('MES', 'N', 2, 0),
+    ('FECHA', 'D', 8, 0), ('AREA', 'N', 6, 1), ('ESPECIE', 'C', 34, 0), ('COD_ESPEC', 'N', 10, 0),
+    ('COMENTA', 'C', 30, 0), ('PESO_MUES', 'N', 7, 2), ('CAP_BAR', 'N', 10, 0), ('CAP_CE', 'N', 10, 0),
+    ('SUM_BAR', 'N', 10, 0), ('DEN_CE', 'N', 8, 4), ('CAP_MEN', 'N', 10, 0), ('DEN_M', 'N', 8, 4),
+    ('CAP_MEN_A', 'N', 10, 0), ('DEN_MA', 'N', 8, 4), ('SUM_CE', 'N', 10, 0), ('SUM_CE_A', 'N', 10, 0),
+    ('SUM_MES', 'N', 10, 0), ('CAP_EST_A', 'N', 10, 0), ('DEN_EST_A', 'N', 8, 4), ('SUM_EST_A', 'N', 10, 0),
+    ('CAP_ANU', 'N', 10, 0), ('DEN_ANU', 'N', 8, 4), ('CAP_ANUG', 'N', 10, 0), ('CLAN', 'N', 10, 0),
+    ('AREA_BARR', 'N', 8, 5), ('SLME', 'N', 10, 0), ('SLMA', 'N', 10, 0), ('SLAR_ME', 'N', 10, 0),
+    ('CM_B', 'N', 10, 0), ('CMA_B', 'N', 10, 0), ('CM_B_A', 'N', 10, 0), ('SBM_ME', 'N', 10, 0),
+    ('SBM_ME_A', 'N', 10, 0), ('CM_BS', 'N', 10, 0), ('CM_BS_A', 'N', 10, 0), ('CE_BS', 'N', 10, 0),
+    ('CE_BS_A', 'N', 10, 0), ('CAN_BS', 'N', 10, 0), ('CAN_BS_A', 'N', 10, 0), ('SME_BM_E', 'N', 10, 0),
+    ('SME_BM_A_E', 'N', 10, 0), ('SME_BM_AN', 'N', 10, 0), ('SME_BM_A_A', 'N', 10, 0), ('CM_F', 'N', 10, 0),
+    ('CM_F_A', 'N', 10, 0), ('CE_F', 'N', 10, 0), ('CE_F_A', 'N', 10, 0), ('CAN_F', 'N', 10, 0),
+    ('CAN_F_A', 'N', 10, 0), ('SME_F_E', 'N', 10, 0), ('SME_F_A_E', 'N', 10, 0), ('SME_F_AN', 'N', 10, 0),
+    ('SME_F_AN_A', 'N', 10, 0), ('SCLAN_ESTR', 'N', 10, 0), ('CBIO_ESTR', 'N', 10, 0), ('SBIO', 'N', 10, 0),
+    ('CBIO_AT', 'N', 10, 0),
+]
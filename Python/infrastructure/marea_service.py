@@ -0,0 +1,464 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from domain import cobertura, derrotero, factores, histogramas, marea_procesos  # noqa: F401  (registra los procesos y productos)
+from domain.columnar import Table, concat
+from domain.descartes import DiscardResult, apply_discard_transform
+from domain.histogramas import HistogramaTallas
+from domain.jobs import JobContext
+from domain.marea_dataset import MareaDataset
+from domain.procesos import PROCESS_REGISTRY, RUN_ALL_PROCESSES, affected_by, process_graph
+from domain.scheduler import DagScheduler, tables_read
+from domain.streaming import STREAM_REGISTRY, run_streaming
+from infrastructure.dbf_reader import (DbfColumns, DbfRecordWriter, iter_dbf_chunks, read_header, rewrite_dbf_fields,
+                                       write_dbf_subset)
+from infrastructure.edit_journal import EditJournal
+from infrastructure.factores_store import save_factores
+from infrastructure.file_hashing import cached_file_digest, file_signature
+from infrastructure.instrumentation import INSTRUMENTATION, count, span
+from infrastructure.marea_files import find_marea_files, parse_marea_file_name
+from infrastructure.result_cache import ResultCache, code_version
+
+logger = logging.getLogger(__name__)
+
+
+def _unreadable(path: str, error: Exception) -> None:
+    """Informa un archivo de marea que no se pudo leer y lo suma al contador."""
+    count('mareas.archivos_ilegibles')
+    logger.error("Error al leer %s: %s", path, error)
+
+
+def load_marea_dataset(data_dir: str, num_marea: str, anio_marea: str,
+                       etapas: Optional[Iterable] = None) -> MareaDataset:
+    """Lee una sola vez cada archivo de la marea (c/m/md/p/s<marea><año>.dbf)."""
+    sources = find_marea_files(data_dir, num_marea, anio_marea)
+    tables = {}
+    for kind, path in sources.items():
+        try:
+            tables[kind] = DbfColumns(path)
+        except (OSError, ValueError) as e:
+            _unreadable(path, e)
+    return MareaDataset(num_marea, anio_marea, etapas, tables, sources)
+
+
+# Memoria máxima de las mareas guardadas en DatasetCache (registros leídos)
+DATASET_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class DatasetCache:
+    """Mareas ya leídas, para cambiar de marea sin volver a leer sus archivos.
+
+    Cada entrada guarda las tablas de una marea junto con la firma (mtime, tamaño) de
+    sus archivos; sólo se vuelven a abrir los archivos que cambiaron. Si las etapas son
+    las mismas se devuelve el mismo `MareaDataset`, con sus productos ya calculados; si
+    cambió algún archivo, se conservan los productos que no leen esas tablas.
+    Se descartan primero las mareas usadas hace más tiempo, al pasar `max_mareas` o
+    `max_bytes`.
+    """
+
+    def __init__(self, max_mareas: int = 8, max_bytes: int = DATASET_CACHE_MAX_BYTES):
+        self.max_mareas = max_mareas
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[Dict[str, Tuple[int, int]], MareaDataset]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Una lectura por marea a la vez: quien llega durante una precarga espera su resultado
+        self._loading: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+    def get(self, data_dir: str, num_marea: str, anio_marea: str,
+            etapas: Optional[Iterable] = None, context: Optional[JobContext] = None) -> MareaDataset:
+        """Marea leída; con `context`, la lectura se interrumpe entre archivos si se cancela."""
+        key = (os.path.abspath(data_dir), str(num_marea), str(anio_marea))
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            return self._get(key, data_dir, num_marea, anio_marea, etapas, context)
+
+    def _get(self, key: Tuple[str, str, str], data_dir: str, num_marea: str, anio_marea: str,
+             etapas: Optional[Iterable], context: Optional[JobContext]) -> MareaDataset:
+        sources = find_marea_files(data_dir, num_marea, anio_marea)
+        signatures = {}
+        for kind, path in sources.items():
+            try:
+                signatures[kind] = file_signature(path)
+            except OSError:
+                pass
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        candidate = MareaDataset(num_marea, anio_marea, etapas, {}, sources)
+        if cached is not None:
+            old_signatures, old = cached
+            if old_signatures == signatures and old.sources == sources \
+                    and np.array_equal(old.etapas, candidate.etapas):
+                return old
+        tables, changed = {}, set()
+        for kind, path in sources.items():
+            if cached is not None and cached[0].get(kind) == signatures.get(kind) \
+                    and cached[1].sources.get(kind) == path and kind in cached[1].tables:
+                tables[kind] = cached[1].tables[kind]
+                continue
+            changed.add(kind)
+            if context is not None:
+                context.check_cancelled()
+            try:
+                tables[kind] = DbfColumns(path)
+            except (OSError, ValueError) as e:
+                _unreadable(path, e)
+        dataset = MareaDataset(num_marea, anio_marea, etapas, tables, sources)
+        if cached is not None and np.array_equal(cached[1].etapas, dataset.etapas):
+            changed.update(set(cached[1].sources) - set(sources))
+            dataset.keep_products(cached[1], set(process_graph()) - affected_by(changed))
+        with self._lock:
+            self._entries[key] = (signatures, dataset)
+            self._entries.move_to_end(key)
+            self._evict()
+        return dataset
+
+    @staticmethod
+    def _size(dataset: MareaDataset) -> int:
+        return sum(table.size_bytes for table in dataset.tables.values())
+
+    def _evict(self) -> None:
+        """Descarta las mareas más antiguas hasta respetar los límites (la última siempre queda)."""
+        size = sum(self._size(dataset) for _, dataset in self._entries.values())
+        while len(self._entries) > 1 and (len(self._entries) > self.max_mareas or size > self.max_bytes):
+            _, (_, dataset) = self._entries.popitem(last=False)
+            size -= self._size(dataset)
+
+    def discard(self, data_dir: str, num_marea: str, anio_marea: str) -> None:
+        with self._lock:
+            self._entries.pop((os.path.abspath(data_dir), str(num_marea), str(anio_marea)), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def prefetch_marea(context: JobContext, data_dir: str, num_marea: str, anio_marea: str,
+                   datasets: DatasetCache, etapas: Optional[Iterable] = None) -> Dict[str, int]:
+    """Lee y decodifica de antemano los archivos de la marea en `datasets`.
+
+    Se corre en segundo plano apenas se conoce la marea, para que el primer proceso la
+    encuentre en memoria. Se puede cancelar entre archivos y entre columnas. Devuelve
+    los registros leídos por tipo de tabla (vacío si la marea no tiene archivos).
+    """
+    if not find_marea_files(data_dir, num_marea, anio_marea):
+        return {}
+    with span('marea.precargar', marea=f"{num_marea}/{anio_marea}"):
+        dataset = datasets.get(data_dir, num_marea, anio_marea, etapas, context=context)
+        for table in dataset.tables.values():
+            for name in table:
+                context.check_cancelled()
+                table[name]
+    return {kind: table.num_rows for kind, table in dataset.tables.items()}
+
+
+def length_histograms(context: JobContext, data_dir: str, num_marea: str, anio_marea: str,
+                      datasets: Optional[DatasetCache] = None,
+                      etapas: Optional[Iterable] = None) -> HistogramaTallas:
+    """Histogramas de tallas de la marea para el gráfico de distribución.
+
+    Se calculan una vez en segundo plano y quedan en el dataset: después cada cambio de
+    especie, lance o etapa del gráfico es sólo un conteo sobre las filas de esa especie.
+    """
+    if datasets is not None:
+        dataset = datasets.get(data_dir, num_marea, anio_marea, etapas, context=context)
+    else:
+        dataset = load_marea_dataset(data_dir, num_marea, anio_marea, etapas)
+    if not dataset.has_table('muestra'):
+        raise FileNotFoundError(f"La marea {num_marea}/{anio_marea} no tiene archivo de muestras en {data_dir}")
+    with span('marea.histogramas', marea=f"{num_marea}/{anio_marea}"):
+        return _scheduler().run(['histograma_tallas'], dataset, {}, context)['histograma_tallas']
+
+
+def season_barcos(data_dir: str, anio_marea: Optional[str] = None) -> Dict[str, int]:
+    """Valores distintos del campo BARCO en los archivos de captura de la carpeta (opcionalmente
+    de un año) y cuántos registros tiene cada uno. Sólo se decodifica esa columna."""
+    barcos: Dict[str, int] = {}
+    for entry in sorted(os.listdir(data_dir)):
+        parsed = parse_marea_file_name(entry)
+        if not parsed or parsed[0] != 'captura' or (anio_marea and parsed[2] != str(anio_marea)):
+            continue
+        try:
+            columnas = DbfColumns(os.path.join(data_dir, entry))
+        except (OSError, ValueError) as e:
+            _unreadable(os.path.join(data_dir, entry), e)
+            continue
+        if 'BARCO' not in columnas:
+            continue
+        valores, cantidades = np.unique(columnas['BARCO'], return_counts=True)
+        for valor, cantidad in zip(valores.tolist(), cantidades.tolist()):
+            valor = str(valor).strip()
+            if valor:
+                barcos[valor] = barcos.get(valor, 0) + cantidad
+    return barcos
+
+
+def season_track_check(data_dir: str, anio_marea: Optional[str] = None,
+                       limites: Optional[Dict[str, float]] = None) -> Table:
+    """Control de derrotero de todas las capturas de la carpeta (opcionalmente de un año) en
+    una sola pasada vectorizada. `limites` da la velocidad máxima (nudos) por valor de BARCO."""
+    partes = []
+    for entry in sorted(os.listdir(data_dir)):
+        parsed = parse_marea_file_name(entry)
+        if not parsed or parsed[0] != 'captura' or (anio_marea and parsed[2] != str(anio_marea)):
+            continue
+        try:
+            columnas = DbfColumns(os.path.join(data_dir, entry))
+        except (OSError, ValueError) as e:
+            _unreadable(os.path.join(data_dir, entry), e)
+            continue
+        n = columnas.num_rows
+        if not n or any(name not in columnas for name in derrotero.CAMPOS_DERROTERO):
+            continue
+        parte = {name: columnas[name] for name in derrotero.CAMPOS_DERROTERO}
+        parte.update({
+            'marea': np.full(n, parsed[1]), 'anio': np.full(n, parsed[2]),
+            'barco': np.char.strip(columnas['BARCO'].astype(str)) if 'BARCO' in columnas else np.full(n, ''),
+            'grupo': np.full(n, len(partes), dtype=np.int64),
+        })
+        partes.append(parte)
+    if not partes:
+        return {}
+    captura = concat(partes)
+    barcos, por_barco = np.unique(captura['barco'], return_inverse=True)
+    limite = np.array([(limites or {}).get(barco, derrotero.VELOCIDAD_LIMITE) for barco in barcos.tolist()],
+                      dtype=np.float64)[por_barco.reshape(-1)]
+    with span('derrotero.temporada', lances=len(limite)):
+        tabla = derrotero.tramos(captura, captura['grupo'], limite)
+    fila = tabla.pop('fila')
+    return dict({'marea': captura['marea'][fila], 'anio': captura['anio'][fila],
+                 'barco': captura['barco'][fila]}, **tabla)
+
+
+def correct_discards(data_dir: str, num_marea: str, anio_marea: str, transform: str,
+                     especie: Optional[int] = None, lances: Optional[Iterable[int]] = None,
+                     regla=None, kg_cajon: Optional[float] = None,
+                     journal: Optional[EditJournal] = None) -> DiscardResult:
+    """Aplica una corrección de descarte (ver `domain.descartes`) al archivo de captura de la
+    marea y lo reescribe una sola vez con las filas cambiadas.
+
+    Con `journal` (el diario de ediciones de la captura) la corrección se registra como un
+    paso que se puede deshacer y el archivo no se toca hasta guardar el diario.
+    """
+    if journal is not None:
+        with span('descartes.corregir', marea=f"{num_marea}/{anio_marea}", correccion=transform):
+            result = apply_discard_transform(journal.columns(), transform, especie, lances, regla, kg_cajon)
+            if result.registros:
+                journal.edit(result.filas, result.columnas, f"Corrección {transform}")
+        return result
+    path = find_marea_files(data_dir, num_marea, anio_marea).get('captura')
+    if not path:
+        raise FileNotFoundError(f"No se encontró la captura de la marea {num_marea}/{anio_marea} en {data_dir}")
+    with span('descartes.corregir', marea=f"{num_marea}/{anio_marea}", correccion=transform):
+        result = apply_discard_transform(DbfColumns(path), transform, especie, lances, regla, kg_cajon)
+        if result.registros:
+            rewrite_dbf_fields(path, result.filas, result.columnas)
+    return result
+
+
+def open_edit_journal(data_dir: str, num_marea: str, anio_marea: str, kind: str = 'captura') -> EditJournal:
+    """Diario de ediciones de un archivo de la marea; retoma la sesión anterior si quedó sin guardar."""
+    path = find_marea_files(data_dir, num_marea, anio_marea).get(kind)
+    if not path:
+        raise FileNotFoundError(f"No se encontró el archivo de {kind} de la marea {num_marea}/{anio_marea} en {data_dir}")
+    return EditJournal(path)
+
+
+def _write_stage_cuts(dataset: MareaDataset, cortes: Dict[str, List[np.ndarray]],
+                      output_dir: str) -> Dict[str, np.ndarray]:
+    """Escribe un archivo por tabla y etapa (ej. c11825a.dbf) y resume lo escrito."""
+    archivos, etapas, registros = [], [], []
+    for kind, indices_por_etapa in cortes.items():
+        source = dataset.sources.get(kind)
+        if not source:
+            continue
+        for etapa, indices in enumerate(indices_por_etapa):
+            target = _stage_cut_target(source, etapa, output_dir)
+            registros.append(write_dbf_subset(source, target, indices))
+            archivos.append(target)
+            etapas.append(etapa)
+    return {'archivo': np.array(archivos), 'etapa': np.array(etapas, dtype=np.int64),
+            'registros': np.array(registros, dtype=np.int64)}
+
+
+def _stage_cut_target(source: str, etapa: int, output_dir: str) -> str:
+    stem, ext = os.path.splitext(os.path.basename(source))
+    return os.path.join(output_dir, f"{stem.lower()}{marea_procesos.etapa_letter(etapa)}{ext.lower()}")
+
+
+def _stream_stage_cuts(sources: Dict[str, str], num_marea: str, anio_marea: str, etapas: Optional[Iterable],
+                       output_dir: str, chunk_rows: int, context: JobContext) -> Dict[str, np.ndarray]:
+    """"Cortar bases" recorriendo cada archivo por bloques: cada registro se copia al
+    archivo de su etapa sin cargar el archivo completo."""
+    dataset = MareaDataset(num_marea, anio_marea, etapas, {})
+    archivos, etapas_escritas, registros = [], [], []
+    for kind in marea_procesos.STAGE_CUT_KINDS:
+        source = sources.get(kind)
+        if not source:
+            continue
+        header = read_header(source)
+        if 'FECHA' not in header.field_names:
+            continue
+        with open(source, 'rb') as f:
+            header_bytes = f.read(header.header_length)
+        targets = [_stage_cut_target(source, etapa, output_dir) for etapa in range(len(dataset.etapas))]
+        writers = [DbfRecordWriter(target, header_bytes) for target in targets]
+        try:
+            for chunk in iter_dbf_chunks(source, chunk_rows):
+                context.check_cancelled()
+                etapa = dataset.etapa_index(chunk['FECHA'])
+                for i, writer in enumerate(writers):
+                    writer.append(chunk.records[etapa == i])
+        except BaseException:
+            for writer in writers:
+                writer.abort()
+            raise
+        for etapa, (target, writer) in enumerate(zip(targets, writers)):
+            registros.append(writer.close())
+            archivos.append(target)
+            etapas_escritas.append(etapa)
+    return {'archivo': np.array(archivos), 'etapa': np.array(etapas_escritas, dtype=np.int64),
+            'registros': np.array(registros, dtype=np.int64)}
+
+
+def _run_streamed(context: JobContext, names: List[str], sources: Dict[str, str], num_marea: str,
+                  anio_marea: str, etapas: Optional[Iterable], params: Dict[str, Any],
+                  output_dir: str, chunk_rows: int) -> Dict[str, Any]:
+    """Ejecuta por bloques los procesos que lo admiten; los demás quedan fuera del resultado."""
+    etapas = list(etapas or [])
+    results = {}
+    for name in names:
+        if name == "Cortar bases":
+            with span('proceso.bloques', proceso=name):
+                results[name] = _stream_stage_cuts(sources, num_marea, anio_marea, etapas, output_dir,
+                                                   chunk_rows, context)
+            continue
+        aggregator = STREAM_REGISTRY.get(name)
+        if aggregator is None or aggregator.table not in sources:
+            continue
+        with span('proceso.bloques', proceso=name, bloque=chunk_rows):
+            results[name] = run_streaming(aggregator, iter_dbf_chunks(sources[aggregator.table], chunk_rows),
+                                          num_marea, anio_marea, etapas, params, context)
+    return results
+
+
+def _scheduler() -> DagScheduler:
+    """Planificador con un tramo de tiempo por nodo si la instrumentación está activa.
+
+    Al perfilar, los nodos se ejecutan en el hilo actual para que cProfile los vea.
+    """
+    if not INSTRUMENTATION.enabled:
+        return DagScheduler(process_graph())
+    return DagScheduler(process_graph(), max_workers=0 if INSTRUMENTATION.profiling else None,
+                        tracer=lambda name: span(f'nodo.{name}'))
+
+
+def open_result_cache(cache_dir: str, max_bytes: Optional[int] = None) -> ResultCache:
+    """Caché de resultados versionada con el código actual de los procesos."""
+    kwargs = {'max_bytes': max_bytes} if max_bytes else {}
+    return ResultCache(cache_dir, version=code_version(process_graph()), **kwargs)
+
+
+def _run_cached(cache: ResultCache, names: List[str], dataset: MareaDataset, params: Dict[str, Any],
+                context: JobContext) -> Dict[str, Any]:
+    """Toma de la caché los procesos ya calculados y ejecuta (y guarda) el resto."""
+    input_hashes = {kind: cached_file_digest(path) for kind, path in dataset.sources.items()
+                    if kind in dataset.tables}
+    key_params = dict(params, etapas=dataset.etapas.astype(str).tolist())
+    # Cada proceso se indexa sólo por las tablas que lee: editar las submuestras no invalida la captura
+    graph = process_graph()
+    keys = {name: cache.key(name, {kind: digest for kind, digest in input_hashes.items()
+                                   if kind in tables_read(graph, name)}, key_params)
+            for name in names}
+    results, pending = {}, []
+    for name in names:
+        hit, value = cache.get(keys[name])
+        if hit:
+            results[name] = value
+        else:
+            pending.append(name)
+    if pending:
+        computed = _scheduler().run(pending, dataset, params, context)
+        for name, value in computed.items():
+            cache.put(keys[name], value)
+        results.update(computed)
+    return {name: results[name] for name in names}
+
+
+def run_processes(context: JobContext, names: Iterable[str], num_marea: str, anio_marea: str,
+                  etapas: Optional[Iterable] = None, especies: Optional[Iterable] = None,
+                  data_dir: str = '.', output_dir: Optional[str] = None,
+                  dataset: Optional[MareaDataset] = None,
+                  cache: Optional[ResultCache] = None,
+                  chunk_rows: Optional[int] = None,
+                  datasets: Optional[DatasetCache] = None,
+                  umbrales: Optional[Dict[str, int]] = None,
+                  nombres_especies: Optional[Dict[str, int]] = None,
+                  velocidad_limite: Optional[float] = None) -> Dict[str, Any]:
+    """Ejecuta un conjunto de procesos sobre la marea como un grafo de dependencias.
+
+    La marea se lee una sola vez y los productos intermedios se comparten, por lo que
+    ejecutar todos los procesos cuesta aproximadamente una lectura por archivo. Con
+    `cache`, los procesos cuyas entradas no cambiaron se toman de la caché.
+
+    Con `chunk_rows` (y sin `dataset`), los procesos que admiten cálculo por bloques
+    recorren sus archivos de a `chunk_rows` registros, con memoria acotada, y no pasan
+    por la caché; el resto se ejecuta como siempre.
+
+    Con `datasets`, la marea se toma de las ya leídas (sin releer archivos sin cambios).
+
+    `umbrales` cambia los mínimos del control de muestreo y `nombres_especies` (nombre
+    científico -> código) asocia las submuestras a su especie (ver `domain.cobertura`).
+    `velocidad_limite` es la velocidad máxima del buque para el control de derrotero.
+    """
+    names = list(names)
+    if RUN_ALL_PROCESSES in names:
+        names = list(PROCESS_REGISTRY)
+    params = {'especies': list(especies or [])}
+    if umbrales:
+        params['umbrales'] = dict(umbrales)
+    if nombres_especies:
+        params['nombres_especies'] = dict(nombres_especies)
+    if velocidad_limite:
+        params['velocidad_limite'] = float(velocidad_limite)
+    with span('procesos', marea=f"{num_marea}/{anio_marea}", procesos=names), \
+            INSTRUMENTATION.profile(f"{num_marea}_{anio_marea}_{'_'.join(names) if len(names) == 1 else 'todos'}"):
+        results = {}
+        if chunk_rows and dataset is None:
+            sources = find_marea_files(data_dir, num_marea, anio_marea)
+            if not sources:
+                raise FileNotFoundError(f"No se encontraron archivos de la marea {num_marea}/{anio_marea} en {data_dir}")
+            context.report_progress(0, "Recorriendo archivos de la marea por bloques")
+            results = _run_streamed(context, names, sources, num_marea, anio_marea, etapas, params,
+                                    output_dir or data_dir, chunk_rows)
+        pending = [name for name in names if name not in results]
+
+        if pending:
+            context.report_progress(0, "Leyendo archivos de la marea")
+            if dataset is None and datasets is not None:
+                dataset = datasets.get(data_dir, num_marea, anio_marea, etapas)
+            elif dataset is None:
+                dataset = load_marea_dataset(data_dir, num_marea, anio_marea, etapas)
+            if not dataset.tables:
+                raise FileNotFoundError(f"No se encontraron archivos de la marea {num_marea}/{anio_marea} en {data_dir}")
+
+            if cache is None:
+                computed = _scheduler().run(pending, dataset, params, context)
+            else:
+                computed = _run_cached(cache, pending, dataset, params, context)
+
+            if "Cortar bases" in computed:
+                computed["Cortar bases"] = _write_stage_cuts(dataset, computed["Cortar bases"], output_dir or data_dir)
+            if "Factores CPUE" in computed:
+                aportes = _scheduler().run(['aportes_factores'], dataset, params)['aportes_factores']
+                computed["Factores CPUE"] = save_factores(output_dir or data_dir, num_marea, anio_marea,
+                                                          computed["Factores CPUE"], aportes)
+            results.update(computed)
+    context.report_progress(100)
+    return {name: results[name] for name in names if name in results}
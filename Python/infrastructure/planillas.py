@@ -0,0 +1,469 @@
+"""Lectura por filas de planillas de Excel (.xls de Excel 5 a 2003 y .xlsx), sin dependencias
+externas.
+
+Las hojas se recorren fila por fila sin armar la planilla completa en memoria: en un .xls
+se leen el directorio y la FAT del documento compuesto OLE2 y después los registros
+BIFF5/BIFF8 del flujo "Workbook", de a tiras de sectores a medida que se recorre la hoja;
+en un .xlsx se recorre el XML de la hoja con `iterparse`. Cada fila llega como una lista de valores
+(str, float, bool o None); las fechas quedan como número serial de Excel.
+"""
+import io
+import os
+import re
+import struct
+import sys
+import zipfile
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+Row = List[object]
+
+_OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_FREE_SECTOR = 0xFFFFFFFF
+_END_OF_CHAIN = 0xFFFFFFFE
+
+# Registros BIFF8 que se usan
+_BOF, _EOF, _BOUNDSHEET, _SST, _CONTINUE = 0x0809, 0x000A, 0x0085, 0x00FC, 0x003C
+_NUMBER, _RK, _MULRK, _LABELSST, _LABEL, _RSTRING = 0x0203, 0x027E, 0x00BD, 0x00FD, 0x0204, 0x00D6
+_FORMULA, _STRING, _BOOLERR = 0x0006, 0x0207, 0x0205
+_BIFF5, _BIFF8 = 0x0500, 0x0600
+# Texto de 8 bits de los libros BIFF5 (Excel 5/95)
+_BIFF5_ENCODING = 'cp1252'
+
+_XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_XLSX_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+
+
+class PlanillaError(ValueError):
+    """La planilla no se puede leer (formato desconocido o archivo dañado)."""
+
+
+def sheet_names(path: str) -> List[str]:
+    """Nombres de las hojas, en el orden del libro."""
+    if _is_xlsx(path):
+        with zipfile.ZipFile(path) as zf:
+            return [name for name, _ in _xlsx_sheets(zf)]
+    return [name for name, _ in _XlsBook(path).sheets]
+
+
+def iter_rows(path: str, sheet: Optional[str] = None) -> Iterator[Tuple[int, Row]]:
+    """(número de fila desde 0, valores) de cada fila con datos de la hoja (la primera si no se indica)."""
+    if _is_xlsx(path):
+        yield from _iter_xlsx_rows(path, sheet)
+    else:
+        yield from _XlsBook(path).iter_rows(sheet)
+
+
+def _is_xlsx(path: str) -> bool:
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    if head.startswith(b'PK'):
+        return True
+    if head != _OLE_SIGNATURE:
+        raise PlanillaError(f"{os.path.basename(path)} no es una planilla de Excel")
+    return False
+
+
+def _select(sheets: List[Tuple[str, object]], sheet: Optional[str], path: str):
+    if not sheets:
+        raise PlanillaError(f"{os.path.basename(path)} no tiene hojas")
+    if sheet is None:
+        return sheets[0][1]
+    for name, ref in sheets:
+        if name.strip().lower() == sheet.strip().lower():
+            return ref
+    raise PlanillaError(f"{os.path.basename(path)} no tiene la hoja '{sheet}'")
+
+
+def _place(row: Row, col: int, value: object) -> None:
+    if col >= len(row):
+        row.extend([None] * (col + 1 - len(row)))
+    row[col] = value
+
+
+# --- .xls: documento compuesto OLE2 con registros BIFF8 ---
+
+# Sectores contiguos que se leen juntos al recorrer un flujo
+_READ_AHEAD_SECTORS = 128
+
+
+class _OleStream:
+    """Flujo de un documento compuesto leído a pedido: sólo la tabla FAT y la cadena de
+    sectores del flujo están en memoria, el contenido se lee del archivo al recorrerlo."""
+
+    def __init__(self, f, sectors: List[int], sector_size: int, size: int):
+        self.f = f
+        self.sectors = sectors
+        self.sector_size = sector_size
+        self.size = size
+        self.pos = 0
+        self._buf, self._buf_start = b'', 0
+
+    def seek(self, pos: int) -> None:
+        self.pos = pos
+
+    def read(self, n: int) -> bytes:
+        parts = []
+        while n > 0 and self.pos < self.size:
+            offset = self.pos - self._buf_start
+            if not 0 <= offset < len(self._buf):
+                self._fill()
+                offset = self.pos - self._buf_start
+            piece = self._buf[offset:offset + min(n, self.size - self.pos)]
+            parts.append(piece)
+            self.pos += len(piece)
+            n -= len(piece)
+        return b''.join(parts)
+
+    def _fill(self) -> None:
+        """Lee desde el sector de `pos` la tira de sectores contiguos en el archivo que le sigue."""
+        k = self.pos // self.sector_size
+        if k >= len(self.sectors):
+            raise PlanillaError("Flujo del documento compuesto truncado")
+        run = 1
+        while (k + run < len(self.sectors) and run < _READ_AHEAD_SECTORS
+               and self.sectors[k + run] == self.sectors[k] + run):
+            run += 1
+        self.f.seek((self.sectors[k] + 1) * self.sector_size)
+        self._buf = self.f.read(run * self.sector_size)
+        self._buf_start = k * self.sector_size
+        if not self._buf:
+            raise PlanillaError("Flujo del documento compuesto truncado")
+
+
+class _OleFile:
+    """Directorio y FAT de un documento compuesto OLE2, sin leer el contenido de los flujos."""
+
+    def __init__(self, f):
+        self.f = f
+        header = f.read(512)
+        if header[:8] != _OLE_SIGNATURE:
+            raise PlanillaError("No es un documento compuesto OLE2")
+        self.sector_size = 1 << struct.unpack_from('<H', header, 0x1E)[0]
+        self.mini_size = 1 << struct.unpack_from('<H', header, 0x20)[0]
+        dir_start, = struct.unpack_from('<I', header, 0x30)
+        self.mini_cutoff, self.mini_fat_start, mini_fat_count, difat_start, difat_count = \
+            struct.unpack_from('<IIIII', header, 0x38)
+
+        fat_sectors = [s for s in struct.unpack_from('<109I', header, 0x4C) if s != _FREE_SECTOR]
+        per_sector = self.sector_size // 4
+        for _ in range(difat_count):
+            if difat_start in (_FREE_SECTOR, _END_OF_CHAIN):
+                break
+            values = struct.unpack(f'<{per_sector}I', self._sector(difat_start))
+            fat_sectors.extend(s for s in values[:-1] if s != _FREE_SECTOR)
+            difat_start = values[-1]
+        self.fat = array('I', b''.join(self._sector(s) for s in fat_sectors))
+        if sys.byteorder == 'big':
+            self.fat.byteswap()
+        self.has_mini_fat = bool(mini_fat_count)
+
+        directory = self._read_chain(dir_start, self.fat)
+        self.entries = []
+        for offset in range(0, len(directory) - 127, 128):
+            name_len, kind = struct.unpack_from('<HB', directory, offset + 64)
+            name = directory[offset:offset + max(0, name_len - 2)].decode('utf-16-le', 'replace')
+            start, size = struct.unpack_from('<II', directory, offset + 116)
+            self.entries.append((name, kind, start, size))
+        if not self.entries:
+            raise PlanillaError("Documento compuesto sin directorio")
+
+    def _sector(self, index: int) -> bytes:
+        self.f.seek((index + 1) * self.sector_size)
+        return self.f.read(self.sector_size)
+
+    @staticmethod
+    def _chain(start: int, table) -> List[int]:
+        sectors = []
+        while start not in (_END_OF_CHAIN, _FREE_SECTOR) and start < len(table) and len(sectors) <= len(table):
+            sectors.append(start)
+            start = table[start]
+        return sectors
+
+    def _read_chain(self, start: int, table) -> bytes:
+        return b''.join(self._sector(s) for s in self._chain(start, table))
+
+    def open_stream(self, names: Tuple[str, ...]):
+        """Primer flujo cuyo nombre esté en `names`, para leerlo con `seek`/`read`."""
+        for name, kind, start, size in self.entries:
+            if kind != 2 or name not in names:
+                continue
+            if size >= self.mini_cutoff:
+                return _OleStream(self.f, self._chain(start, self.fat), self.sector_size, size)
+            # Flujo chico (menos de 4 KB): está en el mini flujo del directorio raíz y se lee entero
+            root_stream = self._read_chain(self.entries[0][2], self.fat)
+            mini_fat = array('I', self._read_chain(self.mini_fat_start, self.fat) if self.has_mini_fat else b'')
+            if sys.byteorder == 'big':
+                mini_fat.byteswap()
+            data = b''.join(root_stream[s * self.mini_size:(s + 1) * self.mini_size]
+                            for s in self._chain(start, mini_fat))[:size]
+            return io.BytesIO(data)
+        raise PlanillaError("El documento no contiene un libro de Excel")
+
+
+def _rk_value(rk: int) -> float:
+    if rk & 0x02:
+        value = float(rk >> 2 if rk < 0x80000000 else (rk >> 2) - (1 << 30))
+    else:
+        value = struct.unpack('<d', struct.pack('<Q', (rk & 0xFFFFFFFC) << 32))[0]
+    return value / 100.0 if rk & 0x01 else value
+
+
+class _XlsBook:
+    """Libro BIFF5/BIFF8: cadenas compartidas e inicio de cada hoja; las celdas se leen al recorrerla."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sheets: List[Tuple[str, int]] = []
+        self.sst: List[str] = []
+        with self._open() as stream:
+            self._read_globals(stream)
+
+    @contextmanager
+    def _open(self):
+        """Flujo "Workbook" del libro; se lee del archivo a medida que se recorren los registros."""
+        with open(self.path, 'rb') as f:
+            yield _OleFile(f).open_stream(('Workbook', 'Book'))
+
+    @staticmethod
+    def _records(stream, offset: int) -> Iterator[Tuple[int, int, bytes]]:
+        stream.seek(offset)
+        while True:
+            head = stream.read(4)
+            if len(head) < 4:
+                return
+            kind, length = struct.unpack('<HH', head)
+            yield offset, kind, stream.read(length)
+            offset += 4 + length
+
+    def _read_globals(self, stream) -> None:
+        records = self._records(stream, 0)
+        _, kind, data = next(records, (0, None, b''))
+        version = struct.unpack_from('<H', data)[0] if kind == _BOF and len(data) >= 2 else None
+        if version not in (_BIFF5, _BIFF8):
+            raise PlanillaError(f"{os.path.basename(self.path)}: sólo se leen libros de Excel 5 o posterior")
+        self.biff8 = version == _BIFF8
+        sst_parts: List[bytes] = []
+        for _, kind, data in records:
+            if kind == _EOF:
+                break
+            if kind == _BOUNDSHEET:
+                position, _, sheet_type, cch, flags = struct.unpack_from('<IBBBB', data)
+                if sheet_type == 0:  # hoja de cálculo (no gráficos ni macros)
+                    name = _decode_chars(data, 8, cch, flags)[0] if self.biff8 else \
+                        data[7:7 + cch].decode(_BIFF5_ENCODING, 'replace')
+                    self.sheets.append((name, position))
+            elif kind == _SST:
+                sst_parts = [data]
+            elif kind == _CONTINUE and sst_parts:
+                sst_parts.append(data)
+            elif sst_parts:
+                self.sst = _read_sst(sst_parts)
+                sst_parts = []
+        if sst_parts:
+            self.sst = _read_sst(sst_parts)
+
+    def _text(self, data: bytes, offset: int, cch: int) -> str:
+        """Texto de una celda: en BIFF8 lleva un byte de opciones antes de los caracteres."""
+        if self.biff8:
+            return _decode_chars(data, offset + 1, cch, data[offset])[0]
+        return data[offset:offset + cch].decode(_BIFF5_ENCODING, 'replace')
+
+    def iter_rows(self, sheet: Optional[str]) -> Iterator[Tuple[int, Row]]:
+        position = _select(self.sheets, sheet, self.path)
+        with self._open() as stream:
+            yield from self._iter_sheet(stream, position)
+
+    def _iter_sheet(self, stream, position: int) -> Iterator[Tuple[int, Row]]:
+        current, row = -1, []
+        pending_formula: Optional[Tuple[int, int]] = None
+        records = self._records(stream, position)
+        next(records, None)  # BOF de la hoja
+        for _, kind, data in records:
+            if kind == _EOF:
+                break
+            cells: List[Tuple[int, int, object]] = []
+            if kind == _NUMBER:
+                r, c, _, value = struct.unpack_from('<HHHd', data)
+                cells.append((r, c, value))
+            elif kind == _RK:
+                r, c, _, rk = struct.unpack_from('<HHHI', data)
+                cells.append((r, c, _rk_value(rk)))
+            elif kind == _MULRK:
+                r, first = struct.unpack_from('<HH', data)
+                for i in range((len(data) - 6) // 6):
+                    cells.append((r, first + i, _rk_value(struct.unpack_from('<I', data, 6 + i * 6)[0])))
+            elif kind == _LABELSST:
+                r, c, _, index = struct.unpack_from('<HHHI', data)
+                cells.append((r, c, self.sst[index] if index < len(self.sst) else ''))
+            elif kind in (_LABEL, _RSTRING):
+                r, c, _, cch = struct.unpack_from('<HHHH', data)
+                cells.append((r, c, self._text(data, 8, cch)))
+            elif kind == _BOOLERR:
+                r, c, _, value, is_error = struct.unpack_from('<HHHBB', data)
+                cells.append((r, c, None if is_error else bool(value)))
+            elif kind == _FORMULA:
+                r, c = struct.unpack_from('<HH', data)
+                result = data[6:14]
+                if result[6:8] != b'\xff\xff':
+                    cells.append((r, c, struct.unpack('<d', result)[0]))
+                elif result[0] == 0:
+                    pending_formula = (r, c)  # el texto llega en el registro STRING siguiente
+                elif result[0] == 1:
+                    cells.append((r, c, bool(result[2])))
+            elif kind == _STRING and pending_formula is not None:
+                cch, = struct.unpack_from('<H', data)
+                cells.append((*pending_formula, self._text(data, 2, cch)))
+                pending_formula = None
+            for r, c, value in cells:
+                if r != current:
+                    if any(v not in (None, '') for v in row):
+                        yield current, row
+                    current, row = r, []
+                _place(row, c, value)
+        if any(v not in (None, '') for v in row):
+            yield current, row
+
+
+def _decode_chars(data: bytes, offset: int, cch: int, flags: int) -> Tuple[str, int]:
+    """Texto Unicode de Excel (compacto en latin-1 o UTF-16) y posición siguiente."""
+    pos = offset
+    runs = ext = 0
+    if flags & 0x08:
+        runs, = struct.unpack_from('<H', data, pos)
+        pos += 2
+    if flags & 0x04:
+        ext, = struct.unpack_from('<I', data, pos)
+        pos += 4
+    size = cch * (2 if flags & 0x01 else 1)
+    raw = data[pos:pos + size]
+    text = raw.decode('utf-16-le' if flags & 0x01 else 'latin-1', 'replace')
+    return text, pos + size + runs * 4 + ext
+
+
+def _read_sst(parts: List[bytes]) -> List[str]:
+    """Tabla de cadenas compartidas; una cadena puede seguir en el CONTINUE siguiente."""
+    strings: List[str] = []
+    total, = struct.unpack_from('<I', parts[0], 4)
+    part, pos = 0, 8
+    data = parts[0]
+    while len(strings) < total:
+        if pos >= len(data):
+            part += 1
+            if part >= len(parts):
+                break
+            data, pos = parts[part], 0
+            continue
+        cch, flags = struct.unpack_from('<HB', data, pos)
+        pos += 3
+        runs = ext = 0
+        if flags & 0x08:
+            runs, = struct.unpack_from('<H', data, pos)
+            pos += 2
+        if flags & 0x04:
+            ext, = struct.unpack_from('<I', data, pos)
+            pos += 4
+        chars: List[str] = []
+        remaining, wide = cch, flags & 0x01
+        while True:
+            width = 2 if wide else 1
+            take = min(remaining, (len(data) - pos) // width)
+            chars.append(data[pos:pos + take * width].decode('utf-16-le' if wide else 'latin-1', 'replace'))
+            pos += take * width
+            remaining -= take
+            if remaining == 0 or part + 1 >= len(parts):
+                break
+            # Al pasar a otro CONTINUE se repite el byte de opciones (puede cambiar el ancho)
+            part += 1
+            data = parts[part]
+            wide, pos = data[0] & 0x01, 1
+        strings.append(''.join(chars))
+        # Formato enriquecido y datos extendidos, que también pueden cruzar registros
+        skip = runs * 4 + ext
+        while skip:
+            step = min(skip, len(data) - pos)
+            pos += step
+            skip -= step
+            if skip and part + 1 < len(parts):
+                part += 1
+                data, pos = parts[part], 0
+            elif skip:
+                break
+    return strings
+
+
+# --- .xlsx: XML dentro de un ZIP ---
+
+def _xlsx_sheets(zf: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """(nombre, archivo de la hoja dentro del ZIP)."""
+    targets: Dict[str, str] = {}
+    with zf.open('xl/_rels/workbook.xml.rels') as f:
+        for _, element in iterparse(f):
+            if element.tag == f'{_PKG_REL_NS}Relationship':
+                target = element.get('Target', '').lstrip('/')
+                targets[element.get('Id')] = target if target.startswith('xl/') else 'xl/' + target
+    sheets = []
+    with zf.open('xl/workbook.xml') as f:
+        for _, element in iterparse(f):
+            if element.tag == f'{_XLSX_NS}sheet':
+                sheets.append((element.get('name'), targets.get(element.get(f'{_XLSX_REL_NS}id'), '')))
+    return sheets
+
+
+def _xlsx_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    strings = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, element in iterparse(f):
+            if element.tag == f'{_XLSX_NS}si':
+                strings.append(''.join(t.text or '' for t in element.iter(f'{_XLSX_NS}t')))
+                element.clear()
+    return strings
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _iter_xlsx_rows(path: str, sheet: Optional[str]) -> Iterator[Tuple[int, Row]]:
+    with zipfile.ZipFile(path) as zf:
+        target = _select(_xlsx_sheets(zf), sheet, path)
+        shared = _xlsx_shared_strings(zf)
+        number = -1
+        with zf.open(target) as f:
+            for _, element in iterparse(f):
+                if element.tag != f'{_XLSX_NS}row':
+                    continue
+                row: Row = []
+                for position, cell in enumerate(element.iter(f'{_XLSX_NS}c')):
+                    match = _CELL_REF.match(cell.get('r', ''))
+                    col = _column_index(match.group(1)) if match else position
+                    kind = cell.get('t', 'n')
+                    value_node = cell.find(f'{_XLSX_NS}v')
+                    text = value_node.text if value_node is not None else None
+                    if kind == 'inlineStr':
+                        value: object = ''.join(t.text or '' for t in cell.iter(f'{_XLSX_NS}t'))
+                    elif text is None:
+                        continue
+                    elif kind == 's':
+                        value = shared[int(text)]
+                    elif kind == 'b':
+                        value = text == '1'
+                    elif kind in ('str', 'e'):
+                        value = text if kind == 'str' else None
+                    else:
+                        value = float(text)
+                    _place(row, col, value)
+                # El atributo r (número de fila) es optativo: sin él, las filas son consecutivas
+                number = int(element.get('r')) - 1 if element.get('r') else number + 1
+                element.clear()
+                if any(v not in (None, '') for v in row):
+                    yield number, row
@@ -1,11 +1,33 @@
-
-import dbf
+import logging
 import os
-from typing import List
+from typing import TYPE_CHECKING
 from domain.entities import Especie, Buque, Observador
+from infrastructure.instrumentation import count, span
+
+if TYPE_CHECKING:
+    from domain.catalog import CatalogTable
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(dbf_path: str):
+    """Lee el catálogo por columnas (NumPy se importa recién al leer el primer catálogo)."""
+    from infrastructure.dbf_reader import DbfColumns
+    return DbfColumns(dbf_path)
+
+
+def _text(values):
+    """Columna como texto sin espacios (los códigos numéricos del DBF también se tratan como texto)."""
+    import numpy as np
+    return np.char.strip(values.astype(str))
+
 
 class CatalogRepository:
-    """Repositorio para acceder a los catálogos desde archivos DBF."""
+    """Repositorio para acceder a los catálogos desde archivos DBF.
+
+    Cada catálogo se devuelve como una `CatalogTable` (por columnas, ordenada por nombre);
+    se recorre como una lista de entidades, que se arman recién al pedir cada fila.
+    """
 
     def __init__(self, base_path: str):
         """Inicializa el repositorio con la ruta base a la carpeta FoxPro."""
@@ -14,88 +36,81 @@ class CatalogRepository:
     def _get_full_path(self, file_name: str) -> str:
         return os.path.join(self.base_path, file_name)
 
-    def get_especies(self) -> List[Especie]:
-        """Lee Especies.dbf y devuelve una lista de entidades Especie."""
-        especies = []
-        dbf_path = self._get_full_path("Especies.dbf")
-        try:
-            table = dbf.Table(dbf_path, codepage='cp1252') # cp1252 es común para Windows en español
-            table.open(dbf.READ_ONLY)
-            for record in table:
-                try:
-                    codinidep = str(record.codinidep).strip()
-                    nom_vul_cas = str(record.nomvulcas).strip()
-                    nom_cient = str(record.nomcient).strip()
-                    if codinidep and nom_vul_cas and nom_cient:
-                        especies.append(Especie(
-                            codinidep=codinidep,
-                            nom_vul_cas=nom_vul_cas,
-                            nom_cient=nom_cient
-                        ))
-                except (dbf.FieldMissingError, AttributeError) as field_err:
-                    print(f"Advertencia: Campo faltante en {dbf_path}: {field_err}")
-                    continue # Salta al siguiente registro
-            table.close()
-        except Exception as e:
-            print(f"Error al leer {dbf_path}: {e}")
-        return sorted(especies, key=lambda x: x.nom_vul_cas)
-
-    def get_buques(self) -> List[Buque]:
-        """Lee 'Buques.DBF' y devuelve una lista de entidades Buque."""
-        buques = []
-        dbf_path = self._get_full_path("Buques.DBF")
-        try:
-            table = dbf.Table(dbf_path, codepage='cp1252')
-            table.open(dbf.READ_ONLY)
-            for record in table:
-                try:
-                    nombre = str(record.buque).strip()
-                    if not nombre: # El nombre es la clave principal, no puede estar vacío
-                        continue
-                    
-                    buques.append(Buque(
-                        nombre=nombre,
-                        buque_cod=str(record.buquecod).strip(),
-                        tipo_flota=str(record.tipo_flta).strip(),
-                        flota=str(record.flota).strip(),
-                        # Manejo robusto de conversión para campos numéricos
-                        eslora=float(str(record.eslora or 0).strip() or 0),
-                        pot_hp=int(float(str(record.pothp or 0).strip() or 0)),
-                        matricula=str(record.matbuq).strip()
-                    ))
-                except (dbf.FieldMissingError, AttributeError) as field_err:
-                    print(f"Advertencia: Campo faltante en {dbf_path}: {field_err}")
-                    continue
-                except (ValueError, TypeError) as type_err:
-                    print(f"Advertencia: Error de tipo en registro {record} de {dbf_path}: {type_err}")
-                    continue
-            table.close()
-        except Exception as e:
-            print(f"Error al leer {dbf_path}: {e}")
-        return sorted(buques, key=lambda x: x.nombre)
-
-    def get_observadores(self) -> List[Observador]:
-        """Lee 'Observadores.DBF' y devuelve una lista de entidades Observador."""
-        observadores = []
-        dbf_path = self._get_full_path("Observadores.DBF")
-        try:
-            table = dbf.Table(dbf_path, codepage='cp1252')
-            table.open(dbf.READ_ONLY)
-            for record in table:
-                try:
-                    obs_nro = str(record.obsnro).strip()
-                    apellido = str(record.obser).strip()
-                    nombre = str(record.obsnom).strip()
-                    if obs_nro and apellido:
-                        observadores.append(Observador(
-                            obs_nro=obs_nro,
-                            apellido=apellido,
-                            nombre=nombre
-                        ))
-                except (dbf.FieldMissingError, AttributeError) as field_err:
-                    print(f"Advertencia: Campo faltante en {dbf_path}: {field_err}")
-                    continue
-            table.close()
-        except Exception as e:
-            print(f"Error al leer {dbf_path}: {e}")
-        return sorted(observadores, key=lambda x: x.apellido)
+    @staticmethod
+    def _open_table(dbf_path: str):
+        """Lee un catálogo completo y contabiliza registros y bytes leídos."""
+        table = _columns(dbf_path)
+        count('catalogos.bytes_leidos', os.path.getsize(dbf_path))
+        count('catalogos.registros_leidos', table.num_rows)
+        return table
+
+    @staticmethod
+    def _skip_records(dbf_path: str, omitted: int, reason: str) -> None:
+        """Informa los registros descartados y los suma al contador del motivo."""
+        if omitted:
+            count(f'catalogos.registros_omitidos.{reason}', omitted)
+            logger.warning("%d registros omitidos en %s: %s", omitted, dbf_path, reason)
+
+    def _read(self, file_name: str, tramo_name: str, entity, build) -> 'CatalogTable':
+        """Lee `file_name` y arma el catálogo con `build(columnas, ruta)`; vacío si falla."""
+        from domain.catalog import CatalogTable
+        dbf_path = self._get_full_path(file_name)
+        with span(tramo_name) as tramo:
+            try:
+                catalog = build(self._open_table(dbf_path), dbf_path)
+            except KeyError as field_err:
+                logger.error("Campo faltante en %s: %s", dbf_path, field_err)
+                count('catalogos.registros_omitidos.FieldMissingError')
+                catalog = None
+            except Exception as e:
+                logger.error("Error al leer %s: %s", dbf_path, e)
+                catalog = None
+            if catalog is None:
+                catalog = CatalogTable.from_entities(entity, [])
+            tramo.set(registros=len(catalog))
+        return catalog
+
+    def get_especies(self) -> 'CatalogTable[Especie]':
+        """Lee Especies.dbf: especies con código y ambos nombres, ordenadas por nombre vulgar."""
+        from domain.catalog import CatalogTable
+
+        def build(table, dbf_path):
+            codinidep, nom_vul_cas, nom_cient = (_text(table[f]) for f in ('CODINIDEP', 'NOMVULCAS', 'NOMCIENT'))
+            keep = (codinidep != '') & (nom_vul_cas != '') & (nom_cient != '')
+            self._skip_records(dbf_path, int((~keep).sum()), 'campos_vacios')
+            return CatalogTable(Especie, {'codinidep': codinidep[keep], 'nom_vul_cas': nom_vul_cas[keep],
+                                          'nom_cient': nom_cient[keep]}, sort_by='nom_vul_cas')
+        return self._read("Especies.dbf", 'catalogos.especies', Especie, build)
+
+    def get_buques(self) -> 'CatalogTable[Buque]':
+        """Lee 'Buques.DBF' ordenado por nombre; flota y tipo de flota son categóricas."""
+        import numpy as np
+        from domain.catalog import CatalogTable
+
+        def build(table, dbf_path):
+            nombre = _text(table['BUQUE'])
+            # El nombre es la clave principal, no puede estar vacío
+            keep = nombre != ''
+            self._skip_records(dbf_path, int((~keep).sum()), 'campos_vacios')
+            return CatalogTable(Buque, {
+                'nombre': nombre[keep],
+                'buque_cod': _text(table['BUQUECOD'])[keep],
+                'tipo_flota': _text(table['TIPO_FLTA'])[keep],
+                'flota': _text(table['FLOTA'])[keep],
+                'eslora': np.asarray(table['ESLORA'], dtype=np.float64)[keep],
+                'pot_hp': np.asarray(table['POTHP'], dtype=np.float64)[keep].astype(np.int64),
+                'matricula': _text(table['MATBUQ'])[keep],
+            }, categorical=('tipo_flota', 'flota'), sort_by='nombre')
+        return self._read("Buques.DBF", 'catalogos.buques', Buque, build)
+
+    def get_observadores(self) -> 'CatalogTable[Observador]':
+        """Lee 'Observadores.DBF' ordenado por apellido."""
+        from domain.catalog import CatalogTable
+
+        def build(table, dbf_path):
+            obs_nro, apellido, nombre = (_text(table[f]) for f in ('OBSNRO', 'OBSER', 'OBSNOM'))
+            keep = (obs_nro != '') & (apellido != '')
+            self._skip_records(dbf_path, int((~keep).sum()), 'campos_vacios')
+            return CatalogTable(Observador, {'obs_nro': obs_nro[keep], 'apellido': apellido[keep],
+                                             'nombre': nombre[keep]}, sort_by='apellido')
+        return self._read("Observadores.DBF", 'catalogos.observadores', Observador, build)
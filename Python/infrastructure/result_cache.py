@@ -0,0 +1,181 @@
+"""Caché en disco de resultados de procesos, indexada por el contenido de la marea.
+
+La clave de cada resultado combina el hash de los DBF de entrada, los parámetros del
+proceso (etapas, especies) y la versión del código de los procesos, por lo que volver
+a ejecutar un control sobre archivos sin cambios devuelve el resultado guardado.
+"""
+import glob
+import hashlib
+import json
+import marshal
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import domain
+from domain.scheduler import TaskNode
+from infrastructure import dbf_reader
+
+# Incrementar si cambia el formato de los resultados guardados
+CACHE_FORMAT_VERSION = 1
+
+# Tamaño máximo por defecto de la caché en disco (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.pkl'
+
+
+def code_sources(nodes: Mapping[str, TaskNode]) -> List[str]:
+    """Archivos fuente de los que dependen los resultados: los módulos que definen cada
+    proceso, todo `domain/` (las funciones auxiliares que llaman) y el lector de DBF."""
+    paths = set(glob.glob(os.path.join(list(domain.__path__)[0], '*.py')))
+    paths.add(dbf_reader.__file__)
+    for node in nodes.values():
+        module = sys.modules.get(getattr(node.func, '__module__', None) or '')
+        if getattr(module, '__file__', None):
+            paths.add(module.__file__)
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def code_version(nodes: Mapping[str, TaskNode], sources: Optional[Iterable[str]] = None) -> str:
+    """Huella del código de los procesos y productos: cambia al modificar cualquiera de ellos
+    o cualquiera de los módulos de `code_sources` (por defecto)."""
+    digest = hashlib.sha1(str(CACHE_FORMAT_VERSION).encode())
+    for name in sorted(nodes):
+        node = nodes[name]
+        digest.update(name.encode('utf-8'))
+        digest.update(repr(node.deps).encode('utf-8'))
+        digest.update(marshal.dumps(node.func.__code__))
+    for path in (code_sources(nodes) if sources is None else sources):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Aciertos, fallos y desalojos desde que se abrió la caché."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size_bytes: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """Caché LRU de resultados en una carpeta, acotada por tamaño total.
+
+    Cada entrada es un archivo `<clave>.pkl`; la fecha de modificación registra el
+    último uso, así el orden LRU se conserva entre ejecuciones. Es segura para usar
+    desde varios hilos del ejecutor de procesos.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, version: str = ''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._entries: Optional[OrderedDict] = None  # clave -> tamaño, del menos al más usado
+        self._stats = CacheStats()
+
+    def key(self, name: str, input_hashes: Mapping[str, str], params: Mapping[str, Any]) -> str:
+        """Clave de un resultado: proceso, hash de cada archivo de entrada, parámetros y versión."""
+        payload = json.dumps({'proceso': name, 'entradas': dict(input_hashes), 'params': params,
+                              'version': self.version}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(True, resultado) si la clave está en caché; (False, None) si no."""
+        with self._lock:
+            entries = self._load_index()
+            path = self._entry_path(key)
+            if key in entries:
+                try:
+                    with open(path, 'rb') as f:
+                        value = pickle.load(f)
+                    os.utime(path)
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                    # Entrada dañada o que referencia clases que ya no existen: se descarta
+                    self._forget(key)
+                else:
+                    entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return True, value
+            self._stats.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        """Guarda un resultado y desaloja los menos usados si se supera el tamaño máximo."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            entries = self._load_index()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if key in entries:
+                self._stats.size_bytes -= entries[key]
+            entries[key] = len(data)
+            entries.move_to_end(key)
+            self._stats.size_bytes += len(data)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove_file(key)
+            self._entries = OrderedDict()
+            self._stats.size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries = self._load_index()
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions,
+                              self._stats.size_bytes, len(entries))
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def _load_index(self) -> OrderedDict:
+        """Índice LRU de las entradas existentes, leído de la carpeta la primera vez."""
+        if self._entries is None:
+            found = []
+            if os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(_ENTRY_SUFFIX):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime_ns, entry.name[:-len(_ENTRY_SUFFIX)], stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._stats.size_bytes = sum(size for _, _, size in found)
+        return self._entries
+
+    def _evict(self) -> None:
+        while self._stats.size_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._forget(oldest)
+            self._stats.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        self._stats.size_bytes -= self._entries.pop(key, 0)
+        self._remove_file(key)
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass  # Otro proceso del lote ya la desalojó
@@ -0,0 +1,325 @@
+"""Almacén de temporada: capturas, lances, tallas, producción y submuestras biológicas de
+muchas mareas en una base SQLite indexada, para consultas por año, especie y buque sin releer los DBF.
+
+La ingesta es incremental: cada archivo se registra con su fecha de modificación,
+tamaño y hash, y sólo se vuelven a cargar los archivos nuevos o modificados.
+"""
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain import marea_procesos  # noqa: F401  (registra los productos de la marea)
+from domain.columnar import Table
+from domain.marea_dataset import MareaDataset
+from domain.procesos import process_graph
+from domain.scheduler import DagScheduler
+from infrastructure.dbf_reader import DbfColumns
+from infrastructure.file_hashing import file_digest, file_signature
+from infrastructure.marea_files import parse_marea_file_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archivos (
+    id INTEGER PRIMARY KEY,
+    ruta TEXT UNIQUE NOT NULL,
+    directorio TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    marea INTEGER NOT NULL,
+    anio INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamano INTEGER NOT NULL,
+    registros INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lances (
+    archivo_id INTEGER NOT NULL, anio INTEGER, marea INTEGER, buque TEXT, lance INTEGER,
+    fecha TEXT, horas REAL, latitud REAL, longitud REAL
+);
+CREATE TABLE IF NOT EXISTS capturas (
+    archivo_id INTEGER NOT NULL, anio INTEGER, marea INTEGER, buque TEXT, lance INTEGER,
+    fecha TEXT, especie INTEGER, kg REAL, descarte REAL
+);
+CREATE TABLE IF NOT EXISTS tallas (
+    archivo_id INTEGER NOT NULL, tipo TEXT, anio INTEGER, marea INTEGER, buque TEXT, lance INTEGER,
+    fecha TEXT, especie INTEGER, talla INTEGER, machos INTEGER, hembras INTEGER,
+    indeterminados INTEGER, total INTEGER
+);
+CREATE TABLE IF NOT EXISTS produccion (
+    archivo_id INTEGER NOT NULL, anio INTEGER, marea INTEGER, buque TEXT, fecha TEXT,
+    especie TEXT, producto TEXT, categoria TEXT, factor REAL, kilos REAL
+);
+CREATE TABLE IF NOT EXISTS submuestras (
+    archivo_id INTEGER NOT NULL, anio INTEGER, marea INTEGER, buque TEXT, lance INTEGER,
+    fecha TEXT, especie TEXT, ejemplar INTEGER, largo INTEGER, peso REAL, sexo INTEGER,
+    estadio INTEGER, edad INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_lances_anio_buque ON lances (anio, buque);
+CREATE INDEX IF NOT EXISTS ix_lances_archivo ON lances (archivo_id);
+CREATE INDEX IF NOT EXISTS ix_capturas_anio_especie ON capturas (anio, especie);
+CREATE INDEX IF NOT EXISTS ix_capturas_anio_buque ON capturas (anio, buque);
+CREATE INDEX IF NOT EXISTS ix_capturas_archivo ON capturas (archivo_id);
+CREATE INDEX IF NOT EXISTS ix_tallas_anio_especie ON tallas (anio, especie, talla);
+CREATE INDEX IF NOT EXISTS ix_tallas_archivo ON tallas (archivo_id);
+CREATE INDEX IF NOT EXISTS ix_produccion_anio_especie ON produccion (anio, especie);
+CREATE INDEX IF NOT EXISTS ix_produccion_archivo ON produccion (archivo_id);
+CREATE INDEX IF NOT EXISTS ix_submuestras_anio_especie ON submuestras (anio, especie);
+CREATE INDEX IF NOT EXISTS ix_submuestras_archivo ON submuestras (archivo_id);
+"""
+
+# Tablas del almacén que se cargan desde cada tipo de archivo de marea
+_STORE_TABLES = {
+    'captura': ('lances', 'capturas'),
+    'muestra': ('tallas',),
+    'muestra_descarte': ('tallas',),
+    'produccion': ('produccion',),
+    'submuestra': ('submuestras',),
+}
+
+
+@dataclass
+class IngestReport:
+    """Resultado de una ingesta: rutas agrupadas según lo que se hizo con cada archivo."""
+    nuevos: List[str] = field(default_factory=list)
+    actualizados: List[str] = field(default_factory=list)
+    sin_cambios: List[str] = field(default_factory=list)
+    eliminados: List[str] = field(default_factory=list)
+    errores: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def cargados(self) -> List[str]:
+        return self.nuevos + self.actualizados
+
+
+def _sql_values(values: np.ndarray) -> list:
+    """Convierte una columna NumPy en valores de Python aceptados por sqlite3."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return [None if v == 'NaT' else v for v in values.astype('datetime64[D]').astype(str).tolist()]
+    return values.tolist()
+
+
+def _rows(archivo_id: int, columns: Sequence[np.ndarray]) -> Iterable[tuple]:
+    n = len(columns[0]) if columns else 0
+    return zip([archivo_id] * n, *(_sql_values(np.asarray(c)) for c in columns))
+
+
+def _extract_tables(path: str, kind: str, num_marea: str, anio_marea: str) -> Dict[str, Tuple[list, list]]:
+    """Filas de las tablas del almacén para un archivo: tabla -> (columnas, arreglos)."""
+    source = DbfColumns(path)
+    dataset = MareaDataset(num_marea, anio_marea, None, {kind: source}, {kind: path})
+    marea, anio = int(num_marea), int(anio_marea)
+    n = source.num_rows
+    if not n:
+        return {}
+    buques = source['BARCO'] if 'BARCO' in source else np.full(n, '')
+    extracted = {}
+
+    if kind == 'captura':
+        products = DagScheduler(process_graph(), max_workers=0).run(
+            ['lances', 'captura_larga', 'posiciones'], dataset)
+        lances, larga, pos = products['lances'], products['captura_larga'], products['posiciones']
+        extracted['lances'] = (
+            ['anio', 'marea', 'buque', 'lance', 'fecha', 'horas', 'latitud', 'longitud'],
+            [np.full(n, anio), np.full(n, marea), buques, lances['lance'], lances['fecha'],
+             lances['horas'], pos['lat_inic'], pos['long_inic']])
+        if larga:
+            m = len(larga['fila'])
+            extracted['capturas'] = (
+                ['anio', 'marea', 'buque', 'lance', 'fecha', 'especie', 'kg', 'descarte'],
+                [np.full(m, anio), np.full(m, marea), buques[larga['fila']], larga['lance'], larga['fecha'],
+                 larga['especie'], larga['kg'], larga['descarte']])
+    elif kind in ('muestra', 'muestra_descarte'):
+        # El producto 'tallas' lee la tabla 'muestra'; el descarte tiene el mismo formato
+        if kind == 'muestra_descarte':
+            dataset = MareaDataset(num_marea, anio_marea, None, {'muestra': source}, {'muestra': path})
+        tallas = DagScheduler(process_graph(), max_workers=0).run(['tallas'], dataset)['tallas']
+        if tallas:
+            m = len(tallas['fila'])
+            extracted['tallas'] = (
+                ['tipo', 'anio', 'marea', 'buque', 'lance', 'fecha', 'especie', 'talla',
+                 'machos', 'hembras', 'indeterminados', 'total'],
+                [np.full(m, kind), np.full(m, anio), np.full(m, marea), buques[tallas['fila']],
+                 tallas['lance'], tallas['fecha'], tallas['especie'], tallas['talla'], tallas['machos'],
+                 tallas['hembras'], tallas['indeterminados'], tallas['total']])
+    elif kind == 'produccion':
+        extracted['produccion'] = (
+            ['anio', 'marea', 'buque', 'fecha', 'especie', 'producto', 'categoria', 'factor', 'kilos'],
+            [np.full(n, anio), np.full(n, marea), buques, source['FECHA'], source['ESPECIE'],
+             source['PRODUCTO'], source['CATEGORIA'], source['FACTOR'], source['KILOS']])
+    elif kind == 'submuestra':
+        # Los ejemplares se identifican por el nombre científico, no por código de especie
+        extracted['submuestras'] = (
+            ['anio', 'marea', 'buque', 'lance', 'fecha', 'especie', 'ejemplar', 'largo', 'peso',
+             'sexo', 'estadio', 'edad'],
+            [np.full(n, anio), np.full(n, marea), buques, source['LANCE'], source['FECHA'],
+             np.char.strip(source['ESPECIE'].astype(str)), source['NEJEMPLAR'], source['LARGO_TOT'],
+             source['PESO_TOT'], source['SEXO'], source['ESTADIO'], source['EDAD']])
+    return extracted
+
+
+class SeasonStore:
+    """Base SQLite con los datos de todas las mareas de una o más temporadas."""
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'SeasonStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingesta
+    # ------------------------------------------------------------------
+
+    def ingest_directory(self, data_dir: str, log: Optional[Callable[[str], None]] = None) -> IngestReport:
+        """Carga los archivos de marea nuevos o modificados de una carpeta.
+
+        Los archivos registrados que ya no existen en la carpeta se quitan del almacén.
+        """
+        report = IngestReport()
+        directorio = os.path.abspath(data_dir)
+        presentes = set()
+        for entry in sorted(os.listdir(directorio)):
+            parsed = parse_marea_file_name(entry)
+            if not parsed or parsed[0] not in _STORE_TABLES:
+                continue
+            path = os.path.join(directorio, entry)
+            presentes.add(path)
+            try:
+                estado = self.ingest_file(path, *parsed)
+            except (OSError, ValueError, KeyError) as e:
+                report.errores[path] = str(e)
+                continue
+            getattr(report, estado).append(path)
+            if log and estado != 'sin_cambios':
+                log(f"{entry}: {estado.replace('_', ' ')}")
+
+        registrados = self._conn.execute(
+            "SELECT id, ruta FROM archivos WHERE directorio = ?", (directorio,)).fetchall()
+        for archivo_id, ruta in registrados:
+            if ruta not in presentes:
+                with self._conn:
+                    self._delete_file_rows(archivo_id)
+                    self._conn.execute("DELETE FROM archivos WHERE id = ?", (archivo_id,))
+                report.eliminados.append(ruta)
+        return report
+
+    def ingest_file(self, path: str, kind: str, num_marea: str, anio_marea: str) -> str:
+        """Carga un archivo si cambió; devuelve 'nuevos', 'actualizados' o 'sin_cambios'."""
+        path = os.path.abspath(path)
+        mtime_ns, tamano = file_signature(path)
+        previo = self._conn.execute(
+            "SELECT id, sha1, mtime_ns, tamano FROM archivos WHERE ruta = ?", (path,)).fetchone()
+        if previo and previo[2] == mtime_ns and previo[3] == tamano:
+            return 'sin_cambios'
+
+        sha1 = file_digest(path)
+        if previo and previo[1] == sha1:
+            # Sólo cambió la fecha de modificación (archivo copiado o guardado sin cambios)
+            with self._conn:
+                self._conn.execute("UPDATE archivos SET mtime_ns = ?, tamano = ? WHERE id = ?",
+                                   (mtime_ns, tamano, previo[0]))
+            return 'sin_cambios'
+
+        tablas = _extract_tables(path, kind, num_marea, anio_marea)
+        registros = sum(len(arrays[0]) for _, arrays in tablas.values())
+        with self._conn:
+            if previo:
+                archivo_id = previo[0]
+                self._delete_file_rows(archivo_id)
+                self._conn.execute(
+                    "UPDATE archivos SET sha1 = ?, mtime_ns = ?, tamano = ?, registros = ? WHERE id = ?",
+                    (sha1, mtime_ns, tamano, registros, archivo_id))
+            else:
+                archivo_id = self._conn.execute(
+                    "INSERT INTO archivos (ruta, directorio, tipo, marea, anio, sha1, mtime_ns, tamano, registros)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, os.path.dirname(path), kind, int(num_marea), int(anio_marea), sha1, mtime_ns,
+                     tamano, registros)).lastrowid
+            for tabla, (columnas, arrays) in tablas.items():
+                placeholders = ', '.join('?' * (len(columnas) + 1))
+                self._conn.executemany(
+                    f"INSERT INTO {tabla} (archivo_id, {', '.join(columnas)}) VALUES ({placeholders})",
+                    _rows(archivo_id, arrays))
+        return 'actualizados' if previo else 'nuevos'
+
+    def _delete_file_rows(self, archivo_id: int) -> None:
+        for tabla in ('lances', 'capturas', 'tallas', 'produccion', 'submuestras'):
+            self._conn.execute(f"DELETE FROM {tabla} WHERE archivo_id = ?", (archivo_id,))
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, params: Sequence = ()) -> Table:
+        """Ejecuta una consulta y devuelve el resultado como tabla de columnas."""
+        cursor = self._conn.execute(sql, tuple(params))
+        columnas = [d[0] for d in cursor.description]
+        filas = cursor.fetchall()
+        if not filas:
+            return {c: np.array([]) for c in columnas}
+        return {c: np.array(valores) for c, valores in zip(columnas, zip(*filas))}
+
+    def mareas(self, anio: Optional[int] = None) -> Table:
+        """Mareas cargadas (marea, año, buque, lances)."""
+        sql = "SELECT marea, anio, MIN(buque) AS buque, COUNT(*) AS lances FROM lances"
+        params: list = []
+        if anio is not None:
+            sql += " WHERE anio = ?"
+            params.append(int(anio))
+        return self.query(sql + " GROUP BY anio, marea ORDER BY anio, marea", params)
+
+    def captura_por_especie(self, anio: int, buques: Optional[Sequence[str]] = None) -> Table:
+        """Kilos, descarte, lances y mareas por especie en un año, opcionalmente para algunos buques."""
+        where, params = self._filters(anio, buques=buques)
+        return self.query(
+            "SELECT especie, SUM(kg) AS kilos, SUM(descarte) AS descarte, COUNT(*) AS lances,"
+            " COUNT(DISTINCT marea) AS mareas FROM capturas" + where +
+            " GROUP BY especie ORDER BY kilos DESC", params)
+
+    def distribucion_tallas(self, anio: int, especie: int, buques: Optional[Sequence[str]] = None,
+                            tipo: str = 'muestra') -> Table:
+        """Ejemplares por talla y sexo de una especie en todas las mareas del año."""
+        where, params = self._filters(anio, especie=especie, buques=buques)
+        return self.query(
+            "SELECT talla, SUM(machos) AS machos, SUM(hembras) AS hembras,"
+            " SUM(indeterminados) AS indeterminados, SUM(total) AS total FROM tallas" + where +
+            " AND tipo = ? GROUP BY talla ORDER BY talla", params + [tipo])
+
+    def produccion_por_especie(self, anio: int, buques: Optional[Sequence[str]] = None) -> Table:
+        """Kilos de producción por especie y producto en un año."""
+        where, params = self._filters(anio, buques=buques)
+        return self.query(
+            "SELECT especie, producto, SUM(kilos) AS kilos, COUNT(DISTINCT marea) AS mareas FROM produccion"
+            + where + " GROUP BY especie, producto ORDER BY especie, producto", params)
+
+    def maduracion(self, anio: int, especie: str, buques: Optional[Sequence[str]] = None) -> Table:
+        """Ejemplares submuestreados de una especie (nombre científico) por sexo y estadio, con su largo medio."""
+        where, params = self._filters(anio, buques=buques)
+        return self.query(
+            "SELECT sexo, estadio, COUNT(*) AS ejemplares, AVG(largo) AS largo_medio FROM submuestras"
+            + where + " AND especie = ? GROUP BY sexo, estadio ORDER BY sexo, estadio",
+            params + [especie.strip()])
+
+    @staticmethod
+    def _filters(anio: int, especie: Optional[int] = None,
+                 buques: Optional[Sequence[str]] = None) -> Tuple[str, list]:
+        """Condiciones WHERE sobre las columnas indexadas (año, especie, buque)."""
+        where, params = " WHERE anio = ?", [int(anio)]
+        if especie is not None:
+            where += " AND especie = ?"
+            params.append(int(especie))
+        if buques:
+            where += f" AND buque IN ({', '.join('?' * len(buques))})"
+            params.extend(buques)
+        return where, params
@@ -0,0 +1,163 @@
+"""Espacio de trabajo con varias mareas abiertas.
+
+Cada marea guarda su estado (número, año, observador, buque, etapas y especies) en
+un archivo chico propio, `marea_<id>.json`. Un índice compacto (`indice.json`) lista
+todas las mareas con lo necesario para mostrarlas y elegirlas, y recuerda la marea
+activa, así listar o cambiar de marea no obliga a abrir todos los archivos.
+"""
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+INDEX_FILE = "indice.json"
+# Campos del estado de una marea que se copian al índice
+INDEX_FIELDS = ('num_marea', 'anio_marea', 'buque_cod')
+MAREA_FIELDS = ('num_marea', 'anio_marea', 'observador_cod', 'buque_cod', 'etapas', 'especies')
+
+
+@dataclass
+class WorkspaceEntry:
+    """Fila del índice: identifica una marea y alcanza para mostrarla en el selector."""
+    id: str
+    num_marea: str = ""
+    anio_marea: str = ""
+    buque_cod: Optional[str] = None
+    actualizado: str = ""
+
+    @property
+    def display_name(self) -> str:
+        """Formato: marea/año (o "Marea nueva" si todavía no tiene número)."""
+        if not self.num_marea:
+            return "Marea nueva"
+        return f"{self.num_marea}/{self.anio_marea}" if self.anio_marea else self.num_marea
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Escribe en un temporal y lo reemplaza, para no dejar archivos a medio escribir."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class MareaWorkspace:
+    """Mareas abiertas en una carpeta: un archivo de estado por marea y un índice."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._entries: Dict[str, WorkspaceEntry] = {}
+        self.active_id: Optional[str] = None
+        self._load_index()
+
+    def _marea_path(self, marea_id: str) -> str:
+        return os.path.join(self.directory, f"marea_{marea_id}.json")
+
+    def _load_index(self) -> None:
+        data = _read_json(os.path.join(self.directory, INDEX_FILE))
+        if isinstance(data, dict) and isinstance(data.get('mareas'), list):
+            for row in data['mareas']:
+                try:
+                    entry = WorkspaceEntry(**row)
+                except TypeError:
+                    continue
+                if os.path.exists(self._marea_path(entry.id)):
+                    self._entries[entry.id] = entry
+            self.active_id = data.get('activa') if data.get('activa') in self._entries else None
+        elif os.path.isdir(self.directory):
+            self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Sin índice (o dañado) se reconstruye leyendo los archivos de cada marea."""
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith('marea_') and name.endswith('.json'):
+                marea_id = name[len('marea_'):-len('.json')]
+                state = _read_json(os.path.join(self.directory, name))
+                if isinstance(state, dict):
+                    self._entries[marea_id] = self._entry_for(marea_id, state)
+        if self._entries:
+            self._save_index()
+
+    @staticmethod
+    def _entry_for(marea_id: str, state: Dict[str, Any]) -> WorkspaceEntry:
+        return WorkspaceEntry(marea_id, num_marea=state.get('num_marea') or "",
+                              anio_marea=state.get('anio_marea') or "",
+                              buque_cod=state.get('buque_cod'),
+                              actualizado=datetime.now().isoformat(timespec='seconds'))
+
+    def _save_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json(os.path.join(self.directory, INDEX_FILE),
+                    {'activa': self.active_id, 'mareas': [asdict(e) for e in self._entries.values()]})
+
+    def entries(self) -> List[WorkspaceEntry]:
+        """Mareas del espacio de trabajo, ordenadas por año y número (sólo lee el índice)."""
+        def key(entry: WorkspaceEntry):
+            num = entry.num_marea
+            return (entry.anio_marea, int(num) if num.isdigit() else float('inf'), num, entry.id)
+        return sorted(self._entries.values(), key=key)
+
+    def entry(self, marea_id: str) -> Optional[WorkspaceEntry]:
+        return self._entries.get(marea_id)
+
+    def find(self, num_marea: str, anio_marea: str) -> Optional[WorkspaceEntry]:
+        """Marea con ese número y año, si ya está en el espacio de trabajo."""
+        for entry in self._entries.values():
+            if entry.num_marea == num_marea and entry.anio_marea == anio_marea:
+                return entry
+        return None
+
+    def create(self, state: Optional[Dict[str, Any]] = None) -> str:
+        """Agrega una marea (vacía o con `state`), la activa y devuelve su id."""
+        marea_id = uuid.uuid4().hex[:12]
+        self._entries[marea_id] = WorkspaceEntry(marea_id)
+        self.active_id = marea_id
+        self.save(marea_id, state or {})
+        return marea_id
+
+    def load(self, marea_id: str) -> Dict[str, Any]:
+        """Estado guardado de una marea ({} si su archivo no se puede leer)."""
+        state = _read_json(self._marea_path(marea_id))
+        return state if isinstance(state, dict) else {}
+
+    def save(self, marea_id: str, state: Dict[str, Any]) -> None:
+        """Guarda el estado de la marea; el índice se reescribe sólo si cambió lo que muestra."""
+        state = {name: state.get(name) for name in MAREA_FIELDS if name in state}
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json(self._marea_path(marea_id), state)
+        previous = self._entries.get(marea_id)
+        entry = self._entry_for(marea_id, state)
+        if previous is None or any(getattr(previous, f) != getattr(entry, f) for f in INDEX_FIELDS):
+            self._entries[marea_id] = entry
+            self._save_index()
+
+    def activate(self, marea_id: str) -> Dict[str, Any]:
+        """Marca la marea como activa y devuelve su estado."""
+        if marea_id not in self._entries:
+            raise KeyError(marea_id)
+        if self.active_id != marea_id:
+            self.active_id = marea_id
+            self._save_index()
+        return self.load(marea_id)
+
+    def remove(self, marea_id: str) -> None:
+        """Quita una marea del espacio de trabajo (no toca sus archivos DBF)."""
+        if self._entries.pop(marea_id, None) is None:
+            return
+        try:
+            os.remove(self._marea_path(marea_id))
+        except OSError:
+            pass
+        if self.active_id == marea_id:
+            self.active_id = None
+        self._save_index()
@@ -1,12 +1,23 @@
+import json
 import sys
 import os
+import time
+
+# Referencia para medir el tiempo hasta el primer pintado (antes de importar Qt)
+_INICIO = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication
 from util import resource_path
 from infrastructure import config_manager
+from infrastructure.instrumentation import INSTRUMENTATION, span
 
 # Importar la ventana principal desde la capa de presentación
 from presentation.main_window import MainWindow
 
+# Con esta variable definida la aplicación informa sus tiempos de inicio en JSON y se cierra
+ENV_MEDIR_INICIO = 'CONTROL_MAREAS_MEDIR_INICIO'
+
+
 def load_stylesheet(path):
     """Carga un archivo de stylesheet QSS."""
     try:
@@ -16,7 +27,26 @@ def load_stylesheet(path):
         print(f"Advertencia: No se encontró el archivo de estilos en {path}")
         return ""
 
-if __name__ == "__main__":
+
+def _report_startup(window: MainWindow, app: QApplication) -> None:
+    """Imprime los milisegundos hasta el primer pintado y hasta tener catálogos y estado cargados."""
+    tiempos = {}
+
+    def marcar(nombre):
+        tiempos[nombre] = round((time.perf_counter() - _INICIO) * 1000, 1)
+        if 'listo_ms' in tiempos and 'primer_pintado_ms' in tiempos:
+            print(json.dumps(tiempos), flush=True)
+            app.quit()
+
+    window.first_painted.connect(lambda: marcar('primer_pintado_ms'))
+    window.startup_completed.connect(lambda: marcar('listo_ms'))
+
+
+def main() -> int:
+    # Instrumentación (desactivada salvo CONTROL_MAREAS_DIAGNOSTICO=1 o desde el diálogo de diagnóstico)
+    INSTRUMENTATION.configure(log_path=config_manager.get_diagnostics_log_path(),
+                              profile_dir=config_manager.get_profiles_path())
+
     # Crear la aplicación
     app = QApplication(sys.argv)
 
@@ -32,9 +62,16 @@ if __name__ == "__main__":
     style_sheet = load_stylesheet(style_path)
     app.setStyleSheet(style_sheet)
 
-    # Crear y mostrar la ventana principal
-    window = MainWindow()
-    window.show()
+    # Crear y mostrar la ventana principal; catálogos y estado se cargan tras el primer pintado
+    with span('inicio.ventana_principal'):
+        window = MainWindow(defer_startup=True)
+        if os.environ.get(ENV_MEDIR_INICIO):
+            _report_startup(window, app)
+        window.show()
 
     # Ejecutar el bucle de eventos de la aplicación
-    sys.exit(app.exec())
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
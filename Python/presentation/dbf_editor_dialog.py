@@ -0,0 +1,210 @@
+from typing import Dict, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView,
+    QComboBox, QLineEdit, QPushButton, QLabel, QMessageBox
+)
+
+from infrastructure.edit_journal import EditJournal
+from presentation.dbf_table_model import DbfTableModel
+
+# Columnas que quedan fijas a la izquierda mientras se recorren los demás campos
+PINNED_FIELDS = ('LANCE', 'FECHA')
+
+KIND_LABELS = {'captura': "Captura (C)", 'muestra': "Muestras (M)", 'muestra_descarte': "Muestras descarte (D)",
+               'produccion': "Producción (P)", 'submuestra': "Submuestras (S)"}
+
+
+class DbfEditorDialog(QDialog):
+    """Revisión y edición de los archivos de una marea ("Edita archivo completo").
+
+    Las filas se leen a medida que se recorren y sólo se decodifican las celdas visibles
+    (`DbfTableModel`); LANCE y FECHA quedan fijas a la izquierda. Las ediciones pasan por
+    el diario del archivo: se deshacen, y si se cierra sin guardar quedan pendientes para
+    la próxima vez.
+    """
+
+    def __init__(self, files: Dict[str, str], parent=None):
+        super().__init__(parent)
+        self.files = files
+        self.journal: Optional[EditJournal] = None
+        self.model: Optional[DbfTableModel] = None
+        self.saved = False
+        self.setWindowTitle("Editar archivos de la marea")
+        self.resize(980, 600)
+
+        layout = QVBoxLayout(self)
+        barra = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        for kind in files:
+            self.kind_combo.addItem(KIND_LABELS.get(kind, kind), kind)
+        self.kind_combo.currentIndexChanged.connect(lambda _i: self.open_kind(self.kind_combo.currentData()))
+        self.filter_field = QComboBox()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtro: valor, >100, <=5, dd/mm/aaaa o parte del texto")
+        self.filter_edit.returnPressed.connect(self.apply_filter)
+        filter_btn = QPushButton("Filtrar")
+        filter_btn.clicked.connect(self.apply_filter)
+        barra.addWidget(QLabel("Archivo:"))
+        barra.addWidget(self.kind_combo)
+        barra.addSpacing(12)
+        barra.addWidget(QLabel("Campo:"))
+        barra.addWidget(self.filter_field)
+        barra.addWidget(self.filter_edit, 1)
+        barra.addWidget(filter_btn)
+        layout.addLayout(barra)
+
+        tablas = QHBoxLayout()
+        tablas.setSpacing(0)
+        self.pinned_view = QTableView()
+        self.table_view = QTableView()
+        for view in (self.pinned_view, self.table_view):
+            view.setSelectionBehavior(QAbstractItemView.SelectItems)
+            view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+            view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+            view.horizontalHeader().setSectionsClickable(True)
+            view.horizontalHeader().setSortIndicatorShown(True)
+            view.horizontalHeader().sortIndicatorChanged.connect(self._sort)
+            view.verticalHeader().setDefaultSectionSize(22)
+            view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.pinned_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.pinned_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.verticalScrollBar().valueChanged.connect(self.pinned_view.verticalScrollBar().setValue)
+        self.pinned_view.verticalScrollBar().valueChanged.connect(self.table_view.verticalScrollBar().setValue)
+        tablas.addWidget(self.pinned_view)
+        tablas.addWidget(self.table_view, 1)
+        layout.addLayout(tablas, 1)
+
+        botones = QHBoxLayout()
+        self.status_label = QLabel()
+        self.undo_btn = QPushButton("Deshacer")
+        self.undo_btn.clicked.connect(self.undo)
+        self.redo_btn = QPushButton("Rehacer")
+        self.redo_btn.clicked.connect(self.redo)
+        self.save_btn = QPushButton("Guardar")
+        self.save_btn.clicked.connect(self.save)
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        botones.addWidget(self.status_label, 1)
+        for button in (self.undo_btn, self.redo_btn, self.save_btn, close_btn):
+            botones.addWidget(button)
+        layout.addLayout(botones)
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+        QShortcut(QKeySequence.Save, self, activated=self.save)
+
+        if files:
+            self.open_kind(next(iter(files)))
+
+    # -- archivo -------------------------------------------------------------
+
+    def open_kind(self, kind: str) -> None:
+        """Muestra otro archivo de la marea; las ediciones del anterior quedan en su diario."""
+        path = self.files[kind]
+        try:
+            journal = EditJournal(path)
+        except ValueError as e:
+            reply = QMessageBox.question(self, "Editar archivos",
+                                         f"{e}.\n¿Descartar las ediciones pendientes y abrir el archivo actual?")
+            if reply != QMessageBox.Yes:
+                return
+            journal = EditJournal(path, recover=False)
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = journal
+        self.model = DbfTableModel(journal, self)
+        self.table_view.ensurePolished()
+        self.model.set_palette(self.table_view.palette())
+        self.model.journal_changed.connect(self._update_status)
+        self.model.edit_rejected.connect(lambda message: QMessageBox.warning(self, "Valor inválido", message))
+        self.model.modelReset.connect(self._configure_columns)
+        self.model.modelReset.connect(self._update_status)
+        self.pinned_view.setModel(self.model)
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionModel(self.pinned_view.selectionModel())
+        self._configure_columns()
+        self.filter_field.clear()
+        self.filter_field.addItems([f.name for f in self.model.fields])
+        self.filter_edit.clear()
+        if self.kind_combo.currentData() != kind:
+            self.kind_combo.blockSignals(True)
+            self.kind_combo.setCurrentIndex(self.kind_combo.findData(kind))
+            self.kind_combo.blockSignals(False)
+        self._update_status()
+
+    def pinned_columns(self):
+        return [self.model.column_index(name) for name in PINNED_FIELDS
+                if name in [f.name for f in self.model.fields]]
+
+    def _configure_columns(self) -> None:
+        pinned = set(self.pinned_columns())
+        for column in range(self.model.columnCount()):
+            self.pinned_view.setColumnHidden(column, column not in pinned)
+            self.table_view.setColumnHidden(column, column in pinned)
+        self.pinned_view.resizeColumnsToContents()
+        ancho = sum(self.pinned_view.columnWidth(c) for c in pinned) + self.pinned_view.verticalHeader().width() + 4
+        self.pinned_view.setFixedWidth(max(ancho, 60))
+
+    # -- acciones ------------------------------------------------------------
+
+    def apply_filter(self) -> None:
+        if self.model is None:
+            return
+        try:
+            self.model.set_filter(self.filter_field.currentText(), self.filter_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Filtro inválido", str(e))
+
+    def _sort(self, column: int, order) -> None:
+        if self.model is not None:
+            self.model.sort(column, order)
+
+    def undo(self) -> None:
+        if self.model is not None:
+            self.model.undo()
+
+    def redo(self) -> None:
+        if self.model is not None:
+            self.model.redo()
+
+    def save(self) -> None:
+        if self.model is None or not self.journal.dirty:
+            return
+        try:
+            cambios = self.model.save()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error al guardar", str(e))
+            return
+        self.saved = True
+        self.status_label.setText(f"{cambios} celdas guardadas")
+
+    def _update_status(self) -> None:
+        if self.model is None:
+            return
+        total = self.journal.num_rows
+        visibles = self.model.total_rows()
+        texto = f"{visibles} de {total} registros" if visibles != total else f"{total} registros"
+        if self.journal.dirty:
+            texto += f" · {self.journal.edited_cells} celdas sin guardar"
+        self.status_label.setText(texto)
+        self.undo_btn.setEnabled(self.journal.can_undo)
+        self.redo_btn.setEnabled(self.journal.can_redo)
+        self.save_btn.setEnabled(self.journal.dirty)
+
+    def done(self, result: int) -> None:
+        if self.journal is not None and self.journal.dirty:
+            reply = QMessageBox.question(
+                self, "Editar archivos",
+                f"Hay {self.journal.edited_cells} celdas sin guardar. ¿Guardarlas ahora?\n"
+                "(Si no, quedan pendientes y se recuperan al volver a abrir el archivo)",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+            if reply == QMessageBox.Cancel:
+                return
+            if reply == QMessageBox.Yes:
+                self.save()
+        if self.journal is not None:
+            self.journal.close()
+        super().done(result)
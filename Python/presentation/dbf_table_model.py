@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor, QPalette
+
+from infrastructure.dbf_reader import DbfField
+from infrastructure.edit_journal import EditJournal
+
+# Filas que se agregan a la vista con cada fetchMore
+FETCH_ROWS = 500
+# Filas que se decodifican juntas de un campo, y bloques decodificados que se conservan
+BLOCK_ROWS = 128
+CACHE_BLOCKS = 1024
+
+# Fondo de las celdas editadas según el tema (claro u oscuro) de la tabla que las muestra
+EDITED_CELL_COLORS = {'light': QColor(255, 243, 176), 'dark': QColor(112, 92, 24)}
+
+
+def _parse(text: str, field: DbfField) -> Any:
+    """Valor de un campo a partir del texto escrito en la celda (ValueError si no corresponde)."""
+    text = str(text).strip()
+    if field.type in ('N', 'F'):
+        value = float(text.replace(',', '.')) if text else 0.0
+        return value if field.decimals else int(round(value))
+    if field.type == 'D':
+        if not text:
+            return np.datetime64('NaT')
+        for formato in ('%d/%m/%Y', '%Y-%m-%d'):
+            try:
+                return np.datetime64(datetime.strptime(text, formato).date(), 'D')
+            except ValueError:
+                pass
+        raise ValueError(f"Fecha inválida: {text} (dd/mm/aaaa)")
+    if field.type == 'L':
+        return text.upper() in ('T', 'S', 'Y', '1', 'VERDADERO')
+    return text
+
+
+def _format(value: Any, field: DbfField) -> str:
+    if field.type in ('N', 'F'):
+        return f"{value:.{field.decimals}f}" if field.decimals else str(int(value))
+    if field.type == 'D':
+        return '' if np.isnat(value) else value.astype(datetime).strftime('%d/%m/%Y')
+    if field.type == 'L':
+        return 'T' if value else 'F'
+    return str(value)
+
+
+class DbfTableModel(QAbstractTableModel):
+    """Vista editable de un DBF a través de su diario de ediciones (`EditJournal`).
+
+    Las filas se agregan de a `FETCH_ROWS` con canFetchMore/fetchMore y sólo se decodifican
+    los bloques de celdas que se muestran. Filtro y orden son arreglos de índices de
+    registros: no copian la tabla. Las ediciones van al diario y se pueden deshacer.
+    """
+
+    # Mensaje de una edición rechazada (valor que no entra en el campo o con formato inválido)
+    edit_rejected = Signal(str)
+    # Cambió la cantidad de celdas editadas sin guardar
+    journal_changed = Signal()
+
+    def __init__(self, journal: EditJournal, parent=None):
+        super().__init__(parent)
+        self.journal = journal
+        self.fields = list(journal.header.fields)
+        self._filtered: Optional[np.ndarray] = None
+        self._sort: Optional[tuple] = None
+        self._order: Optional[np.ndarray] = None
+        self._loaded = min(FETCH_ROWS, journal.num_rows)
+        self._blocks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.set_palette(QPalette())
+
+    def set_palette(self, palette: QPalette) -> None:
+        """Toma los colores de las celdas editadas de la paleta de la vista (claro u oscuro)."""
+        tema = 'dark' if palette.color(QPalette.Base).lightness() < 128 else 'light'
+        self.edited_color = EDITED_CELL_COLORS[tema]
+        self.edited_text_color = palette.color(QPalette.Text)
+
+    # -- estructura --------------------------------------------------------
+
+    def total_rows(self) -> int:
+        """Registros que pasan el filtro (cargados o no)."""
+        return self.journal.num_rows if self._order is None else len(self._order)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.fields)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < self.total_rows()
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        nuevas = min(FETCH_ROWS, self.total_rows() - self._loaded)
+        if nuevas <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + nuevas - 1)
+        self._loaded += nuevas
+        self.endInsertRows()
+
+    def column_index(self, name: str) -> int:
+        return [f.name for f in self.fields].index(name.upper())
+
+    def source_row(self, row: int) -> int:
+        """Registro del archivo (sin contar los borrados) que se muestra en la fila `row`."""
+        return int(row if self._order is None else self._order[row])
+
+    # -- celdas ------------------------------------------------------------
+
+    def _block(self, column: int, block: int) -> np.ndarray:
+        key = (column, block)
+        values = self._blocks.get(key)
+        if values is not None:
+            self._blocks.move_to_end(key)
+            return values
+        start = block * BLOCK_ROWS
+        stop = min(start + BLOCK_ROWS, self.total_rows())
+        rows = np.arange(start, stop) if self._order is None else self._order[start:stop]
+        values = self.journal.values(self.fields[column].name, rows)
+        self._blocks[key] = values
+        if len(self._blocks) > CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+        return values
+
+    def value(self, row: int, column: int) -> Any:
+        return self._block(column, row // BLOCK_ROWS)[row % BLOCK_ROWS]
+
+    def data(self, index, role=Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        field = self.fields[index.column()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return _format(self.value(index.row(), index.column()), field)
+        if role == Qt.TextAlignmentRole and field.type in ('N', 'F'):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole) and \
+                self.journal.is_edited(field.name, self.source_row(index.row())):
+            return self.edited_color if role == Qt.BackgroundRole else self.edited_text_color
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.fields[section].name
+        return str(self.source_row(section) + 1)
+
+    def flags(self, index) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        field = self.fields[index.column()]
+        row = self.source_row(index.row())
+        try:
+            cambios = self.journal.edit([row], {field.name: [_parse(value, field)]},
+                                        f"{field.name} del registro {row + 1}")
+        except ValueError as e:
+            self.edit_rejected.emit(str(e))
+            return False
+        if cambios:
+            self._blocks.pop((index.column(), index.row() // BLOCK_ROWS), None)
+            self.dataChanged.emit(index, index)
+            self.journal_changed.emit()
+        return True
+
+    # -- deshacer / guardar ----------------------------------------------------
+
+    def _refresh(self) -> None:
+        self._blocks.clear()
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, len(self.fields) - 1))
+        self.journal_changed.emit()
+
+    def undo(self) -> bool:
+        if self.journal.undo() is None:
+            return False
+        self._refresh()
+        return True
+
+    def redo(self) -> bool:
+        if self.journal.redo() is None:
+            return False
+        self._refresh()
+        return True
+
+    def save(self) -> int:
+        cambios = self.journal.save()
+        self._refresh()
+        return cambios
+
+    # -- filtro y orden -------------------------------------------------------
+
+    def set_filter(self, name: Optional[str], text: str = '') -> int:
+        """Muestra sólo los registros cuyo campo `name` coincide con `text`.
+
+        En los campos numéricos `text` es un valor o una comparación ('>100', '<=5'); en
+        las fechas, dd/mm/aaaa; en el texto, una parte del valor sin distinguir mayúsculas.
+        Sin `name` o sin texto se quita el filtro. Devuelve los registros que quedan.
+        """
+        text = (text or '').strip()
+        if not name or not text:
+            self._filtered = None
+        else:
+            field = self.fields[self.column_index(name)]
+            self._filtered = np.flatnonzero(self._matches(self.journal.column(field.name), field, text))
+        self._rebuild()
+        return self.total_rows()
+
+    @staticmethod
+    def _matches(column: np.ndarray, field: DbfField, text: str) -> np.ndarray:
+        if field.type in ('N', 'F'):
+            for operador in ('<=', '>=', '<>', '<', '>', '='):
+                if text.startswith(operador):
+                    valor = float(_parse(text[len(operador):], field))
+                    return {'<=': column <= valor, '>=': column >= valor, '<>': column != valor,
+                            '<': column < valor, '>': column > valor, '=': column == valor}[operador]
+            return column == float(_parse(text, field))
+        if field.type in ('D', 'L'):
+            return column == _parse(text, field)
+        return np.char.find(np.char.lower(column.astype(str)), text.lower()) >= 0
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """Ordena por una columna (estable); con `column` < 0 vuelve al orden del archivo."""
+        self._sort = (column, order) if column >= 0 else None
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.beginResetModel()
+        order = self._filtered
+        if self._sort is not None:
+            column, sentido = self._sort
+            values = self.journal.column(self.fields[column].name)
+            rows = np.arange(len(values)) if order is None else order
+            order = rows[np.argsort(values[rows], kind='stable')]
+            if sentido == Qt.DescendingOrder:
+                order = order[::-1]
+        self._order = order
+        self._blocks.clear()
+        self._loaded = min(FETCH_ROWS, self.total_rows())
+        self.endResetModel()
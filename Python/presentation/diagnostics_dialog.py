@@ -0,0 +1,108 @@
+import json
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
+    QCheckBox, QPushButton, QLabel, QTabWidget, QPlainTextEdit
+)
+
+from infrastructure.instrumentation import INSTRUMENTATION, Instrumentation
+
+
+class DiagnosticsDialog(QDialog):
+    """Muestra los últimos tramos de tiempo, los contadores y los perfiles registrados."""
+
+    def __init__(self, parent=None, instrumentation: Instrumentation = INSTRUMENTATION):
+        super().__init__(parent)
+        self.instrumentation = instrumentation
+        self.setWindowTitle("Diagnóstico")
+        self.resize(720, 480)
+
+        layout = QVBoxLayout(self)
+
+        opciones = QHBoxLayout()
+        self.enabled_check = QCheckBox("Registrar tiempos y contadores")
+        self.enabled_check.setChecked(instrumentation.enabled)
+        self.enabled_check.toggled.connect(self._set_enabled)
+        self.profile_check = QCheckBox("Perfilar procesos (cProfile)")
+        self.profile_check.setChecked(instrumentation.profiling)
+        self.profile_check.setEnabled(instrumentation.enabled)
+        self.profile_check.toggled.connect(self._set_profiling)
+        opciones.addWidget(self.enabled_check)
+        opciones.addWidget(self.profile_check)
+        opciones.addStretch()
+        layout.addLayout(opciones)
+
+        self.log_label = QLabel(f"Log: {instrumentation.log_path or '(sin archivo)'}")
+        self.log_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.log_label)
+
+        self.tabs = QTabWidget()
+        self.spans_table = self._make_table(["Hora", "Tramo", "ms", "Detalle"])
+        self.counters_table = self._make_table(["Contador", "Valor"])
+        self.profile_text = QPlainTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.tabs.addTab(self.spans_table, "Tiempos")
+        self.tabs.addTab(self.counters_table, "Contadores")
+        self.tabs.addTab(self.profile_text, "Perfiles")
+        layout.addWidget(self.tabs)
+
+        botones = QHBoxLayout()
+        botones.addStretch()
+        refresh_btn = QPushButton("Actualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Limpiar")
+        reset_btn.clicked.connect(self._reset)
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        for button in (refresh_btn, reset_btn, close_btn):
+            botones.addWidget(button)
+        layout.addLayout(botones)
+
+        self.refresh()
+
+    @staticmethod
+    def _make_table(headers) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(len(headers) - 1, QHeaderView.Stretch)
+        return table
+
+    def refresh(self) -> None:
+        """Vuelve a leer tramos y contadores (los más recientes primero)."""
+        spans = [s for s in reversed(self.instrumentation.recent_spans())]
+        tramos = [s for s in spans if 'resumen' not in s]
+        self.spans_table.setRowCount(len(tramos))
+        for row, entry in enumerate(tramos):
+            detalle = json.dumps(entry.get('atributos', {}), ensure_ascii=False, default=str)
+            values = [entry['hora'][11:], entry['tramo'], f"{entry['ms']:.1f}", detalle]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.spans_table.setItem(row, col, item)
+
+        counters = sorted(self.instrumentation.counters().items())
+        self.counters_table.setRowCount(len(counters))
+        for row, (name, value) in enumerate(counters):
+            self.counters_table.setItem(row, 0, QTableWidgetItem(name))
+            item = QTableWidgetItem(f"{value:,}".replace(',', '.'))
+            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.counters_table.setItem(row, 1, item)
+
+        perfiles = [s for s in spans if 'resumen' in s]
+        self.profile_text.setPlainText("\n\n".join(
+            f"{p['tramo']} ({p['archivo'] or 'sin archivo'})\n{p['resumen']}" for p in perfiles))
+
+    def _set_enabled(self, enabled: bool) -> None:
+        self.instrumentation.configure(enabled=enabled)
+        self.profile_check.setEnabled(enabled)
+
+    def _set_profiling(self, profiling: bool) -> None:
+        self.instrumentation.configure(profiling=profiling)
+
+    def _reset(self) -> None:
+        self.instrumentation.reset()
+        self.refresh()
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPalette, QTransform
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+# Colores de las series según el tema; en el oscuro, tonos claros que contrastan con el fondo
+SERIES_COLORS = {
+    'light': [QColor(52, 101, 164), QColor(204, 0, 0), QColor(78, 154, 6), QColor(245, 121, 0),
+              QColor(117, 80, 123), QColor(193, 125, 17), QColor(85, 87, 83)],
+    'dark': [QColor(114, 159, 207), QColor(239, 41, 41), QColor(138, 226, 52), QColor(252, 175, 62),
+             QColor(173, 127, 168), QColor(233, 185, 110), QColor(211, 215, 207)],
+}
+
+# Fracción del ancho de cada talla que ocupan sus barras (el resto separa las tallas)
+BAR_GROUP_WIDTH = 0.85
+
+MARGIN_LEFT, MARGIN_TOP, MARGIN_RIGHT, MARGIN_BOTTOM = 48, 34, 10, 24
+# Separación mínima en píxeles entre las etiquetas del eje de tallas
+MIN_LABEL_SPACING = 28
+
+
+class LengthChart(QWidget):
+    """Histograma de tallas dibujado con QPainter, sin un widget por barra.
+
+    Cada serie es un QPainterPath en coordenadas de datos (x = posición en el eje de
+    tallas, y = ejemplares); al pintar, una transformación las lleva al área del gráfico.
+    Por eso `set_series` sólo rearma las series cuyos conteos cambiaron, y un cambio de
+    escala o de tamaño de la ventana no rearma ninguna.
+    """
+
+    def __init__(self, title: str = "", parent=None):
+        super().__init__(parent)
+        self.title = title
+        self._eje = np.zeros(0, dtype=np.int64)
+        self._series: Dict[str, np.ndarray] = {}
+        self._paths: Dict[str, QPainterPath] = {}
+        # Conteos con que se armó cada path, para saber cuáles hay que rearmar
+        self._built: Dict[str, np.ndarray] = {}
+        self._colors: Dict[str, QColor] = {}
+        self._ymax = 0
+        self.setMinimumSize(320, 180)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def series_names(self) -> List[str]:
+        return list(self._series)
+
+    def set_series(self, eje: np.ndarray, series: Dict[str, np.ndarray],
+                   colors: Optional[Dict[str, QColor]] = None) -> List[str]:
+        """Reemplaza las series del gráfico; devuelve las que hubo que volver a armar.
+
+        Si cambian el eje o las series presentes (y con ellas el lugar de cada barra
+        dentro de su talla) se rearman todas.
+        """
+        eje = np.asarray(eje)
+        if not np.array_equal(eje, self._eje) or list(series) != list(self._series):
+            self._paths.clear()
+            self._built.clear()
+        self._eje = eje
+        self._series = {name: np.asarray(values) for name, values in series.items()}
+        self._colors = {name: color for name, color in (colors or {}).items() if name in series}
+        rebuilt = []
+        for i, (name, values) in enumerate(self._series.items()):
+            if name in self._built and np.array_equal(self._built[name], values):
+                continue
+            self._paths[name] = self._build_path(i, values)
+            self._built[name] = values.copy()
+            rebuilt.append(name)
+        self._ymax = max((int(values.max()) for values in self._series.values() if len(values)), default=0)
+        self.update()
+        return rebuilt
+
+    def theme(self) -> str:
+        """'dark' o 'light' según el fondo de la paleta (la hoja de estilos del tema la ajusta)."""
+        return 'dark' if self.palette().color(QPalette.Base).lightness() < 128 else 'light'
+
+    def series_colors(self) -> Dict[str, QColor]:
+        """Color de cada serie: el indicado en `set_series` o el que le toca en el tema."""
+        paleta = SERIES_COLORS[self.theme()]
+        return {name: self._colors.get(name, paleta[i % len(paleta)]) for i, name in enumerate(self._series)}
+
+    def _build_path(self, i: int, values: np.ndarray) -> QPainterPath:
+        ancho = BAR_GROUP_WIDTH / len(self._series)
+        inicio = (1 - BAR_GROUP_WIDTH) / 2 + i * ancho
+        path = QPainterPath()
+        for posicion in np.flatnonzero(values).tolist():
+            path.addRect(QRectF(posicion + inicio, 0, ancho, float(values[posicion])))
+        return path
+
+    def plot_rect(self) -> QRectF:
+        return QRectF(self.rect()).adjusted(MARGIN_LEFT, MARGIN_TOP, -MARGIN_RIGHT, -MARGIN_BOTTOM)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        palette = self.palette()
+        colors = self.series_colors()
+        painter.fillRect(self.rect(), palette.color(QPalette.Base))
+        area = self.plot_rect()
+        painter.setPen(palette.color(QPalette.Text))
+        painter.drawText(QRectF(0, 2, self.width(), 16), Qt.AlignHCenter, self.title)
+        self._paint_legend(painter, colors)
+        painter.setPen(palette.color(QPalette.Mid))
+        painter.drawLine(area.bottomLeft(), area.bottomRight())
+        painter.drawLine(area.bottomLeft(), area.topLeft())
+        painter.setPen(palette.color(QPalette.Text))
+        if not len(self._eje) or self._ymax <= 0:
+            painter.drawText(area, Qt.AlignCenter, "Sin ejemplares medidos")
+            return
+        self._paint_axes(painter, area)
+
+        painter.save()
+        painter.setClipRect(area)
+        painter.setTransform(QTransform(area.width() / len(self._eje), 0, 0, -area.height() / self._ymax,
+                                        area.left(), area.bottom()))
+        for name, path in self._paths.items():
+            painter.fillPath(path, colors[name])
+        painter.restore()
+
+    def _paint_axes(self, painter: QPainter, area: QRectF) -> None:
+        metrics = painter.fontMetrics()
+        for fraccion in (0, 0.5, 1):
+            y = area.bottom() - fraccion * area.height()
+            valor = round(self._ymax * fraccion)
+            painter.drawText(QRectF(0, y - 8, MARGIN_LEFT - 4, 16), Qt.AlignRight | Qt.AlignVCenter, str(valor))
+        ancho = area.width() / len(self._eje)
+        paso = max(1, int(np.ceil(MIN_LABEL_SPACING / ancho)))
+        for posicion in range(0, len(self._eje), paso):
+            x = area.left() + (posicion + 0.5) * ancho
+            texto = str(int(self._eje[posicion]))
+            painter.drawText(QRectF(x - 20, area.bottom() + 4, 40, metrics.height()), Qt.AlignHCenter, texto)
+
+    def _paint_legend(self, painter: QPainter, colors: Dict[str, QColor]) -> None:
+        x = MARGIN_LEFT
+        for name, color in colors.items():
+            painter.fillRect(QRectF(x, 21, 10, 10), color)
+            painter.drawText(QRectF(x + 14, 18, 200, 16), Qt.AlignLeft, name)
+            x += 24 + painter.fontMetrics().horizontalAdvance(name)
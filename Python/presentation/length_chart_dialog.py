@@ -0,0 +1,135 @@
+import re
+from typing import Iterable, Optional
+
+import numpy as np
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QLabel, QPushButton
+
+from domain.histogramas import SEXOS, SIN_ETAPA, HistogramaTallas
+from infrastructure.instrumentation import span
+from presentation.length_chart import LengthChart
+
+ALL_ETAPAS = "Todas las etapas"
+
+
+def parse_lances(text: str) -> Optional[np.ndarray]:
+    """Lances escritos como '3, 7-12, 20'; sin texto, None (todos los lances)."""
+    text = (text or '').strip()
+    if not text:
+        return None
+    lances = []
+    for parte in re.split(r'[,;\s]+', text):
+        rango = re.fullmatch(r'(\d+)(?:-(\d+))?', parte)
+        if rango is None:
+            raise ValueError(f"Lances inválidos: {parte} (ej. 3, 7-12)")
+        desde, hasta = int(rango.group(1)), int(rango.group(2) or rango.group(1))
+        lances.extend(range(min(desde, hasta), max(desde, hasta) + 1))
+    return np.unique(lances)
+
+
+def etapa_label(etapa: int) -> str:
+    return "Sin etapa" if etapa == SIN_ETAPA else f"Etapa {etapa + 1}"
+
+
+class LengthChartDialog(QDialog):
+    """Distribución de tallas de la marea por sexo y por etapa.
+
+    Los histogramas vienen precalculados (`HistogramaTallas`): cambiar de especie o
+    filtrar por lance o etapa sólo recuenta las filas de la especie, y cada gráfico
+    rearma únicamente las series que cambiaron.
+    """
+
+    def __init__(self, histograma: HistogramaTallas, title: str = "", especies: Iterable[int] = (),
+                 parent=None):
+        super().__init__(parent)
+        self.histograma = histograma
+        self.setWindowTitle(title or "Distribución de tallas")
+        self.resize(860, 620)
+
+        layout = QVBoxLayout(self)
+        filtros = QHBoxLayout()
+        self.especie_combo = QComboBox()
+        for codigo in histograma.especies.tolist():
+            nombre = histograma.nombres.get(codigo)
+            self.especie_combo.addItem(f"{nombre} ({codigo})" if nombre else str(codigo), codigo)
+        self.etapa_combo = QComboBox()
+        self.lances_edit = QLineEdit()
+        self.lances_edit.setPlaceholderText("Lances: 3, 7-12 (vacío = todos)")
+        filtros.addWidget(QLabel("Especie:"))
+        filtros.addWidget(self.especie_combo, 1)
+        filtros.addWidget(QLabel("Etapa:"))
+        filtros.addWidget(self.etapa_combo)
+        filtros.addWidget(self.lances_edit)
+        layout.addLayout(filtros)
+
+        self.sexo_chart = LengthChart("Ejemplares por talla y sexo")
+        self.etapa_chart = LengthChart("Ejemplares por talla y etapa")
+        layout.addWidget(self.sexo_chart, 1)
+        layout.addWidget(self.etapa_chart, 1)
+
+        botones = QHBoxLayout()
+        self.status_label = QLabel()
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        botones.addWidget(self.status_label, 1)
+        botones.addWidget(close_btn)
+        layout.addLayout(botones)
+
+        self._lances: Optional[np.ndarray] = None
+        self.especie_combo.currentIndexChanged.connect(lambda _i: self.show_especie(self.especie_combo.currentData()))
+        self.etapa_combo.currentIndexChanged.connect(lambda _i: self._update_sexo())
+        self.lances_edit.editingFinished.connect(self.apply_lances)
+
+        preferida = next((i for i in range(self.especie_combo.count())
+                          if self.especie_combo.itemData(i) in set(especies)), 0)
+        if self.especie_combo.count():
+            self.especie_combo.setCurrentIndex(preferida)
+            self.show_especie(self.especie_combo.currentData())
+        else:
+            self.status_label.setText("La marea no tiene tallas medidas")
+
+    def especie(self) -> Optional[int]:
+        return self.especie_combo.currentData()
+
+    def show_especie(self, codigo: int) -> None:
+        """Muestra otra especie: cambian el eje y las etapas, se rearman los dos gráficos."""
+        with span('ui.grafico_tallas', especie=codigo):
+            etapa = self.etapa_combo.currentData()
+            self.etapa_combo.blockSignals(True)
+            self.etapa_combo.clear()
+            self.etapa_combo.addItem(ALL_ETAPAS, None)
+            for valor in self.histograma.etapas(codigo).tolist():
+                self.etapa_combo.addItem(etapa_label(valor), valor)
+            indice = self.etapa_combo.findData(etapa)
+            self.etapa_combo.setCurrentIndex(max(indice, 0))
+            self.etapa_combo.blockSignals(False)
+            self._update_sexo()
+            self._update_etapas()
+
+    def apply_lances(self) -> None:
+        try:
+            lances = parse_lances(self.lances_edit.text())
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        if np.array_equal(lances, self._lances):
+            return
+        self._lances = lances
+        if self.especie() is not None:
+            self._update_sexo()
+            self._update_etapas()
+
+    def _update_sexo(self) -> None:
+        codigo = self.especie()
+        if codigo is None:
+            return
+        etapa = self.etapa_combo.currentData()
+        series = self.histograma.por_sexo(codigo, self._lances, None if etapa is None else [etapa])
+        self.sexo_chart.set_series(self.histograma.eje(codigo), {sexo.capitalize(): series[sexo] for sexo in SEXOS})
+        total = sum(int(values.sum()) for values in series.values())
+        self.status_label.setText(f"{total} ejemplares medidos")
+
+    def _update_etapas(self) -> None:
+        codigo = self.especie()
+        series = self.histograma.por_etapa(codigo, self._lances)
+        self.etapa_chart.set_series(self.histograma.eje(codigo),
+                                    {etapa_label(etapa): values for etapa, values in series.items()})
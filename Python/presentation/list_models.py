@@ -0,0 +1,155 @@
+from bisect import bisect_right
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QAbstractListModel, QDate, QModelIndex, Qt
+
+from domain.entities import Especie
+from domain.intervals import IntervalIndex
+
+
+class _SortedListModel(QAbstractListModel):
+    """Base de las listas ordenadas de la ventana principal (sólo lectura, filas eliminables)."""
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._size()
+
+    def flags(self, index) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def remove_row(self, row: int) -> None:
+        if not 0 <= row < self._size():
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._pop(row)
+        self.endRemoveRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._clear()
+        self.endResetModel()
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+    def _pop(self, row: int) -> None:
+        raise NotImplementedError
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+
+class SpeciesListModel(_SortedListModel):
+    """Especies objetivo ordenadas por nombre a mostrar, sin repetir código INIDEP."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._especies: List[Especie] = []
+        self._keys: List[str] = []
+        self._codigos: Set[str] = set()
+
+    def data(self, index, role=Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._especies):
+            return None
+        especie = self._especies[index.row()]
+        if role == Qt.DisplayRole:
+            return especie.display_name
+        if role == Qt.UserRole:
+            return especie
+        return None
+
+    def contains(self, codinidep: str) -> bool:
+        return codinidep in self._codigos
+
+    def add(self, especie: Especie) -> Optional[int]:
+        """Inserta la especie en su lugar y devuelve la fila; None si ya estaba."""
+        if especie.codinidep in self._codigos:
+            return None
+        key = especie.display_name
+        row = bisect_right(self._keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.insert(row, key)
+        self._especies.insert(row, especie)
+        self._codigos.add(especie.codinidep)
+        self.endInsertRows()
+        return row
+
+    def set_especies(self, especies: Iterable[Especie]) -> None:
+        """Reemplaza toda la lista con un único ordenamiento (restaurar estado)."""
+        self.beginResetModel()
+        self._clear()
+        for especie in especies:
+            if especie.codinidep not in self._codigos:
+                self._codigos.add(especie.codinidep)
+                self._especies.append(especie)
+        self._especies.sort(key=lambda e: e.display_name)
+        self._keys = [e.display_name for e in self._especies]
+        self.endResetModel()
+
+    def especie(self, row: int) -> Especie:
+        return self._especies[row]
+
+    def especies(self) -> List[Especie]:
+        return list(self._especies)
+
+    def _size(self) -> int:
+        return len(self._especies)
+
+    def _pop(self, row: int) -> None:
+        especie = self._especies.pop(row)
+        del self._keys[row]
+        self._codigos.discard(especie.codinidep)
+
+    def _clear(self) -> None:
+        self._especies.clear()
+        self._keys.clear()
+        self._codigos.clear()
+
+
+class StageListModel(_SortedListModel):
+    """Etapas de la marea ordenadas por fecha inicial; rechaza solapamientos."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._etapas = IntervalIndex()
+
+    def data(self, index, role=Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._etapas):
+            return None
+        start_date, end_date = self._etapas[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{start_date.toString('dd/MM/yyyy')} - {end_date.toString('dd/MM/yyyy')}"
+        if role == Qt.UserRole:
+            return start_date, end_date
+        return None
+
+    def overlapping(self, start_date: QDate, end_date: QDate) -> Optional[Tuple[QDate, QDate]]:
+        """Etapa existente que se solapa con [start_date, end_date], o None."""
+        row = self._etapas.overlapping(start_date, end_date)
+        return None if row is None else self._etapas[row]
+
+    def add(self, start_date: QDate, end_date: QDate) -> int:
+        """Inserta la etapa en orden y devuelve la fila (ValueError si es inválida o se solapa)."""
+        if end_date < start_date or self._etapas.overlapping(start_date, end_date) is not None:
+            raise ValueError("Etapa inválida o solapada")
+        row = self._etapas.insertion_row(start_date)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._etapas.insert(start_date, end_date)
+        self.endInsertRows()
+        return row
+
+    def etapa(self, row: int) -> Tuple[QDate, QDate]:
+        return self._etapas[row]
+
+    def etapas(self) -> List[Tuple[QDate, QDate]]:
+        return list(self._etapas)
+
+    def _size(self) -> int:
+        return len(self._etapas)
+
+    def _pop(self, row: int) -> None:
+        self._etapas.pop(row)
+
+    def _clear(self) -> None:
+        self._etapas.clear()
@@ -1,13 +1,14 @@
 import os
 import sys
 from datetime import datetime
-from PySide6.QtCore import Qt, QEvent, QDate
-from PySide6.QtGui import QGuiApplication
+from functools import partial
+from PySide6.QtCore import Qt, QEvent, QDate, QTimer, Signal
+from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut
 from PySide6.QtWidgets import QStyle
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QGroupBox, QLabel, QLineEdit, QComboBox, QPushButton, QListWidget,
-    QFormLayout, QListWidgetItem, QDateEdit, QMessageBox, QSpacerItem, QSizePolicy
+    QGroupBox, QLabel, QLineEdit, QComboBox, QPushButton, QListView,
+    QFormLayout, QDateEdit, QMessageBox, QSpacerItem, QSizePolicy, QFileDialog
 )
 
 # Ajustar la ruta para importar desde las carpetas de la arquitectura
@@ -16,27 +17,89 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from util import resource_path
 from infrastructure.repositories import CatalogRepository
 from infrastructure import config_manager
-from presentation.stage_list_item_widget import StageListItemWidget
-from presentation.species_list_item_widget import SpeciesListItemWidget
+from infrastructure.workspace import MareaWorkspace
+from presentation.list_models import SpeciesListModel, StageListModel
+from presentation.removable_item_delegate import RemovableItemDelegate
+from presentation.process_runner import ProcessRunner
+from presentation.marea_watcher import MareaWatcher
+from infrastructure.instrumentation import span
 from domain.entities import Especie, Buque, Observador
+from domain.jobs import Job
+from domain.procesos import RUN_ALL_PROCESSES, get_process, read_only_processes
+
+# Botón de búsqueda de códigos: no es un proceso de la marea, se habilita siempre
+LOOKUP_BUTTON_NAME = "BUSCAR CODIGO BARCO/AIP"
 
 PROCESS_BUTTON_NAMES = [
     "Cortar bases", "Control Dias horas Arrastrero", 
     "Posiciones con una especie arrastreros", "Resumen produccion",
     "Distribución de tallas", "Distribución de tallas XXXX",
     "Controla archivo L", "Largo peso", "Reemplaza especies",
-    "Resumen muestra/maduros", "BUSCAR CODIGO BARCO/AIP"
+    "Resumen muestra/maduros", "Factores CPUE", "Control muestreo", "Control derrotero", LOOKUP_BUTTON_NAME
 ]
 
+# Control de cobertura que se corre solo al guardar la marea, una vez terminada la edición
+SAMPLING_CHECK = "Control muestreo"
+SAMPLING_CHECK_DELAY_MS = 800
+
+# Lectura anticipada de los archivos de la marea, al dejar de cambiar número o año
+PREFETCH_JOB = "Precarga"
+PREFETCH_DELAY_MS = 400
+
+# Carga de planillas de Excel de los observadores en los archivos C y M de la marea
+IMPORT_JOB = "Importar planillas"
+# Errores de validación que se listan al rechazar una importación
+IMPORT_ERRORS_SHOWN = 20
+
+# Revisión y edición de los archivos de la marea ("Edita archivo completo" del menú FoxPro)
+EDIT_BUTTON_NAME = "Editar archivos"
+
+# Gráfico de distribución de tallas (lo que se revisaba en las planillas Dist_tallas_*.xls)
+LENGTH_CHART_JOB = "Gráfico de tallas"
+
+# Controles que se vuelven a correr cuando los archivos de la marea cambian por fuera (FoxPro, Excel)
+RECHECK_JOB = "Actualizar controles"
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Se emite al pintarse la ventana por primera vez y al terminar de cargar catálogos y estado
+    first_painted = Signal()
+    startup_completed = Signal()
+
+    def __init__(self, defer_startup: bool = False):
+        """Con `defer_startup`, catálogos y estado se cargan después del primer pintado."""
         super().__init__()
         self.setWindowTitle("Control de Mareas - INIDEP")
         self.setGeometry(100, 100, 800, 600)
 
+        # Catálogos por columnas (CatalogTable); los combos guardan la posición de cada fila
         self.all_species = []
+        self.all_buques = []
+        self.all_observadores = []
+        self._registry_lookup = None
         self.species_search_mode = 'common_first'  # 'common_first' or 'scientific_first'
         self.process_buttons = []
+        self.process_runner = ProcessRunner(self)
+        self.process_results = {}
+        self._result_cache = None
+        self._dataset_cache = None
+        self._auto_checks = set()
+        self._sampling_timer = QTimer(self)
+        self._sampling_timer.setSingleShot(True)
+        self._sampling_timer.setInterval(SAMPLING_CHECK_DELAY_MS)
+        self._sampling_timer.timeout.connect(self._check_sampling)
+        self._prefetch_job = None
+        self.length_chart_dialog = None
+        self._recheck_names = set()
+        # Marea (número, año) sobre la que corre la actualización de controles en curso
+        self._recheck_marea = None
+        self.marea_watcher = MareaWatcher(self)
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self._prefetch_timer.timeout.connect(self._prefetch_marea)
+        self.workspace = None
+        # Mientras se carga el estado de una marea no se guarda nada
+        self._applying_state = False
         # Tema actual (default: light). Intentar leer de config.
         self.theme = 'light'
         try:
@@ -47,11 +110,29 @@ class MainWindow(QMainWindow):
             pass
 
         self._setup_ui()
+        # Centrado se realiza en showEvent para obtener frame real
+        self._centered = False
+        self._painted = False
+        self._startup_pending = defer_startup
+        if not defer_startup:
+            self._complete_startup()
+
+    def _complete_startup(self) -> None:
+        """Carga catálogos y estado guardado y conecta las señales de los widgets."""
+        self._startup_pending = False
         self._load_catalogs()
         self._load_state()
         self._connect_signals()
-        # Centrado se realiza en showEvent para obtener frame real
-        self._centered = False
+        self.startup_completed.emit()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+            if self._startup_pending:
+                # Dejar que el primer cuadro llegue a pantalla antes de leer los catálogos
+                QTimer.singleShot(0, self._complete_startup)
 
     def _setup_ui(self):
         """Configura la interfaz de usuario."""
@@ -100,13 +181,38 @@ class MainWindow(QMainWindow):
 
         self.num_marea.textChanged.connect(self._save_state)
         self.anio_marea.textChanged.connect(self._save_state)
+        self.num_marea.textChanged.connect(self._prefetch_timer.start)
+        self.anio_marea.textChanged.connect(self._prefetch_timer.start)
+        self.num_marea.textChanged.connect(self._forget_marea_results)
+        self.anio_marea.textChanged.connect(self._forget_marea_results)
         self.observador_combo.currentIndexChanged.connect(self._save_state)
         self.buque_combo.currentIndexChanged.connect(self._save_state)
+        self.marea_selector.activated.connect(self._switch_marea)
+
+        self.process_runner.job_progress.connect(self._on_process_progress)
+        self.process_runner.job_partial.connect(self._on_process_partial)
+        self.process_runner.job_finished.connect(self._on_process_finished)
+        self.process_runner.job_failed.connect(self._on_process_failed)
+        self.process_runner.job_cancelled.connect(self._on_process_cancelled)
+        self.process_runner.running_changed.connect(self._update_process_buttons_state)
+
+        self.marea_watcher.marea_changed.connect(self._on_marea_files_changed)
+        self.marea_watcher.watch(config_manager.get_input_data_path())
 
     def _setup_datos_marea_group(self) -> QGroupBox:
         """Configura el QGroupBox de 'Datos Generales de Marea'."""
         datos_group = QGroupBox("Datos Generales de Marea")
 
+        # Selector del espacio de trabajo: cambiar de marea no vuelve a leer catálogos
+        self.marea_selector = QComboBox()
+        self.marea_selector.setToolTip("Mareas del espacio de trabajo")
+        self.new_marea_btn = QPushButton("Nueva")
+        self.new_marea_btn.setToolTip("Agregar una marea al espacio de trabajo")
+        self.new_marea_btn.clicked.connect(self._new_marea)
+        self.remove_marea_btn = QPushButton("Quitar")
+        self.remove_marea_btn.setToolTip("Quitar la marea del espacio de trabajo (no borra sus archivos)")
+        self.remove_marea_btn.clicked.connect(self._remove_marea)
+
         self.num_marea = QLineEdit()
         self.num_marea.setMaxLength(3)
         self.anio_marea = QLineEdit()
@@ -129,6 +235,11 @@ class MainWindow(QMainWindow):
         self.theme_toggle_btn.setToolTip("Alternar tema Claro/Oscuro")
         self.theme_toggle_btn.setFixedSize(28, 28)
         self.theme_toggle_btn.clicked.connect(self._toggle_theme)
+        self.diagnostics_btn = QPushButton("⏱")
+        self.diagnostics_btn.setObjectName("diagnosticsButton")
+        self.diagnostics_btn.setToolTip("Diagnóstico: tiempos, contadores y perfiles")
+        self.diagnostics_btn.setFixedSize(28, 28)
+        self.diagnostics_btn.clicked.connect(self._show_diagnostics)
 
         # Layouts
         num_marea_layout = QVBoxLayout()
@@ -145,18 +256,28 @@ class MainWindow(QMainWindow):
         buque_label_row = QHBoxLayout()
         buque_label_row.addWidget(QLabel("Buque"))
         buque_label_row.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+        buque_label_row.addWidget(self.diagnostics_btn)
         buque_label_row.addWidget(self.theme_toggle_btn)
         buque_layout.addLayout(buque_label_row)
         buque_layout.addWidget(self.buque_combo)
         buque_layout.addWidget(self.buque_info_label)
 
+        workspace_row = QHBoxLayout()
+        workspace_row.addWidget(QLabel("Marea"))
+        workspace_row.addWidget(self.marea_selector, 1)
+        workspace_row.addWidget(self.new_marea_btn)
+        workspace_row.addWidget(self.remove_marea_btn)
+
         datos_main_layout = QHBoxLayout()
         datos_main_layout.addLayout(num_marea_layout, 1)
         datos_main_layout.addLayout(anio_marea_layout, 1)
         datos_main_layout.addLayout(observador_layout, 2)
         datos_main_layout.addLayout(buque_layout, 2)
-        
-        datos_group.setLayout(datos_main_layout)
+
+        datos_layout = QVBoxLayout()
+        datos_layout.addLayout(workspace_row)
+        datos_layout.addLayout(datos_main_layout)
+        datos_group.setLayout(datos_layout)
         return datos_group
 
     def _setup_etapas_group(self) -> QGroupBox:
@@ -176,7 +297,8 @@ class MainWindow(QMainWindow):
         fechas_layout.addWidget(QLabel("Fecha Final:"))
         fechas_layout.addWidget(self.etapa_end_date)
 
-        self.etapas_list = QListWidget()
+        self.etapas_model = StageListModel(self)
+        self.etapas_list = self._make_removable_list(self.etapas_model, self._remove_trip_stage)
         self.add_etapa_btn = QPushButton("Agregar Etapa")
         self.add_etapa_btn.clicked.connect(self._add_trip_stage)
 
@@ -208,7 +330,8 @@ class MainWindow(QMainWindow):
         especie_input_layout.addWidget(self.especie_combo)
         especie_input_layout.addWidget(self.toggle_species_view_btn)
 
-        self.especies_list = QListWidget()
+        self.especies_model = SpeciesListModel(self)
+        self.especies_list = self._make_removable_list(self.especies_model, self._remove_target_specie)
         self.add_especie_btn = QPushButton("Agregar Especie")
         self.add_especie_btn.clicked.connect(self._add_target_specie)
 
@@ -218,6 +341,23 @@ class MainWindow(QMainWindow):
         especies_group.setLayout(especies_v_layout)
         return especies_group
 
+    def _make_removable_list(self, model, remove_row) -> QListView:
+        """Lista ordenada cuyas filas se pintan con un botón "Eliminar" (también tecla Supr)."""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setMouseTracking(True)
+        delegate = RemovableItemDelegate(view)
+        delegate.delete_requested.connect(remove_row)
+        view.setItemDelegate(delegate)
+        shortcut = QShortcut(QKeySequence.Delete, view, context=Qt.WidgetShortcut)
+
+        def remove_current():
+            if view.currentIndex().isValid():
+                remove_row(view.currentIndex().row())
+        shortcut.activated.connect(remove_current)
+        return view
+
     def _setup_procesos_group(self) -> QGroupBox:
         """Configura el QGroupBox de 'Procesos'."""
         procesos_group = QGroupBox("Procesos")
@@ -227,38 +367,83 @@ class MainWindow(QMainWindow):
         for name in PROCESS_BUTTON_NAMES:
             button = QPushButton(name)
             button.setEnabled(False)
-            self.process_buttons.append(button)
+            if name == LOOKUP_BUTTON_NAME:
+                button.clicked.connect(self._show_registry_lookup)
+                self.lookup_button = button
+            else:
+                button.clicked.connect(partial(self._run_process, name))
+                self.process_buttons.append(button)
             procesos_layout.addWidget(button, row, col)
             col += 1
             if col > 2:
                 col = 0
                 row += 1
-        
+
+        self.run_all_btn = QPushButton(RUN_ALL_PROCESSES)
+        self.run_all_btn.setEnabled(False)
+        self.run_all_btn.setToolTip("Ejecuta todos los procesos disponibles leyendo la marea una sola vez")
+        self.run_all_btn.clicked.connect(partial(self._run_process, RUN_ALL_PROCESSES))
+        self.process_buttons.append(self.run_all_btn)
+        procesos_layout.addWidget(self.run_all_btn, row, col)
+        row += 1
+
         self.clear_button = QPushButton("Limpiar Todo")
         self.clear_button.clicked.connect(self._clear_all_fields)
-        procesos_layout.addWidget(self.clear_button, row, 0, 1, 3) # Span across all columns
+        procesos_layout.addWidget(self.clear_button, row, 0, 1, 2)
+
+        self.cancel_processes_btn = QPushButton("Cancelar Procesos")
+        self.cancel_processes_btn.setEnabled(False)
+        self.cancel_processes_btn.clicked.connect(self.process_runner.cancel_all)
+        procesos_layout.addWidget(self.cancel_processes_btn, row, 2)
+        row += 1
+
+        self.import_button = QPushButton(IMPORT_JOB)
+        self.import_button.setEnabled(False)
+        self.import_button.setToolTip("Carga planillas de Excel de captura y de tallas en los archivos C y M de la marea")
+        self.import_button.clicked.connect(self._import_planillas)
+        procesos_layout.addWidget(self.import_button, row, 0)
+
+        self.edit_button = QPushButton(EDIT_BUTTON_NAME)
+        self.edit_button.setEnabled(False)
+        self.edit_button.setToolTip("Revisa y edita los archivos C, M, P y S de la marea, con deshacer")
+        self.edit_button.clicked.connect(self._show_dbf_editor)
+        procesos_layout.addWidget(self.edit_button, row, 1)
+
+        self.length_chart_button = QPushButton(LENGTH_CHART_JOB)
+        self.length_chart_button.setEnabled(False)
+        self.length_chart_button.setToolTip("Distribución de tallas por sexo y por etapa, filtrable por especie y lance")
+        self.length_chart_button.clicked.connect(self._show_length_chart)
+        procesos_layout.addWidget(self.length_chart_button, row, 2)
 
         procesos_group.setLayout(procesos_layout)
         return procesos_group
 
     def _load_catalogs(self):
         """Carga los datos de los catálogos en los ComboBox."""
+        with span('ui.cargar_catalogos'):
+            self._populate_catalogs()
+
+    def _populate_catalogs(self):
+        from domain.catalog import CatalogTable
         data_path = resource_path('data')
         
         repo = CatalogRepository(base_path=data_path)
 
-        observadores = repo.get_observadores()
+        self.all_observadores = CatalogTable.from_entities(Observador, repo.get_observadores(), sort_by='apellido')
         self.observador_combo.addItem("Seleccione un observador...", userData=None)
-        for obs in observadores:
-            self.observador_combo.addItem(obs.display_name, userData=obs)
+        for row, obs in enumerate(self.all_observadores):
+            self.observador_combo.addItem(obs.display_name, userData=row)
 
-        buques = repo.get_buques()
+        self.all_buques = CatalogTable.from_entities(Buque, repo.get_buques(), categorical=('tipo_flota', 'flota'),
+                                                     sort_by='nombre')
         self.buque_combo.addItem("Seleccione un buque...", userData=None)
-        for buque in buques:
-            self.buque_combo.addItem(buque.display_name, userData=buque)
+        for row, buque in enumerate(self.all_buques):
+            self.buque_combo.addItem(buque.display_name, userData=row)
+        self._registry_lookup = None
+        self.lookup_button.setEnabled(True)
 
         # Cargar y guardar todas las especies, luego poblar el combo
-        self.all_species = sorted(repo.get_especies(), key=lambda e: e.nom_vul_cas or '')
+        self.all_species = CatalogTable.from_entities(Especie, repo.get_especies(), sort_by='nom_vul_cas')
         self._repopulate_species_combo()
 
         # Actualizar los campos de información con el estado inicial (vacío)
@@ -271,81 +456,142 @@ class MainWindow(QMainWindow):
         self.anio_marea.setText(str(datetime.now().year))
         self.observador_combo.setCurrentIndex(0)
         self.buque_combo.setCurrentIndex(0)
-        self.etapas_list.clear()
-        self.especies_list.clear()
+        self.etapas_model.clear()
+        self.especies_model.clear()
         self._update_process_buttons_state()
         self._save_state()
 
     def _save_state(self):
         """Guarda el estado actual de la aplicación en un archivo de configuración."""
-        etapas = []
-        for i in range(self.etapas_list.count()):
-            item = self.etapas_list.item(i)
-            start_date, end_date = item.data(Qt.UserRole)
-            etapas.append({
-                'start_date': start_date.toString(Qt.ISODate),
-                'end_date': end_date.toString(Qt.ISODate)
-            })
-
-        especies = []
-        for i in range(self.especies_list.count()):
-            item = self.especies_list.item(i)
-            specie = item.data(Qt.UserRole)
-            especies.append(specie.codinidep)
-
-        state = {
+        if self._applying_state:
+            return
+        with span('ui.guardar_estado'):
+            self._write_state()
+        self._sampling_timer.start()
+
+    def _marea_state(self) -> dict:
+        """Estado de la marea que se está editando (lo que se guarda por marea)."""
+        etapas = [{
+            'start_date': start_date.toString(Qt.ISODate),
+            'end_date': end_date.toString(Qt.ISODate)
+        } for start_date, end_date in self.etapas_model.etapas()]
+
+        especies = [specie.codinidep for specie in self.especies_model.especies()]
+
+        return {
             'num_marea': self.num_marea.text(),
             'anio_marea': self.anio_marea.text(),
-            'observador_cod': self.observador_combo.currentData().obs_nro if self.observador_combo.currentIndex() > 0 else None,
-            'buque_cod': self.buque_combo.currentData().buque_cod if self.buque_combo.currentIndex() > 0 else None,
+            'observador_cod': self._selected_value(self.observador_combo, self.all_observadores, 'obs_nro'),
+            'buque_cod': self._selected_value(self.buque_combo, self.all_buques, 'buque_cod'),
             'theme': self.theme,
             'etapas': etapas,
             'especies': especies
         }
+
+    @staticmethod
+    def _selected_value(combo: QComboBox, catalog, field: str):
+        """Campo `field` de la fila del catálogo elegida en el combo (None si no hay selección)."""
+        row = combo.currentData() if combo.currentIndex() > 0 else None
+        return catalog.value(row, field) if row is not None else None
+
+    @staticmethod
+    def _combo_index(catalog, field: str, value) -> int:
+        """Posición en el combo de la fila con `field == value` (0, el texto guía, si no existe)."""
+        row = catalog.find(field, value) if value is not None and len(catalog) else None
+        return row + 1 if row is not None else 0
+
+    def _write_state(self):
+        state = self._marea_state()
+        # config.json sigue reflejando la marea activa (y el tema)
         config_manager.save_config(state)
+        if self.workspace is not None and self.workspace.active_id:
+            self.workspace.save(self.workspace.active_id, state)
+            entry = self.workspace.entry(self.workspace.active_id)
+            row = self.marea_selector.findData(entry.id)
+            if row >= 0 and self.marea_selector.itemText(row) != entry.display_name:
+                self.marea_selector.setItemText(row, entry.display_name)
 
     def _load_state(self):
         """Carga el estado de la aplicación desde un archivo de configuración."""
         state = config_manager.load_config()
-        if not state:
-            return
 
         # Tema (mantener coherencia con lo aplicado por main.py)
-        if state.get('theme') in ('light', 'dark'):
+        if state and state.get('theme') in ('light', 'dark'):
             self.theme = state['theme']
             if hasattr(self, 'theme_toggle_btn'):
                 self.theme_toggle_btn.setText("🌙" if self.theme == 'light' else "☀")
 
-        self.num_marea.setText(state.get('num_marea', ''))
-        self.anio_marea.setText(state.get('anio_marea', str(datetime.now().year)))
-
-        if state.get('observador_cod'):
-            for i in range(self.observador_combo.count()):
-                obs = self.observador_combo.itemData(i)
-                if obs and obs.obs_nro == state['observador_cod']:
-                    self.observador_combo.setCurrentIndex(i)
-                    break
-
-        if state.get('buque_cod'):
-            for i in range(self.buque_combo.count()):
-                buque = self.buque_combo.itemData(i)
-                if buque and buque.buque_cod == state['buque_cod']:
-                    self.buque_combo.setCurrentIndex(i)
-                    break
-
-        self.etapas_list.clear()
-        for etapa_data in state.get('etapas', []):
-            start_date = QDate.fromString(etapa_data['start_date'], Qt.ISODate)
-            end_date = QDate.fromString(etapa_data['end_date'], Qt.ISODate)
-            self._add_trip_stage(start_date, end_date, save=False)
-
-        self.especies_list.clear()
-        for codinidep in state.get('especies', []):
-            for especie in self.all_species:
-                if especie.codinidep == codinidep:
-                    self._add_target_specie(specie_to_add=especie, save=False)
-                    break
-        
+        with span('ui.abrir_espacio_trabajo'):
+            self.workspace = MareaWorkspace(config_manager.get_workspace_path())
+            if not self.workspace.entries():
+                # Primer inicio con espacio de trabajo: la marea de config.json pasa a ser la primera
+                self.workspace.create(state or {})
+            marea_id = self.workspace.active_id or self.workspace.entries()[0].id
+            self._refresh_marea_selector()
+            self._activate_marea(marea_id)
+
+    def _refresh_marea_selector(self) -> None:
+        self.marea_selector.clear()
+        for entry in self.workspace.entries():
+            self.marea_selector.addItem(entry.display_name, userData=entry.id)
+        self.remove_marea_btn.setEnabled(self.marea_selector.count() > 1)
+
+    def _activate_marea(self, marea_id: str) -> None:
+        """Muestra la marea `marea_id`; los catálogos y la marea leída en caché se reutilizan."""
+        with span('ui.cambiar_marea'):
+            state = self.workspace.activate(marea_id)
+            self.marea_selector.setCurrentIndex(self.marea_selector.findData(marea_id))
+            self._apply_state(state)
+        if state:
+            config_manager.save_config(self._marea_state())
+
+    def _switch_marea(self, row: int) -> None:
+        marea_id = self.marea_selector.itemData(row)
+        if marea_id and marea_id != self.workspace.active_id:
+            self._activate_marea(marea_id)
+
+    def _new_marea(self) -> None:
+        """Agrega una marea vacía al espacio de trabajo y la muestra."""
+        marea_id = self.workspace.create({'anio_marea': str(datetime.now().year)})
+        self._refresh_marea_selector()
+        self._activate_marea(marea_id)
+        self.num_marea.setFocus()
+
+    def _remove_marea(self) -> None:
+        """Quita la marea activa del espacio de trabajo y muestra otra."""
+        if self.marea_selector.count() <= 1:
+            return
+        entry = self.workspace.entry(self.workspace.active_id)
+        reply = QMessageBox.question(self, "Quitar marea",
+                                     f"¿Quitar la marea {entry.display_name} del espacio de trabajo?\n"
+                                     "Los archivos de la marea no se borran.")
+        if reply != QMessageBox.Yes:
+            return
+        self.workspace.remove(entry.id)
+        self._refresh_marea_selector()
+        self._activate_marea(self.workspace.entries()[0].id)
+
+    def _apply_state(self, state: dict) -> None:
+        """Carga en la interfaz el estado guardado de una marea, sin volver a guardarlo."""
+        self._applying_state = True
+        try:
+            self.num_marea.setText(state.get('num_marea', ''))
+            self.anio_marea.setText(state.get('anio_marea', str(datetime.now().year)))
+            self.observador_combo.setCurrentIndex(
+                self._combo_index(self.all_observadores, 'obs_nro', state.get('observador_cod')))
+            self.buque_combo.setCurrentIndex(self._combo_index(self.all_buques, 'buque_cod', state.get('buque_cod')))
+
+            self.etapas_model.clear()
+            for etapa_data in state.get('etapas', []):
+                start_date = QDate.fromString(etapa_data['start_date'], Qt.ISODate)
+                end_date = QDate.fromString(etapa_data['end_date'], Qt.ISODate)
+                self._add_trip_stage(start_date, end_date, save=False)
+
+            # Un solo ordenamiento para todas las especies guardadas (las desconocidas se descartan)
+            rows = (self.all_species.find('codinidep', codinidep) for codinidep in state.get('especies', []))
+            self.especies_model.set_especies(self.all_species[row] for row in rows if row is not None)
+        finally:
+            self._applying_state = False
         self._update_process_buttons_state()
 
     def _toggle_theme(self):
@@ -367,8 +613,8 @@ class MainWindow(QMainWindow):
 
     def _update_observador_info(self) -> None:
         """Actualiza el campo de texto con la información del observador seleccionado."""
-        selected_index = self.observador_combo.currentIndex()
-        observador = self.observador_combo.itemData(selected_index)
+        row = self.observador_combo.currentData()
+        observador = self.all_observadores[row] if row is not None else None
 
         if observador:
             self.observador_info_label.setText(f"Código: {observador.obs_nro}")
@@ -377,8 +623,8 @@ class MainWindow(QMainWindow):
 
     def _update_buque_info(self) -> None:
         """Actualiza el campo de texto con la información del buque seleccionado."""
-        selected_index = self.buque_combo.currentIndex()
-        buque = self.buque_combo.itemData(selected_index)
+        row = self.buque_combo.currentData()
+        buque = self.all_buques[row] if row is not None else None
 
         if buque:
             info_text = (f"Cód.: {buque.buque_cod}, "
@@ -388,19 +634,330 @@ class MainWindow(QMainWindow):
         else:
             self.buque_info_label.clear()
 
-    def _update_process_buttons_state(self) -> None:
-        """Habilita o deshabilita los botones de procesos según el estado de los campos de marea."""
-        marea_completa = all([
+    def _marea_completa(self) -> bool:
+        return all([
             self.num_marea.text(),
             self.anio_marea.text(),
             self.observador_combo.currentIndex() > 0,
             self.buque_combo.currentIndex() > 0,
-            self.etapas_list.count() > 0,
-            self.especies_list.count() > 0
+            self.etapas_model.rowCount() > 0,
+            self.especies_model.rowCount() > 0
         ])
 
+    def _update_process_buttons_state(self) -> None:
+        """Habilita o deshabilita los botones de procesos según el estado de los campos de marea."""
+        marea_completa = self._marea_completa()
         for button in self.process_buttons:
-            button.setEnabled(marea_completa)
+            button.setEnabled(marea_completa and not self.process_runner.is_running(button.text()))
+        self.cancel_processes_btn.setEnabled(bool(self.process_runner.running_jobs()))
+        self.import_button.setEnabled(bool(self.num_marea.text() and self.anio_marea.text())
+                                      and not self.process_runner.is_running(IMPORT_JOB))
+        self.edit_button.setEnabled(bool(self.num_marea.text() and self.anio_marea.text()))
+        self.length_chart_button.setEnabled(bool(self.num_marea.text() and self.anio_marea.text())
+                                            and not self.process_runner.is_running(LENGTH_CHART_JOB))
+
+    def _process_params(self) -> dict:
+        """Parámetros de la marea actual que reciben todos los procesos."""
+        etapas = [(start_date.toString(Qt.ISODate), end_date.toString(Qt.ISODate))
+                  for start_date, end_date in self.etapas_model.etapas()]
+        especies = self.especies_model.especies()
+        row = self.buque_combo.currentData()
+        buque = self.all_buques[row] if row is not None else None
+        velocidad = None
+        if buque:
+            from domain.derrotero import velocidad_limite
+            velocidad = float(velocidad_limite(buque.eslora, buque.pot_hp))
+        return {
+            'num_marea': self.num_marea.text(),
+            'anio_marea': self.anio_marea.text(),
+            'etapas': etapas,
+            'especies': [specie.codinidep for specie in especies],
+            'nombres_especies': {specie.nom_cient: specie.codinidep for specie in especies if specie.nom_cient},
+            'velocidad_limite': velocidad,
+            'data_dir': config_manager.get_input_data_path(),
+        }
+
+    @property
+    def result_cache(self):
+        """Caché de resultados de procesos, creada al ejecutar el primer proceso."""
+        if self._result_cache is None:
+            from infrastructure.marea_service import open_result_cache
+            self._result_cache = open_result_cache(config_manager.get_result_cache_path())
+        return self._result_cache
+
+    @property
+    def dataset_cache(self):
+        """Mareas ya leídas: al volver a una marea no se releen sus archivos sin cambios."""
+        if self._dataset_cache is None:
+            from infrastructure.marea_service import DatasetCache
+            self._dataset_cache = DatasetCache()
+        return self._dataset_cache
+
+    def _run_process(self, name: str) -> None:
+        """Lanza el proceso asociado a un botón en segundo plano."""
+        # Importación diferida: los motores de proceso cargan NumPy y registran los procesos
+        from infrastructure.marea_service import run_processes
+        if name != RUN_ALL_PROCESSES and get_process(name) is None:
+            QMessageBox.information(self, "Proceso no disponible",
+                                    f"El proceso '{name}' todavía no está implementado.")
+            return
+        params = self._process_params()
+        params['names'] = [name]
+        params['cache'] = self.result_cache
+        params['datasets'] = self.dataset_cache
+        job = Job(name=name, func=run_processes, params=params)
+        if self.process_runner.submit(job):
+            self.statusBar().showMessage(f"{name}: iniciado")
+
+    def _check_sampling(self) -> None:
+        """Controla en segundo plano la cobertura de muestreo si la marea ya tiene su captura."""
+        if not self._marea_completa() or self.process_runner.is_running(SAMPLING_CHECK):
+            return
+        params = self._process_params()
+        from infrastructure.marea_files import find_marea_files
+        if 'captura' not in find_marea_files(params['data_dir'], params['num_marea'], params['anio_marea']):
+            return
+        from infrastructure.marea_service import run_processes
+        params['names'] = [SAMPLING_CHECK]
+        params['datasets'] = self.dataset_cache
+        self._auto_checks.add(SAMPLING_CHECK)
+        if not self.process_runner.submit(Job(name=SAMPLING_CHECK, func=run_processes, params=params)):
+            self._auto_checks.discard(SAMPLING_CHECK)
+
+    def _prefetch_marea(self) -> None:
+        """Lee en segundo plano los archivos de la marea identificada y cancela la precarga anterior."""
+        num, anio = self.num_marea.text().strip(), self.anio_marea.text().strip()
+        name = f"{PREFETCH_JOB} {num}/{anio}"
+        if name == self._prefetch_job:
+            return
+        if self._prefetch_job:
+            self.process_runner.cancel(self._prefetch_job)
+            self._prefetch_job = None
+        data_dir = config_manager.get_input_data_path()
+        from infrastructure.marea_files import find_marea_files
+        if not find_marea_files(data_dir, num, anio):
+            return
+        from infrastructure.marea_service import prefetch_marea
+        params = {'data_dir': data_dir, 'num_marea': num, 'anio_marea': anio,
+                  'datasets': self.dataset_cache, 'etapas': self._process_params()['etapas']}
+        if self.process_runner.submit(Job(name=name, func=prefetch_marea, params=params)):
+            self._prefetch_job = name
+        else:
+            # Todavía termina una precarga cancelada de esta misma marea
+            self._prefetch_timer.start()
+
+    def _end_prefetch(self, name: str) -> bool:
+        """True si `name` es una precarga (que no se informa como proceso)."""
+        if not name.startswith(PREFETCH_JOB + " "):
+            return False
+        if name == self._prefetch_job:
+            self._prefetch_job = None
+        return True
+
+    def _import_planillas(self) -> None:
+        """Elige planillas de Excel y las importa en segundo plano a los archivos de la marea."""
+        data_dir = config_manager.get_input_data_path()
+        paths, _ = QFileDialog.getOpenFileNames(self, IMPORT_JOB, data_dir, "Planillas de Excel (*.xls *.xlsx)")
+        if not paths:
+            return
+        num, anio = self.num_marea.text().strip(), self.anio_marea.text().strip()
+        from infrastructure.marea_files import find_marea_files
+        existentes = {'captura', 'muestra'} & set(find_marea_files(data_dir, num, anio))
+        if existentes:
+            reply = QMessageBox.question(self, IMPORT_JOB,
+                                         f"La marea {num}/{anio} ya tiene archivos de {' y '.join(sorted(existentes))}.\n"
+                                         "¿Reemplazarlos con los datos de las planillas?")
+            if reply != QMessageBox.Yes:
+                return
+        from infrastructure.importacion import import_planillas
+        params = {'paths': paths, 'data_dir': data_dir, 'num_marea': num, 'anio_marea': anio,
+                  'reemplazar': bool(existentes)}
+        if self.process_runner.submit(Job(name=IMPORT_JOB, func=import_planillas, params=params)):
+            self.statusBar().showMessage(f"{IMPORT_JOB}: iniciado")
+
+    def _on_import_finished(self, result) -> None:
+        if result.errores:
+            detalle = '\n'.join(str(error) for error in result.errores[:IMPORT_ERRORS_SHOWN])
+            if len(result.errores) > IMPORT_ERRORS_SHOWN:
+                detalle += f"\n... y {len(result.errores) - IMPORT_ERRORS_SHOWN} más"
+            self.statusBar().showMessage(f"{IMPORT_JOB}: rechazada", 5000)
+            QMessageBox.warning(self, IMPORT_JOB, f"No se escribió ningún archivo: {len(result.errores)} "
+                                                  f"valores con errores.\n\n{detalle}")
+            return
+        importados = ', '.join(f"{registros} registros de {kind}" for kind, registros in result.registros.items())
+        self.statusBar().showMessage(f"{IMPORT_JOB}: {importados or 'ninguna hoja reconocida'}", 5000)
+        # La marea cambió: se vuelve a leer y a controlar
+        self._prefetch_job = None
+        self._prefetch_timer.start()
+        self._sampling_timer.start()
+
+    def _on_process_progress(self, name: str, percent: int, message: str) -> None:
+        text = f"{name}: {percent}%"
+        if message:
+            text += f" - {message}"
+        self.statusBar().showMessage(text)
+
+    def _on_process_partial(self, name: str, result: object) -> None:
+        self.process_results.setdefault(name, []).append(result)
+
+    def _on_process_finished(self, name: str, result: object) -> None:
+        if self._end_prefetch(name):
+            return
+        if name == IMPORT_JOB:
+            self._on_import_finished(result)
+            return
+        if name == LENGTH_CHART_JOB:
+            self._on_length_chart_ready(result)
+            return
+        if name == RECHECK_JOB:
+            # Si mientras tanto se pasó a otra marea, los controles actualizados ya no corresponden
+            if self._recheck_marea == self._current_marea():
+                self.process_results.update(result)
+                self.statusBar().showMessage(f"Controles actualizados: {', '.join(result)}", 5000)
+            self._recheck()
+            return
+        self.process_results.update(result)
+        if name in self._auto_checks:
+            self._auto_checks.discard(name)
+            alertas = sum(1 for alerta in result.get(name, {}).get('alerta', []) if alerta)
+            self.statusBar().showMessage(
+                f"{name}: {alertas} días bajo el protocolo" if alertas else f"{name}: sin alertas", 5000)
+            return
+        stats = self.result_cache.stats()
+        self.statusBar().showMessage(
+            f"{name}: finalizado (caché: {stats.hits} aciertos, {stats.misses} fallos)", 5000)
+
+    def _on_process_failed(self, name: str, message: str) -> None:
+        if self._end_prefetch(name):
+            return
+        self.statusBar().showMessage(f"{name}: error", 5000)
+        if name == RECHECK_JOB:
+            self._recheck()
+            return
+        if name in self._auto_checks:
+            # El control automático no interrumpe la edición
+            self._auto_checks.discard(name)
+            return
+        QMessageBox.critical(self, "Error en el proceso", f"'{name}' falló: {message}")
+
+    def _on_process_cancelled(self, name: str) -> None:
+        if self._end_prefetch(name):
+            return
+        self._auto_checks.discard(name)
+        self.statusBar().showMessage(f"{name}: cancelado", 5000)
+
+    def _on_marea_files_changed(self, num: str, anio: str, kinds: list) -> None:
+        """Archivos de la marea actual modificados por fuera: se vuelven a correr sólo los
+        controles ya ejecutados que leen esas tablas."""
+        try:
+            actual = int(num) == int(self.num_marea.text()) and anio == self.anio_marea.text().strip()
+        except ValueError:
+            return
+        if not actual:
+            return
+        from infrastructure.marea_service import affected_by
+        afectados = affected_by(kinds)
+        # La marea en memoria conserva los productos que no leen esas tablas
+        self._prefetch_job = None
+        self._prefetch_timer.start()
+        if SAMPLING_CHECK in afectados:
+            self._sampling_timer.start()
+        # Sólo los controles: los procesos que escriben archivos (cortar bases, factores) no se
+        # relanzan solos
+        controles = set(read_only_processes()) - {SAMPLING_CHECK}
+        self._recheck_names.update(name for name in self.process_results if name in afectados and name in controles)
+        self.statusBar().showMessage(f"Cambiaron los archivos de {', '.join(kinds)} de la marea {num}/{anio}", 5000)
+        self._recheck()
+
+    def _current_marea(self) -> tuple:
+        return self.num_marea.text().strip(), self.anio_marea.text().strip()
+
+    def _forget_marea_results(self) -> None:
+        """Cambió la marea: los resultados y los controles pendientes de la anterior ya no valen."""
+        self.process_results.clear()
+        self._recheck_names.clear()
+
+    def _recheck(self) -> None:
+        """Corre en segundo plano los controles pendientes de actualizar (uno a la vez)."""
+        if not self._recheck_names or self.process_runner.is_running(RECHECK_JOB):
+            return
+        params = self._process_params()
+        from infrastructure.marea_service import run_processes
+        params['names'] = sorted(self._recheck_names)
+        params['cache'] = self.result_cache
+        params['datasets'] = self.dataset_cache
+        if self.process_runner.submit(Job(name=RECHECK_JOB, func=run_processes, params=params)):
+            self._recheck_marea = self._current_marea()
+            self._recheck_names.clear()
+            self.statusBar().showMessage(f"{RECHECK_JOB}: {', '.join(params['names'])}")
+
+    @property
+    def registry_lookup(self):
+        """Índice de búsqueda de buques y observadores, armado al usarlo por primera vez."""
+        if self._registry_lookup is None:
+            from domain.registry_lookup import RegistryLookup
+            self._registry_lookup = RegistryLookup(self.all_buques, self.all_observadores)
+        return self._registry_lookup
+
+    def _show_registry_lookup(self) -> None:
+        """Abre la búsqueda de códigos de buque/observador, con la consulta del buque elegido."""
+        from presentation.registry_lookup_dialog import RegistryLookupDialog
+        dialog = RegistryLookupDialog(self.registry_lookup, config_manager.get_input_data_path(),
+                                      self.anio_marea.text() or None, self)
+        row = self.buque_combo.currentData()
+        if row is not None:
+            dialog.query_edit.setText(self.all_buques.value(row, 'nombre'))
+        dialog.exec()
+
+    def _show_dbf_editor(self) -> None:
+        """Abre los archivos de la marea en el editor; si se guardó algo, la marea se vuelve a leer."""
+        data_dir = config_manager.get_input_data_path()
+        num, anio = self.num_marea.text().strip(), self.anio_marea.text().strip()
+        from infrastructure.marea_files import find_marea_files
+        files = find_marea_files(data_dir, num, anio)
+        if not files:
+            self.statusBar().showMessage(f"No se encontraron archivos de la marea {num}/{anio}", 5000)
+            return
+        from presentation.dbf_editor_dialog import DbfEditorDialog
+        dialog = DbfEditorDialog(files, self)
+        dialog.exec()
+        if dialog.saved:
+            self._prefetch_job = None
+            self._prefetch_timer.start()
+            self._sampling_timer.start()
+
+    def _show_length_chart(self) -> None:
+        """Calcula en segundo plano los histogramas de tallas de la marea y abre el gráfico."""
+        params = self._process_params()
+        from infrastructure.marea_service import length_histograms
+        job_params = {'data_dir': params['data_dir'], 'num_marea': params['num_marea'].strip(),
+                      'anio_marea': params['anio_marea'].strip(), 'datasets': self.dataset_cache,
+                      'etapas': params['etapas']}
+        if self.process_runner.submit(Job(name=LENGTH_CHART_JOB, func=length_histograms, params=job_params)):
+            self.statusBar().showMessage(f"{LENGTH_CHART_JOB}: calculando")
+
+    def _on_length_chart_ready(self, histograma) -> None:
+        from presentation.length_chart_dialog import LengthChartDialog
+        num, anio = self.num_marea.text().strip(), self.anio_marea.text().strip()
+        if self.length_chart_dialog is not None:
+            self.length_chart_dialog.close()
+        self.length_chart_dialog = LengthChartDialog(histograma, f"Distribución de tallas {num}/{anio}",
+                                                     self._process_params()['especies'], self)
+        self.length_chart_dialog.show()
+        self.statusBar().clearMessage()
+
+    def _show_diagnostics(self) -> None:
+        """Abre el diálogo con los tiempos y contadores registrados."""
+        from presentation.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self).exec()
+
+    def closeEvent(self, event):
+        """Cancela los procesos en curso antes de cerrar la ventana."""
+        self._sampling_timer.stop()
+        self._prefetch_timer.stop()
+        self.marea_watcher.stop()
+        self.process_runner.shutdown()
+        super().closeEvent(event)
 
     def _toggle_species_view(self):
         """Cambia el modo de visualización de las especies y repuebla el ComboBox."""
@@ -417,19 +974,19 @@ class MainWindow(QMainWindow):
         self.especie_combo.clear()
         self.especie_combo.addItem("Buscar especie...", userData=None)
 
-        for especie in self.all_species:
+        for row, especie in enumerate(self.all_species):
             display_name = ""
             if self.species_search_mode == 'common_first':
                 display_name = especie.display_name
             else:  # scientific_first
                 display_name = f"{especie.nom_cient} ({especie.nom_vul_cas})"
             
-            self.especie_combo.addItem(display_name, userData=especie)
+            self.especie_combo.addItem(display_name, userData=row)
         
         self.especie_combo.blockSignals(False)
 
         # Intentar restaurar la selección o texto
-        if current_data:
+        if current_data is not None:
             index = self.especie_combo.findData(current_data)
             if index != -1:
                 self.especie_combo.setCurrentIndex(index)
@@ -445,36 +1002,17 @@ class MainWindow(QMainWindow):
             selected_index = self.especie_combo.currentIndex()
             if selected_index <= 0:
                 return
-            specie = self.especie_combo.itemData(selected_index)
+            row = self.especie_combo.itemData(selected_index)
+            specie = self.all_species[row] if row is not None else None
         
         if not isinstance(specie, Especie):
             return
 
-        for i in range(self.especies_list.count()):
-            item = self.especies_list.item(i)
-            if item.data(Qt.UserRole).codinidep == specie.codinidep:
-                if not specie_to_add:
-                    QMessageBox.warning(self, "Especie Duplicada", "La especie ya se encuentra en la lista.")
-                return
-
-        list_item = QListWidgetItem()
-        list_item.setData(Qt.UserRole, specie)
-
-        insert_row = 0
-        while insert_row < self.especies_list.count():
-            item = self.especies_list.item(insert_row)
-            existing_specie = item.data(Qt.UserRole)
-            if specie.display_name < existing_specie.display_name:
-                break
-            insert_row += 1
-        
-        self.especies_list.insertItem(insert_row, list_item)
+        if self.especies_model.add(specie) is None:
+            if not specie_to_add:
+                QMessageBox.warning(self, "Especie Duplicada", "La especie ya se encuentra en la lista.")
+            return
 
-        item_widget = SpeciesListItemWidget(specie.display_name, list_item)
-        item_widget.deleted.connect(self._remove_target_specie)
-        list_item.setSizeHint(item_widget.sizeHint())
-        self.especies_list.setItemWidget(list_item, item_widget)
-        
         if not specie_to_add:
             self.especie_combo.setCurrentIndex(0)
             self.especie_combo.lineEdit().clear()
@@ -484,11 +1022,9 @@ class MainWindow(QMainWindow):
             self._save_state()
         self._update_process_buttons_state()
 
-    def _remove_target_specie(self, item_to_delete):
-        """Elimina un item de la lista de especies."""
-        row = self.especies_list.row(item_to_delete)
-        if row >= 0:
-            self.especies_list.takeItem(row)
+    def _remove_target_specie(self, row: int):
+        """Elimina la fila `row` de la lista de especies."""
+        self.especies_model.remove_row(row)
         self._save_state()
         self._update_process_buttons_state()
 
@@ -535,32 +1071,15 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error de Fechas", "La fecha final no puede ser anterior a la fecha inicial.")
             return
 
-        for i in range(self.etapas_list.count()):
-            item = self.etapas_list.item(i)
-            existing_start, existing_end = item.data(Qt.UserRole)
-            if start_date <= existing_end and existing_start <= end_date:
-                QMessageBox.critical(self, "Error de Solapamiento",
-                                     f"La etapa se solapa con una existente: "
-                                     f"{existing_start.toString('dd/MM/yyyy')} a {existing_end.toString('dd/MM/yyyy')}")
-                return
-
-        list_item = QListWidgetItem()
-        list_item.setData(Qt.UserRole, (start_date, end_date))
+        overlapping = self.etapas_model.overlapping(start_date, end_date)
+        if overlapping is not None:
+            existing_start, existing_end = overlapping
+            QMessageBox.critical(self, "Error de Solapamiento",
+                                 f"La etapa se solapa con una existente: "
+                                 f"{existing_start.toString('dd/MM/yyyy')} a {existing_end.toString('dd/MM/yyyy')}")
+            return
 
-        insert_row = 0
-        while insert_row < self.etapas_list.count():
-            item = self.etapas_list.item(insert_row)
-            existing_start, _ = item.data(Qt.UserRole)
-            if start_date < existing_start:
-                break
-            insert_row += 1
-        
-        self.etapas_list.insertItem(insert_row, list_item)
-        
-        item_widget = StageListItemWidget(start_date, end_date, list_item)
-        item_widget.deleted.connect(self._remove_trip_stage)
-        list_item.setSizeHint(item_widget.sizeHint())
-        self.etapas_list.setItemWidget(list_item, item_widget)
+        self.etapas_model.add(start_date, end_date)
 
         if save:
             self.etapa_start_date.setDate(QDate.currentDate())
@@ -569,10 +1088,8 @@ class MainWindow(QMainWindow):
             self._save_state()
         self._update_process_buttons_state()
 
-    def _remove_trip_stage(self, item_to_delete):
-        """Elimina un item de la lista de etapas."""
-        row = self.etapas_list.row(item_to_delete)
-        if row >= 0:
-            self.etapas_list.takeItem(row)
+    def _remove_trip_stage(self, row: int):
+        """Elimina la fila `row` de la lista de etapas."""
+        self.etapas_model.remove_row(row)
         self._save_state()
         self._update_process_buttons_state()
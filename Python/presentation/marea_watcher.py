@@ -0,0 +1,88 @@
+import os
+from typing import Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from infrastructure.marea_files import changed_mareas, snapshot_marea_files
+
+# Espera tras el último aviso antes de revisar la carpeta: FoxPro y Excel escriben en varias pasadas
+DEBOUNCE_MS = 500
+# Intervalo de revisión cuando el sistema no puede avisar los cambios (carpetas de red, límite de inotify)
+POLL_INTERVAL_MS = 3000
+
+
+class MareaWatcher(QObject):
+    """Avisa qué archivos de marea de la carpeta de datos cambiaron por fuera de la aplicación.
+
+    Usa QFileSystemWatcher (inotify en Linux) sobre la carpeta y sus DBF; si no puede
+    vigilarla, o con `polling`, la revisa cada `POLL_INTERVAL_MS`. Los avisos se agrupan:
+    después de `DEBOUNCE_MS` sin cambios se comparan las firmas (mtime, tamaño) y se
+    emite `marea_changed` una vez por marea, con los tipos de tabla que cambiaron.
+    """
+
+    # Número, año y tipos de tabla (captura, muestra, ...) de una marea con archivos cambiados
+    marea_changed = Signal(str, str, list)
+
+    def __init__(self, parent=None, polling: bool = False, debounce_ms: int = DEBOUNCE_MS,
+                 poll_interval_ms: int = POLL_INTERVAL_MS):
+        super().__init__(parent)
+        self.data_dir: Optional[str] = None
+        self.force_polling = polling
+        self.polling = polling
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.rescan)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.rescan)
+
+    def watch(self, data_dir: str) -> bool:
+        """Empieza a vigilar `data_dir` (deja de vigilar la anterior). False si no existe."""
+        self.stop()
+        if not os.path.isdir(data_dir):
+            return False
+        self.data_dir = data_dir
+        self._snapshot = snapshot_marea_files(data_dir)
+        self.polling = self.force_polling or not self._watcher.addPath(data_dir)
+        if self.polling:
+            self._poll_timer.start()
+        else:
+            self._watch_files()
+        return True
+
+    def stop(self) -> None:
+        self._debounce.stop()
+        self._poll_timer.stop()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self.data_dir = None
+        self._snapshot = {}
+
+    def _watch_files(self) -> None:
+        # Un archivo reemplazado (guardar con renombre) deja de vigilarse: se vuelve a agregar
+        vigilados = set(self._watcher.files())
+        nuevos = [path for path in self._snapshot if path not in vigilados]
+        if nuevos:
+            self._watcher.addPaths(nuevos)
+
+    def _schedule(self, _path: str = '') -> None:
+        self._debounce.start()
+
+    def rescan(self) -> Dict[Tuple[str, str], Set[str]]:
+        """Compara la carpeta con la última revisión y avisa las mareas que cambiaron."""
+        if self.data_dir is None:
+            return {}
+        snapshot = snapshot_marea_files(self.data_dir)
+        changes = changed_mareas(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        if not self.polling:
+            self._watch_files()
+        for (num, anio), kinds in sorted(changes.items()):
+            self.marea_changed.emit(num, anio, sorted(kinds))
+        return changes
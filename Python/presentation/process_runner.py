@@ -0,0 +1,163 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from domain.jobs import Job, JobContext, JobCancelledError, CancellationToken
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (segundos) con el que se consulta un proceso externo para detectar cancelación
+_PROCESS_POLL_INTERVAL = 0.1
+
+
+class JobSignals(QObject):
+    """Señales emitidas por un trabajo en ejecución (se entregan en el hilo de la UI)."""
+    started = Signal(str)
+    progress = Signal(str, int, str)
+    partial = Signal(str, object)
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+    cancelled = Signal(str)
+
+
+class _JobRunnable(QRunnable):
+    """Adaptador que ejecuta un `Job` dentro del `QThreadPool`."""
+
+    def __init__(self, job: Job, token: CancellationToken, runner: 'ProcessRunner'):
+        super().__init__()
+        self.job = job
+        self.token = token
+        self.runner = runner
+        self.signals = JobSignals()
+
+    def run(self):
+        name = self.job.name
+        context = JobContext(
+            token=self.token,
+            on_progress=lambda percent, message: self.signals.progress.emit(name, percent, message),
+            on_partial=lambda result: self.signals.partial.emit(name, result),
+        )
+        try:
+            self.token.raise_if_cancelled()
+            self.signals.started.emit(name)
+            if self.job.cpu_bound:
+                result = self._run_in_process()
+            else:
+                result = self.job.run(context)
+            self.token.raise_if_cancelled()
+        except JobCancelledError:
+            self.signals.cancelled.emit(name)
+        except Exception as e:
+            logger.exception("Job %s falló", name)
+            self.signals.failed.emit(name, str(e))
+        else:
+            self.signals.finished.emit(name, result)
+
+    def _run_in_process(self):
+        """Delegar el cálculo a un proceso separado, sin bloquear la detección de cancelación.
+
+        Un proceso que ya empezó no puede interrumpirse: al cancelar se descarta su resultado.
+        """
+        future = self.runner.process_pool().submit(self.job.func, **self.job.params)
+        while True:
+            if self.token.is_cancelled:
+                future.cancel()
+                raise JobCancelledError()
+            try:
+                return future.result(timeout=_PROCESS_POLL_INTERVAL)
+            except FutureTimeoutError:
+                continue
+
+
+class ProcessRunner(QObject):
+    """Ejecuta procesos en segundo plano sobre un `QThreadPool`.
+
+    Los procesos livianos o limitados por E/S corren en hilos del pool; los marcados
+    como `cpu_bound` se delegan a un `ProcessPoolExecutor`. Se pueden ejecutar varios
+    procesos distintos a la vez, pero no dos instancias del mismo proceso.
+    """
+    job_started = Signal(str)
+    job_progress = Signal(str, int, str)
+    job_partial = Signal(str, object)
+    job_finished = Signal(str, object)
+    job_failed = Signal(str, str)
+    job_cancelled = Signal(str)
+    running_changed = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: Optional[int] = None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool()
+        if max_threads:
+            self.thread_pool.setMaxThreadCount(max_threads)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        # Trabajos en curso por nombre; se conserva la referencia hasta recibir su señal final
+        self._active: Dict[str, _JobRunnable] = {}
+
+    def process_pool(self) -> ProcessPoolExecutor:
+        """Pool de procesos creado a demanda (solo si algún trabajo lo necesita)."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return self._process_pool
+
+    def submit(self, job: Job) -> bool:
+        """Encola un trabajo. Devuelve False si ya hay uno con el mismo nombre en curso."""
+        if job.name in self._active:
+            return False
+        runnable = _JobRunnable(job, CancellationToken(), self)
+        runnable.setAutoDelete(False)
+        runnable.signals.started.connect(self.job_started)
+        runnable.signals.progress.connect(self.job_progress)
+        runnable.signals.partial.connect(self.job_partial)
+        runnable.signals.finished.connect(self._on_job_finished)
+        runnable.signals.failed.connect(self._on_job_failed)
+        runnable.signals.cancelled.connect(self._on_job_cancelled)
+        self._active[job.name] = runnable
+        self.thread_pool.start(runnable)
+        self.running_changed.emit()
+        return True
+
+    def is_running(self, name: str) -> bool:
+        return name in self._active
+
+    def running_jobs(self) -> List[str]:
+        return list(self._active)
+
+    def cancel(self, name: str) -> None:
+        """Solicita la cancelación de un trabajo; el aviso llega por `job_cancelled`."""
+        runnable = self._active.get(name)
+        if runnable:
+            runnable.token.cancel()
+
+    def cancel_all(self) -> None:
+        for runnable in self._active.values():
+            runnable.token.cancel()
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        return self.thread_pool.waitForDone(msecs)
+
+    def shutdown(self) -> None:
+        """Cancela los trabajos pendientes y libera los pools."""
+        self.cancel_all()
+        self.thread_pool.waitForDone()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def _finish(self, name: str) -> None:
+        self._active.pop(name, None)
+        self.running_changed.emit()
+
+    def _on_job_finished(self, name: str, result: object) -> None:
+        self._finish(name)
+        self.job_finished.emit(name, result)
+
+    def _on_job_failed(self, name: str, message: str) -> None:
+        self._finish(name)
+        self.job_failed.emit(name, message)
+
+    def _on_job_cancelled(self, name: str) -> None:
+        self._finish(name)
+        self.job_cancelled.emit(name)
@@ -0,0 +1,135 @@
+from typing import List, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
+    QLineEdit, QPushButton, QLabel, QTabWidget, QWidget
+)
+
+from domain.jobs import Job, JobContext
+from domain.registry_lookup import BarcoResolution, RegistryLookup
+from presentation.process_runner import ProcessRunner
+
+RESOLVE_JOB_NAME = "Resolver buques de la temporada"
+
+
+def resolve_season(context: JobContext, lookup: RegistryLookup, data_dir: str,
+                   anio_marea: Optional[str] = None) -> List[BarcoResolution]:
+    """Trabajo en segundo plano: resuelve cada BARCO distinto de los archivos de captura."""
+    from infrastructure.marea_service import season_barcos
+    context.report_progress(0, "Leyendo el campo BARCO de las capturas")
+    barcos = season_barcos(data_dir, anio_marea)
+    context.report_progress(50, f"Resolviendo {len(barcos)} nombres de buque")
+    return lookup.resolve_vessels(barcos)
+
+
+class RegistryLookupDialog(QDialog):
+    """Búsqueda de códigos de buques y observadores ("BUSCAR CODIGO BARCO/AIP").
+
+    Los resultados se actualizan con cada tecla; la pestaña "Temporada" resuelve de una
+    vez todos los BARCO de los archivos de captura de la carpeta de entrada.
+    """
+
+    VESSEL_HEADERS = ["Buque", "Código", "Matrícula", "Eslora", "Pot. HP", "Flota", "Coincide por", "Dist."]
+    OBSERVER_HEADERS = ["Número", "Apellido", "Nombre", "Coincide por", "Dist."]
+    SEASON_HEADERS = ["BARCO", "Registros", "Estado", "Buque", "Código", "Matrícula", "Dist."]
+
+    def __init__(self, lookup: RegistryLookup, data_dir: str, anio_marea: Optional[str] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.lookup = lookup
+        self.data_dir = data_dir
+        self.anio_marea = anio_marea
+        self.setWindowTitle("Buscar código de buque / observador")
+        self.resize(760, 480)
+
+        layout = QVBoxLayout(self)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Nombre, matrícula o código de buque; apellido o número de observador")
+        self.query_edit.textChanged.connect(self.search)
+        layout.addWidget(self.query_edit)
+
+        self.tabs = QTabWidget()
+        self.vessels_table = self._make_table(self.VESSEL_HEADERS)
+        self.observers_table = self._make_table(self.OBSERVER_HEADERS)
+        season = QWidget()
+        season_layout = QVBoxLayout(season)
+        self.resolve_btn = QPushButton("Resolver todos los BARCO de la temporada")
+        self.resolve_btn.clicked.connect(self.start_season_resolution)
+        self.season_label = QLabel(f"Carpeta: {data_dir}")
+        self.season_table = self._make_table(self.SEASON_HEADERS)
+        season_layout.addWidget(self.resolve_btn)
+        season_layout.addWidget(self.season_label)
+        season_layout.addWidget(self.season_table)
+        self.tabs.addTab(self.vessels_table, "Buques")
+        self.tabs.addTab(self.observers_table, "Observadores")
+        self.tabs.addTab(season, "Temporada")
+        layout.addWidget(self.tabs)
+
+        botones = QHBoxLayout()
+        botones.addStretch()
+        close_btn = QPushButton("Cerrar")
+        close_btn.clicked.connect(self.accept)
+        botones.addWidget(close_btn)
+        layout.addLayout(botones)
+
+        self.runner = ProcessRunner(self)
+        self.runner.job_progress.connect(lambda _name, _pct, message: self.season_label.setText(message))
+        self.runner.job_finished.connect(self._on_season_resolved)
+        self.runner.job_failed.connect(lambda _name, message: self._season_done(f"Error: {message}"))
+
+    @staticmethod
+    def _make_table(headers) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        return table
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows) -> None:
+        table.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if isinstance(value, (int, float)):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(r, c, item)
+
+    def search(self, query: str) -> None:
+        """Actualiza las coincidencias de buques y observadores para la consulta."""
+        self._fill(self.vessels_table, [
+            (m.item.nombre, m.item.buque_cod, m.item.matricula, m.item.eslora, m.item.pot_hp, m.item.flota,
+             m.campo, m.distancia)
+            for m in self.lookup.search_vessels(query)])
+        self._fill(self.observers_table, [
+            (m.item.obs_nro, m.item.apellido, m.item.nombre, m.campo, m.distancia)
+            for m in self.lookup.search_observers(query)])
+
+    def start_season_resolution(self) -> None:
+        job = Job(name=RESOLVE_JOB_NAME, func=resolve_season,
+                  params={'lookup': self.lookup, 'data_dir': self.data_dir, 'anio_marea': self.anio_marea})
+        if self.runner.submit(job):
+            self.resolve_btn.setEnabled(False)
+
+    def _on_season_resolved(self, _name: str, resoluciones: List[BarcoResolution]) -> None:
+        rows = []
+        for resolucion in resoluciones:
+            mejor = resolucion.candidatos[0] if resolucion.candidatos else None
+            rows.append((resolucion.barco, resolucion.registros, resolucion.estado,
+                         mejor.item.nombre if mejor else '', mejor.item.buque_cod if mejor else '',
+                         mejor.item.matricula if mejor else '', mejor.distancia if mejor else ''))
+        self._fill(self.season_table, rows)
+        pendientes = sum(1 for r in resoluciones if r.buque is None)
+        self._season_done(f"{len(resoluciones)} nombres de buque, {pendientes} sin resolver")
+
+    def _season_done(self, message: str) -> None:
+        self.season_label.setText(message)
+        self.resolve_btn.setEnabled(True)
+
+    def done(self, result: int) -> None:
+        self.runner.shutdown()
+        super().done(result)
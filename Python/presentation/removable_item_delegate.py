@@ -0,0 +1,96 @@
+from PySide6.QtCore import QEvent, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QCursor, QFont, QFontMetrics, QPainter, QPalette
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+
+class RemovableItemDelegate(QStyledItemDelegate):
+    """
+    Pinta cada fila de una lista con su texto y un botón "Eliminar" dibujado
+    (sin crear un widget por fila). Un clic sobre el botón emite `delete_requested`.
+    """
+    delete_requested = Signal(int)
+
+    BUTTON_TEXT = "Eliminar"
+    MARGIN = 5
+    PADDING_X = 8
+    PADDING_Y = 4
+    TEXT_PIXEL_SIZE = 11
+    BUTTON_PIXEL_SIZE = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed_row = -1
+
+    @staticmethod
+    def _font(base: QFont, pixel_size: int) -> QFont:
+        font = QFont(base)
+        font.setPixelSize(pixel_size)
+        return font
+
+    def button_rect(self, option: QStyleOptionViewItem) -> QRect:
+        """Rectángulo del botón dentro de la fila, alineado a la derecha."""
+        metrics = QFontMetrics(self._font(option.font, self.BUTTON_PIXEL_SIZE))
+        rect = QRect(0, 0, metrics.horizontalAdvance(self.BUTTON_TEXT) + 2 * self.PADDING_X,
+                     metrics.height() + 2 * self.PADDING_Y)
+        rect.moveCenter(option.rect.center())
+        rect.moveRight(option.rect.right() - self.MARGIN)
+        return rect
+
+    def _is_hovered(self, option: QStyleOptionViewItem, button: QRect) -> bool:
+        view = option.widget
+        if view is None or not option.state & QStyle.State_MouseOver:
+            return False
+        viewport = view.viewport() if hasattr(view, 'viewport') else view
+        return button.contains(viewport.mapFromGlobal(QCursor.pos()))
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index) -> None:
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text, opt.text = opt.text, ""
+        style = opt.widget.style() if opt.widget is not None else None
+        if style is not None:
+            # Fondo de la fila (selección/hover) según el estilo activo
+            style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        palette = option.palette
+        button = self.button_rect(option)
+        selected = bool(option.state & QStyle.State_Selected)
+
+        painter.save()
+        painter.setFont(self._font(option.font, self.TEXT_PIXEL_SIZE))
+        painter.setPen(palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        text_rect = option.rect.adjusted(self.MARGIN, 0, -(button.width() + 3 * self.MARGIN), 0)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(text, Qt.ElideRight, text_rect.width()))
+
+        background = palette.color(QPalette.Highlight)
+        if self._pressed_row == index.row():
+            background = background.darker(140)
+        elif self._is_hovered(option, button):
+            background = background.darker(120)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(button, 4, 4)
+        painter.setFont(self._font(option.font, self.BUTTON_PIXEL_SIZE))
+        painter.setPen(palette.color(QPalette.HighlightedText))
+        painter.drawText(button, Qt.AlignCenter, self.BUTTON_TEXT)
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index) -> QSize:
+        size = super().sizeHint(option, index)
+        return QSize(size.width(), max(size.height(), self.button_rect(option).height() + 2 * self.PADDING_Y))
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick) \
+                and event.button() == Qt.LeftButton \
+                and self.button_rect(option).contains(event.position().toPoint()):
+            self._pressed_row = index.row()
+            return True
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton \
+                and self._pressed_row != -1:
+            pressed, self._pressed_row = self._pressed_row, -1
+            if pressed == index.row() and self.button_rect(option).contains(event.position().toPoint()):
+                self.delete_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import run_benchmarks, startup_report
+from benchmarks.synthetic_marea import ESPECIES, generate_marea
+from domain.jobs import JobContext
+from infrastructure.dbf_reader import DbfColumns, read_header
+from infrastructure.marea_service import run_processes
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INPUT_DATA = os.path.join(APP_ROOT, 'input_data')
+
+
+def _layout(path):
+    return [(f.name, f.type, f.length, f.decimals) for f in read_header(path).fields]
+
+
+def test_synthetic_marea_uses_exact_layouts(tmp_path):
+    """Test: Los archivos generados tienen la misma estructura que los de los observadores."""
+    paths = generate_marea(str(tmp_path), 118, 2025, lances=50, seed=1)
+    for kind, sample in (('captura', 'C11825.DBF'), ('muestra', 'M11825.DBF'), ('produccion', 'P11825.DBF')):
+        assert _layout(paths[kind]) == _layout(os.path.join(INPUT_DATA, sample))
+        assert read_header(paths[kind]).header_length == read_header(os.path.join(INPUT_DATA, sample)).header_length
+    assert DbfColumns(paths['captura']).num_rows == 50
+
+
+def test_synthetic_marea_runs_every_process(tmp_path):
+    """Test: Los procesos funcionan sobre una marea sintética y las tallas se decodifican."""
+    generate_marea(str(tmp_path), 5, 2025, lances=120, seed=2)
+    results = run_processes(JobContext(), ["Distribución de tallas", "Control Dias horas Arrastrero"], '5', '2025',
+                            etapas=[('2025-01-01', '2025-12-31')], especies=[ESPECIES[0][0]],
+                            data_dir=str(tmp_path))
+    distribucion = results["Distribución de tallas"]
+    assert (distribucion['machos'] + distribucion['hembras'] == distribucion['total']).all()
+    control = results["Control Dias horas Arrastrero"]
+    assert control['lances'][control['especie'] == ESPECIES[0][0]][0] == 120
+
+
+def test_run_suite_writes_every_case(tmp_path, monkeypatch):
+    """Test: La corrida mide todos los casos y el JSON incluye tiempo y memoria de cada uno."""
+    monkeypatch.setitem(run_benchmarks.ESCALAS, 'marea', (2, 30))
+    salida = tmp_path / 'bench.json'
+    assert run_benchmarks.main(['--repeticiones', '1', '--salida', str(salida)]) == 0
+    resultados = json.loads(salida.read_text(encoding='utf-8'))
+    assert resultados['lances'] == 60
+    assert set(resultados['resultados']) == {'carga_catalogos', 'catalogos_vistas', 'lectura_mareas',
+                                             'cortar_bases',
+                                             'distribucion_tallas', 'distribucion_tallas_bloques',
+                                             'resumen_produccion', 'control_dias_horas', 'validacion',
+                                             'exportar_distribucion'}
+    assert {"Control muestreo", "Control derrotero"} <= set(run_benchmarks.validation_processes())
+    assert "Control Dias horas Arrastrero" not in run_benchmarks.validation_processes()
+    for caso in resultados['resultados'].values():
+        assert caso['segundos_mediana'] >= 0 and caso['pico_memoria_mb'] >= 0
+
+
+def test_compare_flags_regressions():
+    """Test: La comparación marca los casos más lentos que la tolerancia."""
+    anterior = {'resultados': {'a': {'segundos_mediana': 1.0}, 'b': {'segundos_mediana': 1.0}}}
+    actual = {'resultados': {'a': {'segundos_mediana': 1.1}, 'b': {'segundos_mediana': 1.5},
+                             'nuevo': {'segundos_mediana': 1.0}}}
+    comparacion = run_benchmarks.compare(actual, anterior)
+    assert [(f['caso'], f['regresion']) for f in comparacion] == [('a', False), ('b', True)]
+
+
+def test_startup_report_groups_importtime_by_package():
+    """Test: El informe de inicio agrupa la salida de -X importtime por paquete de primer nivel."""
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        500 |     numpy.core",
+        "import time:      1500 |       2000 |   numpy",
+        "import time:      2000 |       2000 |   dbf",
+        "import time:       300 |       4300 | presentation.main_window",
+    ])
+    modulos = startup_report.parse_importtime(stderr)
+    assert [m['modulo'] for m in modulos] == ['numpy.core', 'numpy', 'dbf', 'presentation.main_window']
+    assert modulos[-1]['nivel'] == 0 and modulos[0]['nivel'] == 2
+    assert startup_report.group_by_package(modulos) == {'numpy': 2.0, 'dbf': 2.0, 'presentation': 0.3}
@@ -0,0 +1,61 @@
+import os
+import sys
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.catalog import Categorical, CatalogTable, NumericColumn, StringColumn
+from domain.entities import Buque, Especie
+from infrastructure.repositories import CatalogRepository
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_columns_store_values_compactly():
+    """Test: Los textos van en un solo str y las categorías se guardan una vez, internadas."""
+    nombres = StringColumn(['Merluza', '', 'Piñero'])
+    assert len(nombres) == 3 and nombres[0] == 'Merluza' and nombres[1] == '' and nombres[2] == 'Piñero'
+    assert nombres.take([2, 0]).tolist() == ['Piñero', 'Merluza']
+
+    flota = Categorical.from_values(['COSTEROS', 'ALTURA', 'COSTEROS'])
+    assert flota.categories == ('COSTEROS', 'ALTURA') and flota.codes.tolist() == [0, 1, 0]
+    assert flota[0] is flota[2] is sys.intern('COSTEROS')
+
+
+def test_catalog_table_rows_sort_and_find():
+    """Test: Las filas se arman como entidades con __slots__, ordenadas, y se buscan por campo."""
+    buques = [Buque('ZAFIRO', '7', '21', 'COSTEROS', 20.5, 500, '0123'),
+              Buque('ANTONELLA', '1097', '21', 'COSTEROS', 16.25, 355, '0033')]
+    catalogo = CatalogTable.from_entities(Buque, buques, categorical=('tipo_flota', 'flota'), sort_by='nombre')
+    assert len(catalogo) == 2
+    assert catalogo[0] == buques[1] and list(catalogo) == [buques[1], buques[0]]
+    assert catalogo[-1].display_name == 'ZAFIRO'
+    assert isinstance(catalogo.columns['eslora'], NumericColumn) and isinstance(catalogo[0].eslora, float)
+    assert catalogo.find('buque_cod', '7') == 1 and catalogo.find('buque_cod', '999') is None
+    assert catalogo.value(1, 'matricula') == '0123'
+    assert not hasattr(catalogo[0], '__dict__')
+    assert CatalogTable.from_entities(Buque, catalogo) is catalogo
+
+
+def test_repository_returns_columnar_catalogs():
+    """Test: El repositorio devuelve catálogos por columnas ordenados, con flota categórica."""
+    repo = CatalogRepository(os.path.join(APP_ROOT, 'data'))
+    especies = repo.get_especies()
+    assert isinstance(especies, CatalogTable) and len(especies) > 1000
+    nombres = especies.values('nom_vul_cas')
+    assert nombres == sorted(nombres)
+    assert all(isinstance(e, Especie) and e.codinidep and e.nom_cient for e in especies[:50])
+
+    buques = repo.get_buques()
+    assert isinstance(buques.columns['flota'], Categorical)
+    assert len(buques.columns['flota'].categories) < len(buques) / 10
+    assert buques.nbytes < 64 * 1024
+
+
+def test_repository_missing_file_returns_empty_catalog(tmp_path):
+    """Test: Si un catálogo no existe se devuelve un catálogo vacío."""
+    repo = CatalogRepository(str(tmp_path))
+    assert len(repo.get_observadores()) == 0
+    with pytest.raises(IndexError):
+        repo.get_observadores()[0]
@@ -0,0 +1,132 @@
+import os
+import sys
+import csv
+import shutil
+import subprocess
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli
+from domain.procesos import RUN_ALL_PROCESSES
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INPUT_DATA = os.path.join(APP_ROOT, 'input_data')
+
+
+@pytest.fixture
+def season_dir(tmp_path):
+    """Carpeta con dos mareas: la de ejemplo (118/2025) y una copia como 119/2025."""
+    for name in os.listdir(INPUT_DATA):
+        shutil.copy(os.path.join(INPUT_DATA, name), tmp_path / name)
+        shutil.copy(os.path.join(INPUT_DATA, name), tmp_path / name.replace('118', '119'))
+    return tmp_path
+
+
+def test_discover_mareas(season_dir):
+    """Test: Las mareas se detectan por su archivo de captura."""
+    assert cli.discover_mareas(str(season_dir)) == [('118', '2025'), ('119', '2025')]
+
+
+def test_run_batch_in_parallel(season_dir):
+    """Test: Las mareas se procesan en un pool y los resultados se consolidan."""
+    summary, tables = cli.run_batch(str(season_dir), ["Resumen produccion"], workers=2, log=lambda m: None)
+    assert [(r['marea'], r['proceso'], r['estado']) for r in summary] == [
+        ('118', '*', 'ok'), ('118', 'Resumen produccion', 'ok'), ('119', '*', 'ok'), ('119', 'Resumen produccion', 'ok')]
+    # El tiempo es de la marea (fila '*'), no se repite en cada proceso
+    assert all(r['segundos'] == '' for r in summary if r['proceso'] != '*')
+    resumen = tables["Resumen produccion"]
+    assert sorted(set(resumen['marea'])) == ['118', '119']
+
+
+def test_run_batch_by_chunks_matches_full_read(season_dir):
+    """Test: Con --bloque el lote produce las mismas tablas que leyendo los archivos completos."""
+    names = ["Resumen produccion", "Control Dias horas Arrastrero"]
+    _, completo = cli.run_batch(str(season_dir), names, workers=1, log=lambda m: None)
+    _, bloques = cli.run_batch(str(season_dir), names, workers=1, log=lambda m: None, chunk_rows=5)
+    for name in names:
+        assert bloques[name]['especie'].tolist() == completo[name]['especie'].tolist()
+        assert bloques[name]['kilos'].tolist() == pytest.approx(completo[name]['kilos'].tolist())
+
+
+def test_run_batch_reports_errors_per_marea(season_dir):
+    """Test: Una marea inexistente se informa como error sin detener el lote."""
+    summary, _ = cli.run_batch(str(season_dir), ["Resumen produccion"],
+                               mareas=[('118', '2025'), ('500', '2025')], workers=1, log=lambda m: None)
+    estados = {r['marea']: r['estado'] for r in summary}
+    assert estados == {'118': 'ok', '500': 'error'}
+
+
+def test_cli_runs_without_pyside(season_dir, tmp_path):
+    """Test: El modo por lotes no importa PySide6 y escribe el resumen consolidado."""
+    salida = tmp_path / 'resumen.csv'
+    resultados = tmp_path / 'resultados'
+    code = (
+        "import sys, cli\n"
+        f"rc = cli.main(['procesar', {str(season_dir)!r}, '--procesos', 'Distribución de tallas', 'Resumen produccion',"
+        f" '--salida', {str(salida)!r}, '--resultados', {str(resultados)!r}, '--workers', '2',"
+        " '--formatos', 'csv', 'txt', 'xlsx'])\n"
+        "assert 'PySide6' not in sys.modules, 'PySide6 importado'\n"
+        "sys.exit(rc)\n"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], cwd=APP_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    with open(salida, encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6
+    assert os.path.exists(resultados / 'Resumen_produccion.csv')
+    assert os.path.exists(resultados / 'Resumen_produccion.TXT')
+    assert os.path.exists(resultados / 'Distribución_de_tallas.xlsx')
+
+
+def test_cli_validates_mareas_and_skips_writers_by_default(season_dir, capsys):
+    """Test: --mareas se valida como NUM/AÑO y por defecto no corren los procesos que escriben archivos."""
+    for invalida in ('118', '118/25/x', 'a/2025'):
+        with pytest.raises(SystemExit) as exc:
+            cli.main(['procesar', str(season_dir), '--mareas', invalida])
+        assert exc.value.code == 2
+    assert 'NUM/AÑO' in capsys.readouterr().err
+
+    procesos = cli.batch_processes([RUN_ALL_PROCESSES])
+    assert "Cortar bases" not in procesos and "Factores CPUE" not in procesos and "Control derrotero" in procesos
+    assert cli.batch_processes([RUN_ALL_PROCESSES, "Cortar bases"])[-1] == "Cortar bases"
+
+
+def test_batch_takes_etapas_and_especies_from_workspace(season_dir, tmp_path):
+    """Test: Cada marea corre con las etapas y especies de su estado guardado; sin etapas,
+    "Cortar bases" se informa como error en lugar de 'ok' sin archivos."""
+    from infrastructure.workspace import MareaWorkspace
+    espacio = tmp_path / 'espacio'
+    MareaWorkspace(str(espacio)).create({
+        'num_marea': '118', 'anio_marea': '2025', 'especies': [],
+        'etapas': [{'start_date': '2025-07-15', 'end_date': '2025-07-20'},
+                   {'start_date': '2025-07-21', 'end_date': '2025-08-02'}]})
+    cortes = tmp_path / 'cortes'
+    cortes.mkdir()
+    summary, tables = cli.run_batch(str(season_dir), ["Cortar bases", "Control Dias horas Arrastrero"],
+                                    workers=1, output_dir=str(cortes), log=lambda m: None,
+                                    workspace_dir=str(espacio))
+    estados = {(r['marea'], r['proceso']): (r['estado'], r['detalle']) for r in summary}
+    assert estados[('118', 'Cortar bases')][0] == 'ok'
+    assert estados[('119', 'Cortar bases')] == ('error', "la marea no tiene etapas cargadas")
+    assert estados[('119', '*')][1].startswith('sin etapas')
+    assert any(name.startswith('c11825') for name in os.listdir(cortes))
+    assert not any(name.startswith('c11925') for name in os.listdir(cortes))
+    control = tables["Control Dias horas Arrastrero"]
+    assert set(control['etapa'][control['marea'] == '118'].tolist()) <= {0, 1}
+
+
+def test_cli_commands_only_take_their_own_options(season_dir, tmp_path, capsys):
+    """Test: Cada comando tiene sólo sus opciones: las de otro comando se rechazan en lugar de ignorarse."""
+    for argv in (['derrotero', str(season_dir), str(tmp_path / 'd.csv'), '--formatos', 'xlsx'],
+                 ['procesar', str(season_dir), '--reemplazar'],
+                 ['importar', str(season_dir), 'planilla.xls'],
+                 [str(season_dir)]):
+        with pytest.raises(SystemExit) as exc:
+            cli.main(argv)
+        assert exc.value.code == 2
+    capsys.readouterr()
+
+    assert cli.main(['procesar', '--listar']) == 0
+    assert "Control derrotero" in capsys.readouterr().out.splitlines()
@@ -0,0 +1,80 @@
+import os
+import sys
+import numpy as np
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import JobContext
+from infrastructure.dbf_reader import write_dbf
+from infrastructure.marea_layouts import CAPTURA_LAYOUT, MUESTRA_LAYOUT, SUBMUESTRA_LAYOUT
+from infrastructure.marea_service import run_processes
+
+MERLUZA, CALAMAR = 7210040101, 3210020101
+DIA1, DIA2 = '2025-07-30', '2025-07-31'
+
+
+def _marea(directory, submuestra_nombre='Merluccius hubbsi'):
+    """Dos días de pesca: el primero con merluza en dos lances, el segundo en uno."""
+    d = str(directory)
+    write_dbf(os.path.join(d, 'C0125.DBF'), CAPTURA_LAYOUT, {
+        'BARCO': np.full(3, 'FEDERICO C'), 'MAREA': np.full(3, 1), 'LANCE': np.array([1, 2, 3]),
+        'FECHA': np.array([DIA1, DIA1, DIA2], dtype='datetime64[D]'),
+        'ESPECIE_1': np.full(3, MERLUZA), 'KG_1': np.array([100.0, 200.0, 300.0]),
+        'ESPECIE_2': np.array([CALAMAR, 0, 0]), 'KG_2': np.array([10.0, 0.0, 0.0]),
+    })
+    write_dbf(os.path.join(d, 'M0125.DBF'), MUESTRA_LAYOUT, {
+        'BARCO': np.full(3, 'FEDERICO C'), 'MAREA': np.full(3, 1), 'LANCE': np.array([1, 2, 3]),
+        'FECHA': np.array([DIA1, DIA1, DIA2], dtype='datetime64[D]'),
+        'ESPECIE': np.full(3, 'Merluccius hubbsi'), 'COD_ESPEC': np.full(3, MERLUZA),
+    })
+    write_dbf(os.path.join(d, 'S0125.DBF'), SUBMUESTRA_LAYOUT, {
+        'BARCO': np.full(4, 'FEDERICO C'), 'MAREA': np.full(4, 1), 'LANCE': np.array([1, 1, 1, 2]),
+        'FECHA': np.full(4, DIA1, dtype='datetime64[D]'), 'ESPECIE': np.full(4, submuestra_nombre),
+        'NEJEMPLAR': np.arange(1, 5),
+    })
+    return d
+
+
+def _control(data_dir, names=("Control muestreo",), **params):
+    params.setdefault('especies', [MERLUZA])
+    params.setdefault('etapas', [(DIA1, DIA1), (DIA2, DIA2)])
+    return run_processes(JobContext(), list(names), '1', '2025', data_dir=data_dir, **params)
+
+
+def test_daily_counts_and_alerts(tmp_path):
+    """Test: Por día se cuentan lances, muestras y submuestras, y se marcan los días bajo el mínimo."""
+    diario = _control(_marea(tmp_path))["Control muestreo"]
+    assert diario['fecha'].astype(str).tolist() == [DIA1, DIA2]
+    assert diario['lances_dia'].tolist() == [2, 1]
+    assert diario['lances_especie'].tolist() == [2, 1]
+    assert diario['muestras'].tolist() == [2, 1]
+    assert diario['submuestras'].tolist() == [2, 0]
+    assert diario['ejemplares'].tolist() == [4, 0]
+    assert diario['alerta'].tolist() == ['', 'muestras < 2; submuestras < 1']
+
+    # Los mínimos se pueden cambiar
+    diario = _control(str(tmp_path), umbrales={'muestras': 1, 'ejemplares': 5})["Control muestreo"]
+    assert diario['alerta'].tolist() == ['ejemplares < 5', 'submuestras < 1; ejemplares < 5']
+
+
+def test_submuestra_names_map_to_codes(tmp_path):
+    """Test: Las submuestras guardan el nombre científico; se asocian al código con las muestras o con los nombres dados."""
+    data_dir = _marea(tmp_path, submuestra_nombre='MERLUCCIUS HUBBSI ')
+    assert _control(data_dir)["Control muestreo"]['ejemplares'].tolist() == [4, 0]
+
+    _marea(tmp_path, submuestra_nombre='Illex argentinus')
+    diario = _control(data_dir, especies=[CALAMAR], nombres_especies={'Illex argentinus': CALAMAR})["Control muestreo"]
+    assert diario['especie'].tolist() == [CALAMAR]
+    assert diario['ejemplares'].tolist() == [4] and diario['muestras'].tolist() == [0]
+
+
+def test_summary_by_etapa(tmp_path):
+    """Test: El resumen por etapa suma los días y cuenta los días de pesca y con alerta."""
+    resumen = _control(_marea(tmp_path), names=["Control muestreo por etapa"], especies=[],
+                       etapas=[(DIA1, DIA2)])["Control muestreo por etapa"]
+    # Sin especies objetivo se controlan todas las capturadas
+    assert resumen['especie'].tolist() == [CALAMAR, MERLUZA]
+    assert resumen['dias'].tolist() == [1, 2]
+    assert resumen['muestras'].tolist() == [0, 3]
+    assert resumen['dias_alerta'].tolist() == [1, 1]
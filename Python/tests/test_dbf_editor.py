@@ -0,0 +1,124 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication, QMessageBox
+
+from infrastructure.dbf_reader import DbfColumns, write_dbf
+from infrastructure.edit_journal import EditJournal
+from infrastructure.marea_layouts import CAPTURA_LAYOUT
+from presentation.dbf_editor_dialog import DbfEditorDialog
+from presentation.dbf_table_model import BLOCK_ROWS, FETCH_ROWS, EDITED_CELL_COLORS, DbfTableModel
+
+LANCES = 1200
+
+
+@pytest.fixture(scope='session')
+def qt_app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def captura(tmp_path):
+    path = str(tmp_path / 'C0125.DBF')
+    lance = np.arange(1, LANCES + 1)
+    write_dbf(path, CAPTURA_LAYOUT, {
+        'BARCO': np.full(LANCES, 'FEDERICO C'), 'MAREA': np.full(LANCES, 1), 'LANCE': lance % 1000,
+        'FECHA': np.datetime64('2025-01-01') + lance // 4,
+        'ESPECIE_1': np.full(LANCES, 7210040101), 'KG_1': (lance % 100).astype(float),
+    })
+    return path
+
+
+def test_rows_are_fetched_and_decoded_lazily(qt_app, captura):
+    """Test: La vista agrega filas de a bloques y sólo decodifica las celdas que se piden."""
+    journal = EditJournal(captura)
+    decodificadas = []
+    values = journal.values
+    journal.values = lambda name, rows: decodificadas.append(len(rows)) or values(name, rows)
+    model = DbfTableModel(journal)
+
+    assert model.rowCount() == FETCH_ROWS and model.canFetchMore()
+    model.fetchMore()
+    model.fetchMore()
+    assert model.rowCount() == LANCES and not model.canFetchMore()
+    assert model.columnCount() == len(CAPTURA_LAYOUT) and not decodificadas
+
+    lance = model.column_index('LANCE')
+    assert model.data(model.index(0, lance)) == '1'
+    assert model.data(model.index(1100, model.column_index('FECHA'))) == '03/10/2025'
+    assert model.data(model.index(5, model.column_index('KG_1'))) == '6.00'
+    assert model.data(model.index(1, lance)) == '2'  # mismo bloque, ya decodificado
+    assert decodificadas == [BLOCK_ROWS] * 3
+
+
+def test_filter_sort_and_edit_through_journal(qt_app, captura):
+    """Test: Filtro y orden son índices de registros; las ediciones van al diario y se deshacen."""
+    model = DbfTableModel(EditJournal(captura))
+    kg = model.column_index('KG_1')
+    assert model.set_filter('KG_1', '>=98') == 24
+    assert model.rowCount() == 24
+    assert model.headerData(0, Qt.Vertical) == '98'  # número de registro en el archivo
+    model.sort(model.column_index('LANCE'), Qt.DescendingOrder)
+    assert [model.data(model.index(r, model.column_index('LANCE'))) for r in range(3)] == ['999', '998', '899']
+    assert model.set_filter('BARCO', 'federico') == LANCES
+    with pytest.raises(ValueError):
+        model.set_filter('KG_1', '>mucho')
+
+    model.set_filter(None)
+    model.sort(-1)
+    index = model.index(3, kg)
+    assert model.setData(index, '12,5')
+    assert model.data(index) == '12.50' and model.data(index, Qt.BackgroundRole) == EDITED_CELL_COLORS['light']
+    oscura = QPalette()
+    oscura.setColor(QPalette.Base, QColor('#2E2E2E'))
+    oscura.setColor(QPalette.Text, QColor('#FFFFFF'))
+    model.set_palette(oscura)
+    assert model.data(index, Qt.BackgroundRole) == EDITED_CELL_COLORS['dark']
+    assert model.data(index, Qt.ForegroundRole) == QColor('#FFFFFF')
+    rechazos = []
+    model.edit_rejected.connect(rechazos.append)
+    assert not model.setData(index, '1e12') and rechazos
+    assert not model.setData(model.index(0, model.column_index('FECHA')), '31/02/2025')
+    assert model.journal.edited_cells == 1
+
+    assert model.undo()
+    assert model.data(index) == '4.00' and model.data(index, Qt.BackgroundRole) is None
+    assert model.redo()
+    assert model.save() == 1
+    assert DbfColumns(captura)['KG_1'][3] == 12.5
+
+
+def test_dialog_pins_lance_and_fecha(qt_app, captura, monkeypatch):
+    """Test: LANCE y FECHA quedan en la vista fija y al cerrar sin guardar las ediciones siguen en el diario."""
+    dialog = DbfEditorDialog({'captura': captura})
+    model = dialog.model
+    fijas = [model.column_index('LANCE'), model.column_index('FECHA')]
+    assert sorted(dialog.pinned_columns()) == sorted(fijas)
+    assert all(not dialog.pinned_view.isColumnHidden(c) and dialog.table_view.isColumnHidden(c) for c in fijas)
+    assert dialog.pinned_view.isColumnHidden(model.column_index('KG_1'))
+    assert dialog.table_view.selectionModel() is dialog.pinned_view.selectionModel()
+
+    dialog.filter_field.setCurrentText('LANCE')
+    dialog.filter_edit.setText('7')
+    dialog.apply_filter()
+    assert model.total_rows() == 2 and '2 de 1200 registros' in dialog.status_label.text()
+    # El orden deja las columnas fijas donde estaban
+    model.sort(model.column_index('KG_1'), Qt.DescendingOrder)
+    assert dialog.table_view.isColumnHidden(fijas[0])
+
+    model.setData(model.index(0, model.column_index('OBSERVAC')), 'revisar posición')
+    assert dialog.save_btn.isEnabled() and 'celdas sin guardar' in dialog.status_label.text()
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args, **kwargs: QMessageBox.No)
+    dialog.reject()
+    assert not dialog.saved
+    assert EditJournal(captura).edited_cells == 1
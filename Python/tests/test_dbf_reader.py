@@ -0,0 +1,110 @@
+import os
+import sys
+import struct
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from infrastructure.dbf_reader import DbfColumns, read_header, read_records, write_dbf, write_dbf_subset
+from infrastructure.marea_files import find_marea_files, marea_file_stem, parse_marea_file_name
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+CAPTURA = os.path.join(INPUT_DATA, 'C11825.DBF')
+
+
+def test_read_header_with_extra_header_byte():
+    """Test: Se interpreta el encabezado de los archivos de marea (que el paquete dbf no lee)."""
+    header = read_header(CAPTURA)
+    assert header.record_count == 49
+    assert header.field_names[:3] == ['BARCO', 'MAREA', 'LANCE']
+    assert header.field('ESPECIE_25').length == 10
+    assert header.fields[-1].offset + header.fields[-1].length == header.record_length
+
+
+def test_decode_columns():
+    """Test: Los campos C, N y D se decodifican a arreglos NumPy."""
+    table = DbfColumns(CAPTURA)
+    assert table.num_rows == 49
+    assert table['BARCO'][0] == 'DON SANTIAGO'
+    assert table['LANCE'].dtype == np.int64
+    assert table['LANCE'][0] == 1
+    assert table['FECHA'][0] == np.datetime64('2025-07-15')
+    assert table['HORA_INIC'][0] == pytest.approx(17.15)
+    assert table['KG_1'][0] == pytest.approx(6330.0)
+    assert table['ESPECIE_1'][0] == 5139030101
+    # Las columnas quedan memorizadas
+    assert table['LANCE'] is table['lance']
+
+
+def test_decode_irregular_numeric_and_blank(tmp_path):
+    """Test: Valores vacíos valen 0 y los desbordes con '*' no rompen la lectura."""
+    path = tmp_path / 'x.dbf'
+    fields = [(b'VALOR', b'N', 6, 2), (b'FECHA', b'D', 8, 0)]
+    record_length = 1 + 6 + 8
+    header = bytearray(32)
+    header[0] = 3
+    struct.pack_into('<IHH', header, 4, 3, 32 + 32 * len(fields) + 1, record_length)
+    for name, ftype, length, dec in fields:
+        desc = bytearray(32)
+        desc[:len(name)] = name
+        desc[11] = ftype[0]
+        desc[16] = length
+        desc[17] = dec
+        header += desc
+    header += b'\r'
+    records = b' ' + b' 12.50' + b'20250102' + b' ' + b'      ' + b'        ' + b' ' + b'******' + b'20251301'
+    path.write_bytes(bytes(header) + records + b'\x1a')
+
+    table = DbfColumns(str(path))
+    assert list(table['VALOR']) == [12.5, 0.0, 0.0]
+    assert table['FECHA'][0] == np.datetime64('2025-01-02')
+    assert np.isnat(table['FECHA'][1]) and np.isnat(table['FECHA'][2])
+
+
+def test_write_dbf_subset_roundtrip(tmp_path):
+    """Test: El corte de un DBF conserva los registros elegidos byte a byte."""
+    target = tmp_path / 'c11825a.dbf'
+    written = write_dbf_subset(CAPTURA, str(target), np.array([0, 5, 10]))
+    assert written == 3
+    original = read_records(CAPTURA)
+    cut = read_records(str(target))
+    assert np.array_equal(cut, original[[0, 5, 10]])
+    assert DbfColumns(str(target))['LANCE'].tolist() == [1, 6, 11]
+
+
+def test_find_marea_files():
+    """Test: Se ubican los archivos de la marea sin distinguir mayúsculas."""
+    assert marea_file_stem('c', '3', '2023') == 'c0323'
+    files = find_marea_files(INPUT_DATA, '118', '2025')
+    assert set(files) == {'captura', 'muestra', 'produccion'}
+    assert files['captura'].endswith('C11825.DBF')
+    assert find_marea_files(INPUT_DATA, '', '2025') == {}
+
+
+def test_parse_marea_file_name():
+    """Test: El nombre del archivo identifica tipo de tabla, marea y año."""
+    assert parse_marea_file_name('C11825.DBF') == ('captura', '118', '2025')
+    assert parse_marea_file_name('md0323.dbf') == ('muestra_descarte', '3', '2023')
+    assert parse_marea_file_name('c9721.dbf') == ('captura', '97', '2021')
+    assert parse_marea_file_name('c12822a.dbf') is None
+    assert parse_marea_file_name('Buques.DBF') is None
+
+
+def test_write_dbf_round_trip(tmp_path):
+    """Test: Un DBF escrito con write_dbf se vuelve a leer con los mismos valores."""
+    specs = [('NOMBRE', 'C', 10, 0), ('FECHA', 'D', 8, 0), ('KG', 'N', 7, 2), ('CANT', 'N', 3, 0)]
+    columns = {
+        'NOMBRE': np.array(['Merluza', 'Ñato', '']),
+        'FECHA': np.array(['2025-07-15', 'NaT', '2025-08-02'], dtype='datetime64[D]'),
+        'KG': np.array([12.5, -0.25, 99999.0]),
+        'CANT': np.array([7, 0, 1000]),
+    }
+    path = str(tmp_path / 'nuevo.dbf')
+    assert write_dbf(path, specs, columns) == 3
+    table = DbfColumns(path)
+    assert table['NOMBRE'].tolist() == ['Merluza', 'Ñato', '']
+    assert np.isnat(table['FECHA'][1]) and str(table['FECHA'][2]) == '2025-08-02'
+    assert table['KG'].tolist() == [12.5, -0.25, 0.0]  # 99999.00 no entra en N(7,2): '*******'
+    assert table['CANT'].tolist() == [7, 0, 0]
@@ -0,0 +1,77 @@
+import os
+import sys
+import csv
+import numpy as np
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli
+from domain.derrotero import VELOCIDAD_LIMITE, distancia_mn, velocidad_limite
+from domain.jobs import JobContext
+from infrastructure.dbf_reader import write_dbf
+from infrastructure.marea_layouts import CAPTURA_LAYOUT
+from infrastructure.marea_service import run_processes, season_track_check
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+
+
+def _captura(directory, nombre, barco, lat_inic, lat_final, hora_inic, hora_final, fecha='2025-07-30'):
+    """Lances sobre el meridiano 60° O del mismo día; las latitudes en GG.MM."""
+    n = len(lat_inic)
+    write_dbf(os.path.join(str(directory), nombre), CAPTURA_LAYOUT, {
+        'BARCO': np.full(n, barco), 'MAREA': np.full(n, 1), 'LANCE': np.arange(1, n + 1),
+        'FECHA': np.full(n, fecha, dtype='datetime64[D]'),
+        'HORA_INIC': np.array(hora_inic), 'HORA_FINAL': np.array(hora_final),
+        'LAT_INIC': np.array(lat_inic), 'LAT_FINAL': np.array(lat_final),
+        'LONG_INIC': np.full(n, 60.0), 'LONG_FINAL': np.full(n, 60.0),
+    })
+
+
+def test_distance_and_vessel_limit():
+    """Test: La distancia es ortodrómica en millas y el límite sale de la eslora o de la potencia."""
+    # Un grado de latitud son 60 millas
+    assert np.isclose(distancia_mn(-44.0, -62.0, -45.0, -62.0), 60.04, atol=0.01)
+    limites = velocidad_limite([30.0, 0.0, 0.0, 0.0, 200.0], [0, 250, 1500, 0, 5000])
+    assert np.round(limites, 1).tolist() == [16.6, 10.0, 16.0, VELOCIDAD_LIMITE, VELOCIDAD_LIMITE]
+
+
+def test_marea_flags_misplaced_haul():
+    """Test: Una latitud mal cargada aparece como tránsitos imposibles hacia y desde ese lance."""
+    tramos = run_processes(JobContext(), ["Control derrotero"], '118', '2025',
+                           data_dir=INPUT_DATA)["Control derrotero"]
+    alertas = tramos['alerta'] != ''
+    # El lance 27 tiene 43.302 en lugar de 44.302 de latitud
+    assert tramos['lance_anterior'][alertas].tolist() == [26, 27]
+    assert tramos['lance'][alertas].tolist() == [27, 28]
+    assert (tramos['velocidad_kn'][alertas] > 40).all()
+    assert (np.diff(tramos['lance']) > 0).all()
+
+    tramos = run_processes(JobContext(), ["Control derrotero"], '118', '2025', data_dir=INPUT_DATA,
+                           velocidad_limite=60)["Control derrotero"]
+    assert not (tramos['alerta'] != '').any()
+
+
+def test_season_batch_uses_each_vessel_limit(tmp_path, capsys):
+    """Test: La temporada se controla en una pasada, sin tránsitos entre mareas y con el límite de cada buque."""
+    # 30 millas en 2 h (15 nudos) entre los lances 1 y 2; el lance 3 no tiene posición
+    _captura(tmp_path, 'C0125.DBF', 'FEDERICO C', [44.0, 44.3, 0.0], [44.0, 44.3, 0.0],
+             [10.0, 13.0, 16.0], [11.0, 14.0, 17.0])
+    # El lance 2 empieza antes de que termine el 1, a 12 millas
+    _captura(tmp_path, 'C0225.DBF', 'DON SANTIAGO', [44.0, 44.12], [44.0, 44.12], [8.0, 8.3], [9.0, 9.3])
+    _captura(tmp_path, 'C0124.DBF', 'FEDERICO C', [44.0, 46.0], [44.0, 46.0], [8.0, 9.0], [8.3, 9.3],
+             fecha='2024-07-30')
+
+    tramos = season_track_check(str(tmp_path), '2025', {'FEDERICO C': 12.0})
+    assert tramos['marea'].tolist() == ['1', '2'] and tramos['barco'].tolist() == ['FEDERICO C', 'DON SANTIAGO']
+    assert np.round(tramos['distancia_mn']).tolist() == [30.0, 12.0]
+    assert tramos['velocidad_kn'].tolist() == [15.0, -1.0]
+    assert tramos['limite_kn'].tolist() == [12.0, VELOCIDAD_LIMITE]
+    assert tramos['alerta'].tolist() == ['velocidad', 'superpuesto']
+
+    salida = tmp_path / 'derrotero.csv'
+    assert cli.main(['derrotero', str(tmp_path), str(salida), '--anio', '2024']) == 0
+    assert '1 tránsitos entre lances, 1 con alerta' in capsys.readouterr().out
+    with open(salida, newline='', encoding='utf-8') as f:
+        filas = list(csv.DictReader(f))
+    assert [(f['marea'], f['anio'], f['lance']) for f in filas] == [('1', '2024', '2')]
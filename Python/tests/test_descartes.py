@@ -0,0 +1,109 @@
+import os
+import sys
+import shutil
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli
+from domain.descartes import apply_discard_transform
+from infrastructure.dbf_reader import DbfColumns, read_header, read_records, rewrite_dbf_fields
+from infrastructure.marea_service import correct_discards
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    shutil.copy(os.path.join(INPUT_DATA, 'C11825.DBF'), tmp_path)
+    return str(tmp_path)
+
+
+def _slots(captura, especie):
+    """(fila, KG, DESCAR) de cada par con la especie."""
+    pares = []
+    for i in range(1, 26):
+        for fila in np.flatnonzero(captura[f'ESPECIE_{i}'] == especie):
+            pares.append((fila, captura[f'KG_{i}'][fila], captura[f'DESCAR_{i}'][fila]))
+    return sorted(pares)
+
+
+def test_transforms_on_slot_pairs():
+    """Test: Cada corrección cambia sólo los pares elegidos y recalcula los totales."""
+    captura = {
+        'LANCE': np.array([1, 2, 3]),
+        'ESPECIE_1': np.array([10, 10, 20]), 'KG_1': np.array([100.0, 40.0, 7.0]),
+        'DESCAR_1': np.array([10.0, 0.0, 0.0]),
+        'ESPECIE_2': np.array([20, 0, 10]), 'KG_2': np.array([5.0, 0.0, 3.0]), 'DESCAR_2': np.array([50.0, 0.0, 0.0]),
+        'CAPT_TOTAL': np.array([105.0, 40.0, 10.0]), 'DESCARTE': np.array([60.0, 0.0, 0.0]),
+    }
+    total = apply_discard_transform(captura, 'descarte_total', especie=10, lances=[1, 3])
+    assert total.filas.tolist() == [0, 2]
+    assert total.columnas['DESCAR_1'].tolist() == [100.0, 0.0]
+    assert total.columnas['DESCAR_2'].tolist() == [50.0, 3.0]
+    assert total.columnas['DESCARTE'].tolist() == [150.0, 3.0]
+
+    cajones = apply_discard_transform(captura, 'cajones_a_kilos', especie=20, kg_cajon=25)
+    assert cajones.columnas['KG_1'].tolist() == [100.0, 175.0] and cajones.columnas['KG_2'].tolist() == [125.0, 3.0]
+    assert cajones.columnas['CAPT_TOTAL'].tolist() == [225.0, 178.0]
+    assert cajones.columnas['DESCARTE'].tolist() == [1260.0, 0.0]
+
+    porcentaje = apply_discard_transform(captura, 'porcentaje_a_kilos', regla=lambda c: c['LANCE'] == 1)
+    assert 'DESCAR_1' not in porcentaje.columnas
+    assert porcentaje.columnas['DESCAR_2'].tolist() == [2.5]
+    assert porcentaje.pares == 1
+
+    with pytest.raises(ValueError):
+        apply_discard_transform(captura, 'cajones_a_kilos', especie=10)
+
+
+def test_correct_discards_rewrites_capture_once(data_dir):
+    """Test: La corrección reescribe la captura en una pasada, sólo las celdas que cambian."""
+    path = os.path.join(data_dir, 'C11825.DBF')
+    antes = DbfColumns(path)
+    registros_antes = read_records(path).copy()
+    especie = int(antes['ESPECIE_1'][0])
+
+    result = correct_discards(data_dir, '118', '2025', 'descarte_total', especie=especie)
+    assert result.registros > 0
+
+    despues = DbfColumns(path)
+    assert [kg for _, kg, _ in _slots(despues, especie)] == [d for _, _, d in _slots(despues, especie)]
+    kilos = sum(despues[f'KG_{i}'] for i in range(1, 26))
+    descarte = sum(despues[f'DESCAR_{i}'] for i in range(1, 26))
+    assert np.allclose(despues['CAPT_TOTAL'], np.round(kilos, 1))
+    assert np.allclose(despues['DESCARTE'], np.round(descarte, 1))
+
+    # Las filas y campos que no cambian quedan byte a byte
+    registros = read_records(path)
+    sin_cambios = np.setdiff1d(np.arange(len(registros)), result.filas)
+    assert (registros[sin_cambios] == registros_antes[sin_cambios]).all()
+    assert (despues['OBSERVAC'] == antes['OBSERVAC']).all()
+    assert read_header(path).record_count == antes.num_rows
+
+    # Aplicarla de nuevo no cambia nada
+    assert correct_discards(data_dir, '118', '2025', 'descarte_total', especie=especie).registros == 0
+
+
+def test_rewrite_rejects_values_that_do_not_fit(data_dir):
+    """Test: Si un valor desborda su campo no se modifica el archivo."""
+    path = os.path.join(data_dir, 'C11825.DBF')
+    with open(path, 'rb') as f:
+        original = f.read()
+    with pytest.raises(ValueError):
+        rewrite_dbf_fields(path, np.array([0]), {'KG_1': np.array([1e9])})
+    with open(path, 'rb') as f:
+        assert f.read() == original
+
+
+def test_cli_corrects_season(data_dir, capsys):
+    """Test: El modo por lotes corrige todas las mareas de la carpeta y termina."""
+    rc = cli.main(['corregir-descarte', data_dir, 'cajones_a_kilos', '--kg-cajon', '2', '--lances', '1'])
+    assert rc == 0
+    assert 'Marea 118/2025' in capsys.readouterr().out
+    captura = DbfColumns(os.path.join(data_dir, 'C11825.DBF'))
+    original = DbfColumns(os.path.join(INPUT_DATA, 'C11825.DBF'))
+    assert captura['KG_1'][0] == original['KG_1'][0] * 2
+    assert captura['KG_1'][1] == original['KG_1'][1]
@@ -0,0 +1,112 @@
+import os
+import sys
+import shutil
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from infrastructure.dbf_reader import DbfColumns, read_header, read_records
+from infrastructure.edit_journal import EditJournal
+from infrastructure.marea_service import correct_discards, open_edit_journal
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+
+
+@pytest.fixture
+def captura(tmp_path):
+    path = str(tmp_path / 'C11825.DBF')
+    shutil.copy(os.path.join(INPUT_DATA, 'C11825.DBF'), path)
+    return path
+
+
+def _bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_edits_stay_in_overlay_until_saved(captura):
+    """Test: Las ediciones se deshacen y rehacen sin tocar el archivo y se aplican al guardar."""
+    # El primer registro borrado: las filas se cuentan sin él, como en DbfColumns
+    header = read_header(captura)
+    with open(captura, 'r+b') as f:
+        f.seek(header.header_length)
+        f.write(b'*')
+    original = _bytes(captura)
+    antes = DbfColumns(captura)
+
+    diario = EditJournal(captura)
+    assert diario.num_rows == antes.num_rows
+    assert diario.edit([25], {'LAT_INIC': 44.302}, "Latitud del lance 27") == 1
+    assert diario.edit([0, 1], {'KG_1': [10.004, antes['KG_1'][1]], 'OBSERVAC': 'revisado'}, "Kilos") == 3
+    assert diario.values('KG_1', [0, 1]).tolist() == [10.0, antes['KG_1'][1]]
+    assert diario.values('OBSERVAC', [0]).tolist() == ['revisado']
+    assert diario.edited_cells == 4 and _bytes(captura) == original
+
+    diario.undo()
+    assert diario.edited_cells == 1 and diario.can_redo
+    assert diario.values('KG_1', [0]).tolist() == [antes['KG_1'][0]]
+    diario.redo()
+    assert diario.history == ["Latitud del lance 27", "Kilos"]
+    with pytest.raises(ValueError):
+        diario.edit([2], {'KG_1': 1e9})
+    assert diario.edited_cells == 4
+
+    assert diario.save() == 4
+    assert not diario.dirty and not diario.can_undo and not os.path.exists(diario.journal_path)
+    despues = DbfColumns(captura)
+    assert despues['LAT_INIC'][25] == 44.302 and despues['KG_1'][0] == 10.0 and despues['OBSERVAC'][0] == 'revisado'
+    intactas = np.setdiff1d(np.arange(antes.num_rows), [0, 1, 25])
+    assert (read_records(captura)[intactas] == antes.records[intactas]).all()
+    assert read_records(captura, include_deleted=True)[0, 0] == ord('*')
+
+
+def test_journal_recovers_interrupted_session(captura):
+    """Test: El diario en disco devuelve ediciones e historial a una sesión nueva."""
+    diario = EditJournal(captura)
+    diario.edit([0], {'LANCE': 99}, "Lance")
+    diario.edit([1], {'FECHA': np.datetime64('NaT')}, "Fecha")
+    diario.edit([2], {'BARCO': 'FEDERICO C'}, "Barco")
+    diario.undo()
+    diario.close()
+    with open(diario.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "edit')  # corte a mitad de una línea
+
+    recuperado = EditJournal(captura)
+    assert recuperado.history == ["Lance", "Fecha"] and recuperado.can_redo
+    assert recuperado.values('LANCE', [0]).tolist() == [99]
+    assert np.isnat(recuperado.values('FECHA', [1])[0])
+    recuperado.redo()
+    assert recuperado.values('BARCO', [2]).tolist() == ['FEDERICO C']
+    recuperado.close()
+    assert EditJournal(captura).history == ["Lance", "Fecha", "Barco"]
+
+    # Si el archivo cambió por fuera, el diario ya no corresponde
+    with open(captura, 'ab') as f:
+        f.write(b' ')
+    with pytest.raises(ValueError):
+        EditJournal(captura)
+    assert not EditJournal(captura, recover=False).dirty
+
+
+def test_discard_correction_can_be_undone(captura):
+    """Test: Una corrección de descarte registrada en el diario se deshace sin reescribir el archivo."""
+    data_dir = os.path.dirname(captura)
+    original = _bytes(captura)
+    especie = int(DbfColumns(captura)['ESPECIE_1'][0])
+
+    diario = open_edit_journal(data_dir, '118', '2025')
+    result = correct_discards(data_dir, '118', '2025', 'descarte_total', especie=especie, journal=diario)
+    assert result.registros > 0 and diario.dirty and _bytes(captura) == original
+    diario.undo()
+    assert not diario.dirty
+    diario.redo()
+    diario.save()
+
+    directo = os.path.join(data_dir, 'directo')
+    os.makedirs(directo)
+    with open(os.path.join(directo, 'C11825.DBF'), 'wb') as f:
+        f.write(original)
+    correct_discards(directo, '118', '2025', 'descarte_total', especie=especie)
+    assert _bytes(captura) == _bytes(os.path.join(directo, 'C11825.DBF'))
@@ -0,0 +1,80 @@
+import os
+import sys
+import csv
+import zipfile
+import pytest
+import numpy as np
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.legacy_parity import legacy_number, read_legacy_report
+from infrastructure.exporters import (EXPORT_FORMATS, ExportRequest, export_path, export_table,
+                                      export_tables)
+
+
+@pytest.fixture
+def tabla():
+    return {
+        'barco': np.array(['FEDERICO C', 'DON "T"; X, Y', 'Piñero']),
+        'lance': np.array([1, 2, 3]),
+        'fecha': np.array(['2025-09-02', 'NaT', '2025-09-03'], dtype='datetime64[D]'),
+        'latitud': np.array([-43.29, -43.345, np.nan]),
+        'kilos': np.array([1234.5, 0.126, 10.0]),
+    }
+
+
+def test_csv_matches_csv_module(tabla, tmp_path):
+    """Test: El CSV escrito por bloques se lee igual que uno escrito con el módulo csv."""
+    result = export_table(ExportRequest(str(tmp_path / 't.csv'), tabla, 'csv'), batch_rows=2)
+    assert result.filas == 3
+    with open(tmp_path / 't.csv', newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(tabla)
+    assert rows[2] == ['DON "T"; X, Y', '2', '', '-43.345', '0.126']
+    assert rows[3] == ['Piñero', '3', '2025-09-03', '', '10.0']
+
+
+def test_legacy_txt_and_gis_layout(tabla, tmp_path):
+    """Test: TXT y GIS siguen el formato de los informes viejos y se leen con el lector de paridad."""
+    export_table(ExportRequest(str(tmp_path / 't.txt'), tabla, 'txt'))
+    rows, decimal = read_legacy_report(str(tmp_path / 't.txt'))
+    assert decimal == ','
+    assert rows[0] == list(tabla)
+    assert rows[1] == ['FEDERICO C', '1', '02/09/2025', '-43,2900', '1234,50']
+    # El separador dentro de un texto no corre las columnas
+    assert rows[2][0] == 'DON "T"  X  Y' and len(rows[2]) == 5
+    assert legacy_number(rows[2][4], decimal) == 0.13
+
+    export_table(ExportRequest(str(tmp_path / 't_GIS.TXT'), tabla, 'gis', decimales={'kilos': 1}))
+    rows, decimal = read_legacy_report(str(tmp_path / 't_GIS.TXT'))
+    assert decimal == '.'
+    assert rows[1] == ['FEDERICO C', '1', '02/09/2025', '-43.2900', '1234.5']
+    with open(tmp_path / 't_GIS.TXT', 'rb') as f:
+        assert 'Piñero'.encode('cp1252') in f.read()
+
+
+def test_xlsx_is_a_valid_workbook(tabla, tmp_path):
+    """Test: El XLSX tiene hoja, títulos, números como valores y fechas seriales de Excel."""
+    export_table(ExportRequest(str(tmp_path / 't.xlsx'), tabla, 'xlsx', hoja='Resumen muestra/maduros'))
+    with zipfile.ZipFile(tmp_path / 't.xlsx') as zf:
+        assert zf.testzip() is None
+        assert 'name="Resumen muestra_maduros"' in zf.read('xl/workbook.xml').decode()
+        sheet = zf.read('xl/worksheets/sheet1.xml').decode()
+    assert sheet.count('<row>') == 4
+    assert '<t>DON "T"; X, Y</t>' in sheet
+    assert '<c s="1"><v>45902</v></c>' in sheet
+    assert '<c><v>1234.5</v></c>' in sheet
+
+
+def test_export_tables_writes_every_format(tabla, tmp_path):
+    """Test: El pool escribe todos los archivos y un formato desconocido falla con ValueError."""
+    requests = [ExportRequest(export_path(str(tmp_path), 'Distribución de tallas', formato), tabla, formato)
+                for formato in EXPORT_FORMATS]
+    results = export_tables(requests, max_workers=4)
+    assert sorted(os.path.basename(r.path) for r in results) == [
+        'Distribución_de_tallas.TXT', 'Distribución_de_tallas.csv', 'Distribución_de_tallas.xlsx',
+        'Distribución_de_tallas_GIS.TXT']
+    assert all(r.filas == 3 for r in results)
+    with pytest.raises(ValueError):
+        export_table(ExportRequest(str(tmp_path / 't.ods'), tabla, 'ods'))
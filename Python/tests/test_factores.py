@@ -0,0 +1,106 @@
+import os
+import socket
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.factores import area_barrida
+from domain.jobs import JobContext
+from domain.procesos import affected_by
+from infrastructure.dbf_reader import DbfColumns, write_dbf
+from infrastructure.factores_store import FACTORES_FILE, FactoresTemporada, factores_path
+from infrastructure.marea_layouts import CAPTURA_LAYOUT
+from infrastructure.marea_service import run_processes
+
+MERLUZA, CALAMAR = 7210040101, 3210020101
+
+
+def _captura(directory, stem, fechas, kilos_merluza, area=0.1):
+    """Captura de lances de una hora con el área barrida cargada en AREA_BARR."""
+    n = len(fechas)
+    write_dbf(os.path.join(str(directory), f'{stem}.DBF'), CAPTURA_LAYOUT, {
+        'BARCO': np.full(n, 'FEDERICO C'), 'MAREA': np.full(n, 1), 'LANCE': np.arange(1, n + 1),
+        'FECHA': np.array(fechas, dtype='datetime64[D]'),
+        'HORA_INIC': np.full(n, 8.0), 'HORA_FINAL': np.full(n, 9.0),
+        'VEL_ARRAS': np.full(n, 3.5), 'AREA_BARR': np.full(n, area),
+        'ESPECIE_1': np.full(n, MERLUZA), 'KG_1': np.array(kilos_merluza, dtype=float),
+        'ESPECIE_2': np.array([CALAMAR] + [0] * (n - 1)), 'KG_2': np.array([50.0] + [0.0] * (n - 1)),
+    })
+
+
+def test_area_barrida_uses_recorded_value_first():
+    """Test: El área barrida es velocidad x horas x abertura / 1852, salvo que el lance traiga AREA_BARR."""
+    area = area_barrida(np.array([3.5, 3.5]), np.array([56 / 60, 1.0]), np.array([50.0, 50.0]),
+                        np.array([0.0, 0.5]))
+    assert area[0] == pytest.approx(0.08819, abs=1e-5)
+    assert area[1] == 0.5
+
+
+def test_factores_by_lance_month_and_year(tmp_path):
+    """Test: CPUE y densidad por lance y razones de sumas por mes con el esfuerzo de todos los lances."""
+    _captura(tmp_path, 'C0125', ['2025-07-30', '2025-07-31', '2025-08-01'], [1000, 3000, 500])
+    tabla = run_processes(JobContext(), ["Factores CPUE"], '1', '2025', data_dir=str(tmp_path),
+                          especies=[CALAMAR])["Factores CPUE"]
+    # Sólo la especie pedida, con el esfuerzo de los dos lances de julio
+    assert tabla['especie'].tolist() == [CALAMAR]
+    assert tabla['cap_ce'][0] == pytest.approx(50.0)
+    assert tabla['den_ce'][0] == pytest.approx(0.05 / 0.1)
+    assert tabla['cap_men'][0] == pytest.approx(25.0) and tabla['slme'][0] == 2
+    assert tabla['slma'][0] == 3 and tabla['cap_anu'][0] == pytest.approx(50 / 3)
+
+    factores = DbfColumns(factores_path(str(tmp_path), '1', '2025'))
+    assert factores['COD_ESPEC'].tolist() == [CALAMAR]
+    assert factores['CAP_CE'].tolist() == [50] and factores['DEN_M'][0] == pytest.approx(0.25)
+    assert factores['AREA_BARR'][0] == pytest.approx(0.1)
+
+
+def test_annual_factors_update_incrementally(tmp_path):
+    """Test: Una marea nueva suma sus aportes al año; reprocesar una marea reemplaza los suyos."""
+    _captura(tmp_path, 'C0125', ['2025-07-30'], [1000])
+    _captura(tmp_path, 'C0225', ['2025-09-01'], [3000], area=0.0)
+    run = lambda num: run_processes(JobContext(), ["Factores CPUE"], num, '2025', data_dir=str(tmp_path),
+                                    especies=[MERLUZA])["Factores CPUE"]
+
+    assert run('1')['cap_anu'].tolist() == [1000]
+    segunda = run('2')
+    # Año: 4000 kg en 2 horas; la densidad sólo usa el lance con área barrida
+    assert segunda['cap_anu'][0] == pytest.approx(2000) and segunda['slma'][0] == 2
+    assert segunda['den_anu'][0] == pytest.approx(1.0 / 0.1)
+    assert segunda['den_ce'][0] == 0
+
+    _captura(tmp_path, 'C0125', ['2025-07-30'], [5000])
+    assert run('1')['cap_anu'][0] == pytest.approx(4000)
+    temporada = FactoresTemporada(os.path.join(str(tmp_path), FACTORES_FILE))
+    assert temporada.mareas() == ['1/2025', '2/2025']
+    temporada.quitar('2', '2025')
+    anuales = FactoresTemporada(temporada.path).anuales([2025], [MERLUZA])
+    assert anuales['cap_anu'].tolist() == [5000] and anuales['slma'].tolist() == [1]
+
+
+def test_stale_lock_is_broken(tmp_path):
+    """Test: Un .lock de un proceso que ya terminó, o más viejo que la espera, se rompe."""
+    temporada = FactoresTemporada(os.path.join(str(tmp_path), FACTORES_FILE))
+    lock_path = temporada.path + '.lock'
+    muerto = subprocess.Popen([sys.executable, '-c', 'pass'])
+    muerto.wait()
+    with open(lock_path, 'w') as f:
+        f.write(f"{muerto.pid} {socket.gethostname()}")
+    assert temporada.actualizar('1', '2025', {}) is True
+    assert not os.path.exists(lock_path)
+
+    with open(lock_path, 'w') as f:
+        f.write(f"{os.getpid()} {socket.gethostname()}")
+    os.utime(lock_path, (0, 0))
+    assert temporada.actualizar('2', '2025', {}) is True
+    assert not os.path.exists(lock_path)
+
+
+def test_aportes_depend_only_on_captura():
+    """Test: Los aportes de la temporada dependen sólo de la captura; "Factores CPUE" también de la muestra."""
+    assert 'aportes_factores' not in affected_by(['muestra'])
+    assert {'aportes_factores', 'Factores CPUE'} <= affected_by(['captura'])
+    assert 'Factores CPUE' in affected_by(['muestra'])
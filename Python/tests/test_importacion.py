@@ -0,0 +1,134 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli
+from domain.jobs import JobContext
+from domain.marea_procesos import decode_tallas
+from infrastructure.dbf_reader import DbfColumns
+from infrastructure.exporters import ExportRequest, export_table
+from infrastructure.importacion import import_planillas
+from infrastructure import planillas
+from infrastructure.planillas import iter_rows, sheet_names
+
+FOXPRO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'FoxPro'))
+PLANILLA_CAPTURA = os.path.join(FOXPRO, 'C0323.xls')
+PLANILLA_BIFF5 = os.path.join(FOXPRO, 'observ.xls')
+MERLUZA = 7210040101
+
+
+def _planilla(path, tabla, hoja='Tallas'):
+    """Planilla .xlsx con los encabezados en la primera fila."""
+    export_table(ExportRequest(str(path), tabla, 'xlsx', hoja=hoja))
+    return str(path)
+
+
+@pytest.mark.skipif(not os.path.exists(PLANILLA_CAPTURA), reason="Sin planillas de ejemplo")
+def test_xls_capture_sheet_imports_to_dbf(tmp_path):
+    """Test: Una planilla .xls de lances se lee por filas y se escribe como archivo de captura."""
+    assert sheet_names(PLANILLA_CAPTURA) == ['C0323']
+    primera = next(iter_rows(PLANILLA_CAPTURA))[1]
+    assert [str(v).strip() for v in primera[:3]] == ['Buque', 'marea', 'lan']
+
+    result = import_planillas(JobContext(), [PLANILLA_CAPTURA], str(tmp_path), '3', '2023')
+    assert not result.errores and result.registros == {'captura': 113}
+    captura = DbfColumns(result.archivos['captura'])
+    assert os.path.basename(result.archivos['captura']) == 'C0323.DBF'
+    assert captura['BARCO'][0] == 'GEMINIS'
+    assert captura['LANCE'].tolist() == list(range(1, 114))
+    assert str(captura['FECHA'][0]) == '2023-01-08' and str(captura['FECHA'][-1]) == '2023-02-11'
+    assert (captura['MAREA'] == 3).all()
+
+    with pytest.raises(FileExistsError):
+        import_planillas(JobContext(), [PLANILLA_CAPTURA], str(tmp_path), '3', '2023')
+
+
+@pytest.mark.skipif(not os.path.exists(PLANILLA_BIFF5), reason="Sin planillas de ejemplo")
+def test_excel95_workbook_is_read():
+    """Test: Los libros de Excel 5/95 (BIFF5) se leen con el texto en cp1252."""
+    assert sheet_names(PLANILLA_BIFF5) == ['observ']
+    filas = [valores for _, valores in iter_rows(PLANILLA_BIFF5)]
+    assert filas[0][:3] == ['idnoserie', 'nombre', 'apel1']
+    assert filas[1][0] == 70.0 and filas[1][2] == 'ABDO'
+
+
+@pytest.mark.skipif(not os.path.exists(PLANILLA_BIFF5), reason="Sin planillas de ejemplo")
+def test_xls_is_read_by_sectors(monkeypatch):
+    """Test: El .xls se lee del archivo de a tiras de sectores, nunca completo, y da las mismas filas."""
+    esperado = list(iter_rows(PLANILLA_BIFF5))
+    lecturas = []
+
+    class Contador:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.f.close()
+
+        def seek(self, pos):
+            self.f.seek(pos)
+
+        def read(self, n=-1):
+            data = self.f.read(n)
+            lecturas.append(len(data))
+            return data
+
+    monkeypatch.setattr(planillas, 'open', lambda path, mode='r': Contador(open(path, mode)), raising=False)
+    monkeypatch.setattr(planillas, '_READ_AHEAD_SECTORS', 1)
+    assert list(iter_rows(PLANILLA_BIFF5)) == esperado
+    assert max(lecturas) <= 512 < os.path.getsize(PLANILLA_BIFF5)
+
+
+def test_length_rows_are_encoded_into_talla_fields(tmp_path):
+    """Test: Las filas de tallas se agrupan por muestra y se codifican en TALLA_n desde la más chica."""
+    planilla = _planilla(tmp_path / 'tallas.xlsx', {
+        'Lance': np.array([2, 1, 1, 1, 2]),
+        'Fecha': np.array(['2025-07-30', '2025-07-29', '2025-07-29', '2025-07-29', '2025-07-30']),
+        'Especie': np.array(['Merluccius hubbsi'] * 5),
+        'Cód. especie': np.full(5, MERLUZA),
+        'Talla': np.array([40, 34, 37, 35, 40]),
+        'Machos': np.array([1, 2, 0, 1, 0]), 'Hembras': np.array([0, 1, 3, 0, 0]),
+    })
+    # La misma talla dos veces en la muestra del lance 2
+    result = import_planillas(JobContext(), [planilla], str(tmp_path), '1', '2025')
+    assert [e.campo for e in result.errores] == ['TALLA'] and not result.archivos
+    assert result.errores[0].fila == 6  # encabezado en la fila 1
+
+    planilla = _planilla(tmp_path / 'tallas.xlsx', {
+        'Lance': np.array([2, 1, 1, 1]), 'Fecha': np.array(['30/07/2025', '29/07/2025', '29/07/2025', '29/07/2025']),
+        'Especie': np.array(['Merluccius hubbsi'] * 4), 'Cód. especie': np.full(4, MERLUZA),
+        'Talla': np.array([40, 34, 37, 35]),
+        'Machos': np.array([1, 2, 0, 1]), 'Hembras': np.array([0, 1, 3, 0]),
+    })
+    result = import_planillas(JobContext(), [planilla], str(tmp_path), '1', '2025')
+    assert result.registros == {'muestra': 2}
+    muestra = DbfColumns(result.archivos['muestra'])
+    assert muestra['LANCE'].tolist() == [1, 2]
+    assert muestra['PRIM_TALLA'].tolist() == [34, 40] and muestra['ULT_TALLA'].tolist() == [37, 40]
+    tallas = decode_tallas(np.array([muestra[f'TALLA_{i}'][0] for i in range(1, 6)]))
+    assert tallas['talla'].tolist() == [34, 35, 36, 37, 0]
+    assert tallas['machos'].tolist() == [2, 1, 0, 0, 0] and tallas['total'].tolist() == [3, 1, 0, 3, 0]
+
+
+def test_invalid_rows_reject_whole_import(tmp_path, capsys):
+    """Test: Con valores inválidos no se escribe nada y se informan todos los errores por hoja y fila."""
+    planilla = _planilla(tmp_path / 'lances.xlsx', {
+        'Buque': np.array(['FEDERICO C'] * 3), 'Marea': np.array([1, 1, 7]), 'Lance': np.array([1, 2, 3]),
+        'Fecha': np.array(['29/07/2025', '31/02/2025', '30/07/2025']),
+        'Capt_total': np.array(['10', 'mucho', '99999999999']),
+    }, hoja='Lances')
+    rc = cli.main(['importar', str(tmp_path), planilla, '--marea', '1/2025'])
+    assert rc == 1
+    errores = capsys.readouterr().err
+    assert 'lances.xlsx:Lances!3 FECHA' in errores
+    assert 'lances.xlsx:Lances!3 CAPT_TOTAL: no es un número' in errores
+    assert 'lances.xlsx:Lances!4 CAPT_TOTAL: no entra en el campo (10,1)' in errores
+    assert 'lances.xlsx:Lances!4 MAREA' in errores
+    assert not [name for name in os.listdir(tmp_path) if name.lower().endswith(('.dbf', '.tmp'))]
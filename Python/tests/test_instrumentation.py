@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import JobContext
+from infrastructure import instrumentation
+from infrastructure.instrumentation import INSTRUMENTATION, Instrumentation, count, span
+from infrastructure.marea_service import load_marea_dataset, run_processes
+from infrastructure.repositories import CatalogRepository
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INPUT_DATA = os.path.join(APP_ROOT, 'input_data')
+
+
+@pytest.fixture
+def enabled(tmp_path):
+    """Activa la instrumentación global durante el test."""
+    INSTRUMENTATION.reset()
+    INSTRUMENTATION.configure(enabled=True, profiling=False, profile_dir=str(tmp_path / 'perfiles'))
+    yield INSTRUMENTATION
+    INSTRUMENTATION.configure(enabled=False, profiling=False)
+    INSTRUMENTATION.reset()
+
+
+def test_disabled_instrumentation_records_nothing():
+    """Test: Desactivada, `span` devuelve el tramo nulo compartido y no se cuenta nada."""
+    inst = Instrumentation()
+    inst.configure(enabled=False)
+    with inst.span('algo') as tramo:
+        tramo.set(x=1)
+    inst.count('registros', 10)
+    assert tramo is instrumentation._NULL_SPAN
+    assert inst.recent_spans() == [] and inst.counters() == {}
+
+
+def test_spans_and_counters_go_to_rotating_log(tmp_path):
+    """Test: Los tramos se registran con su duración y atributos en un log JSON-lines rotativo."""
+    log_path = tmp_path / 'logs' / 'diagnostico.jsonl'
+    inst = Instrumentation()
+    inst.configure(enabled=True, log_path=str(log_path), max_bytes=300, backup_count=2)
+    with inst.span('catalogos.especies', archivo='Especies.dbf') as tramo:
+        tramo.set(registros=3)
+    inst.count('dbf.registros_leidos', 5)
+    inst.count('dbf.registros_leidos', 2)
+
+    entry = inst.recent_spans()[0]
+    assert entry['tramo'] == 'catalogos.especies' and entry['ms'] >= 0
+    assert entry['atributos'] == {'archivo': 'Especies.dbf', 'registros': 3}
+    assert inst.counters() == {'dbf.registros_leidos': 7}
+    assert json.loads(log_path.read_text(encoding='utf-8').splitlines()[0])['tramo'] == 'catalogos.especies'
+
+    for i in range(20):
+        with inst.span(f'tramo_{i}'):
+            pass
+    assert os.path.exists(f"{log_path}.1")
+
+
+def test_span_marks_errors():
+    """Test: Un tramo que termina con excepción registra el tipo de error."""
+    inst = Instrumentation()
+    inst.configure(enabled=True)
+    with pytest.raises(ValueError):
+        with inst.span('falla'):
+            raise ValueError("x")
+    assert inst.recent_spans()[0]['atributos'] == {'error': 'ValueError'}
+
+
+def test_process_run_records_node_spans_and_profile(enabled, tmp_path):
+    """Test: Una ejecución de procesos registra un tramo por nodo y, si se pide, un perfil cProfile."""
+    enabled.configure(profiling=True)
+    run_processes(JobContext(), ["Resumen produccion"], '118', '2025', data_dir=INPUT_DATA)
+    tramos = [s['tramo'] for s in enabled.recent_spans()]
+    assert 'nodo.Resumen produccion' in tramos and 'procesos' in tramos
+    perfil = next(s for s in enabled.recent_spans() if s['tramo'].startswith('perfil:'))
+    assert os.path.exists(perfil['archivo']) and 'resumen_produccion' in perfil['resumen']
+    assert enabled.counters()['dbf.registros_leidos'] > 0
+
+
+def test_catalog_repository_counts_records(enabled):
+    """Test: La lectura de catálogos cuenta registros y bytes leídos."""
+    repo = CatalogRepository(os.path.join(APP_ROOT, 'data'))
+    especies = repo.get_especies()
+    counters = enabled.counters()
+    assert counters['catalogos.registros_leidos'] >= len(especies) > 0
+    assert counters['catalogos.bytes_leidos'] > 0
+    assert enabled.recent_spans()[-1]['atributos'] == {'registros': len(especies)}
+
+
+def test_unreadable_marea_file_is_logged_and_counted(enabled, tmp_path, caplog):
+    """Test: Un archivo de marea ilegible se informa por el logger y suma al contador, sin cortar la carga."""
+    (tmp_path / 'C11825.DBF').write_bytes(b'no es un dbf')
+    with caplog.at_level('ERROR', logger='infrastructure.marea_service'):
+        dataset = load_marea_dataset(str(tmp_path), '118', '2025')
+    assert dataset.num_rows('captura') == 0
+    assert enabled.counters()['mareas.archivos_ilegibles'] == 1
+    assert 'C11825.DBF' in caplog.text
+
+
+def test_module_helpers_are_noops_when_disabled():
+    """Test: `span` y `count` del módulo no registran nada con la instrumentación apagada."""
+    assert not INSTRUMENTATION.enabled
+    with span('x'):
+        count('y')
+    assert 'y' not in INSTRUMENTATION.counters()
+
+
+def test_diagnostics_dialog_lists_spans(qtbot, enabled):
+    """Test: El diálogo de diagnóstico muestra tramos y contadores."""
+    from presentation.diagnostics_dialog import DiagnosticsDialog
+    with span('ui.guardar_estado'):
+        count('dbf.registros_leidos', 3)
+    dialog = DiagnosticsDialog()
+    qtbot.addWidget(dialog)
+    assert dialog.spans_table.item(0, 1).text() == 'ui.guardar_estado'
+    assert dialog.counters_table.item(0, 0).text() == 'dbf.registros_leidos'
+    dialog.enabled_check.setChecked(False)
+    assert not enabled.enabled
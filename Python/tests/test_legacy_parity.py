@@ -0,0 +1,68 @@
+import os
+import shutil
+import sys
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import legacy_parity
+from benchmarks.legacy_parity import (FOXPRO_DIR, legacy_dates, legacy_hmm_minutes, legacy_number,
+                                      parse_positions_report, parse_species_report, run_parity)
+
+requires_foxpro = pytest.mark.skipif(not os.path.isdir(FOXPRO_DIR), reason="Sin la carpeta FoxPro del sistema viejo")
+
+
+def test_legacy_number_formats():
+    """Test: Se leen los números de los informes con coma decimal, con miles y en formato GIS."""
+    assert legacy_number('     226600,00 ') == 226600.0
+    assert legacy_number('1.244.268,43') == 1244268.43
+    assert legacy_number('-43.2900', decimal='.') == -43.29
+    assert legacy_number('******') is None
+    assert legacy_hmm_minutes(6.55) == 415
+    assert legacy_hmm_minutes(8.3) == 510  # Excel recorta el cero final de 8,30
+    assert legacy_dates('08/29/2022') == legacy_dates('29/08/2022')
+    assert len(legacy_dates('02/09/2025')) == 2
+
+
+def test_parse_species_report_sections(tmp_path):
+    """Test: Del informe B se toman las filas por especie y los totales, no la sección por área."""
+    path = tmp_path / 'B12822a.TXT'
+    path.write_bytes(
+        b"\r\nEspecie  ; Kilos ; Descarte  ; Desc.%   ; Lances  ; Dias ; Horas \r\n"
+        b"Scomber colias ;  225800,00 ;  0,00 ;   0,00 ;  8 ;  2 ;  6,55\r\n"
+        b" Trachurus sp. ;     800,00 ; 800,00 ; 100,00  ;  7 ;  2 ;  6,35\r\n\r\n"
+        b" ;  226600,00 ;  800,00 ;  0,3530 ;  8 ;  2\r\n\r\n"
+        b"Datos de captura y esfuerzo por area\r\n"
+        b"Area  ; Kilos ; Descarte  ; Desc%   ; Lances  ; D\xedas ; Horas \r\n"
+        b"  4060 ; 226600,00 ; 800,00 ; 0,35 ; 8 ; 5 ; 6,55\r\n\x1a")
+    report = parse_species_report(str(path))
+
+    assert list(report.especies) == ['Scomber colias', 'Trachurus sp.']
+    assert report.especies['Trachurus sp.']['minutos'] == 6 * 60 + 35
+    assert report.totales == {'kilos': 226600.0, 'descarte': 800.0, 'descarte_pct': 0.353, 'lances': 8, 'dias': 2}
+
+
+@requires_foxpro
+def test_ported_processes_match_legacy_reports():
+    """Test: Todos los informes y cortes del sistema viejo coinciden con los procesos portados."""
+    informe = run_parity(repeticiones=1, log=lambda *_: None)
+    comparados = [caso for caso in informe['casos'] if not caso['omitido']]
+
+    assert {caso['proceso'] for caso in comparados} >= set(legacy_parity.REPORT_PROCESSES.values()) | {"Cortar bases"}
+    assert [(caso['caso'], caso['diferencias']) for caso in comparados if not caso['ok']] == []
+    assert all(caso['segundos'] > 0 for caso in comparados)
+
+
+@requires_foxpro
+def test_parity_reports_numeric_differences(tmp_path):
+    """Test: Un informe con una posición alterada más allá de la tolerancia se informa como diferencia."""
+    shutil.copy(os.path.join(FOXPRO_DIR, 'c12822a.dbf'), tmp_path / 'c12822a.dbf')
+    original = open(os.path.join(FOXPRO_DIR, 'C12822a.TXT'), 'rb').read()
+    (tmp_path / 'C12822a.TXT').write_bytes(original.replace(b'-40,4167', b'-40,4180', 1))
+    assert parse_positions_report(str(tmp_path / 'C12822a.TXT'))[0].latitud == -40.418
+
+    informe = run_parity(str(tmp_path), repeticiones=1, log=lambda *_: None)
+    caso, = informe['casos']
+    assert not caso['ok']
+    assert len(caso['diferencias']) == 1 and 'latitud' in caso['diferencias'][0]
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtGui import QColor
+
+from domain.histogramas import SEXOS, HistogramaTallas
+from domain.jobs import JobContext
+from infrastructure.marea_service import length_histograms, run_processes
+from presentation.length_chart import SERIES_COLORS, LengthChart
+from presentation.length_chart_dialog import LengthChartDialog, parse_lances
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+
+
+def _temporada(filas, especies=12, seed=0):
+    """Tallas de una temporada sintética: una fila por talla medida de cada muestra."""
+    rng = np.random.default_rng(seed)
+    return {
+        'especie': rng.integers(0, especies, filas) * 1000 + 7210040101,
+        'etapa': rng.integers(-1, 4, filas),
+        'lance': rng.integers(1, 400, filas),
+        'talla': rng.integers(10, 90, filas),
+        'machos': rng.integers(0, 20, filas),
+        'hembras': rng.integers(0, 20, filas),
+        'indeterminados': rng.integers(0, 3, filas),
+    }
+
+
+def test_histograms_match_length_distribution():
+    """Test: Los histogramas precalculados suman lo mismo que "Distribución de tallas"."""
+    etapas = [('2025-01-01', '2025-06-30'), ('2025-07-01', '2025-12-31')]
+    histograma = length_histograms(JobContext(), INPUT_DATA, '118', '2025', etapas=etapas)
+    distribucion = run_processes(JobContext(), ["Distribución de tallas"], '118', '2025', etapas=etapas,
+                                 data_dir=INPUT_DATA)["Distribución de tallas"]
+    for especie in histograma.especies.tolist():
+        eje = histograma.eje(especie)
+        por_sexo = histograma.por_sexo(especie)
+        filas = distribucion['especie'] == especie
+        for sexo in SEXOS:
+            esperado = np.bincount(distribucion['talla'][filas] - eje[0], weights=distribucion[sexo][filas],
+                                   minlength=len(eje))
+            assert (por_sexo[sexo] == esperado).all()
+        assert sum(por_sexo[sexo].sum() for sexo in SEXOS) == sum(v.sum() for v in histograma.por_etapa(especie).values())
+    assert histograma.nombres
+
+    with pytest.raises(KeyError):
+        histograma.eje(1)
+    assert parse_lances(' 3, 7-9 ;12').tolist() == [3, 7, 8, 9, 12] and parse_lances('') is None
+    with pytest.raises(ValueError):
+        parse_lances('3-a')
+
+
+def test_filters_redraw_only_changed_series(qtbot):
+    """Test: Al filtrar por etapa o lance sólo se rearman las series cuyos conteos cambian."""
+    tallas = {
+        'especie': np.array([1, 1, 1, 1, 2]), 'etapa': np.array([0, 0, 1, 1, 0]),
+        'lance': np.array([1, 2, 3, 3, 1]), 'talla': np.array([20, 21, 20, 25, 40]),
+        'machos': np.array([3, 0, 1, 2, 5]), 'hembras': np.array([0, 4, 0, 0, 5]),
+        'indeterminados': np.array([0, 0, 0, 0, 1]),
+    }
+    dialog = LengthChartDialog(HistogramaTallas(tallas), especies=[2])
+    qtbot.addWidget(dialog)
+    assert dialog.especie() == 2 and dialog.status_label.text() == "11 ejemplares medidos"
+    dialog.especie_combo.setCurrentIndex(0)
+    assert dialog.sexo_chart._eje.tolist() == list(range(20, 26))
+    assert dialog.etapa_chart.series_names() == ['Etapa 1', 'Etapa 2']
+
+    def reconstruidas(accion):
+        antes = dict(dialog.sexo_chart._paths)
+        accion()
+        return [name for name, path in dialog.sexo_chart._paths.items() if path is not antes.get(name)]
+
+    cambio_etapa = reconstruidas(lambda: dialog.etapa_combo.setCurrentIndex(dialog.etapa_combo.findData(1)))
+    assert cambio_etapa == ['Machos', 'Hembras']  # los indeterminados siguen en cero
+    dialog.lances_edit.setText('3')
+    assert reconstruidas(dialog.apply_lances) == [] and dialog.status_label.text() == "3 ejemplares medidos"
+
+    dialog.resize(500, 400)
+    assert not dialog.sexo_chart.grab().isNull()
+
+
+def test_species_switch_is_fast_on_a_season(qtbot):
+    """Test: Con una temporada de muestras, cambiar de especie tarda menos de 50 ms."""
+    dialog = LengthChartDialog(HistogramaTallas(_temporada(600_000)))
+    qtbot.addWidget(dialog)
+    dialog.resize(860, 620)
+    dialog.show()
+    tiempos = []
+    for i in (3, 7, 11, 0, 5):
+        inicio = time.perf_counter()
+        dialog.especie_combo.setCurrentIndex(i)
+        dialog.sexo_chart.repaint()
+        dialog.etapa_chart.repaint()
+        tiempos.append(time.perf_counter() - inicio)
+    assert dialog.etapa_chart.series_names() == ['Sin etapa', 'Etapa 1', 'Etapa 2', 'Etapa 3', 'Etapa 4']
+    assert sorted(tiempos)[len(tiempos) // 2] < 0.05
+
+
+def test_chart_follows_dark_theme(qtbot):
+    """Test: Con la hoja de estilos oscura el fondo sale de la paleta y las series usan los colores del tema."""
+    chart = LengthChart("Tallas")
+    qtbot.addWidget(chart)
+    chart.setStyleSheet("QWidget { background-color: #2E2E2E; color: #FFFFFF; }")
+    chart.ensurePolished()
+    chart.set_series(np.arange(20, 25), {'Machos': np.array([1, 0, 3, 2, 1]), 'Hembras': np.array([0, 2, 1, 0, 4])})
+    assert chart.theme() == 'dark'
+    assert list(chart.series_colors().values()) == SERIES_COLORS['dark'][:2]
+
+    imagen = chart.grab().toImage()
+    assert imagen.pixelColor(2, 2) == QColor('#2E2E2E')
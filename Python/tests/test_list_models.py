@@ -0,0 +1,81 @@
+import os
+import sys
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtCore import QDate, Qt
+
+from domain.entities import Especie
+from domain.intervals import IntervalIndex
+from presentation.list_models import SpeciesListModel, StageListModel
+
+
+def test_interval_index_overlap_and_order():
+    """Test: Los intervalos quedan ordenados y se detecta el solapamiento con el vecino correcto."""
+    index = IntervalIndex()
+    assert index.insert(10, 20) == 0
+    assert index.insert(30, 40) == 1
+    assert index.insert(0, 5) == 0
+    assert list(index) == [(0, 5), (10, 20), (30, 40)]
+
+    assert index.overlapping(21, 29) is None
+    assert index.overlapping(20, 25) == 1      # comparte el extremo (intervalos cerrados)
+    assert index.overlapping(6, 9) is None
+    assert index.overlapping(-10, 100) == 2    # abarca a todos: devuelve el último que empieza antes
+    assert index.overlapping(41, 50) is None
+    with pytest.raises(ValueError):
+        index.insert(35, 45)
+    with pytest.raises(ValueError):
+        index.insert(60, 50)
+
+    assert index.pop(1) == (10, 20)
+    assert index.overlapping(12, 18) is None
+
+
+def test_species_model_sorted_insert_and_duplicates():
+    """Test: El modelo de especies inserta por búsqueda binaria y rechaza códigos repetidos."""
+    model = SpeciesListModel()
+    merluza = Especie('3', 'Merluza', 'Merluccius hubbsi')
+    anchoita = Especie('1', 'Anchoita', 'Engraulis anchoita')
+    caballa = Especie('2', 'Caballa', 'Scomber colias')
+
+    assert model.add(merluza) == 0
+    assert model.add(anchoita) == 0
+    assert model.add(caballa) == 1
+    assert model.add(Especie('2', 'Caballa', 'Scomber colias')) is None
+    assert [model.index(i).data(Qt.DisplayRole) for i in range(model.rowCount())] == \
+        [e.display_name for e in (anchoita, caballa, merluza)]
+    assert model.index(2).data(Qt.UserRole) is merluza
+
+    model.remove_row(1)
+    assert not model.contains('2')
+    assert model.add(caballa) == 1
+
+
+def test_species_model_bulk_restore_sorts_once():
+    """Test: Restaurar muchas especies deja la lista ordenada y sin duplicados."""
+    model = SpeciesListModel()
+    especies = [Especie(str(i), f'Especie {i:04d}', f'Genus {i}') for i in range(2000, 0, -1)]
+    model.set_especies(especies + especies[:10])
+
+    assert model.rowCount() == 2000
+    nombres = [e.display_name for e in model.especies()]
+    assert nombres == sorted(nombres)
+    assert model.add(Especie('0', 'Especie 0000', 'Genus 0')) == 0
+
+
+def test_stage_model_rejects_overlaps():
+    """Test: El modelo de etapas ordena por fecha inicial y rechaza etapas solapadas."""
+    model = StageListModel()
+    model.add(QDate(2025, 8, 1), QDate(2025, 8, 10))
+    model.add(QDate(2025, 7, 1), QDate(2025, 7, 15))
+
+    assert model.etapas()[0] == (QDate(2025, 7, 1), QDate(2025, 7, 15))
+    assert model.index(1).data(Qt.DisplayRole) == "01/08/2025 - 10/08/2025"
+    assert model.overlapping(QDate(2025, 7, 15), QDate(2025, 7, 20)) == (QDate(2025, 7, 1), QDate(2025, 7, 15))
+    assert model.overlapping(QDate(2025, 7, 16), QDate(2025, 7, 31)) is None
+    with pytest.raises(ValueError):
+        model.add(QDate(2025, 8, 5), QDate(2025, 8, 20))
+    assert model.rowCount() == 2
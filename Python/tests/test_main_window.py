@@ -7,8 +7,8 @@ from unittest.mock import MagicMock
 # Añadir el directorio raíz del proyecto de Python al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from PySide6.QtCore import QDate, Qt
-from PySide6.QtWidgets import QApplication, QListWidgetItem
+from PySide6.QtCore import QDate, QPoint, Qt
+from PySide6.QtWidgets import QApplication, QMessageBox, QStyleOptionViewItem
 
 from presentation.main_window import MainWindow
 from domain.entities import Especie, Observador, Buque
@@ -42,10 +42,13 @@ def mock_repository(mocker, mock_species):
     return mock_repo
 
 @pytest.fixture
-def mock_config_manager(mocker):
+def mock_config_manager(mocker, tmp_path):
     """Crea un mock del config_manager."""
     mock_cm = MagicMock()
     mock_cm.load_config.return_value = None # No config file by default
+    mock_cm.get_result_cache_path.return_value = str(tmp_path / 'cache')
+    mock_cm.get_workspace_path.return_value = str(tmp_path / 'mareas')
+    mock_cm.get_input_data_path.return_value = str(tmp_path)
     mocker.patch('presentation.main_window.config_manager', new=mock_cm)
     return mock_cm
 
@@ -110,7 +113,7 @@ def test_save_state_on_change(window, mock_config_manager):
     # Verificar que se llamó al guardado
     mock_config_manager.save_config.assert_called()
 
-def test_load_state_on_startup(mocker, qt_app, mock_repository):
+def test_load_state_on_startup(mocker, qt_app, mock_repository, tmp_path):
     """Test: El estado se carga correctamente al iniciar si existe un archivo de config."""
     # Preparar un estado guardado
     saved_state = {
@@ -126,6 +129,7 @@ def test_load_state_on_startup(mocker, qt_app, mock_repository):
     
     mock_cm = MagicMock()
     mock_cm.load_config.return_value = saved_state
+    mock_cm.get_workspace_path.return_value = str(tmp_path / 'mareas')
     mocker.patch('presentation.main_window.config_manager', new=mock_cm)
 
     # Crear una nueva ventana para forzar la carga del estado
@@ -136,9 +140,9 @@ def test_load_state_on_startup(mocker, qt_app, mock_repository):
     assert win.anio_marea.text() == '2024'
     assert win.observador_combo.currentIndex() == 1
     assert win.buque_combo.currentIndex() == 1
-    assert win.etapas_list.count() == 1
-    assert win.especies_list.count() == 1
-    assert win.especies_list.item(0).data(Qt.UserRole).nom_vul_cas == 'Merluza'
+    assert win.etapas_model.rowCount() == 1
+    assert win.especies_model.rowCount() == 1
+    assert win.especies_model.index(0).data(Qt.UserRole).nom_vul_cas == 'Merluza'
 
 def test_clear_all_fields(qtbot, window, mock_config_manager):
     """Test: El botón 'Limpiar Todo' reinicia la UI y guarda el estado vacío."""
@@ -154,7 +158,7 @@ def test_clear_all_fields(qtbot, window, mock_config_manager):
     # Verificar que los campos están vacíos
     assert window.num_marea.text() == ''
     assert window.observador_combo.currentIndex() == 0
-    assert window.etapas_list.count() == 0
+    assert window.etapas_model.rowCount() == 0
     
     # Verificar que el año se ha reseteado al actual
     from datetime import datetime
@@ -170,7 +174,7 @@ def test_clear_all_fields(qtbot, window, mock_config_manager):
         'especies': []
     })
 
-def test_load_state_with_missing_keys(mocker, qt_app, mock_repository):
+def test_load_state_with_missing_keys(mocker, qt_app, mock_repository, tmp_path):
     """Test: Cargar un estado con claves faltantes no rompe la aplicación."""
     # Estado solo con una clave
     saved_state = {
@@ -179,6 +183,7 @@ def test_load_state_with_missing_keys(mocker, qt_app, mock_repository):
     
     mock_cm = MagicMock()
     mock_cm.load_config.return_value = saved_state
+    mock_cm.get_workspace_path.return_value = str(tmp_path / 'mareas')
     mocker.patch('presentation.main_window.config_manager', new=mock_cm)
 
     # La creación de la ventana no debe fallar
@@ -189,9 +194,9 @@ def test_load_state_with_missing_keys(mocker, qt_app, mock_repository):
     from datetime import datetime
     assert win.anio_marea.text() == str(datetime.now().year)
     assert win.observador_combo.currentIndex() == 0
-    assert win.etapas_list.count() == 0
+    assert win.etapas_model.rowCount() == 0
 
-def test_load_state_with_invalid_values(mocker, qt_app, mock_repository):
+def test_load_state_with_invalid_values(mocker, qt_app, mock_repository, tmp_path):
     """Test: Cargar un estado con valores inválidos (códigos no existentes)."""
     saved_state = {
         'observador_cod': '999', # Código no existente
@@ -200,25 +205,26 @@ def test_load_state_with_invalid_values(mocker, qt_app, mock_repository):
     
     mock_cm = MagicMock()
     mock_cm.load_config.return_value = saved_state
+    mock_cm.get_workspace_path.return_value = str(tmp_path / 'mareas')
     mocker.patch('presentation.main_window.config_manager', new=mock_cm)
 
     win = MainWindow()
 
     # Los combos no deben seleccionar nada y las listas deben estar vacías
     assert win.observador_combo.currentIndex() == 0
-    assert win.especies_list.count() == 0
+    assert win.especies_model.rowCount() == 0
 
 def test_add_target_specie(qtbot, window):
     """Test: Añadir una especie a la lista de especies objetivo."""
-    assert window.especies_list.count() == 0
+    assert window.especies_model.rowCount() == 0
     
     # Seleccionar "Caballa"
     window.especie_combo.setCurrentIndex(2)
     
     qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
     
-    assert window.especies_list.count() == 1
-    item = window.especies_list.item(0)
+    assert window.especies_model.rowCount() == 1
+    item = window.especies_model.index(0)
     specie_data = item.data(Qt.UserRole)
     assert specie_data.nom_vul_cas == 'Caballa'
 
@@ -236,10 +242,10 @@ def test_add_species_sorted(qtbot, window):
     window.especie_combo.setCurrentIndex(2) # Caballa
     qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
 
-    assert window.especies_list.count() == 3
-    assert window.especies_list.item(0).data(Qt.UserRole).nom_vul_cas == 'Anchoita'
-    assert window.especies_list.item(1).data(Qt.UserRole).nom_vul_cas == 'Caballa'
-    assert window.especies_list.item(2).data(Qt.UserRole).nom_vul_cas == 'Merluza'
+    assert window.especies_model.rowCount() == 3
+    assert window.especies_model.index(0).data(Qt.UserRole).nom_vul_cas == 'Anchoita'
+    assert window.especies_model.index(1).data(Qt.UserRole).nom_vul_cas == 'Caballa'
+    assert window.especies_model.index(2).data(Qt.UserRole).nom_vul_cas == 'Merluza'
 
 def test_prevent_duplicate_species(qtbot, window, mocker):
     """Test: No se pueden añadir especies duplicadas."""
@@ -248,14 +254,14 @@ def test_prevent_duplicate_species(qtbot, window, mocker):
     # Añadir Caballa
     window.especie_combo.setCurrentIndex(2)
     qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
-    assert window.especies_list.count() == 1
+    assert window.especies_model.rowCount() == 1
 
     # Intentar añadir Caballa de nuevo
     window.especie_combo.setCurrentIndex(2)
     qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
     
     # La lista no debe crecer y debe mostrarse una advertencia
-    assert window.especies_list.count() == 1
+    assert window.especies_model.rowCount() == 1
     mock_msg_box.assert_called_once()
 
 def test_remove_specie(qtbot, window):
@@ -263,15 +269,33 @@ def test_remove_specie(qtbot, window):
     # Añadir una especie primero
     window.especie_combo.setCurrentIndex(1) # Anchoita
     qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
-    assert window.especies_list.count() == 1
+    assert window.especies_model.rowCount() == 1
+
+    # Clic sobre el botón "Eliminar" que pinta el delegate en la fila
+    window.show()
+    qtbot.waitExposed(window)
+    view = window.especies_list
+    option = QStyleOptionViewItem()
+    option.initFrom(view)
+    option.rect = view.visualRect(window.especies_model.index(0))
+    button = view.itemDelegate().button_rect(option)
+    qtbot.mouseClick(view.viewport(), Qt.LeftButton, pos=button.center())
+
+    assert window.especies_model.rowCount() == 0
+
+def test_click_on_row_text_keeps_specie(qtbot, window):
+    """Test: Un clic sobre el texto de la fila la selecciona sin eliminarla."""
+    window.especie_combo.setCurrentIndex(1) # Anchoita
+    qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
+    window.show()
+    qtbot.waitExposed(window)
 
-    # Obtener el widget del item y simular clic en su botón de borrar
-    item_widget = window.especies_list.itemWidget(window.especies_list.item(0))
-    # Asumimos que el botón de borrar se llama 'delete_button' en SpeciesListItemWidget
-    # Si no es accesible, necesitamos otra estrategia, como emitir la señal.
-    item_widget.deleted.emit(window.especies_list.item(0))
+    view = window.especies_list
+    row_rect = view.visualRect(window.especies_model.index(0))
+    qtbot.mouseClick(view.viewport(), Qt.LeftButton, pos=QPoint(row_rect.left() + 10, row_rect.center().y()))
 
-    assert window.especies_list.count() == 0
+    assert window.especies_model.rowCount() == 1
+    assert view.currentIndex().row() == 0
 
 def test_toggle_species_view(qtbot, window):
     """Test: El modo de búsqueda de especies alterna correctamente."""
@@ -298,8 +322,8 @@ def test_add_trip_stage(qtbot, window):
 
     qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
 
-    assert window.etapas_list.count() == 1
-    item = window.etapas_list.item(0)
+    assert window.etapas_model.rowCount() == 1
+    item = window.etapas_model.index(0)
     s_date, e_date = item.data(Qt.UserRole)
     assert s_date == start_date
     assert e_date == end_date
@@ -312,14 +336,14 @@ def test_prevent_overlapping_stages(qtbot, window, mocker):
     window.etapa_start_date.setDate(QDate(2025, 10, 20))
     window.etapa_end_date.setDate(QDate(2025, 10, 25))
     qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
-    assert window.etapas_list.count() == 1
+    assert window.etapas_model.rowCount() == 1
 
     # Intentar añadir etapa solapada
     window.etapa_start_date.setDate(QDate(2025, 10, 22))
     window.etapa_end_date.setDate(QDate(2025, 10, 27))
     qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
 
-    assert window.etapas_list.count() == 1
+    assert window.etapas_model.rowCount() == 1
     mock_msg_box.assert_called_once()
 
 def test_prevent_end_date_before_start_date(qtbot, window, mocker):
@@ -330,18 +354,236 @@ def test_prevent_end_date_before_start_date(qtbot, window, mocker):
     window.etapa_end_date.setDate(QDate(2025, 10, 20))
     qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
 
-    assert window.etapas_list.count() == 0
+    assert window.etapas_model.rowCount() == 0
     mock_msg_box.assert_called_once()
 
 def test_enter_in_species_combo_adds_item(qtbot, window):
     """Test: Presionar Enter en el combo de especies la añade a la lista."""
-    assert window.especies_list.count() == 0
+    assert window.especies_model.rowCount() == 0
     
     window.especie_combo.setCurrentIndex(2) # Caballa
     
     # Simular la presión de la tecla Enter en el lineEdit del combo
     qtbot.keyClick(window.especie_combo.lineEdit(), Qt.Key_Return)
 
-    assert window.especies_list.count() == 1
-    assert window.especies_list.item(0).data(Qt.UserRole).nom_vul_cas == 'Caballa'
+    assert window.especies_model.rowCount() == 1
+    assert window.especies_model.index(0).data(Qt.UserRole).nom_vul_cas == 'Caballa'
+
+
+def test_process_button_runs_registered_process(qtbot, window, mock_config_manager, tmp_path):
+    """Test: Los botones de proceso ejecutan el proceso sobre la marea en segundo plano."""
+    import shutil
+    input_data = os.path.join(os.path.dirname(__file__), '..', 'input_data')
+    for name in os.listdir(input_data):
+        shutil.copy(os.path.join(input_data, name), tmp_path / name)
+    mock_config_manager.get_input_data_path.return_value = str(tmp_path)
+
+    window.num_marea.setText("118")
+    window.anio_marea.setText("2025")
+    window.observador_combo.setCurrentIndex(1)
+    window.buque_combo.setCurrentIndex(1)
+    window.etapa_start_date.setDate(QDate(2025, 7, 15))
+    window.etapa_end_date.setDate(QDate(2025, 8, 2))
+    qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
+    window.especie_combo.setCurrentIndex(3)  # Merluza
+    qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
+
+    button = next(b for b in window.process_buttons if b.text() == "Resumen produccion")
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=5000,
+                          check_params_cb=lambda name, result: name == "Resumen produccion"):
+        qtbot.mouseClick(button, Qt.LeftButton)
+
+    resumen = window.process_results["Resumen produccion"]
+    assert list(resumen['especie']) == ['Langostino']
+    assert button.isEnabled()
+
+def test_saving_marea_checks_sampling_in_background(qtbot, window, mock_config_manager, tmp_path, mocker):
+    """Test: Al guardar una marea con captura se controla la cobertura de muestreo sin interrumpir."""
+    import shutil
+    shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'input_data', 'C11825.DBF'), tmp_path)
+    mock_config_manager.get_input_data_path.return_value = str(tmp_path)
+    mock_msg_box = mocker.patch('presentation.main_window.QMessageBox.critical')
+
+    window.num_marea.setText("118")
+    window.anio_marea.setText("2025")
+    window.observador_combo.setCurrentIndex(1)
+    window.buque_combo.setCurrentIndex(1)
+    window.etapa_start_date.setDate(QDate(2025, 7, 15))
+    window.etapa_end_date.setDate(QDate(2025, 8, 2))
+    qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=5000,
+                          check_params_cb=lambda name, result: name == "Control muestreo"):
+        window.especie_combo.setCurrentIndex(3)  # Merluza
+        qtbot.mouseClick(window.add_especie_btn, Qt.LeftButton)
 
+    assert "Control muestreo" in window.process_results
+    assert window.statusBar().currentMessage().startswith("Control muestreo:")
+    mock_msg_box.assert_not_called()
+
+def test_marea_files_prefetched_when_marea_identified(qtbot, window, mock_config_manager):
+    """Test: Al completar número y año se leen en segundo plano los archivos de la marea."""
+    input_data = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+    mock_config_manager.get_input_data_path.return_value = input_data
+
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=5000,
+                          check_params_cb=lambda name, result: name == "Precarga 118/2025"):
+        window.num_marea.setText("118")
+        window.anio_marea.setText("2025")
+
+    assert len(window.dataset_cache) == 1
+    assert window.process_results == {}
+    assert not window.process_runner.running_jobs()
+
+def test_unimplemented_process_shows_message(qtbot, window, mocker):
+    """Test: Un proceso sin implementación avisa al usuario en lugar de fallar."""
+    mock_msg_box = mocker.patch('presentation.main_window.QMessageBox.information')
+    mocker.patch('presentation.main_window.get_process', return_value=None)
+
+    window._run_process(window.process_buttons[0].text())
+
+    mock_msg_box.assert_called_once()
+    assert window.process_runner.running_jobs() == []
+
+def test_deferred_startup_loads_catalogs_after_first_paint(qtbot, qt_app, mock_repository, mock_config_manager):
+    """Test: Con inicio diferido los catálogos se leen recién después del primer pintado."""
+    win = MainWindow(defer_startup=True)
+    qtbot.addWidget(win)
+    mock_repository.get_especies.assert_not_called()
+
+    with qtbot.waitSignals([win.first_painted, win.startup_completed], order='strict', timeout=5000):
+        win.show()
+
+    mock_repository.get_especies.assert_called_once()
+    assert win.especie_combo.count() == 4
+
+def test_main_window_import_defers_heavy_modules():
+    """Test: Importar la ventana principal no carga NumPy, dbf ni los motores de proceso."""
+    import subprocess
+    code = ("import sys, presentation.main_window; "
+            "print(sorted(m for m in ('numpy', 'dbf', 'infrastructure.marea_service', 'cProfile') "
+            "if m in sys.modules))")
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    out = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(os.path.dirname(__file__), '..'),
+                         env=env, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
+
+def test_lookup_button_searches_registry(qtbot, window, tmp_path):
+    """Test: "BUSCAR CODIGO BARCO/AIP" se habilita sin marea y busca en los catálogos cargados."""
+    from benchmarks.synthetic_marea import generate_marea
+    from presentation.registry_lookup_dialog import RegistryLookupDialog
+
+    assert window.lookup_button.isEnabled()
+    assert window.lookup_button not in window.process_buttons
+
+    generate_marea(str(tmp_path), 5, 2025, lances=12, seed=1, buque='BARCO 1 ')
+    dialog = RegistryLookupDialog(window.registry_lookup, str(tmp_path), '2025', window)
+    qtbot.addWidget(dialog)
+    qtbot.keyClicks(dialog.query_edit, 'barco l')
+    assert dialog.vessels_table.item(0, 0).text() == 'Barco 1'
+    dialog.query_edit.setText('perez')
+    assert dialog.observers_table.item(0, 1).text() == 'Perez'
+
+    with qtbot.waitSignal(dialog.runner.job_finished, timeout=5000):
+        qtbot.mouseClick(dialog.resolve_btn, Qt.LeftButton)
+    assert [dialog.season_table.item(0, c).text() for c in range(5)] == ['BARCO 1', '12', 'exacto', 'Barco 1', '123']
+    dialog.reject()
+
+def test_switch_between_workspace_mareas(qtbot, window, mock_config_manager, mocker):
+    """Test: Cada marea del espacio de trabajo conserva su estado y cambiar no relee catálogos."""
+    window.num_marea.setText("118")
+    window.buque_combo.setCurrentIndex(1)
+    qtbot.mouseClick(window.add_etapa_btn, Qt.LeftButton)
+    primera = window.workspace.active_id
+
+    qtbot.mouseClick(window.new_marea_btn, Qt.LeftButton)
+    assert window.marea_selector.count() == 2
+    assert window.num_marea.text() == ''
+    assert window.etapas_model.rowCount() == 0
+    window.num_marea.setText("7")
+    assert window.marea_selector.currentText() == f"7/{window.anio_marea.text()}"
+
+    mock_repository = mocker.patch('presentation.main_window.CatalogRepository')
+    window.marea_selector.setCurrentIndex(window.marea_selector.findData(primera))
+    window.marea_selector.activated.emit(window.marea_selector.currentIndex())
+    assert window.workspace.active_id == primera
+    assert window.num_marea.text() == '118'
+    assert window.buque_combo.currentIndex() == 1
+    assert window.etapas_model.rowCount() == 1
+    mock_repository.assert_not_called()
+
+    mocker.patch('presentation.main_window.QMessageBox.question', return_value=QMessageBox.Yes)
+    qtbot.mouseClick(window.remove_marea_btn, Qt.LeftButton)
+    assert window.marea_selector.count() == 1
+    assert window.num_marea.text() == '7'
+    assert not window.remove_marea_btn.isEnabled()
+
+def test_edit_button_opens_marea_files(qtbot, window, mock_config_manager, mocker):
+    """Test: "Editar archivos" se habilita con la marea identificada y abre sus archivos."""
+    from presentation.dbf_editor_dialog import DbfEditorDialog
+    input_data = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+    mock_config_manager.get_input_data_path.return_value = input_data
+    assert not window.edit_button.isEnabled()
+
+    window.num_marea.setText("118")
+    window.anio_marea.setText("2025")
+    assert window.edit_button.isEnabled()
+    abiertos = []
+    mocker.patch.object(DbfEditorDialog, 'exec', lambda dialog: abiertos.append(dict(dialog.files)))
+    window._show_dbf_editor()
+    assert os.path.basename(abiertos[0]['captura']) == 'C11825.DBF'
+
+def test_length_chart_opens_after_background_histograms(qtbot, window, mock_config_manager):
+    """Test: "Gráfico de tallas" calcula los histogramas en segundo plano y abre el gráfico."""
+    input_data = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+    mock_config_manager.get_input_data_path.return_value = input_data
+    window.num_marea.setText("118")
+    window.anio_marea.setText("2025")
+    assert window.length_chart_button.isEnabled()
+
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=5000,
+                          check_params_cb=lambda name, result: name == "Gráfico de tallas"):
+        window._show_length_chart()
+    dialog = window.length_chart_dialog
+    assert dialog.isVisible() and dialog.especie_combo.count() > 0
+    assert dialog.sexo_chart.series_names() == ['Machos', 'Hembras', 'Indeterminados']
+    dialog.close()
+
+def test_external_file_change_rechecks_affected_controls(qtbot, window, mock_config_manager, tmp_path):
+    """Test: Si cambia un archivo de la marea por fuera, se vuelven a correr sólo los controles que lo leen
+    (nunca los procesos que escriben archivos); al cambiar de marea se olvidan los resultados."""
+    import shutil
+    data_dir = tmp_path / 'datos'
+    data_dir.mkdir()
+    input_data = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+    for name in ('C11825.DBF', 'M11825.DBF', 'P11825.DBF'):
+        shutil.copy(os.path.join(input_data, name), data_dir / name)
+    mock_config_manager.get_input_data_path.return_value = str(data_dir)
+    window.num_marea.setText("118")
+    window.anio_marea.setText("2025")
+    window.process_results.update({"Resumen produccion": None, "Control Dias horas Arrastrero": None})
+    assert window.marea_watcher.watch(str(data_dir))
+
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=10000,
+                          check_params_cb=lambda name, result: name == "Actualizar controles") as blocker:
+        with open(data_dir / 'P11825.DBF', 'ab') as f:
+            f.write(b'\x1a')
+    assert list(blocker.args[1]) == ["Resumen produccion"]
+    assert window.process_results["Resumen produccion"] is not None
+    assert window.process_results["Control Dias horas Arrastrero"] is None
+
+    window.marea_watcher.marea_changed.emit('7', '2025', ['captura'])  # otra marea: no se recalcula nada
+    assert not window.process_runner.is_running("Actualizar controles")
+
+    # Los procesos que escriben archivos no se relanzan solos
+    window.process_results.update({"Cortar bases": None, "Factores CPUE": None})
+    with qtbot.waitSignal(window.process_runner.job_finished, timeout=10000,
+                          check_params_cb=lambda name, result: name == "Actualizar controles") as blocker:
+        window.marea_watcher.marea_changed.emit('118', '2025', ['captura', 'muestra'])
+    assert "Cortar bases" not in blocker.args[1] and "Factores CPUE" not in blocker.args[1]
+    assert window.process_results["Cortar bases"] is None and window.process_results["Factores CPUE"] is None
+    assert window.process_results["Control Dias horas Arrastrero"] is not None
+
+    # Otra marea: se olvidan los resultados y los controles pendientes de la anterior
+    window._recheck_names.add("Resumen produccion")
+    window.num_marea.setText("119")
+    assert window.process_results == {} and not window._recheck_names
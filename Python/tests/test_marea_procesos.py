@@ -0,0 +1,140 @@
+import os
+import sys
+import threading
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import JobContext, JobCancelledError
+from domain.marea_dataset import MareaDataset
+from domain.marea_procesos import (decode_tallas, encode_tallas, grados_minutos_a_decimal,
+                                   duracion_horas, horas_a_hmm)
+from domain.scheduler import DagScheduler, TaskNode, resolve_order
+from infrastructure.marea_service import load_marea_dataset, run_processes, RUN_ALL_PROCESSES
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+ETAPAS = [('2025-07-15', '2025-07-20'), ('2025-07-21', '2025-08-02')]
+
+
+@pytest.fixture
+def dataset():
+    return load_marea_dataset(INPUT_DATA, '118', '2025', ETAPAS)
+
+
+def test_decode_tallas_roundtrip():
+    """Test: Los TALLA_n se separan en talla, machos, hembras, indeterminados y total."""
+    decoded = decode_tallas(np.array([42015009000024]))
+    assert [int(decoded[k][0]) for k in ('talla', 'machos', 'hembras', 'indeterminados', 'total')] == [42, 15, 9, 0, 24]
+    assert encode_tallas(42, 15, 9, 0, 24) == 42015009000024
+
+
+def test_legacy_conversions():
+    """Test: Posiciones GG.MM y horas HH.MM se convierten como en los PRG."""
+    assert grados_minutos_a_decimal(np.array([44.421]))[0] == pytest.approx(-44.70166667)
+    assert list(duracion_horas(np.array([17.15, 23.30]), np.array([18.16, 1.00]))) == pytest.approx([61 / 60, 1.5])
+    assert horas_a_hmm(np.array([6.25]))[0] == pytest.approx(6.15)
+
+
+def test_etapa_index():
+    """Test: Cada fecha se asigna a su etapa, o -1 si no cae en ninguna."""
+    ds = MareaDataset('1', '2025', [{'start_date': '2025-01-10', 'end_date': '2025-01-12'},
+                                    {'start_date': '2025-01-01', 'end_date': '2025-01-05'}], {})
+    fechas = np.array(['2025-01-01', '2025-01-07', '2025-01-12', 'NaT'], dtype='datetime64[D]')
+    assert list(ds.etapa_index(fechas)) == [0, -1, 1, -1]
+
+
+def test_resolve_order_and_cycles():
+    """Test: El orden respeta dependencias y los ciclos se detectan."""
+    noop = lambda ds, inputs, params: None
+    nodes = {'a': TaskNode('a', noop), 'b': TaskNode('b', noop, ('a',)), 'c': TaskNode('c', noop, ('a', 'b'))}
+    assert resolve_order(nodes, ['c']) == ['a', 'b', 'c']
+    nodes['a'] = TaskNode('a', noop, ('c',))
+    with pytest.raises(ValueError):
+        resolve_order(nodes, ['c'])
+    with pytest.raises(KeyError):
+        resolve_order(nodes, ['zzz'])
+
+
+def test_scheduler_runs_branches_in_parallel_and_memoizes():
+    """Test: Las ramas independientes corren a la vez y los productos se calculan una vez."""
+    calls = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    def base(ds, inputs, params):
+        calls.append('base')
+        return 10
+
+    def branch(ds, inputs, params):
+        barrier.wait()  # Solo avanza si ambas ramas se ejecutan en paralelo
+        return inputs['base'] + params['extra']
+
+    nodes = {
+        'base': TaskNode('base', base, memoize=True),
+        'izq': TaskNode('izq', branch, ('base',)),
+        'der': TaskNode('der', branch, ('base',)),
+    }
+    ds = MareaDataset('1', '2025', [], {})
+    scheduler = DagScheduler(nodes, max_workers=2)
+    assert scheduler.run(['izq', 'der'], ds, {'extra': 1}) == {'izq': 11, 'der': 11}
+    barrier.reset()
+    scheduler.run(['izq', 'der'], ds, {'extra': 1})
+    assert calls == ['base']
+
+
+def test_scheduler_cancellation():
+    """Test: Un proceso cancelado interrumpe el grafo."""
+    context = JobContext()
+    context.token.cancel()
+    nodes = {'a': TaskNode('a', lambda ds, i, p: 1)}
+    with pytest.raises(JobCancelledError):
+        DagScheduler(nodes).run(['a'], None, {}, context)
+
+
+def test_run_all_reads_each_file_once(dataset, tmp_path):
+    """Test: Ejecutar todos los procesos comparte los productos intermedios."""
+    results = run_processes(JobContext(), [RUN_ALL_PROCESSES], '118', '2025', ETAPAS,
+                            especies=['5139030101'], data_dir=INPUT_DATA,
+                            output_dir=str(tmp_path), dataset=dataset)
+    assert {'Control Dias horas Arrastrero', 'Distribución de tallas', 'Resumen produccion',
+            'Posiciones con una especie arrastreros', 'Cortar bases'} <= set(results)
+    assert {'captura_larga', 'tallas', 'posiciones', 'lances'} <= set(dataset.cached_products())
+
+
+def test_control_dias_horas(dataset):
+    """Test: Los kilos por especie suman lo mismo que los campos KG_n del archivo."""
+    result = run_processes(JobContext(), ["Control Dias horas Arrastrero"], '118', '2025', dataset=dataset)
+    tabla = result["Control Dias horas Arrastrero"]
+    captura = dataset.table('captura')
+    total_kg = sum(captura[f'KG_{i}'].sum() for i in range(1, 26))
+    assert tabla['kilos'].sum() == pytest.approx(total_kg)
+    langostino = (tabla['especie'] == 5139030101) & (tabla['etapa'] == 0)
+    assert tabla['dias'][langostino][0] == len(np.unique(captura['FECHA'][dataset.etapa_index(captura['FECHA']) == 0]))
+
+
+def test_distribucion_tallas_filters_species(dataset):
+    """Test: La distribución de tallas se limita a las especies objetivo."""
+    result = run_processes(JobContext(), ["Distribución de tallas"], '118', '2025',
+                           especies=['5139030101'], dataset=dataset)
+    tabla = result["Distribución de tallas"]
+    assert set(tabla['especie']) == {5139030101}
+    assert np.all(tabla['machos'] + tabla['hembras'] + tabla['indeterminados'] == tabla['total'])
+
+
+def test_cortar_bases_writes_one_file_per_stage(dataset, tmp_path):
+    """Test: El corte por etapas escribe c/m/p<marea><año><letra>.dbf con los registros de cada etapa."""
+    result = run_processes(JobContext(), ["Cortar bases"], '118', '2025', dataset=dataset,
+                           output_dir=str(tmp_path))
+    resumen = result["Cortar bases"]
+    nombres = sorted(os.path.basename(a) for a in resumen['archivo'])
+    assert nombres == ['c11825a.dbf', 'c11825b.dbf', 'm11825a.dbf', 'm11825b.dbf', 'p11825a.dbf', 'p11825b.dbf']
+    etapa = dataset.etapa_index(dataset.table('captura')['FECHA'])
+    captura_a = resumen['registros'][list(resumen['archivo']).index(str(tmp_path / 'c11825a.dbf'))]
+    assert captura_a == np.count_nonzero(etapa == 0)
+
+
+def test_missing_marea_raises(tmp_path):
+    """Test: Sin archivos de la marea el proceso falla con un mensaje claro."""
+    with pytest.raises(FileNotFoundError):
+        run_processes(JobContext(), ["Resumen produccion"], '999', '2025', data_dir=str(tmp_path))
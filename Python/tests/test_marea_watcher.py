@@ -0,0 +1,77 @@
+import os
+import sys
+import shutil
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import JobContext
+from infrastructure.marea_files import changed_mareas, snapshot_marea_files
+from infrastructure.marea_service import DatasetCache, affected_by, open_result_cache, run_processes
+from presentation.marea_watcher import MareaWatcher
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+ETAPAS = [('2025-01-01', '2025-12-31')]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ('C11825.DBF', 'M11825.DBF', 'P11825.DBF'):
+        shutil.copy(os.path.join(INPUT_DATA, name), tmp_path / name)
+    return str(tmp_path)
+
+
+def _modificar(path):
+    with open(path, 'ab') as f:
+        f.write(b'\x1a')
+
+
+def test_changed_file_invalidates_only_dependent_products(data_dir, tmp_path):
+    """Test: Un archivo cambiado sólo invalida los productos y resultados que leen esa tabla."""
+    antes = snapshot_marea_files(data_dir)
+    assert set(antes) == {os.path.join(data_dir, n) for n in ('C11825.DBF', 'M11825.DBF', 'P11825.DBF')}
+    assert affected_by(['produccion']) == {"Resumen produccion", "Cortar bases"}
+    assert "Control Dias horas Arrastrero" not in affected_by(['muestra'])
+
+    datasets = DatasetCache()
+    cache = open_result_cache(str(tmp_path / 'cache'))
+    nombres = ["Control Dias horas Arrastrero", "Resumen produccion", "Distribución de tallas"]
+    run_processes(JobContext(), nombres, '118', '2025', etapas=ETAPAS, data_dir=data_dir,
+                  datasets=datasets, cache=cache)
+    dataset = datasets.get(data_dir, '118', '2025', ETAPAS)
+    larga, tallas = dataset.product('captura_larga', None), dataset.product('tallas', None)
+
+    _modificar(os.path.join(data_dir, 'M11825.DBF'))
+    shutil.copy(os.path.join(data_dir, 'P11825.DBF'), os.path.join(data_dir, 'P11925.DBF'))
+    assert changed_mareas(antes, snapshot_marea_files(data_dir)) == {('118', '2025'): {'muestra'},
+                                                                    ('119', '2025'): {'produccion'}}
+    nuevo = datasets.get(data_dir, '118', '2025', ETAPAS)
+    assert nuevo is not dataset and nuevo.product('captura_larga', None) is larga
+    assert 'tallas' not in nuevo.cached_products()
+
+    misses = cache.stats().misses
+    run_processes(JobContext(), nombres, '118', '2025', etapas=ETAPAS, data_dir=data_dir,
+                  datasets=datasets, cache=cache)
+    assert cache.stats().misses == misses + 1  # sólo la distribución de tallas lee la muestra
+    assert nuevo.product('tallas', None) is not tallas
+
+
+@pytest.mark.parametrize('polling', [True, False])
+def test_watcher_reports_changed_marea_files(qtbot, data_dir, polling):
+    """Test: El vigilante avisa una vez por marea los archivos que cambiaron (con inotify o revisando)."""
+    watcher = MareaWatcher(polling=polling, debounce_ms=50, poll_interval_ms=100)
+    assert watcher.watch(data_dir) and watcher.polling == polling
+    assert not MareaWatcher().watch(os.path.join(data_dir, 'no_existe'))
+
+    with qtbot.waitSignal(watcher.marea_changed, timeout=5000) as blocker:
+        _modificar(os.path.join(data_dir, 'C11825.DBF'))
+    assert blocker.args == ['118', '2025', ['captura']]
+
+    with qtbot.waitSignal(watcher.marea_changed, timeout=5000) as blocker:
+        os.remove(os.path.join(data_dir, 'P11825.DBF'))
+        with open(os.path.join(data_dir, 'notas.txt'), 'w') as f:
+            f.write('no es de una marea')
+    assert blocker.args == ['118', '2025', ['produccion']]
+    watcher.stop()
+    assert watcher.rescan() == {}
@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtWidgets import QApplication
+
+from domain.jobs import Job, JobContext, JobCancelledError, CancellationToken
+from presentation.process_runner import ProcessRunner
+
+
+@pytest.fixture(scope='session')
+def qt_app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def runner(qt_app):
+    r = ProcessRunner(max_threads=4)
+    yield r
+    r.shutdown()
+
+
+def _sumar_con_progreso(context: JobContext, valores):
+    total = 0
+    for i, valor in enumerate(valores):
+        total += valor
+        context.emit_partial(total)
+        context.report_progress((i + 1) * 100 // len(valores), f"valor {valor}")
+    return total
+
+
+def _esperar_evento(context: JobContext, evento: threading.Event):
+    # Bloquea hasta que el test libera el evento, revisando la cancelación
+    while not evento.wait(0.01):
+        context.check_cancelled()
+    return "liberado"
+
+
+def _cuadrado(x):
+    return x * x
+
+
+def test_job_context_reports_and_cancels():
+    """Test: El contexto reenvía el progreso y corta la ejecución al cancelar."""
+    progresos = []
+    context = JobContext(on_progress=lambda p, m: progresos.append((p, m)))
+    context.report_progress(150, "fuera de rango")
+    assert progresos == [(100, "fuera de rango")]
+
+    context.token.cancel()
+    with pytest.raises(JobCancelledError):
+        context.report_progress(10)
+
+
+def test_job_runs_synchronously_without_qt():
+    """Test: Un Job puede ejecutarse en el hilo actual sin ejecutor."""
+    job = Job("suma", _sumar_con_progreso, {'valores': [1, 2, 3]})
+    assert job.run(JobContext(token=CancellationToken())) == 6
+
+
+def test_runner_emits_progress_partials_and_result(qtbot, runner):
+    """Test: El runner entrega progreso, resultados intermedios y el resultado final."""
+    progresos, parciales = [], []
+    runner.job_progress.connect(lambda name, p, m: progresos.append(p))
+    runner.job_partial.connect(lambda name, r: parciales.append(r))
+
+    with qtbot.waitSignal(runner.job_finished, timeout=5000) as blocker:
+        assert runner.submit(Job("suma", _sumar_con_progreso, {'valores': [1, 2, 3, 4]}))
+
+    assert blocker.args == ["suma", 10]
+    assert parciales == [1, 3, 6, 10]
+    assert progresos[-1] == 100
+    assert not runner.is_running("suma")
+
+
+def test_runner_rejects_duplicate_and_cancels(qtbot, runner):
+    """Test: No se lanza dos veces el mismo proceso y la cancelación se informa."""
+    evento = threading.Event()
+    assert runner.submit(Job("espera", _esperar_evento, {'evento': evento}))
+    assert not runner.submit(Job("espera", _esperar_evento, {'evento': evento}))
+
+    with qtbot.waitSignal(runner.job_cancelled, timeout=5000) as blocker:
+        runner.cancel("espera")
+    assert blocker.args == ["espera"]
+    assert runner.running_jobs() == []
+
+
+def test_runner_runs_independent_jobs_concurrently(qtbot, runner):
+    """Test: Dos procesos distintos avanzan a la vez."""
+    evento = threading.Event()
+    runner.submit(Job("primero", _esperar_evento, {'evento': evento}))
+    runner.submit(Job("segundo", _esperar_evento, {'evento': evento}))
+    assert sorted(runner.running_jobs()) == ["primero", "segundo"]
+
+    terminados = []
+    runner.job_finished.connect(lambda name, r: terminados.append(name))
+    evento.set()
+    qtbot.waitUntil(lambda: len(terminados) == 2, timeout=5000)
+    assert sorted(terminados) == ["primero", "segundo"]
+
+
+def test_runner_reports_failures(qtbot, runner, caplog):
+    """Test: Una excepción dentro del proceso se informa por job_failed y queda en el log con su traza."""
+    def _falla(context):
+        raise ValueError("archivo corrupto")
+
+    with caplog.at_level('ERROR', logger='presentation.process_runner'):
+        with qtbot.waitSignal(runner.job_failed, timeout=5000) as blocker:
+            runner.submit(Job("falla", _falla))
+    assert blocker.args == ["falla", "archivo corrupto"]
+    assert "Job falla falló" in caplog.text and caplog.records[-1].exc_info is not None
+
+
+def test_runner_cpu_bound_job_uses_process_pool(qtbot, runner):
+    """Test: Los trabajos cpu_bound se ejecutan en el pool de procesos."""
+    with qtbot.waitSignal(runner.job_finished, timeout=20000) as blocker:
+        runner.submit(Job("cuadrado", _cuadrado, {'x': 12}, cpu_bound=True))
+    assert blocker.args == ["cuadrado", 144]
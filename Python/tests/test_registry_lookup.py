@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic_marea import generate_marea
+from domain.entities import Buque, Observador
+from domain.fuzzy_index import FuzzyIndex, edit_distance, normalize_text
+from domain.registry_lookup import (RESOLUTION_AMBIGUOUS, RESOLUTION_APPROXIMATE, RESOLUTION_EXACT,
+                                    RESOLUTION_NOT_FOUND, RegistryLookup)
+from infrastructure.marea_service import season_barcos
+from infrastructure.repositories import CatalogRepository
+from util import resource_path
+
+BUQUES = [
+    Buque('DON TOMASSO', '1468', 'A', 'Fresquero', 25.0, 800, '02310'),
+    Buque('ANTONELLA', '1097', 'A', 'Fresquero', 20.0, 500, '0033'),
+    Buque('SAN JORGE I', '0', 'B', 'Congelador', 60.0, 3000, '5439'),
+    Buque('SAN JORGE I', '2200', 'B', 'Congelador', 60.0, 3000, '5440'),
+    Buque('MALVINAS ARGENTINAS', '3001', 'B', 'Congelador', 70.0, 4000, '6001'),
+]
+OBSERVADORES = [Observador('42', 'PIÑERO', 'Rubén'), Observador('7610', 'BARGAS PEÑA', 'Raul'),
+                Observador('171', 'FERNANDEZ', 'Mateo')]
+
+
+def test_normalize_and_edit_distance():
+    """Test: Las claves se comparan sin acentos, signos ni mayúsculas, con distancia acotada."""
+    assert normalize_text('  Don  Tomasso. ') == 'DON TOMASSO'
+    assert normalize_text('Piñero') == 'PINERO'
+    assert edit_distance('FEDERICO C', 'FEDRICO C') == 1
+    assert edit_distance('KITTEN', 'SITTING') == 3
+    assert edit_distance('ABCDEFGH', 'XYZ', max_distance=2) == 3
+
+
+def test_index_blocks_and_ranks_by_distance():
+    """Test: La búsqueda devuelve una coincidencia por elemento, ordenada por distancia."""
+    index = FuzzyIndex()
+    for buque in BUQUES:
+        index.add(buque, nombre=buque.nombre, matricula=buque.matricula)
+
+    matches = index.search('don tomaso')
+    assert matches[0].item.nombre == 'DON TOMASSO' and matches[0].distancia == 1
+    assert index.search('02310')[0].campo == 'matricula'
+    assert [m.item.nombre for m in index.search('malvinas', limit=1)] == ['MALVINAS ARGENTINAS']
+    assert index.search('') == []
+    assert index.search('zzzz', max_distance=1) == []
+
+
+def test_registry_lookup_vessels_and_observers():
+    """Test: Los buques se encuentran por nombre, matrícula o código y los observadores por apellido."""
+    lookup = RegistryLookup(BUQUES, OBSERVADORES)
+    assert lookup.search_vessels('33')[0].item.nombre == 'ANTONELLA'       # matrícula 0033
+    assert lookup.search_vessels('1468')[0].item.nombre == 'DON TOMASSO'
+    assert lookup.search_observers('pinero')[0].item.obs_nro == '42'
+    assert lookup.search_observers('FERNAN')[0].item.apellido == 'FERNANDEZ'  # como LEFT(obser,6)
+    assert lookup.search_observers('7610')[0].item.apellido == 'BARGAS PEÑA'
+
+
+def test_resolve_vessels_classifies_each_barco():
+    """Test: Cada BARCO distinto se resuelve una vez y se marca exacto, aproximado, ambiguo o sin coincidencia."""
+    lookup = RegistryLookup(BUQUES, OBSERVADORES)
+    resoluciones = {r.barco: r for r in lookup.resolve_vessels(
+        ['DON TOMASSO', 'don tomasso ', 'ANTONELA', 'SAN JORGE I', 'PESQUERO FANTASMA', 'DON TOMASSO'])}
+
+    assert resoluciones['DON TOMASSO'].estado == RESOLUTION_EXACT
+    assert resoluciones['DON TOMASSO'].registros == 2
+    assert resoluciones['don tomasso'].buque.buque_cod == '1468'
+    assert resoluciones['ANTONELA'].estado == RESOLUTION_APPROXIMATE
+    assert resoluciones['SAN JORGE I'].estado == RESOLUTION_AMBIGUOUS
+    assert resoluciones['SAN JORGE I'].buque is None
+    assert resoluciones['PESQUERO FANTASMA'].estado == RESOLUTION_NOT_FOUND
+
+
+def test_season_barcos_resolved_against_real_registry(tmp_path):
+    """Test: Los BARCO de una temporada se cuentan leyendo sólo esa columna y se resuelven contra Buques.DBF."""
+    generate_marea(str(tmp_path), 1, 2025, lances=30, seed=1, buque='DON SANTIAGO')
+    generate_marea(str(tmp_path), 2, 2025, lances=20, seed=2, buque='Don Santiago ')
+    generate_marea(str(tmp_path), 3, 2024, lances=10, seed=3, buque='ARGENTlNO')
+    assert season_barcos(str(tmp_path), '2025') == {'DON SANTIAGO': 30, 'Don Santiago': 20}
+
+    repo = CatalogRepository(base_path=resource_path('data'))
+    lookup = RegistryLookup(repo.get_buques(), repo.get_observadores())
+    start = time.perf_counter()
+    resoluciones = lookup.resolve_vessels(season_barcos(str(tmp_path)))
+    assert time.perf_counter() - start < 1.0
+    assert [(r.barco, r.registros, r.estado) for r in resoluciones] == [
+        ('DON SANTIAGO', 30, RESOLUTION_EXACT), ('Don Santiago', 20, RESOLUTION_EXACT),
+        ('ARGENTlNO', 10, RESOLUTION_APPROXIMATE)]
+    assert resoluciones[2].buque.nombre == 'ARGENTINO'
@@ -0,0 +1,114 @@
+import os
+import sys
+import shutil
+import pytest
+import numpy as np
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import JobContext
+from domain.procesos import process_graph
+from domain.scheduler import TaskNode
+from infrastructure.marea_service import open_result_cache, run_processes
+from infrastructure.result_cache import ResultCache, code_sources, code_version
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INPUT_DATA = os.path.join(APP_ROOT, 'input_data')
+ETAPAS = [('2025-07-15', '2025-07-20'), ('2025-07-21', '2025-08-02')]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / 'datos'
+    shutil.copytree(INPUT_DATA, target)
+    return target
+
+
+def test_put_get_and_stats(tmp_path):
+    """Test: Una clave guardada se recupera y se cuentan aciertos y fallos."""
+    cache = ResultCache(str(tmp_path))
+    key = cache.key("Resumen produccion", {'captura': 'abc'}, {'especies': [1]})
+    assert cache.get(key) == (False, None)
+    cache.put(key, {'kilos': np.array([1.5, 2.0])})
+    hit, value = cache.get(key)
+    assert hit and value['kilos'].tolist() == [1.5, 2.0]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_key_depends_on_inputs_params_and_version(tmp_path):
+    """Test: Cambiar un hash de entrada, un parámetro o la versión cambia la clave."""
+    cache = ResultCache(str(tmp_path), version='1')
+    base = cache.key("p", {'captura': 'abc'}, {'especies': [1]})
+    assert base == cache.key("p", {'captura': 'abc'}, {'especies': [1]})
+    assert base != cache.key("p", {'captura': 'abd'}, {'especies': [1]})
+    assert base != cache.key("p", {'captura': 'abc'}, {'especies': [2]})
+    assert base != ResultCache(str(tmp_path), version='2').key("p", {'captura': 'abc'}, {'especies': [1]})
+
+
+def test_lru_eviction_survives_reopen(tmp_path):
+    """Test: Al superar el tamaño máximo se desaloja la entrada usada hace más tiempo."""
+    payload = np.zeros(1000)
+    cache = ResultCache(str(tmp_path), max_bytes=20000)
+    cache.put('a', payload)
+    cache.put('b', payload)
+    cache.get('a')
+    cache.put('c', payload)
+    assert cache.stats().evictions == 1
+    assert cache.get('b') == (False, None)
+
+    reopened = ResultCache(str(tmp_path), max_bytes=20000)
+    assert reopened.stats().entries == 2
+    assert reopened.get('a')[0] and reopened.get('c')[0]
+
+
+def test_code_version_changes_with_process_code():
+    """Test: La versión de código cambia si cambia la función de un proceso."""
+    nodes = dict(process_graph())
+    original = code_version(nodes)
+    nodes['lances'] = TaskNode('lances', lambda dataset, inputs, params: {}, (), True)
+    assert code_version(nodes) != original
+
+
+def test_code_version_covers_helper_modules(tmp_path):
+    """Test: La versión cubre los módulos auxiliares de domain y el lector de DBF, no sólo los procesos."""
+    nodes = process_graph()
+    sources = [os.path.basename(path) for path in code_sources(nodes)]
+    assert {'columnar.py', 'marea_procesos.py', 'dbf_reader.py'} <= set(sources)
+
+    helper = tmp_path / 'columnar.py'
+    helper.write_text("def group_by(): pass\n")
+    original = code_version(nodes, [str(helper)])
+    helper.write_text("def group_by(): return None\n")
+    assert code_version(nodes, [str(helper)]) != original
+
+
+def test_unloadable_entries_are_misses(tmp_path):
+    """Test: Una entrada que referencia un módulo o una clase que ya no existe cuenta como fallo."""
+    (tmp_path / 'modulo.pkl').write_bytes(b"cmodulo_que_no_existe\nClase\n.")
+    (tmp_path / 'clase.pkl').write_bytes(b"cbuiltins\nclase_que_no_existe\n.")
+    cache = ResultCache(str(tmp_path))
+    assert cache.get('modulo') == (False, None)
+    assert cache.get('clase') == (False, None)
+    assert cache.stats().entries == 0 and not os.listdir(tmp_path)
+
+
+def test_run_processes_reuses_cached_results(tmp_path, data_dir):
+    """Test: Re-ejecutar con archivos sin cambios usa la caché; modificar un archivo la invalida."""
+    cache = open_result_cache(str(tmp_path / 'cache'))
+    kwargs = dict(etapas=ETAPAS, data_dir=str(data_dir), cache=cache)
+    first = run_processes(JobContext(), ["Resumen produccion"], '118', '2025', **kwargs)
+    second = run_processes(JobContext(), ["Resumen produccion"], '118', '2025', **kwargs)
+    assert cache.stats().hits == 1
+    assert second["Resumen produccion"]['kilos'].tolist() == first["Resumen produccion"]['kilos'].tolist()
+
+    run_processes(JobContext(), ["Resumen produccion"], '118', '2025', especies=[1], **kwargs)
+    assert cache.stats().misses == 2
+
+    with open(data_dir / 'P11825.DBF', 'r+b') as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b' \x1a')
+    run_processes(JobContext(), ["Resumen produccion"], '118', '2025', **kwargs)
+    assert cache.stats().misses == 3
@@ -0,0 +1,106 @@
+import os
+import sys
+import shutil
+import pytest
+import numpy as np
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic_marea import ESPECIES, generate_marea
+from infrastructure.dbf_reader import DbfColumns
+from infrastructure.marea_service import load_marea_dataset, run_processes
+from infrastructure.season_store import SeasonStore
+from domain import marea_procesos
+from domain.jobs import JobContext
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INPUT_DATA = os.path.join(APP_ROOT, 'input_data')
+
+
+@pytest.fixture
+def season_dir(tmp_path):
+    """Carpeta con la marea de ejemplo (118/2025) y una copia como 119/2025."""
+    data_dir = tmp_path / 'datos'
+    data_dir.mkdir()
+    for name in os.listdir(INPUT_DATA):
+        shutil.copy(os.path.join(INPUT_DATA, name), data_dir / name)
+        shutil.copy(os.path.join(INPUT_DATA, name), data_dir / name.replace('118', '119'))
+    return data_dir
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SeasonStore(str(tmp_path / 'temporada.sqlite')) as store:
+        yield store
+
+
+def test_ingest_directory_loads_every_marea(store, season_dir):
+    """Test: La primera ingesta carga todos los archivos de todas las mareas."""
+    report = store.ingest_directory(str(season_dir))
+    assert len(report.nuevos) == 6 and not report.errores
+    mareas = store.mareas(2025)
+    assert mareas['marea'].tolist() == [118, 119]
+    assert mareas['buque'].tolist() == ['DON SANTIAGO', 'DON SANTIAGO']
+
+
+def test_ingest_is_incremental(store, season_dir):
+    """Test: Sólo se recargan los archivos modificados; tocar un archivo sin cambiarlo no lo recarga."""
+    store.ingest_directory(str(season_dir))
+    capturas = store.query("SELECT COUNT(*) AS n FROM capturas")['n'][0]
+
+    os.utime(season_dir / 'C11825.DBF', ns=(1, 1))
+    report = store.ingest_directory(str(season_dir))
+    assert not report.cargados and len(report.sin_cambios) == 6
+
+    with open(season_dir / 'P11925.DBF', 'r+b') as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b' \x1a')
+    report = store.ingest_directory(str(season_dir))
+    assert report.actualizados == [str(season_dir / 'P11925.DBF')]
+    assert store.query("SELECT COUNT(*) AS n FROM capturas")['n'][0] == capturas
+
+
+def test_removed_files_are_dropped(store, season_dir):
+    """Test: Los archivos que desaparecen de la carpeta se quitan del almacén."""
+    store.ingest_directory(str(season_dir))
+    os.remove(season_dir / 'C11925.DBF')
+    report = store.ingest_directory(str(season_dir))
+    assert report.eliminados == [str(season_dir / 'C11925.DBF')]
+    assert store.mareas(2025)['marea'].tolist() == [118]
+
+
+def test_season_queries_match_marea_processes(store, season_dir):
+    """Test: Las consultas de temporada suman lo que calculan los procesos de cada marea."""
+    store.ingest_directory(str(season_dir))
+    dataset = load_marea_dataset(str(season_dir), '118', '2025')
+    control = run_processes(JobContext(), ["Control Dias horas Arrastrero"], '118', '2025',
+                            dataset=dataset)["Control Dias horas Arrastrero"]
+    captura = store.captura_por_especie(2025)
+    por_especie = dict(zip(captura['especie'].tolist(), captura['kilos'].tolist()))
+    for especie, kilos in zip(control['especie'].tolist(), control['kilos'].tolist()):
+        assert por_especie[especie] == pytest.approx(2 * kilos)
+
+    tallas = marea_procesos.tallas(dataset, {}, {})
+    especie = int(tallas['especie'][0])
+    distribucion = store.distribucion_tallas(2025, especie, buques=['DON SANTIAGO'])
+    esperado = tallas['total'][tallas['especie'] == especie].sum() * 2
+    assert distribucion['total'].sum() == esperado
+    assert np.all(np.diff(distribucion['talla']) > 0)
+
+
+def test_submuestras_are_ingested(store, tmp_path):
+    """Test: Los archivos S se cargan en 'submuestras' y se consultan por sexo y estadio."""
+    paths = generate_marea(str(tmp_path / 'sintetica'), 7, 2025, lances=30, seed=3)
+    report = store.ingest_directory(str(tmp_path / 'sintetica'))
+    assert os.path.abspath(paths['submuestra']) in report.nuevos
+
+    source = DbfColumns(paths['submuestra'])
+    maduracion = store.maduracion(2025, ESPECIES[1][1])
+    assert maduracion['ejemplares'].sum() == source.num_rows
+    assert set(maduracion['sexo'].tolist()) <= {1, 2}
+    assert store.maduracion(2024, ESPECIES[1][1])['ejemplares'].size == 0
+
+    os.remove(paths['submuestra'])
+    store.ingest_directory(str(tmp_path / 'sintetica'))
+    assert store.query("SELECT COUNT(*) AS n FROM submuestras")['n'][0] == 0
@@ -0,0 +1,115 @@
+import os
+import sys
+import tracemalloc
+import numpy as np
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic_marea import ESPECIES, generate_marea
+from domain.jobs import JobContext
+from domain.streaming import STREAM_REGISTRY
+from infrastructure.dbf_reader import (DbfColumns, iter_dbf_chunks, iter_record_chunks, read_header,
+                                       read_records)
+from infrastructure.marea_service import run_processes
+
+ETAPAS = [('2025-01-01', '2025-06-30'), ('2025-07-01', '2026-01-31')]
+
+
+@pytest.fixture(scope='module')
+def marea_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('marea')
+    generate_marea(str(directory), 7, 2025, lances=300, seed=3, muestreo=0.5)
+    return str(directory)
+
+
+def _mark_deleted(path, rows):
+    header = read_header(path)
+    with open(path, 'r+b') as f:
+        for row in rows:
+            f.seek(header.header_length + row * header.record_length)
+            f.write(b'*')
+
+
+def test_record_chunks_cover_file_and_skip_deleted(marea_dir, tmp_path):
+    """Test: Los bloques recorren todos los registros, omiten los borrados y numeran como read_records."""
+    source = os.path.join(marea_dir, 'c0725.dbf')
+    path = tmp_path / 'c0725.dbf'
+    path.write_bytes(open(source, 'rb').read())
+    _mark_deleted(str(path), [0, 5, 6, 299])
+
+    chunks = list(iter_record_chunks(str(path), chunk_rows=7))
+    assert [start for start, _ in chunks][:2] == [0, 4]  # el primer bloque (filas 0-6) tenía 3 borrados
+    assert max(block.shape[0] for _, block in chunks) <= 7
+    assert np.array_equal(np.concatenate([block for _, block in chunks]), read_records(str(path)))
+    assert sum(block.shape[0] for _, block in iter_record_chunks(str(path), 7, include_deleted=True)) == 300
+
+    with pytest.raises(ValueError):
+        list(iter_record_chunks(str(path), chunk_rows=0))
+
+
+def test_record_chunks_tolerate_truncated_file(marea_dir, tmp_path):
+    """Test: Un archivo truncado se recorre hasta su último registro completo."""
+    source = os.path.join(marea_dir, 'p0725.dbf')
+    header = read_header(source)
+    data = open(source, 'rb').read()
+    path = tmp_path / 'p0725.dbf'
+    path.write_bytes(data[:header.header_length + header.record_length * 10 + 3])
+
+    chunks = list(iter_dbf_chunks(str(path), chunk_rows=4))
+    assert [chunk.num_rows for chunk in chunks] == [4, 4, 2]
+    assert [chunk.start for chunk in chunks] == [0, 4, 8]
+    assert np.array_equal(np.concatenate([c['KILOS'] for c in chunks]), DbfColumns(source)['KILOS'][:10])
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 64, 100000])
+def test_streamed_processes_match_full_read(marea_dir, chunk_rows):
+    """Test: Cada proceso por bloques combina sus parciales en el mismo resultado que la lectura completa."""
+    names = list(STREAM_REGISTRY)
+    especies = [ESPECIES[0][0]]
+    full = run_processes(JobContext(), names, '7', '2025', etapas=ETAPAS, especies=especies, data_dir=marea_dir)
+    streamed = run_processes(JobContext(), names, '7', '2025', etapas=ETAPAS, especies=especies,
+                             data_dir=marea_dir, chunk_rows=chunk_rows)
+
+    assert list(streamed) == names
+    for name in names:
+        assert list(streamed[name]) == list(full[name]), name
+        for column, values in full[name].items():
+            if np.issubdtype(values.dtype, np.floating):
+                assert np.allclose(streamed[name][column], values), (name, column)
+            else:
+                assert np.array_equal(streamed[name][column], values), (name, column)
+
+
+def test_streamed_stage_cuts_match_full_read(marea_dir, tmp_path):
+    """Test: "Cortar bases" por bloques escribe los mismos archivos que con la marea en memoria."""
+    full_dir, streamed_dir = tmp_path / 'completo', tmp_path / 'bloques'
+    full = run_processes(JobContext(), ["Cortar bases"], '7', '2025', etapas=ETAPAS, data_dir=marea_dir,
+                         output_dir=str(full_dir))["Cortar bases"]
+    streamed = run_processes(JobContext(), ["Cortar bases"], '7', '2025', etapas=ETAPAS, data_dir=marea_dir,
+                             output_dir=str(streamed_dir), chunk_rows=13)["Cortar bases"]
+
+    assert streamed['registros'].tolist() == full['registros'].tolist()
+    assert sum(streamed['registros']) > 0
+    for full_path, streamed_path in zip(full['archivo'], streamed['archivo']):
+        assert os.path.basename(full_path) == os.path.basename(streamed_path)
+        assert open(full_path, 'rb').read() == open(streamed_path, 'rb').read()
+
+
+def test_streaming_keeps_peak_memory_bounded(tmp_path):
+    """Test: Con bloques chicos el pico de memoria no crece con el tamaño del archivo."""
+    def peak(lances, chunk_rows):
+        directory = tmp_path / f'{lances}_{chunk_rows}'
+        generate_marea(str(directory), 1, 2025, lances=lances, seed=1, muestreo=1.0)
+        tracemalloc.start()
+        try:
+            run_processes(JobContext(), ["Distribución de tallas"], '1', '2025', etapas=ETAPAS,
+                          data_dir=str(directory), chunk_rows=chunk_rows)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small, large = peak(200, 50), peak(900, 50)
+    assert large < small * 1.5
+    assert large < peak(900, None) / 2
@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import shutil
+import pytest
+
+# Añadir el directorio raíz del proyecto de Python al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.jobs import CancellationToken, JobCancelledError, JobContext
+from infrastructure.marea_service import DatasetCache, prefetch_marea
+from infrastructure.workspace import INDEX_FILE, MareaWorkspace
+
+INPUT_DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'input_data'))
+ETAPAS = [('2025-07-15', '2025-07-20'), ('2025-07-21', '2025-08-02')]
+
+
+def _state(num, anio='2025', buque='123'):
+    return {'num_marea': num, 'anio_marea': anio, 'observador_cod': '1', 'buque_cod': buque,
+            'etapas': [{'start_date': '2025-07-15', 'end_date': '2025-07-20'}], 'especies': ['3']}
+
+
+def test_create_save_and_reopen(tmp_path):
+    """Test: Cada marea tiene su archivo y el índice recuerda la lista y la marea activa."""
+    ws = MareaWorkspace(str(tmp_path))
+    primera = ws.create(_state('118'))
+    segunda = ws.create(dict(_state('9'), theme='dark'))
+    assert ws.active_id == segunda
+
+    reabierto = MareaWorkspace(str(tmp_path))
+    assert [e.display_name for e in reabierto.entries()] == ['9/2025', '118/2025']
+    assert reabierto.active_id == segunda
+    assert 'theme' not in reabierto.load(segunda)
+    assert reabierto.activate(primera) == _state('118')
+    assert MareaWorkspace(str(tmp_path)).active_id == primera
+
+
+def test_index_rewritten_only_when_summary_changes(tmp_path):
+    """Test: Cambiar etapas o especies no reescribe el índice; cambiar el número sí."""
+    ws = MareaWorkspace(str(tmp_path))
+    marea_id = ws.create(_state('118'))
+    index_path = os.path.join(str(tmp_path), INDEX_FILE)
+    os.utime(index_path, ns=(0, 0))
+
+    ws.save(marea_id, dict(_state('118'), especies=['3', '4']))
+    assert os.stat(index_path).st_mtime_ns == 0
+    assert ws.load(marea_id)['especies'] == ['3', '4']
+
+    ws.save(marea_id, _state('119'))
+    assert os.stat(index_path).st_mtime_ns != 0
+    assert ws.entry(marea_id).num_marea == '119'
+
+
+def test_corrupted_index_is_rebuilt_and_remove(tmp_path):
+    """Test: Con el índice dañado se reconstruye desde los archivos; quitar borra sólo el estado."""
+    ws = MareaWorkspace(str(tmp_path))
+    a = ws.create(_state('1'))
+    b = ws.create(_state('2'))
+    with open(os.path.join(str(tmp_path), INDEX_FILE), 'w') as f:
+        f.write('{roto')
+
+    ws = MareaWorkspace(str(tmp_path))
+    assert {e.id for e in ws.entries()} == {a, b}
+    ws.remove(a)
+    assert not os.path.exists(os.path.join(str(tmp_path), f'marea_{a}.json'))
+    with open(os.path.join(str(tmp_path), INDEX_FILE)) as f:
+        assert [row['id'] for row in json.load(f)['mareas']] == [b]
+
+
+def test_dataset_cache_reuses_unchanged_files(tmp_path):
+    """Test: Volver a una marea no relee sus archivos; sólo se relee el que cambió."""
+    data_dir = tmp_path / 'datos'
+    shutil.copytree(INPUT_DATA, data_dir)
+    cache = DatasetCache()
+
+    dataset = cache.get(str(data_dir), '118', '2025', ETAPAS)
+    assert cache.get(str(data_dir), '118', '2025', ETAPAS) is dataset
+
+    # Otras etapas: dataset nuevo sobre las mismas tablas ya leídas
+    otras = cache.get(str(data_dir), '118', '2025', ETAPAS[:1])
+    assert otras is not dataset
+    assert all(otras.tables[kind] is dataset.tables[kind] for kind in dataset.tables)
+
+    captura = dataset.sources['captura']
+    stat = os.stat(captura)
+    os.utime(captura, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    releido = cache.get(str(data_dir), '118', '2025', ETAPAS[:1])
+    assert releido.tables['captura'] is not otras.tables['captura']
+    assert releido.tables['muestra'] is otras.tables['muestra']
+
+
+def test_prefetch_decodes_marea_into_cache(tmp_path):
+    """Test: La precarga deja la marea leída y decodificada; cancelada no guarda nada."""
+    data_dir = tmp_path / 'datos'
+    shutil.copytree(INPUT_DATA, data_dir)
+    cache = DatasetCache()
+
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(JobCancelledError):
+        prefetch_marea(JobContext(token=token), str(data_dir), '118', '2025', cache, ETAPAS)
+    assert len(cache) == 0
+    assert prefetch_marea(JobContext(), str(data_dir), '999', '2025', cache) == {}
+
+    filas = prefetch_marea(JobContext(), str(data_dir), '118', '2025', cache, ETAPAS)
+    assert set(filas) == {'captura', 'muestra', 'produccion'}
+    dataset = cache.get(str(data_dir), '118', '2025', ETAPAS)
+    assert dataset.tables['captura'].num_rows == filas['captura']
+    assert len(dataset.tables['captura']._decoded) == len(dataset.tables['captura'])
+
+
+def test_dataset_cache_is_bounded(tmp_path):
+    """Test: La caché descarta las mareas usadas hace más tiempo al pasar su límite de memoria."""
+    for num in ('118', '119'):
+        data_dir = tmp_path / num
+        shutil.copytree(INPUT_DATA, data_dir)
+    tamanio = sum(os.path.getsize(os.path.join(INPUT_DATA, name)) for name in os.listdir(INPUT_DATA))
+    cache = DatasetCache(max_bytes=tamanio)
+
+    primera = cache.get(str(tmp_path / '118'), '118', '2025')
+    cache.get(str(tmp_path / '119'), '118', '2025')
+    assert len(cache) == 1
+    assert cache.get(str(tmp_path / '118'), '118', '2025') is not primera